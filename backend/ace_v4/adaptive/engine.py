@@ -1,76 +1,103 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
 
 from ace_v4.anomaly_engine.models import AnomalyRecord
+from ace_v4.performance.config import PerformanceConfig
 from .selector import ModelSelector
 
 
+def _to_float(val) -> float:
+    try:
+        return float(val)
+    except:
+        return np.nan
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    """Column as float64; values float() cannot convert become NaN and are never flagged."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.fromiter((_to_float(val) for val in series), dtype=np.float64, count=len(series))
+
+
 class AdaptiveEngine:
-    def __init__(self):
+    def __init__(self, config: Optional[PerformanceConfig] = None, max_records_per_column: Optional[int] = None):
         self.selector = ModelSelector()
+        self.config = config or PerformanceConfig()
+        self.max_records_per_column = max_records_per_column
 
     def run_on_column(self, df: pd.DataFrame, table_name: str, column: str):
         series = df[column]
         model = self.selector.choose(series)
         model.fit(series)
 
+        values = _column_values(series)
         anomalies = []
 
-        for idx, val in enumerate(series):
-            try:
-                valf = float(val)
-            except:
-                continue
-
-            # StatsModel case  
-            if hasattr(model, "score"):
-                status = model.score(valf)
-                if status == "hard" or status == "soft":
-                    anomalies.append(AnomalyRecord(
-                        id=f"{table_name}_{column}_{idx}",
-                        table_name=table_name,
-                        column_name=column,
-                        row_index=idx,
-                        anomaly_type="outlier",
-                        severity="high" if status == "hard" else "medium",
-                        description=f"Adaptive outlier detected in {column}",
-                        suggested_fix="",
-                        detector="adaptive_stats",
-                        rule_name="adaptive_stats_default",
-                        context={
-                            "value": valf,
-                            "confidence_score": 0.95 if status == "hard" else 0.65,
-                            "confidence_reasoning": "Statistical hard outlier (>3 std dev)." if status == "hard" else "Statistical soft outlier (>2 std dev)."
-                        }
-                    ))
+        # StatsModel case  
+        if hasattr(model, "score"):
+            status = model.score_array(values)
+            flagged = np.flatnonzero(status)
+            if self.max_records_per_column is not None:
+                flagged = flagged[:self.max_records_per_column]
+            for idx in flagged.tolist():
+                hard = status[idx] == 2
+                anomalies.append(AnomalyRecord(
+                    id=f"{table_name}_{column}_{idx}",
+                    table_name=table_name,
+                    column_name=column,
+                    row_index=idx,
+                    anomaly_type="outlier",
+                    severity="high" if hard else "medium",
+                    description=f"Adaptive outlier detected in {column}",
+                    suggested_fix="",
+                    detector="adaptive_stats",
+                    rule_name="adaptive_stats_default",
+                    context={
+                        "value": float(values[idx]),
+                        "confidence_score": 0.95 if hard else 0.65,
+                        "confidence_reasoning": "Statistical hard outlier (>3 std dev)." if hard else "Statistical soft outlier (>2 std dev)."
+                    }
+                ))
 
-            # ML case  
-            elif hasattr(model, "is_anomaly"):
-                if model.is_anomaly(valf):
-                    anomalies.append(AnomalyRecord(
-                        id=f"{table_name}_{column}_{idx}",
-                        table_name=table_name,
-                        column_name=column,
-                        row_index=idx,
-                        anomaly_type="outlier",
-                        severity="medium",
-                        description=f"ML detected anomaly in {column}",
-                        suggested_fix="",
-                        detector="adaptive_ml",
-                        rule_name="adaptive_ml_default",
-                        context={
-                            "value": valf,
-                            "confidence_score": 0.88,  # ML models assumed higher confidence
-                            "confidence_reasoning": "Detected by isolation forest with clear separation."
-                        }
-                    ))
+        # ML case  
+        elif hasattr(model, "is_anomaly"):
+            flagged = np.flatnonzero(model.anomaly_mask(values))
+            if self.max_records_per_column is not None:
+                flagged = flagged[:self.max_records_per_column]
+            for idx in flagged.tolist():
+                anomalies.append(AnomalyRecord(
+                    id=f"{table_name}_{column}_{idx}",
+                    table_name=table_name,
+                    column_name=column,
+                    row_index=idx,
+                    anomaly_type="outlier",
+                    severity="medium",
+                    description=f"ML detected anomaly in {column}",
+                    suggested_fix="",
+                    detector="adaptive_ml",
+                    rule_name="adaptive_ml_default",
+                    context={
+                        "value": float(values[idx]),
+                        "confidence_score": 0.88,  # ML models assumed higher confidence
+                        "confidence_reasoning": "Detected by isolation forest with clear separation."
+                    }
+                ))
 
         return anomalies
 
     def run_on_table(self, table_name: str, df: pd.DataFrame) -> List[AnomalyRecord]:
+        columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+        if len(columns) < 2 or self.config.max_workers <= 1:
+            per_column = [self.run_on_column(df, table_name, col) for col in columns]
+        else:
+            # NumPy releases the GIL for the column scans; results keep column order
+            with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+                per_column = list(executor.map(lambda col: self.run_on_column(df, table_name, col), columns))
         all_anoms = []
-        for col in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                continue
-            all_anoms.extend(self.run_on_column(df, table_name, col))
+        for anomalies in per_column:
+            all_anoms.extend(anomalies)
         return all_anoms
@@ -22,3 +22,7 @@ class MLModel:
         if value < self.lower or value > self.upper:
             return True
         return False
+
+    def anomaly_mask(self, values: np.ndarray) -> np.ndarray:
+        """Vectorised is_anomaly() (NaN is never anomalous)."""
+        return (values < self.lower) | (values > self.upper)
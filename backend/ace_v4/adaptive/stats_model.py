@@ -32,6 +32,12 @@ class StatsModel:
         self.lower_hard = self.median - self.hard_factor * self.iqr
         self.upper_hard = self.median + self.hard_factor * self.iqr
 
+    def score_array(self, values: np.ndarray) -> np.ndarray:
+        """Vectorised score(): 2 = hard, 1 = soft, 0 = normal (NaN is normal)."""
+        hard = (values < self.lower_hard) | (values > self.upper_hard)
+        soft = (values < self.lower_soft) | (values > self.upper_soft)
+        return np.where(hard, 2, np.where(soft, 1, 0)).astype(np.int8)
+
     def score(self, value):
         if value < self.lower_hard or value > self.upper_hard:
             return "hard"
@@ -0,0 +1,59 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from ace_v4.adaptive.engine import AdaptiveEngine
+from ace_v4.adaptive.selector import ModelSelector
+
+def _scalar_reference(series):
+    """Per-value scoring, as run_on_column did before vectorisation."""
+    model = ModelSelector().choose(series)
+    model.fit(series)
+    hits = {}
+    for idx, val in enumerate(series):
+        try:
+            valf = float(val)
+        except:
+            continue
+        if hasattr(model, "score"):
+            status = model.score(valf)
+            if status in ("hard", "soft"):
+                hits[idx] = "high" if status == "hard" else "medium"
+        elif model.is_anomaly(valf):
+            hits[idx] = "medium"
+    return hits
+
+def test_vectorised_matches_scalar_scoring():
+    np.random.seed(7)
+    df = pd.DataFrame({
+        "normal": np.append(np.random.normal(100, 10, 500), [400, -300]),
+        "skewed": np.random.lognormal(0, 2, 502),
+        "with_nan": np.append(np.random.normal(0, 1, 500), [np.nan, 50]),
+        "label": ["a"] * 502,
+    })
+    records = AdaptiveEngine().run_on_table("t", df)
+
+    for col in ["normal", "skewed", "with_nan"]:
+        got = {r.row_index: r.severity for r in records if r.column_name == col}
+        assert got == _scalar_reference(df[col]), col
+    assert all(r.id == f"t_{r.column_name}_{r.row_index}" for r in records)
+    assert not any(r.column_name == "label" for r in records)
+    print("✅ test_vectorised_matches_scalar_scoring passed")
+
+def test_object_column_and_record_cap():
+    df = pd.DataFrame({"mixed": ["1", "2", "x", "2", "1", "900", "2", "1", "-700"]})
+    engine = AdaptiveEngine()
+    got = {r.row_index for r in engine.run_on_column(df, "t", "mixed")}
+    assert got == set(_scalar_reference(df["mixed"]))
+
+    capped = AdaptiveEngine(max_records_per_column=1).run_on_column(df, "t", "mixed")
+    assert len(capped) == 1
+    print("✅ test_object_column_and_record_cap passed")
+
+if __name__ == "__main__":
+    test_vectorised_matches_scalar_scoring()
+    test_object_column_and_record_cap()
@@ -20,3 +20,42 @@ def compare(value, operator, target):
 
     # default fallback
     return False
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except:
+        return float("nan")
+
+
+def compare_series(values, operator, target):
+    """
+    Vectorised compare(): a boolean NumPy mask over a pandas Series.
+
+    ``values`` must already hold what row dicts would contain (see
+    masks.row_values), so each position matches compare(value, operator, target).
+    """
+    import numpy as np
+    import pandas as pd
+
+    if operator in ("equals", "not_equals"):
+        same = (values.astype(str).str.strip() == str(target).strip()).to_numpy()
+        return same if operator == "equals" else ~same
+    if operator in ("<", ">"):
+        try:
+            bound = float(target)
+        except:
+            return np.zeros(len(values), dtype=bool)
+        if pd.api.types.is_numeric_dtype(values):
+            numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            numbers = values.map(_to_float).to_numpy(dtype=np.float64)
+        return numbers < bound if operator == "<" else numbers > bound
+    if operator == "contains":
+        return values.astype(str).str.contains(target, regex=False).to_numpy(dtype=bool)
+    if operator == "starts_with":
+        return values.astype(str).str.startswith(str(target)).to_numpy(dtype=bool)
+
+    # default fallback
+    return np.zeros(len(values), dtype=bool)
@@ -1,5 +1,6 @@
 from .rule_loader import RuleLoader
 from .comparators import compare
+from .masks import compile_rules
 
 class ContextEngine:
     def __init__(self, rules=None):
@@ -69,20 +70,32 @@ class ContextEngine:
         return anomaly
 
     # Main entry: process all anomalies
-    def apply_rules(self, dataset, anomalies):
+    def apply_rules(self, dataset, anomalies, dataset_version=None):
+        """
+        Apply rules to anomalies using masks compiled once per dataset version.
+
+        Anomalies without a row in the dataset are matched against an empty row,
+        as match_rule({}) would.
+        """
+        if not anomalies:
+            return []
+        masks = compile_rules(dataset, self.rules, version=dataset_version)
+        empty_row = [self.match_rule({}, rule) for rule in self.rules]
+        n_rows = len(dataset)
+
         updated = []
 
         for anomaly in anomalies:
-            # fetch actual row
-            if anomaly.row_index is not None and anomaly.row_index < len(dataset):
-                row = dataset.iloc[anomaly.row_index].to_dict()
+            # matches for the actual row
+            if anomaly.row_index is not None and anomaly.row_index < n_rows:
+                matches = masks[:, anomaly.row_index]
             else:
-                row = {}
+                matches = empty_row
 
             suppressed = False
 
-            for rule in self.rules:
-                if self.match_rule(row, rule):
+            for rule, matched in zip(self.rules, matches):
+                if matched:
                     anomaly = self.apply_rule(anomaly, rule)
 
                     # if rule marks suppression, skip adding
@@ -0,0 +1,140 @@
+"""Rules compiled to boolean row masks, cached per rule set and dataset content."""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .comparators import compare_series
+
+try:
+    from pandas.core.dtypes.cast import find_common_type
+except ImportError:  # pragma: no cover - moved in a future pandas
+    find_common_type = None
+
+_CACHE_SIZE = 4
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# What a missing value of a nullable column becomes in dataset.iloc[i].to_dict():
+# pandas 2 boxes pd.NA to None, so the row-wise evaluator compares "None", not "<NA>"
+_ROW_NA = pd.Series([pd.NA], dtype=object).to_dict()[0]
+
+
+def _row_dtype(dataset):
+    """The dtype dataset.iloc[i] takes, which decides how row dict values look."""
+    if find_common_type is None or dataset.shape[1] == 0:
+        return object
+    try:
+        return find_common_type(list(dataset.dtypes))
+    except Exception:
+        return object
+
+
+def row_values(dataset, column, row_dtype):
+    """Column values as dataset.iloc[i].to_dict()[column] would give them (None if absent)."""
+    if column not in dataset.columns:
+        return pd.Series([None] * len(dataset), dtype=object)
+    series = dataset[column]
+    try:
+        if row_dtype is not object and series.dtype != row_dtype:
+            series = series.astype(row_dtype)
+        elif row_dtype is object and series.dtype != object and not pd.api.types.is_numeric_dtype(series):
+            # Timestamps, categoricals etc. are boxed in object rows; str() must see the boxed value
+            series = series.astype(object)
+    except Exception:
+        pass
+    return _box_missing(series.reset_index(drop=True))
+
+
+def _box_missing(series):
+    """Replace pd.NA (nullable and Arrow dtypes, or stray in object columns) with its row-dict form."""
+    if _ROW_NA is pd.NA:
+        return series
+    if series.dtype == object:
+        missing = np.fromiter((value is pd.NA for value in series.to_numpy()), dtype=bool, count=len(series))
+    elif getattr(series.dtype, "na_value", None) is pd.NA:
+        missing = series.isna().to_numpy()
+    else:
+        return series
+    if not missing.any():
+        return series
+    boxed = series.astype(object).to_numpy(copy=True)
+    boxed[missing] = _ROW_NA
+    return pd.Series(boxed, dtype=object)
+
+
+def _condition_masks(dataset, condition, row_dtype, include_shortcuts):
+    values = row_values(dataset, condition["column"], row_dtype)
+    mask = np.ones(len(dataset), dtype=bool)
+    if "operator" in condition and "value" in condition:
+        mask &= compare_series(values, condition["operator"], condition["value"])
+    if "equals" in condition:
+        mask &= compare_series(values, "equals", condition["equals"])
+    if include_shortcuts:
+        if "starts_with" in condition:
+            mask &= compare_series(values, "starts_with", condition["starts_with"])
+        if "contains" in condition:
+            mask &= compare_series(values, "contains", condition["contains"])
+    return mask
+
+
+def compile_rule(dataset, rule, row_dtype=None):
+    """Boolean mask of the rows a rule matches (same semantics as ContextEngine.match_rule)."""
+    row_dtype = _row_dtype(dataset) if row_dtype is None else row_dtype
+    w = rule["when"]
+    mask = _condition_masks(dataset, w, row_dtype, include_shortcuts=True)
+    for cond in w.get("and", []):
+        mask &= _condition_masks(dataset, cond, row_dtype, include_shortcuts=False)
+    return mask
+
+
+def rules_hash(rules):
+    """Content hash of a rule list."""
+    encoded = json.dumps(rules, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def dataset_fingerprint(dataset):
+    """Content hash of a frame's column names, dtypes and values (row positions, not index labels)."""
+    digest = hashlib.sha256(repr([(str(col), str(dtype)) for col, dtype in dataset.dtypes.items()]).encode("utf-8"))
+    digest.update(str(len(dataset)).encode("utf-8"))
+    if dataset.shape[1]:
+        digest.update(pd.util.hash_pandas_object(dataset, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def compile_rules(dataset, rules, version=None):
+    """
+    Masks (rules x rows) for a dataset, compiled once per rule set and dataset.
+
+    Cached by rules_hash and dataset_fingerprint, so equal rules or data held
+    in different objects share an entry and a frame modified in place is
+    recompiled. ``version`` remains as an extra cache key component. Frames
+    whose values cannot be hashed (lists, dicts) are compiled uncached.
+    """
+    try:
+        key = (rules_hash(rules), dataset_fingerprint(dataset), version)
+    except TypeError:
+        key = None
+    if key is not None:
+        with _cache_lock:
+            masks = _cache.get(key)
+            if masks is not None:
+                _cache.move_to_end(key)
+                return masks
+
+    row_dtype = _row_dtype(dataset)
+    if rules:
+        masks = np.vstack([compile_rule(dataset, rule, row_dtype) for rule in rules])
+    else:
+        masks = np.zeros((0, len(dataset)), dtype=bool)
+
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = masks
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return masks
@@ -0,0 +1,83 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from ace_v4.context.engine import ContextEngine
+from ace_v4.context.masks import compile_rules
+
+RULES = [
+    {"name": "refund", "when": {"column": "amount", "operator": "<", "value": 0,
+                                "and": [{"column": "kind", "equals": "refund"}]}, "action": "downgrade_severity"},
+    {"name": "test_acct", "when": {"column": "account", "starts_with": "TEST"}, "action": "suppress"},
+    {"name": "demo", "when": {"column": "account", "contains": "demo"}, "action": "mark_valid_extreme"},
+    {"name": "count_eq", "when": {"column": "count", "equals": "3"}, "action": "mark_valid_extreme"},
+    {"name": "not_vip", "when": {"column": "segment", "operator": "not_equals", "value": "VIP",
+                                 "and": [{"column": "amount", "operator": ">", "value": "100"}]}, "action": "downgrade_severity"},
+    {"name": "missing_col", "when": {"column": "absent", "equals": "None"}, "action": "mark_valid_extreme"},
+]
+
+def _frames():
+    mixed = pd.DataFrame({
+        "amount": [-5.0, 200.0, np.nan, 150.5, -1.0],
+        "kind": ["refund", " refund ", None, "sale", "refund"],
+        "account": ["TEST1", "acct-demo", "x", "TESTdemo", 7],
+        "count": [3, 1, 3, 2, 3],
+        "segment": ["VIP", "std", "std", "VIP", "std"],
+    })
+    # All-numeric frame: rows upcast ints to floats, so "3" no longer equals 3.0
+    numeric = pd.DataFrame({"amount": [-5.0, 120.0, 3.0], "count": [3, 3, 1]})
+    return [mixed, numeric]
+
+def test_masks_match_scalar_rules():
+    engine = ContextEngine(rules=RULES)
+    for df in _frames():
+        masks = compile_rules(df, RULES)
+        for i in range(len(df)):
+            row = df.iloc[i].to_dict()
+            expected = [engine.match_rule(row, rule) for rule in RULES]
+            assert masks[:, i].tolist() == expected, (i, row)
+
+def test_masks_are_cached_per_dataset_version():
+    df = _frames()[0]
+    assert compile_rules(df, RULES) is compile_rules(df, RULES)
+    assert compile_rules(df, RULES, version=2) is not compile_rules(df, RULES, version=3)
+
+def test_cache_follows_rule_and_data_content():
+    df = _frames()[0]
+    masks = compile_rules(df, RULES)
+    # Equal content in new objects hits; edits in place miss
+    assert compile_rules(df.copy(), [dict(rule) for rule in RULES]) is masks
+    rules = [dict(rule) for rule in RULES]
+    rules[2] = {"name": "demo", "when": {"column": "account", "contains": "TEST"}, "action": "mark_valid_extreme"}
+    assert compile_rules(df, rules)[2].tolist() == [True, False, False, True, False]
+    df.loc[1, "account"] = "TEST2"
+    assert compile_rules(df, RULES)[1].tolist() == [True, True, False, True, False]
+
+def test_nullable_missing_values_match_row_rules():
+    nullable = pd.DataFrame({
+        "amount": pd.array([-5.0, None, 150.5], dtype="Float64"),
+        "count": pd.array([3, None, 1], dtype="Int64"),
+        "kind": pd.array(["refund", None, "sale"], dtype="string"),
+        "account": ["TEST1", pd.NA, "demo"],
+        "segment": pd.array(["VIP", None, "std"], dtype="string"),
+    })
+    rules = RULES + [
+        {"name": "na_text", "when": {"column": "kind", "equals": "<NA>"}, "action": "suppress"},
+        {"name": "none_text", "when": {"column": "count", "equals": "None"}, "action": "suppress"},
+    ]
+    engine = ContextEngine(rules=rules)
+    masks = compile_rules(nullable, rules)
+    for i in range(len(nullable)):
+        row = nullable.iloc[i].to_dict()
+        assert masks[:, i].tolist() == [engine.match_rule(row, rule) for rule in rules], (i, row)
+
+if __name__ == "__main__":
+    test_masks_match_scalar_rules()
+    test_masks_are_cached_per_dataset_version()
+    test_cache_follows_rule_and_data_content()
+    test_nullable_missing_values_match_row_rules()
+    print("All tests passed!")
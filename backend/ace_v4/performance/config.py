@@ -11,15 +11,41 @@ class PerformanceConfig:
     chunk_size: int = 250_000    # fewer I/O passes on large files
     sample_rows_for_type_inference: int = 10_000
 
+    # Large-file ingestion backend: "duckdb" (vectorized, multi-threaded) or "pandas" (chunked)
+    ingest_engine: str = "duckdb"
+
     # For agents: max rows to sample for analysis (prevents memory exhaustion)
     max_analysis_rows: int = 100_000
 
     # Parallel execution
     max_workers: int = 4
+    # Pipeline steps the DAG scheduler may run at once
+    max_concurrent_steps: int = 4
+    # Threads each agent step may use for BLAS, OpenMP and joblib work
+    agent_threads: int = 2
+
+    # Agents buffer StateManager artifacts in memory and write them when the step ends
+    state_write_behind: bool = True
+
+    # Segmentation: MiniBatchKMeans from this many rows, silhouette scored on a
+    # fixed sample, and the k sweep stops after `patience` k without improvement
+    clustering_minibatch_rows: int = 50_000
+    clustering_silhouette_sample: int = 10_000
+    clustering_patience: int = 2
+
+    # Anomaly detection: IsolationForest fit rows and rows per parallel scoring chunk
+    anomaly_fit_rows: int = 50_000
+    anomaly_score_chunk_rows: int = 50_000
 
     # Safety
     memory_soft_limit_mb: int = 4_000
 
+    # Worker admission: estimated job memory is base + file MB * per-MB factor
+    # (file size capped at large_file_size_mb, above which agents sample).
+    # A job's CPU cost is max_concurrent_steps * agent_threads.
+    job_base_memory_mb: int = 768
+    job_memory_per_mb: int = 8
+
     # Timeout calculation
     base_timeout_seconds: int = 1800
     timeout_per_mb: int = 10
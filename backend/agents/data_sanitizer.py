@@ -1,6 +1,24 @@
 import pandas as pd
 from typing import Tuple, Dict, List
 
+# standard missing markers
+MISSING_TOKENS: List[str] = [
+    "",
+    " ",
+    "NA",
+    "N A",
+    "NaN",
+    "nan",
+    "None",
+    "null",
+    "Null",
+    ".",
+]
+# object columns convert to numeric when at least this share of values parse
+NUMERIC_COERCE_RATIO = 0.6
+# columns missing more than this share of values are dropped
+HIGH_MISSING_RATIO = 0.9
+
 
 class DataSanitizer:
     """
@@ -20,20 +38,7 @@ class DataSanitizer:
 
         work = df.copy()
 
-        # standard missing markers
-        missing_tokens = [
-            "",
-            " ",
-            "NA",
-            "N A",
-            "NaN",
-            "nan",
-            "None",
-            "null",
-            "Null",
-            ".",
-        ]
-        work = work.replace(missing_tokens, pd.NA)
+        work = work.replace(MISSING_TOKENS, pd.NA)
 
         # flatten multi line cells in object columns
         obj_cols = work.select_dtypes(include=["object"]).columns
@@ -54,7 +59,7 @@ class DataSanitizer:
                 non_na_ratio = as_num.notna().mean()
 
                 # if at least 60 percent of values convert, treat as numeric
-                if non_na_ratio >= 0.6:
+                if non_na_ratio >= NUMERIC_COERCE_RATIO:
                     work[col] = as_num
                     report["numeric_converted"].append(col)
 
@@ -66,7 +71,7 @@ class DataSanitizer:
 
         # drop columns with extremely high missing share
         high_missing = [
-            c for c in work.columns if work[c].isna().mean() > 0.9
+            c for c in work.columns if work[c].isna().mean() > HIGH_MISSING_RATIO
         ]
         if high_missing:
             work = work.drop(columns=high_missing)
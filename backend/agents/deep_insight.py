@@ -23,7 +23,7 @@ from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.state_manager import StateManager
-from core.llm import call_gemini
+from core.llm import call_gemini, llm_map
 from utils.logging import log_launch, log_ok, log_warn, log_info
 
 
@@ -394,13 +394,12 @@ CRITICAL INSTRUCTIONS:
         return []
     
     def _refine_insights_pass2(self, raw_insights: List[Dict], context: str) -> List[Insight]:
-        """Second pass: Refine and add specific recommendations (parallel per-insight LLM calls)."""
+        """Second pass: Refine and add specific recommendations (per-insight LLM calls fanned out at once)."""
         ctx_snippet = context[:1500]
+        selected = raw_insights[:8]
 
-        def _refine_one(insight: Dict) -> Insight:
-            recommendation = ""
-            try:
-                prompt = f"""Given this insight:
+        prompts = [
+            f"""Given this insight:
 Title: {insight.get('title', '')}
 Finding: {insight.get('finding', '')}
 Category: {insight.get('category', '')}
@@ -416,12 +415,18 @@ Return JSON:
   "recommendation": "Specific action to take with who/what/when..."
 }}
 """
-                rec_result = call_gemini(prompt, temperature=0.2, max_tokens=300, parse_json=True)
-                if isinstance(rec_result, dict):
-                    recommendation = rec_result.get("recommendation", "")
-            except Exception as exc:
-                log_warn(f"Recommendation generation failed for {insight.get('title', 'Insight')!r}: {exc}")
-            return Insight(
+            for insight in selected
+        ]
+        results = llm_map(prompts, temperature=0.2, max_tokens=300, parse_json=True)
+
+        refined = []
+        for insight, rec_result in zip(selected, results):
+            recommendation = ""
+            if isinstance(rec_result, dict):
+                if rec_result.get("error"):
+                    log_warn(f"Recommendation generation failed for {insight.get('title', 'Insight')!r}: {rec_result['error']}")
+                recommendation = rec_result.get("recommendation", "")
+            refined.append(Insight(
                 title=insight.get("title", "Insight"),
                 finding=insight.get("finding", ""),
                 why_it_matters=insight.get("why_it_matters", ""),
@@ -430,10 +435,7 @@ Return JSON:
                 impact_score=insight.get("impact_score", 50),
                 category=insight.get("category", "pattern"),
                 recommendation=recommendation,
-            )
-
-        with ThreadPoolExecutor(max_workers=8) as pool:
-            refined = list(pool.map(_refine_one, raw_insights[:8]))
+            ))
 
         return refined
     
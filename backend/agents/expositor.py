@@ -71,7 +71,9 @@ class Expositor:
 
                 # Get cluster labels if available
                 cluster_labels = None
-                if overseer and "labels" in overseer:
+                if overseer and overseer.get("labels_ref"):
+                    cluster_labels = self.state.read_array(overseer["labels_ref"])
+                elif overseer and "labels" in overseer:
                     cluster_labels = np.array(overseer["labels"])
 
                 # Convert schema_map to dict if it's a Pydantic model
@@ -471,6 +473,11 @@ class Expositor:
                     ci_str = f"{ci_low:.1f}-{ci_high:.1f}" if (ci_low is not None and ci_high is not None) else "n/a"
                     lines.append(f"| {rank} | {feat} | {imp:.1f}% | {ci_str} |")
             lines.append("")
+            ties = (importance_report.get("ranking_stability") or {}).get("overlapping_pairs") or []
+            if ties:
+                pairs = ", ".join(f"{a} / {b}" for a, b in ties)
+                lines.append(f"*Ranking caution:* confidence intervals overlap for {pairs}; their relative order may change on new data.")
+                lines.append("")
 
         # Coefficient table with p-values and significance stars
         if coeff:
@@ -14,7 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.logging import log_launch, log_ok, log_warn
 from core.state_manager import StateManager
-from core.analytics import run_universal_clustering, fallback_segmentation
+from core.analytics import run_universal_clustering
 from core.schema import SchemaMap, ensure_schema_map
 from core.auto_features import auto_feature_groups
 from core.data_quality import compute_data_quality
@@ -84,14 +84,16 @@ class Overseer:
             payload = {
                 "stats": stats,
                 "fingerprints": clustering_results.get("fingerprints", {}),
-                "labels": clustering_results.get("labels", []),
                 "sizes": clustering_results.get("sizes", [])
             }
+            labels = clustering_results.get("labels", [])
 
-            # Save output
+            # Save output; per-row labels go to a typed sidecar, not the JSON
             if self.state:
+                payload["labels_ref"] = self.state.write_array("cluster_labels", labels, dtype=np.int16)
                 self.state.write("overseer_output", payload)
             else:
+                payload["labels"] = np.asarray(labels).tolist()
                 with open("data/overseer_output.json", "w") as f:
                     json.dump(payload, f, indent=2)
 
@@ -100,19 +102,17 @@ class Overseer:
 
         except Exception as e:
             log_warn(f"Clustering failed: {e}. Using fallback.")
-            df["cluster"] = fallback_segmentation(df)
-
             # Create minimal fallback output
-            rows_payload = df.to_dict(orient="records")
             fallback_results = {
                 "stats": {"k": 1, "silhouette": 0.0, "data_quality": compute_data_quality(df)},
                 "fingerprints": {},
-                "labels": [0] * len(df),
                 "sizes": [len(df)],
-                "rows": rows_payload
             }
 
             if self.state:
+                fallback_results["labels_ref"] = self.state.write_array(
+                    "cluster_labels", np.zeros(len(df), dtype=np.int16)
+                )
                 self.state.write("overseer_output", fallback_results)
 
             return "overseer done (fallback)"
@@ -124,15 +124,14 @@ class Overseer:
             data_path = self.state.get_file_path("cleaned_uploaded.csv")
             config = PerformanceConfig()
             df = smart_load_dataset(data_path, config=config, max_rows=10000)
-            df["cluster"] = 0
-            rows = df.to_dict(orient="records")
+            labels_ref = self.state.write_array("cluster_labels", np.zeros(len(df), dtype=np.int16))
         except:
-            rows = []
+            labels_ref = None
 
         return {
             "stats": {"k": 1, "silhouette": 0.0, "data_quality": 0.0},
             "fingerprints": {},
-            "rows": rows,
+            "labels_ref": labels_ref,
             "error": str(error)
         }
 
@@ -1,6 +1,10 @@
 ﻿import json
+import re
 import sys
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
 from utils.logging import log_launch, log_warn, log_info, log_ok, log_error
 
 from core.env import ensure_windows_cpu_env
@@ -162,7 +166,11 @@ class PersonaEngine:
             
         try:
             if self.state:
-                self.state.write("personas", {"personas": personas})
+                payload = {"personas": personas}
+                assignments_ref = self._write_assignments(overseer_output, personas)
+                if assignments_ref:
+                    payload["assignments_ref"] = assignments_ref
+                self.state.write("personas", payload)
             else:
                 with open("data/personas_output.json", "w") as f:
                     json.dump(personas, f, indent=2)
@@ -186,6 +194,20 @@ class PersonaEngine:
             raise
 
 
+    def _write_assignments(self, overseer_output: dict, personas) -> Optional[dict]:
+        """Per-row persona index (-1 if none) as a sidecar, derived from cluster labels."""
+        labels_ref = overseer_output.get("labels_ref")
+        labels = self.state.read_array(labels_ref) if labels_ref else None
+        if labels is None or not len(labels) or not isinstance(personas, list):
+            return None
+        lookup = np.full(int(labels.max()) + 1, -1, dtype=np.int16)
+        for idx, persona in enumerate(personas):
+            digits = re.sub(r"\D", "", str(persona.get("cluster_id", ""))) if isinstance(persona, dict) else ""
+            if digits and int(digits) < len(lookup):
+                lookup[int(digits)] = idx
+        return self.state.write_array("persona_assignments", lookup[labels])
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python persona_engine.py <run_path>")
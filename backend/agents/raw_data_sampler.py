@@ -50,7 +50,7 @@ class RawDataSampler:
         
         # Get anomaly indices if available
         anomalies = self.state.read("anomalies") or {}
-        anomaly_indices = anomalies.get("anomaly_indices", [])
+        anomaly_indices = self._anomaly_indices(anomalies)
         
         samples = {}
         
@@ -147,6 +147,17 @@ class RawDataSampler:
         
         return extremes
     
+    def _anomaly_indices(self, anomalies: dict) -> List[int]:
+        """Anomalous row positions from Sentry's sidecars, most anomalous first."""
+        flags = self.state.read_array(anomalies["flags_ref"]) if anomalies.get("flags_ref") else None
+        if flags is None:
+            return anomalies.get("anomaly_indices", [])
+        indices = np.flatnonzero(flags)
+        scores = self.state.read_array(anomalies["scores_ref"]) if anomalies.get("scores_ref") else None
+        if scores is not None:
+            indices = indices[np.argsort(scores[indices], kind="stable")]
+        return indices.tolist()
+
     def _sample_anomalies(self, anomaly_indices: List[int], n: int = 10) -> List[Dict]:
         """Sample actual anomaly rows."""
         if not anomaly_indices:
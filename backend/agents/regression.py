@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -17,6 +18,7 @@ from core.data_loader import smart_load_dataset
 from ace_v4.performance.config import PerformanceConfig
 from anti_gravity.core.regression import compute_regression_insights, infer_target_from_question, select_classification_target
 from core.analytics_validation import apply_artifact_validation
+from core.agent_runtime import STEP_BUDGET_ENV
 
 
 class RegressionAgent:
@@ -66,6 +68,7 @@ class RegressionAgent:
                 shap_data = result.get("shap_explanations", {})
                 shap_artifact = {
                     "importance_ranking": shap_data.get("importance_ranking", []),
+                    "ranking_stability": shap_data.get("ranking_stability"),
                     "base_value": shap_data.get("base_value"),
                     "explained_samples": shap_data.get("explained_samples", 0),
                     "feature_names": shap_data.get("feature_names", []),
@@ -147,6 +150,14 @@ class RegressionAgent:
             log_warn(f"Drift detection failed (non-fatal): {e}")
             self.state.write("drift_report", {"available": False, "error": str(e)})
 
+    @staticmethod
+    def _time_budget():
+        """Seconds the orchestrator allows this step, if it told us."""
+        try:
+            return float(os.environ[STEP_BUDGET_ENV])
+        except (KeyError, ValueError):
+            return None
+
     def run(self):
         log_launch("Training regression explainer...")
         df = self._load_dataset()
@@ -178,6 +189,7 @@ class RegressionAgent:
             model_type=run_config.get("model_type"),
             include_categoricals=bool(run_config.get("include_categoricals", False)),
             fast_mode=bool(run_config.get("fast_mode", False)),
+            time_budget_seconds=self._time_budget(),
         )
         if insights.get("status") not in ("ok", "success"):
             reason = insights.get("reason", "regression skipped")
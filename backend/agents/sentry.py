@@ -4,7 +4,6 @@ import os
 import numpy as np
 import pandas as pd
 
-from sklearn.ensemble import IsolationForest
 from pathlib import Path
 
 from core.env import ensure_windows_cpu_env
@@ -26,6 +25,7 @@ class Sentry:
     def __init__(self, schema_map, state: StateManager):
         self.schema_map = ensure_schema_map(schema_map)
         self.state = state
+        self._data_path = None
 
     def _sanitize_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Remove corrupted columns that contain lists or non-scalar values."""
@@ -63,23 +63,29 @@ class Sentry:
                 self._write_empty_result()
                 return
 
-            # Use universal anomaly detection
-            anomalies_summary = detect_universal_anomalies(df, self.schema_map)
+            # Use universal anomaly detection; when the loaded frame was capped,
+            # every row of the dataset file is scored in streamed batches
+            anomalies_summary = detect_universal_anomalies(df, self.schema_map, data_path=self._data_path)
 
-            # Format for output
+            # Format for output (examples come from the rows held in memory)
             anomalies_list = []
             if anomalies_summary.get("total_count", 0) > 0:
-                indices = anomalies_summary.get("indices", [])
+                indices = [i for i in anomalies_summary.get("indices", [])[:1000] if i < len(df)][:100]
                 if indices:
                     anomalies_list = df.iloc[indices].to_dict(orient="records")
 
             payload = {
                 "status": "success",
                 "anomaly_count": anomalies_summary.get("total_count", 0),
-                "anomalies": anomalies_list[:100],
+                "anomalies": anomalies_list,
+                "rows_scored": anomalies_summary.get("rows_scored", len(df)),
                 "drivers": anomalies_summary.get("drivers", {}),
                 "role_deviations": anomalies_summary.get("role_deviations", {})
             }
+            # Per-row flags and scores go to typed sidecars, not the JSON
+            if anomalies_summary.get("flags") is not None:
+                payload["flags_ref"] = self.state.write_array("anomaly_flags", anomalies_summary["flags"], dtype=np.bool_)
+                payload["scores_ref"] = self.state.write_array("anomaly_scores", anomalies_summary["scores"], dtype=np.float32)
             self.state.write("anomalies", payload)
         except Exception as e:
             print(f"[SENTRY] Error during anomaly detection: {e}")
@@ -98,6 +104,7 @@ class Sentry:
         self.state.write("anomalies", payload)
 
     def _load_base_frame(self) -> pd.DataFrame:
+        self._data_path = None
         overseer_out = self.state.read("overseer_output")
         if overseer_out and "rows" in overseer_out:
             return pd.DataFrame(overseer_out["rows"])
@@ -106,10 +113,12 @@ class Sentry:
         dataset_info = self.state.read("active_dataset") if self.state else None
         candidate = dataset_info.get("path") if isinstance(dataset_info, dict) else None
         if candidate and Path(candidate).exists():
+             self._data_path = candidate
              return smart_load_dataset(candidate, config=config)
 
         data_path = self.state.get_file_path("cleaned_uploaded.csv")
         if Path(data_path).exists():
+             self._data_path = data_path
              return smart_load_dataset(data_path, config=config)
 
         raise FileNotFoundError("Active dataset not found for anomaly detection")
@@ -12,13 +12,12 @@ import sys
 from pathlib import Path
 from typing import Dict, Any, List
 from dataclasses import dataclass, asdict
-from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.state_manager import StateManager
-from core.llm import call_gemini
+from core.llm import call_gemini, llm_map
 from utils.logging import log_launch, log_ok, log_warn, log_info
 
 
@@ -60,32 +59,28 @@ class SoWhatDeepener:
         # Domain for context
         domain = deep_insights.get("domain_detected", "general")
         
-        # Deepen top insights and connections in parallel (each call is independent)
+        # Deepen top insights and connections in one fan-out (each call is independent)
         log_info("Deepening implications (parallel)...")
         implications = []
         stark_truths = []
 
-        with ThreadPoolExecutor(max_workers=7) as pool:
-            insight_futures = [
-                pool.submit(self._deepen_finding, ins, domain, red_flags)
-                for ins in insights[:5]
-            ]
-            conn_futures = [
-                pool.submit(self._deepen_connection, conn, domain)
-                for conn in connections[:2]
-            ]
-            for f in insight_futures:
-                impl = f.result()
-                if impl:
-                    implications.append(impl)
-                    if impl.stark_truth:
-                        stark_truths.append(impl.stark_truth)
-            for f in conn_futures:
-                impl = f.result()
-                if impl:
-                    implications.append(impl)
-                    if impl.stark_truth:
-                        stark_truths.append(impl.stark_truth)
+        calls = [
+            {"prompt": self._finding_prompt(ins, domain, red_flags), "max_tokens": 1500}
+            for ins in insights[:5]
+        ] + [
+            {"prompt": self._connection_prompt(conn, domain), "max_tokens": 1200}
+            for conn in connections[:2]
+        ]
+        titles = [ins.get("title", "Untitled") for ins in insights[:5]]
+        titles += [conn.get("title", "Connection") for conn in connections[:2]]
+
+        results = llm_map(calls, temperature=0.5, parse_json=True)
+        for title, result in zip(titles, results):
+            impl = self._to_implication(title, result)
+            if impl:
+                implications.append(impl)
+                if impl.stark_truth:
+                    stark_truths.append(impl.stark_truth)
         
         # Generate overall stark truth
         log_info("Synthesizing overall stark truth...")
@@ -106,13 +101,13 @@ class SoWhatDeepener:
         log_ok(f"Deepened {len(implications)} findings into stark business truths")
         return result
     
-    def _deepen_finding(
+    def _finding_prompt(
         self, 
         insight: Dict, 
         domain: str,
         red_flags: List[Dict]
-    ) -> DeepImplication | None:
-        """Deepen a single finding through 3 levels of 'so what'."""
+    ) -> str:
+        """Prompt deepening a single finding through 3 levels of 'so what'."""
         
         # Check if any red flags relate to this finding
         related_red_flags = [
@@ -124,7 +119,7 @@ class SoWhatDeepener:
         if related_red_flags:
             red_flag_context = f"\nRED FLAGS identified: {[rf.get('hypothesis', '') for rf in related_red_flags]}"
         
-        prompt = f"""You are a senior business consultant distilling insights for executives.
+        return f"""You are a senior business consultant distilling insights for executives.
 
 DOMAIN: {domain}
 
@@ -166,25 +161,11 @@ CRITICAL:
 - Be DIRECT and CONFIDENT, not hedging
 - Think about what a journalist would put in a headline
 """
-        
-        result = call_gemini(prompt, temperature=0.5, max_tokens=1500, parse_json=True)
-        
-        if isinstance(result, dict):
-            return DeepImplication(
-                finding_title=insight.get("title", "Untitled"),
-                level_1_immediate=result.get("level_1_immediate", ""),
-                level_2_business=result.get("level_2_business", ""),
-                level_3_root=result.get("level_3_root", ""),
-                stark_truth=result.get("stark_truth", ""),
-                stakeholder_impact=result.get("stakeholder_impact", {}),
-            )
-        
-        return None
     
-    def _deepen_connection(self, connection: Dict, domain: str) -> DeepImplication | None:
-        """Deepen a connection finding."""
+    def _connection_prompt(self, connection: Dict, domain: str) -> str:
+        """Prompt deepening a connection finding."""
         
-        prompt = f"""You are a senior business consultant.
+        return f"""You are a senior business consultant.
 
 DOMAIN: {domain}
 
@@ -196,12 +177,13 @@ Connected Findings: {connection.get('connected_findings', [])}
 Generate the 3 levels of "SO WHAT" and a stark truth (same JSON format).
 Focus on what this CONNECTION means - the fact that these things are RELATED.
 """
-        
-        result = call_gemini(prompt, temperature=0.5, max_tokens=1200, parse_json=True)
+    
+    def _to_implication(self, title: str, result) -> DeepImplication | None:
+        """Build a DeepImplication from a deepening response."""
         
         if isinstance(result, dict):
             return DeepImplication(
-                finding_title=connection.get("title", "Connection"),
+                finding_title=title,
                 level_1_immediate=result.get("level_1_immediate", ""),
                 level_2_business=result.get("level_2_business", ""),
                 level_3_root=result.get("level_3_root", ""),
@@ -1,4 +1,5 @@
 """Time Series Analyzer Agent - Detects and analyzes temporal patterns in data."""
+import os
 import sys
 from pathlib import Path
 
@@ -11,6 +12,7 @@ ensure_windows_cpu_env()
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.logging import log_launch, log_ok, log_warn
+from core.agent_runtime import STEP_BUDGET_ENV
 from core.state_manager import StateManager
 from core.schema import SchemaMap, ensure_schema_map
 from core.data_loader import smart_load_dataset
@@ -43,6 +45,14 @@ class TimeSeriesAgent:
             return smart_load_dataset(default_path, config=config)
         raise FileNotFoundError(f"Active dataset not found (path={default_path})")
 
+    @staticmethod
+    def _time_budget():
+        """Seconds the orchestrator allows this step, if it told us."""
+        try:
+            return float(os.environ[STEP_BUDGET_ENV])
+        except (KeyError, ValueError):
+            return None
+
     def run(self):
         log_launch("Analyzing time series patterns...")
 
@@ -69,9 +79,12 @@ class TimeSeriesAgent:
             return
 
         # Configure
+        budget = self._time_budget()
         ts_config = TimeSeriesConfig(
             max_lags=20 if fast_mode else 40,
             forecast_horizon=6 if fast_mode else 12,
+            # Leave a fifth of the step budget for loading and writing artifacts
+            time_budget_seconds=budget * 0.8 if budget else None,
         )
 
         # Run analysis
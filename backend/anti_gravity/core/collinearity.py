@@ -0,0 +1,128 @@
+"""Vectorised collinearity diagnostics for the regression governance step."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.correlation import correlation_kernel, pearson_matrix
+
+# Same cut-off the per-feature regressions used: R^2 >= 0.9999 is reported as infinite VIF.
+VIF_INFINITE_R2 = 0.9999
+# Above this condition number the correlation matrix is treated as singular.
+SINGULAR_CONDITION = 1e12
+# Ridge added to the correlation matrix when it is singular; exact collinearity
+# then yields VIFs of order 1/ridge, which land in the infinite bucket.
+SINGULAR_RIDGE = 1e-8
+DEFAULT_MAX_ROWS = 250_000
+
+
+def _sample_rows(frame: pd.DataFrame, max_rows: Optional[int], random_state: int) -> pd.DataFrame:
+    if max_rows and len(frame) > max_rows:
+        return frame.sample(n=max_rows, random_state=random_state)
+    return frame
+
+
+def _inverse_correlation(corr: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Inverse of a correlation matrix plus its condition number, regularising singular cases."""
+    eigvals = np.linalg.eigvalsh(corr)
+    max_eig = float(eigvals[-1])
+    min_eig = float(eigvals[0])
+    condition = max_eig / min_eig if min_eig > 0 else float("inf")
+    if condition < SINGULAR_CONDITION:
+        try:
+            return np.linalg.inv(corr), condition
+        except np.linalg.LinAlgError:
+            pass
+    ridge = SINGULAR_RIDGE * max(max_eig, 1.0)
+    return np.linalg.inv(corr + ridge * np.eye(corr.shape[0])), condition
+
+
+def vif_from_correlation(
+    frame: pd.DataFrame,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    random_state: int = 42,
+) -> Tuple[Dict[str, float], Optional[float]]:
+    """
+    Variance inflation factors for every column at once.
+
+    VIF_j = 1 / (1 - R^2_j) is the j-th diagonal entry of the inverse
+    correlation matrix, so one p x p inversion replaces p separate regressions
+    of each column on the others. Missing values are median-filled first, as
+    before. Constant columns are reported as infinite (they are perfectly
+    "explained" by the intercept).
+
+    Args:
+        frame: Numeric feature frame
+        max_rows: Sample at most this many rows (None for all)
+        random_state: Seed for the row sample
+
+    Returns:
+        (vif_by_feature, condition_number) where the condition number is that of
+        the standardized design matrix (sqrt of the correlation eigenvalue ratio)
+    """
+    if frame.shape[1] < 2:
+        return {}, None
+    frame = _sample_rows(frame, max_rows, random_state)
+    filled = frame.fillna(frame.median(numeric_only=True))
+    values = filled.to_numpy(dtype=float)
+
+    vif_by_feature: Dict[str, float] = {col: float("inf") for col in filled.columns}
+    finite = np.isfinite(values).all(axis=0)
+    varying = finite & (np.nanstd(values, axis=0) > 0)
+    usable = np.flatnonzero(varying)
+    if usable.size == 0:
+        return vif_by_feature, None
+    if usable.size == 1:
+        vif_by_feature[filled.columns[usable[0]]] = 1.0
+        return vif_by_feature, 1.0
+
+    corr = pearson_matrix(values[:, usable])
+    inverse, condition = _inverse_correlation(corr)
+    diag = np.diag(inverse)
+    limit = 1.0 / (1.0 - VIF_INFINITE_R2)
+    for idx, vif in zip(usable, diag):
+        vif = float(vif)
+        if not np.isfinite(vif) or vif >= limit or vif <= 0:
+            vif = float("inf")
+        vif_by_feature[filled.columns[idx]] = max(vif, 1.0)
+    return vif_by_feature, float(np.sqrt(condition))
+
+
+def correlated_pairs(frame: pd.DataFrame, threshold: float = 0.995) -> List[Tuple[str, str, float]]:
+    """
+    Column pairs whose absolute Pearson correlation reaches ``threshold``.
+
+    Uses the shared correlation kernel: pairwise-complete correlation (as
+    DataFrame.corr) when values are missing, otherwise a single matrix product.
+    Pairs are returned in the row-major order of the upper triangle.
+    """
+    if frame.shape[1] < 2:
+        return []
+    kernel = correlation_kernel(frame)
+    columns = frame.columns
+    return [(columns[i], columns[j], float(kernel.pearson[i, j])) for i, j in zip(*kernel.pairs(threshold))]
+
+
+def compute_collinearity(
+    frame: pd.DataFrame,
+    pair_threshold: float = 0.995,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """
+    VIFs, condition number and highly correlated pairs for a numeric frame.
+
+    Returns:
+        {"vif_by_feature", "max_vif", "condition_number", "correlated_pairs", "rows_used"}
+    """
+    vif_by_feature, condition_number = vif_from_correlation(frame, max_rows=max_rows, random_state=random_state)
+    pairs = correlated_pairs(frame, threshold=pair_threshold)
+    return {
+        "vif_by_feature": vif_by_feature,
+        "max_vif": max(vif_by_feature.values()) if vif_by_feature else None,
+        "condition_number": condition_number,
+        "correlated_pairs": [{"feature1": a, "feature2": b, "correlation": c} for a, b, c in pairs],
+        "rows_used": int(min(len(frame), max_rows)) if max_rows else int(len(frame)),
+    }
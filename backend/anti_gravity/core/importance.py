@@ -0,0 +1,131 @@
+"""Approximate permutation importance on bounded, stratified evaluation samples."""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.inspection import permutation_importance
+
+
+def rows_for_error_bound(target_error: float, z: float = 1.96, min_rows: int = 500) -> int:
+    """
+    Evaluation rows needed so the holdout score is within ``target_error``.
+
+    Accuracy is a mean of Bernoulli outcomes, so its standard error is at most
+    0.5 / sqrt(n); the same bound is used as a working scale for R^2 on
+    standardised residuals. Solving z * 0.5 / sqrt(n) <= target_error gives n.
+    """
+    if target_error <= 0:
+        raise ValueError("target_error must be positive")
+    return max(min_rows, int(math.ceil(round((z * 0.5 / target_error) ** 2, 6))))
+
+
+def stratified_subsample(
+    X: pd.DataFrame,
+    y: pd.Series,
+    rows: int,
+    classification: bool,
+    random_state: int = 42,
+    n_bins: int = 10,
+):
+    """Draw ``rows`` rows keeping class shares (or target quantile shares) intact."""
+    if rows >= len(X):
+        return X, y
+    if classification:
+        strata = y.astype(str)
+    else:
+        ranks = y.rank(method="first")
+        strata = pd.qcut(ranks, q=min(n_bins, max(1, y.nunique())), labels=False, duplicates="drop")
+    frac = rows / len(X)
+    rng = np.random.default_rng(random_state)
+    picked: List[np.ndarray] = []
+    positions = np.arange(len(X))
+    for _, group in pd.Series(positions, index=X.index).groupby(np.asarray(strata)):
+        take = max(1, int(round(len(group) * frac)))
+        picked.append(rng.choice(group.to_numpy(), size=min(take, len(group)), replace=False))
+    chosen = np.sort(np.concatenate(picked))
+    return X.iloc[chosen], y.iloc[chosen]
+
+
+def ranking_stability(names: Sequence[str], means: np.ndarray, ci_low: np.ndarray, ci_high: np.ndarray, top_k: int = 5) -> Dict[str, Any]:
+    """
+    Summarise how trustworthy the importance ordering is.
+
+    Adjacent features in the top ``top_k`` whose confidence intervals overlap
+    could swap places on another sample; the narrative layer should not claim
+    an order between them.
+    """
+    order = np.argsort(-np.asarray(means))[:top_k]
+    ties = []
+    for upper, lower in zip(order, order[1:]):
+        if ci_low[upper] <= ci_high[lower]:
+            ties.append([names[upper], names[lower]])
+    top_separated = bool(len(order) < 2 or ci_low[order[0]] > ci_high[order[1]])
+    return {
+        "top_k": int(len(order)),
+        "top_feature_separated": top_separated,
+        "overlapping_pairs": ties,
+        "stable": not ties,
+    }
+
+
+def approximate_permutation_importance(
+    estimator: Any,
+    X: pd.DataFrame,
+    y: pd.Series,
+    scoring: str,
+    n_repeats: int = 10,
+    classification: bool = False,
+    target_error: float = 0.01,
+    max_rows: Optional[int] = None,
+    random_state: int = 42,
+    n_jobs: int = -1,
+    confidence: float = 0.95,
+) -> Dict[str, Any]:
+    """
+    Permutation importance on a stratified subsample sized from ``target_error``.
+
+    Features are shuffled concurrently (``n_jobs``), each worker running all of
+    its repeats. Confidence intervals are Student-t intervals on the mean score
+    drop across repeats.
+
+    Returns:
+        Dict with per-feature ``mean``, ``std``, ``ci_low`` and ``ci_high``
+        arrays (score units), plus ``rows_used``, ``rows_available`` and
+        ``n_repeats``.
+    """
+    rows = rows_for_error_bound(target_error)
+    if max_rows is not None:
+        rows = min(rows, max_rows)
+    X_eval, y_eval = stratified_subsample(X, y, rows, classification, random_state=random_state)
+
+    perm = permutation_importance(
+        estimator,
+        X_eval,
+        y_eval,
+        n_repeats=n_repeats,
+        random_state=random_state,
+        scoring=scoring,
+        n_jobs=n_jobs,
+    )
+    means = perm.importances_mean
+    stds = perm.importances_std
+    if n_repeats > 1:
+        # importances_std is the population std; rescale to the sample std
+        sem = stds * math.sqrt(n_repeats / (n_repeats - 1)) / math.sqrt(n_repeats)
+        half_width = stats.t.ppf(0.5 + confidence / 2, df=n_repeats - 1) * sem
+    else:
+        half_width = np.zeros_like(means)
+    return {
+        "mean": means,
+        "std": stds,
+        "ci_low": means - half_width,
+        "ci_high": means + half_width,
+        "rows_used": int(len(X_eval)),
+        "rows_available": int(len(X)),
+        "n_repeats": int(n_repeats),
+        "confidence": confidence,
+    }
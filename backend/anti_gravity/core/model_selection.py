@@ -0,0 +1,191 @@
+"""Parallel, budget-aware model selection for the regression governance step."""
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, cpu_count, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import KFold, check_cv, train_test_split
+
+
+def _single_threaded(estimator: Any) -> Any:
+    """Clone an estimator with its own threading disabled; parallelism happens across fits."""
+    est = clone(estimator)
+    if "n_jobs" in est.get_params(deep=False):
+        est.set_params(n_jobs=1)
+    return est
+
+
+def _fit_and_score(estimator, X: pd.DataFrame, y: pd.Series, train_idx, test_idx, scorer) -> Tuple[Optional[float], float]:
+    start = time.perf_counter()
+    try:
+        estimator.fit(X.iloc[train_idx], y.iloc[train_idx])
+        score = float(scorer(estimator, X.iloc[test_idx], y.iloc[test_idx]))
+    except Exception:
+        score = None
+    return score, time.perf_counter() - start
+
+
+def _subsample(X: pd.DataFrame, y: pd.Series, rows: int, classification: bool, random_state: int):
+    if rows >= len(X):
+        return X, y
+    stratify = y if classification and y.value_counts().min() >= 2 else None
+    try:
+        X_sub, _, y_sub, _ = train_test_split(X, y, train_size=rows, stratify=stratify, random_state=random_state)
+    except ValueError:
+        X_sub, _, y_sub, _ = train_test_split(X, y, train_size=rows, random_state=random_state)
+    return X_sub, y_sub
+
+
+def _evaluate(
+    candidates: Dict[str, Any],
+    X: pd.DataFrame,
+    y: pd.Series,
+    folds: int,
+    scorer,
+    n_jobs: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Cross-validate every candidate, running all (candidate, fold) fits concurrently."""
+    first = next(iter(candidates.values()))
+    try:
+        splits = list(check_cv(folds, y, classifier=is_classifier(first)).split(X, y))
+    except ValueError:
+        # Stratification impossible (too few members per class): plain folds instead
+        splits = list(KFold(n_splits=folds).split(X, y))
+    tasks = [(name, train_idx, test_idx) for name in candidates for train_idx, test_idx in splits]
+    workers = max(1, min(n_jobs, len(tasks)))
+    outputs = Parallel(n_jobs=workers)(
+        delayed(_fit_and_score)(
+            _single_threaded(candidates[name]) if workers > 1 else clone(candidates[name]),
+            X, y, train_idx, test_idx, scorer,
+        )
+        for name, train_idx, test_idx in tasks
+    )
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for (name, _, _), (score, seconds) in zip(tasks, outputs):
+        entry = results.setdefault(name, {"scores": [], "fit_seconds": 0.0})
+        entry["fit_seconds"] += seconds
+        if score is None or not math.isfinite(score):
+            entry["failed"] = True
+        else:
+            entry["scores"].append(score)
+    for entry in results.values():
+        scores = entry.pop("scores")
+        if entry.pop("failed", False) or not scores:
+            entry.update({"cv_score": None, "cv_std": None})
+        else:
+            entry.update({"cv_score": float(np.mean(scores)), "cv_std": float(np.std(scores))})
+    return results
+
+
+def select_best_model(
+    candidates: Dict[str, Any],
+    X: pd.DataFrame,
+    y: pd.Series,
+    scoring: str,
+    cv_folds: int = 5,
+    default: Optional[str] = None,
+    time_budget_seconds: Optional[float] = None,
+    halving_min_rows: int = 20_000,
+    halving_factor: int = 2,
+    random_state: int = 42,
+    n_jobs: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Pick the best candidate by cross-validated ``scoring``.
+
+    All (candidate, fold) fits of a round run concurrently on up to ``n_jobs``
+    workers (default: joblib's CPU count, capped by LOKY_MAX_CPU_COUNT). On
+    frames with at least ``halving_min_rows`` rows and more than two candidates,
+    successive halving first scores everyone with 3 folds on a subsample and
+    keeps the best 1/``halving_factor`` for the next, larger round, finishing
+    with full ``cv_folds`` CV on the whole frame. If the projected cost of the
+    next round does not fit in ``time_budget_seconds``, selection stops and the
+    best candidate so far wins.
+
+    Returns:
+        (selected_name, info) where info holds per-candidate cv_score, cv_std,
+        fit_seconds, rows_evaluated and (when dropped) eliminated_at_rows, plus
+        strategy, rounds and selection_seconds.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_seconds if time_budget_seconds else None
+    classification = is_classifier(next(iter(candidates.values())))
+    scorer = get_scorer(scoring)
+    # joblib's count honours LOKY_MAX_CPU_COUNT, the per-agent thread cap the orchestrator sets
+    n_jobs = n_jobs or cpu_count() or 1
+
+    # Round sizes: geometric growth up to the full frame.
+    total = len(X)
+    sizes: List[int] = [total]
+    if total >= halving_min_rows and len(candidates) > 2:
+        rows = total
+        survivors = len(candidates)
+        while survivors > 2:
+            rows //= halving_factor ** 2
+            survivors = math.ceil(survivors / halving_factor)
+            if rows < 2_000:
+                break
+            sizes.insert(0, rows)
+
+    info: Dict[str, Any] = {}
+    alive = dict(candidates)
+    last_seconds: Optional[float] = None
+    last_cost_units = 1.0
+    best_name = default if default in candidates else next(iter(candidates))
+    rounds = 0
+
+    for idx, rows in enumerate(sizes):
+        final_round = idx == len(sizes) - 1
+        folds = cv_folds if final_round else min(3, cv_folds)
+        # Fit cost grows roughly with rows x folds x candidates.
+        cost_units = float(rows) * folds * len(alive)
+        if deadline is not None and last_seconds is not None:
+            projected = last_seconds * cost_units / last_cost_units
+            if time.perf_counter() + projected > deadline:
+                info["budget_exhausted"] = True
+                break
+        X_round, y_round = _subsample(X, y, rows, classification, random_state)
+        round_start = time.perf_counter()
+        results = _evaluate(alive, X_round, y_round, folds, scorer, n_jobs)
+        last_seconds = time.perf_counter() - round_start
+        last_cost_units = cost_units
+        rounds += 1
+
+        for name, entry in results.items():
+            record = info.setdefault(name, {"fit_seconds": 0.0})
+            record["fit_seconds"] = round(record["fit_seconds"] + entry["fit_seconds"], 3)
+            record["rows_evaluated"] = int(len(X_round))
+            if entry["cv_score"] is None:
+                record.update({"cv_score": None, "error": "CV failed"})
+            else:
+                record.update({"cv_score": round(entry["cv_score"], 4), "cv_std": round(entry["cv_std"], 4)})
+
+        ranked = sorted(
+            (name for name, entry in results.items() if entry["cv_score"] is not None),
+            key=lambda name: results[name]["cv_score"],
+            reverse=True,
+        )
+        if ranked:
+            best_name = ranked[0]
+        if final_round or not ranked:
+            break
+        keep = set(ranked[: max(2, math.ceil(len(alive) / halving_factor))])
+        for name in alive:
+            if name not in keep:
+                info[name]["eliminated_at_rows"] = int(len(X_round))
+        alive = {name: est for name, est in alive.items() if name in keep}
+
+    info["strategy"] = "successive_halving" if len(sizes) > 1 else "cross_validation"
+    info["rounds"] = rounds
+    info["parallel_jobs"] = int(n_jobs)
+    info["selection_seconds"] = round(time.perf_counter() - started, 3)
+    if time_budget_seconds:
+        info["budget_seconds"] = round(float(time_budget_seconds), 1)
+    return best_name, info
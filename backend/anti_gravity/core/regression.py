@@ -8,14 +8,17 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, RandomForestClassifier, GradientBoostingClassifier
-from sklearn.inspection import permutation_importance
 from sklearn.linear_model import LinearRegression, Ridge, LogisticRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score, accuracy_score, roc_auc_score, f1_score
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
 
+from anti_gravity.core.collinearity import correlated_pairs, vif_from_correlation
+from anti_gravity.core.importance import approximate_permutation_importance, ranking_stability
+from anti_gravity.core.model_selection import select_best_model
+
 try:
     from xgboost import XGBClassifier, XGBRegressor
     HAS_XGBOOST = True
@@ -29,6 +32,12 @@ class RegressionConfig:
     test_size: float = 0.2
     random_state: int = 42
     max_features: int = 30
+    # Successive halving kicks in for training frames at least this tall
+    halving_min_rows: int = 20_000
+    # Share of the step's time budget that model selection may spend
+    selection_budget_fraction: float = 0.5
+    # Holdout score error bound that sizes the permutation-importance sample
+    importance_target_error: float = 0.01
 
 
 PRIORITIZED_ROLES: List[str] = [
@@ -92,28 +101,6 @@ def _infer_target_type(series: pd.Series) -> str:
     return "continuous"
 
 
-def _compute_vif(frame: pd.DataFrame) -> Dict[str, float]:
-    if frame.shape[1] < 2:
-        return {}
-    filled = frame.fillna(frame.median(numeric_only=True))
-    vif_by_feature: Dict[str, float] = {}
-    for col in filled.columns:
-        y = filled[col]
-        x = filled.drop(columns=[col])
-        if x.shape[1] == 0:
-            vif_by_feature[col] = 1.0
-            continue
-        model = LinearRegression()
-        model.fit(x, y)
-        r2 = model.score(x, y)
-        if r2 >= 0.9999:
-            vif = float("inf")
-        else:
-            vif = 1.0 / (1.0 - r2)
-        vif_by_feature[col] = float(vif)
-    return vif_by_feature
-
-
 def _linear_relation(series_x: pd.Series, series_y: pd.Series) -> Tuple[float, float, float]:
     aligned = pd.concat([series_x, series_y], axis=1).dropna()
     if aligned.empty:
@@ -334,8 +321,10 @@ def compute_regression_insights(
     model_type: Optional[str] = None,
     include_categoricals: bool = False,
     fast_mode: bool = False,
+    time_budget_seconds: Optional[float] = None,
 ) -> Dict[str, Any]:
     config = config or RegressionConfig()
+    selection_budget = time_budget_seconds * config.selection_budget_fraction if time_budget_seconds else None
     if df is None or df.empty:
         return {"status": "skipped", "reason": "Dataset is empty."}
 
@@ -454,7 +443,10 @@ def compute_regression_insights(
         base_frame = sampled
         model_feature_names = list(base_frame.columns)
 
-    vif_by_feature = _compute_vif(base_frame[numeric_subset]) if numeric_subset else {}
+    vif_by_feature, condition_number = (
+        vif_from_correlation(base_frame[numeric_subset], random_state=config.random_state)
+        if numeric_subset else ({}, None)
+    )
     max_vif = max(vif_by_feature.values()) if vif_by_feature else None
     collinearity_decision = "standard"
     if max_vif is not None and max_vif >= 20:
@@ -465,29 +457,25 @@ def compute_regression_insights(
     collinearity_report = {
         "vif_by_feature": vif_by_feature,
         "max_vif": max_vif,
+        "condition_number": condition_number,
         "decision": collinearity_decision,
     }
 
     leakage_pairs: List[Dict[str, Any]] = []
     target_pairs: List[Dict[str, Any]] = []
     leakage_features = base_frame.select_dtypes(include=np.number)
-    if leakage_features.shape[1] >= 2:
-        corr_matrix = leakage_features.corr()
-        for i, col1 in enumerate(corr_matrix.columns):
-            for col2 in corr_matrix.columns[i + 1:]:
-                corr_val = float(corr_matrix.loc[col1, col2])
-                if abs(corr_val) >= 0.995:
-                    slope, intercept, residual_std = _linear_relation(leakage_features[col1], leakage_features[col2])
-                    leakage_pairs.append(
-                        {
-                            "feature1": col1,
-                            "feature2": col2,
-                            "correlation": corr_val,
-                            "linear_relation": {"slope": slope, "intercept": intercept, "residual_std": residual_std},
-                        }
-                    )
-    for col in leakage_features.columns:
-        corr_val = leakage_features[col].corr(target_series)
+    for col1, col2, corr_val in correlated_pairs(leakage_features, threshold=0.995):
+        slope, intercept, residual_std = _linear_relation(leakage_features[col1], leakage_features[col2])
+        leakage_pairs.append(
+            {
+                "feature1": col1,
+                "feature2": col2,
+                "correlation": corr_val,
+                "linear_relation": {"slope": slope, "intercept": intercept, "residual_std": residual_std},
+            }
+        )
+    target_corr = leakage_features.corrwith(target_series) if leakage_features.shape[1] else pd.Series(dtype=float)
+    for col, corr_val in target_corr.items():
         if pd.notna(corr_val) and abs(float(corr_val)) >= 0.995:
             slope, intercept, residual_std = _linear_relation(leakage_features[col], target_series)
             target_pairs.append(
@@ -568,24 +556,23 @@ def compute_regression_insights(
 
             # Quick cross-validation to select best model (use f1 for imbalanced)
             scoring = "f1" if is_imbalanced else "accuracy"
-            best_score = -1.0
-            best_model_name = "logistic_regression"
             cv_folds = 3 if fast_mode else 5
 
             # Prepare data for CV (need to impute first)
             imputer = SimpleImputer(strategy="most_frequent")
             X_train_imputed = pd.DataFrame(imputer.fit_transform(X_train), columns=X_train.columns)
 
-            for name, clf in candidates.items():
-                try:
-                    scores = cross_val_score(clf, X_train_imputed, y_train, cv=cv_folds, scoring=scoring, n_jobs=1)
-                    mean_score = float(scores.mean())
-                    model_selection_info[name] = {"cv_score": round(mean_score, 4), "cv_std": round(float(scores.std()), 4)}
-                    if mean_score > best_score:
-                        best_score = mean_score
-                        best_model_name = name
-                except Exception:
-                    model_selection_info[name] = {"cv_score": None, "error": "CV failed"}
+            best_model_name, model_selection_info = select_best_model(
+                candidates,
+                X_train_imputed,
+                y_train,
+                scoring=scoring,
+                cv_folds=cv_folds,
+                default="logistic_regression",
+                time_budget_seconds=selection_budget,
+                halving_min_rows=config.halving_min_rows,
+                random_state=config.random_state,
+            )
 
             estimator = candidates[best_model_name]
             normalized_model = best_model_name
@@ -653,19 +640,17 @@ def compute_regression_insights(
             imputer = SimpleImputer(strategy="median")
             X_train_imputed = pd.DataFrame(imputer.fit_transform(X_train), columns=X_train.columns)
             cv_folds = 3 if fast_mode else 5
-            best_reg_score = -np.inf
-            best_reg_name = "random_forest"
-
-            for name, reg in reg_candidates.items():
-                try:
-                    scores = cross_val_score(reg, X_train_imputed, y_train, cv=cv_folds, scoring="r2", n_jobs=1)
-                    mean_score = float(scores.mean())
-                    model_selection_info[name] = {"cv_score": round(mean_score, 4), "cv_std": round(float(scores.std()), 4)}
-                    if mean_score > best_reg_score:
-                        best_reg_score = mean_score
-                        best_reg_name = name
-                except Exception:
-                    model_selection_info[name] = {"cv_score": None, "error": "CV failed"}
+            best_reg_name, model_selection_info = select_best_model(
+                reg_candidates,
+                X_train_imputed,
+                y_train,
+                scoring="r2",
+                cv_folds=cv_folds,
+                default="random_forest",
+                time_budget_seconds=selection_budget,
+                halving_min_rows=config.halving_min_rows,
+                random_state=config.random_state,
+            )
 
             estimator = reg_candidates[best_reg_name]
             normalized_model = best_reg_name
@@ -707,26 +692,41 @@ def compute_regression_insights(
 
     scoring = "accuracy" if is_classification else "r2"
     repeats = 5 if fast_mode else 10
-    perm = permutation_importance(pipeline, X_test, y_test, n_repeats=repeats, random_state=config.random_state, scoring=scoring)
-    raw_importance = np.maximum(perm.importances_mean, 0)
+    perm = approximate_permutation_importance(
+        pipeline,
+        X_test,
+        y_test,
+        scoring=scoring,
+        n_repeats=repeats,
+        classification=is_classification,
+        target_error=config.importance_target_error * (2 if fast_mode else 1),
+        random_state=config.random_state,
+    )
+    raw_importance = np.maximum(perm["mean"], 0)
     total_importance = float(raw_importance.sum()) if raw_importance.sum() > 0 else 1.0
     normalized_importance = raw_importance / total_importance
     importance_report = {
         "method": "permutation_importance",
         "scoring": scoring,
         "n_repeats": repeats,
+        "confidence": perm["confidence"],
         "target_column": target_col,
         "target_type": target_type,
         "features": [
             {
                 "feature": model_feature_names[idx],
                 "importance": float(normalized_importance[idx] * 100),
-                "ci_low": float(max(0.0, (perm.importances_mean[idx] - 1.96 * perm.importances_std[idx]) / total_importance * 100)),
-                "ci_high": float(max(0.0, (perm.importances_mean[idx] + 1.96 * perm.importances_std[idx]) / total_importance * 100)),
+                "ci_low": float(max(0.0, perm["ci_low"][idx] / total_importance * 100)),
+                "ci_high": float(max(0.0, perm["ci_high"][idx] / total_importance * 100)),
             }
             for idx in range(len(model_feature_names))
         ],
-        "dataset_split": {"train_rows": int(len(X_train)), "test_rows": int(len(X_test))},
+        "ranking_stability": ranking_stability(model_feature_names, perm["mean"], perm["ci_low"], perm["ci_high"]),
+        "dataset_split": {
+            "train_rows": int(len(X_train)),
+            "test_rows": int(len(X_test)),
+            "importance_rows": perm["rows_used"],
+        },
     }
     importance_report["features"].sort(key=lambda item: item["importance"], reverse=True)
 
@@ -1,11 +1,14 @@
 """Time series analysis utilities for ACE V4."""
 from __future__ import annotations
 
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from joblib import cpu_count
 from scipy import stats as sp_stats
 
 
@@ -15,6 +18,26 @@ class TimeSeriesConfig:
     forecast_horizon: int = 12
     seasonal_periods: Optional[int] = None  # auto-detect if None
     significance_level: float = 0.05
+    # Longer series are averaged onto the inferred (or a coarser) frequency first
+    max_points: int = 5_000
+    # Targets are analysed in this many single-threaded worker processes when the
+    # work is large enough (default: the agent's CPU cap, see _worker_count)
+    n_jobs: Optional[int] = None
+    parallel_min_points: int = 2_000
+    # Wall-clock seconds for the per-target analyses; unfinished targets are dropped
+    time_budget_seconds: Optional[float] = None
+
+
+# Frequency ladder for aggregation: (name, resample rule, approximate days per bin)
+_FREQUENCY_LADDER = [
+    ("minutely", "min", 1 / 1440),
+    ("hourly", "60min", 1 / 24),
+    ("daily", "D", 1.0),
+    ("weekly", "W", 7.0),
+    ("monthly", "MS", 30.44),
+    ("quarterly", "QS", 91.31),
+    ("yearly", "YS", 365.25),
+]
 
 
 def detect_datetime_column(df: pd.DataFrame) -> Optional[str]:
@@ -103,11 +126,19 @@ def compute_time_series_analysis(
 
     # Detect frequency
     freq_info = _detect_frequency(df[datetime_col])
+    analysis_freq = freq_info.get("inferred_freq")
+
+    # Aggregate long series (e.g. event logs) onto a regular grid once for all targets
+    indexed = df.set_index(datetime_col)[target_cols]
+    aggregation = None
+    if len(indexed) > config.max_points:
+        indexed, aggregation = _aggregate_series(indexed, analysis_freq, config.max_points)
+        analysis_freq = aggregation["frequency"]
 
     # Auto-detect seasonal period
     seasonal_period = config.seasonal_periods
     if seasonal_period is None:
-        seasonal_period = _infer_seasonal_period(freq_info.get("inferred_freq"))
+        seasonal_period = _infer_seasonal_period(analysis_freq)
 
     results: Dict[str, Any] = {
         "status": "ok",
@@ -118,16 +149,22 @@ def compute_time_series_analysis(
             "n_observations": len(df),
         },
         "frequency": freq_info,
+        "aggregation": aggregation,
         "seasonal_period": seasonal_period,
         "analyses": {},
     }
 
+    jobs = {}
     for col in target_cols:
-        series = df.set_index(datetime_col)[col].dropna()
+        series = indexed[col].dropna()
         if len(series) < 20:
             continue
-        analysis = _analyze_single_series(series, col, config, seasonal_period)
-        results["analyses"][col] = analysis
+        jobs[col] = series
+    analyses, timed_out = _run_analyses(jobs, config, seasonal_period)
+    # Keep the target order regardless of completion order
+    results["analyses"] = {col: analyses[col] for col in jobs if col in analyses}
+    if timed_out:
+        results["timed_out_targets"] = timed_out
 
     if not results["analyses"]:
         return {"status": "skipped", "reason": "No columns had sufficient non-null time series data."}
@@ -138,6 +175,118 @@ def compute_time_series_analysis(
     return results
 
 
+def _aggregate_series(
+    frame: pd.DataFrame,
+    inferred_freq: Optional[str],
+    max_points: int,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Mean-resample a datetime-indexed frame to the finest frequency with at most ``max_points`` bins."""
+    span_days = (frame.index.max() - frame.index.min()).total_seconds() / 86400
+    names = [name for name, _, _ in _FREQUENCY_LADDER]
+    start = names.index(inferred_freq) if inferred_freq in names else 0
+    name, rule, _ = _FREQUENCY_LADDER[-1]
+    for candidate, candidate_rule, days in _FREQUENCY_LADDER[start:]:
+        if span_days / days <= max_points:
+            name, rule = candidate, candidate_rule
+            break
+    aggregated = frame.resample(rule).mean()
+    return aggregated, {
+        "frequency": name,
+        "rule": rule,
+        "method": "mean",
+        "rows_in": int(len(frame)),
+        "points": int(len(aggregated)),
+    }
+
+
+def _analyze_job(args: tuple) -> Tuple[str, Dict[str, Any]]:
+    col, series, config, seasonal_period = args
+    return col, _analyze_single_series(series, col, config, seasonal_period)
+
+
+def _run_analyses(
+    jobs: Dict[str, pd.Series],
+    config: TimeSeriesConfig,
+    seasonal_period: int,
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Analyse every target series, concurrently when it pays off.
+
+    Targets run in a process pool (statsmodels fits hold the GIL) once there
+    is more than one of them and enough points to amortise worker start-up.
+    Targets still running when ``config.time_budget_seconds`` runs out are
+    dropped and their workers stopped.
+
+    Returns:
+        (analyses by column, names of targets that did not finish in time)
+    """
+    args = [(col, series, config, seasonal_period) for col, series in jobs.items()]
+    workers = min(_worker_count(config), len(args))
+    total_points = sum(len(series) for series in jobs.values())
+    budget = config.time_budget_seconds
+
+    if workers <= 1 or total_points < config.parallel_min_points:
+        deadline = time.monotonic() + budget if budget else None
+        analyses: Dict[str, Dict[str, Any]] = {}
+        for job in args:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            col, analysis = _analyze_job(job)
+            analyses[col] = analysis
+        return analyses, [col for col in jobs if col not in analyses]
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_single_threaded_worker)
+    timed_out: List[str] = []
+    try:
+        futures = {pool.submit(_analyze_job, job): job[0] for job in args}
+        done, pending = wait(futures, timeout=budget)
+        analyses = {}
+        for future in done:
+            try:
+                col, analysis = future.result()
+            except Exception as exc:
+                col, analysis = futures[future], {"error": str(exc)}
+            analyses[col] = analysis
+        timed_out = [futures[future] for future in pending]
+    finally:
+        if timed_out:
+            # Before shutdown, which drops the pool's handles on its processes
+            _stop_workers(pool)
+        pool.shutdown(wait=False, cancel_futures=True)
+    return analyses, [col for col in jobs if col in timed_out]
+
+
+def _worker_count(config: TimeSeriesConfig) -> int:
+    """
+    Worker processes for the per-target analyses.
+
+    Defaults to joblib's CPU count, which honours LOKY_MAX_CPU_COUNT, the
+    per-agent cap the orchestrator sets (ACE_AGENT_THREADS), so the step
+    stays within the CPU share job admission prices it at.
+    """
+    return max(1, config.n_jobs or cpu_count() or 1)
+
+
+def _single_threaded_worker() -> None:
+    """Pool initializer: one BLAS/OpenMP thread per worker, so workers x threads stays at the cap."""
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(1)
+
+
+def _stop_workers(pool: ProcessPoolExecutor) -> None:
+    """Terminate workers still busy on abandoned targets."""
+    terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        if process.is_alive():
+            process.terminate()
+
+
 def _detect_frequency(dt_series: pd.Series) -> Dict[str, Any]:
     """Detect the time frequency of the series."""
     diffs = dt_series.diff().dropna()
@@ -378,55 +527,71 @@ def _analyze_volatility(values: np.ndarray) -> Dict[str, Any]:
 
 def _max_drawdown(values: np.ndarray) -> float:
     """Compute maximum drawdown."""
-    peak = values[0]
-    max_dd = 0.0
-    for v in values[1:]:
-        if v > peak:
-            peak = v
-        dd = (peak - v) / max(abs(peak), 1e-10)
-        if dd > max_dd:
-            max_dd = dd
-    return float(max_dd)
-
-
-def _detect_change_points(values: np.ndarray, index: pd.Index) -> Dict[str, Any]:
-    """Simple change point detection using CUSUM-like approach."""
+    peak = np.maximum.accumulate(values)
+    drawdown = (peak - values) / np.maximum(np.abs(peak), 1e-10)
+    return float(max(drawdown.max(initial=0.0), 0.0))
+
+
+def _cusum_split(segment: np.ndarray, sigma: float, min_size: int) -> Tuple[int, float]:
+    """
+    Best mean-shift split of a segment and its p-value.
+
+    The CUSUM path S_k - k/m * S_m, scaled by sigma * sqrt(m), converges to a
+    Brownian bridge under no change, so its maximum follows the Kolmogorov
+    distribution.
+    """
+    m = len(segment)
+    cumsum = np.cumsum(segment - segment.mean())
+    candidates = np.abs(cumsum[min_size - 1:m - min_size])
+    offset = int(candidates.argmax())
+    stat = float(candidates[offset]) / (sigma * np.sqrt(m))
+    return offset + min_size, float(sp_stats.kstwobign.sf(stat))
+
+
+def _detect_change_points(values: np.ndarray, index: pd.Index, alpha: float = 0.01, max_points: int = 5) -> Dict[str, Any]:
+    """Mean-shift change points by binary segmentation on the CUSUM statistic."""
     n = len(values)
     if n < 20:
         return {"detected": False, "points": []}
 
-    # Split into segments and test for mean shift
-    segment_size = max(10, n // 10)
-    change_points = []
-
-    for i in range(segment_size, n - segment_size, segment_size // 2):
-        left = values[max(0, i - segment_size):i]
-        right = values[i:min(n, i + segment_size)]
+    min_size = max(10, n // 10)
+    # Noise scale from first differences: robust to the level shifts being searched for
+    diffs = np.diff(values)
+    sigma = float(np.median(np.abs(diffs - np.median(diffs))) * 1.4826 / np.sqrt(2))
+    if not np.isfinite(sigma) or sigma <= 0:
+        sigma = float(np.std(diffs)) / np.sqrt(2)
+    if not np.isfinite(sigma) or sigma <= 0:
+        return {"detected": False, "count": 0, "points": [], "method": "binary_segmentation"}
 
-        try:
-            stat, p_val = sp_stats.mannwhitneyu(left, right, alternative="two-sided")
-            if p_val < 0.01:
-                change_points.append({
-                    "index": int(i),
-                    "date": str(index[i]) if hasattr(index, '__getitem__') else str(i),
-                    "p_value": round(float(p_val), 6),
-                    "left_mean": round(float(np.mean(left)), 4),
-                    "right_mean": round(float(np.mean(right)), 4),
-                    "shift_pct": round(float((np.mean(right) - np.mean(left)) / max(abs(np.mean(left)), 1e-10) * 100), 2),
-                })
-        except Exception:
+    change_points = []
+    segments = [(0, n)]
+    while segments and len(change_points) < max_points * 2:
+        start, end = segments.pop()
+        if end - start < 2 * min_size:
             continue
-
-    # Deduplicate nearby change points (keep most significant)
-    filtered = []
-    for cp in sorted(change_points, key=lambda x: x["p_value"]):
-        if not any(abs(cp["index"] - prev["index"]) < segment_size for prev in filtered):
-            filtered.append(cp)
-
+        segment = values[start:end]
+        split, p_val = _cusum_split(segment, sigma, min_size)
+        if p_val >= alpha:
+            continue
+        i = start + split
+        left, right = segment[:split], segment[split:]
+        left_mean, right_mean = float(np.mean(left)), float(np.mean(right))
+        change_points.append({
+            "index": int(i),
+            "date": str(index[i]) if hasattr(index, '__getitem__') else str(i),
+            "p_value": round(p_val, 6),
+            "left_mean": round(left_mean, 4),
+            "right_mean": round(right_mean, 4),
+            "shift_pct": round(float((right_mean - left_mean) / max(abs(left_mean), 1e-10) * 100), 2),
+        })
+        segments.extend([(start, i), (i, end)])
+
+    change_points.sort(key=lambda x: x["p_value"])
     return {
-        "detected": len(filtered) > 0,
-        "count": len(filtered),
-        "points": filtered[:5],
+        "detected": len(change_points) > 0,
+        "count": len(change_points),
+        "points": change_points[:max_points],
+        "method": "binary_segmentation",
     }
 
 
@@ -5,7 +5,7 @@ from pydantic import BaseModel
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-import shutil
+import asyncio
 import os
 import sys
 import json
@@ -13,7 +13,6 @@ import uuid
 import re
 import logging
 import threading
-import hashlib
 import time
 import pandas as pd
 from pathlib import Path
@@ -38,6 +37,14 @@ if os.name == 'nt':
     os.environ["LOKY_MAX_CPU_COUNT"] = str(os.cpu_count())
 
 from core.state_manager import StateManager
+from core.run_snapshot import (
+    build_snapshot_payload,
+    choose_encoding,
+    etag_matches,
+    live_snapshot_etag,
+    sealed_snapshot,
+    snapshot_dir,
+)
 from jobs.redis_queue import RedisJobQueue  # Changed from SQLite queue
 from jobs.models import JobStatus
 from jobs.progress import ProgressTracker
@@ -115,197 +122,12 @@ def _snapshot_redis_set(key: str, payload: str, etag: str, ttl_seconds: int = 30
         return
 
 
-def _snapshot_etag(run_path: Path, lite: bool) -> str:
-    files = [
-        run_path / "run_manifest.json",
-        run_path / "validation_report.json",
-        run_path / "confidence_report.json",
-        run_path / "dataset_identity_card.json",
-    ]
-    if not lite:
-        files.extend(
-            [
-                run_path / "final_report.md",
-                run_path / "enhanced_analytics.json",
-                run_path / "artifacts" / "governed_report.json",
-            ]
-        )
-    hasher = hashlib.sha1()
-    for path in files:
-        if not path.exists():
-            continue
-        stat = path.stat()
-        hasher.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
-    return f"\"{hasher.hexdigest()}\""
-
-
-def _load_json_file(path: Path) -> Optional[Dict[str, Any]]:
-    if not path.exists():
-        return None
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
-
-
-def _build_identity_payload(state: StateManager, run_path: Path) -> Dict[str, Any]:
-    identity = _ensure_identity_card(state, run_path)
-    columns = _normalize_columns(identity.get("columns") or identity.get("fields") or {})
-    numeric_columns = [name for name, meta in columns.items() if _is_numeric_dtype(meta)]
-    summary = {
-        "row_count": identity.get("row_count"),
-        "column_count": identity.get("column_count"),
-        "critical_gap_score": identity.get("critical_gap_score"),
-        "is_safe_mode": identity.get("is_safe_mode"),
-        "drift_status": identity.get("drift_status"),
-        "quality": identity.get("quality"),
-        "data_type": identity.get("data_type"),
-    }
-    return {
-        "identity": identity,
-        "profile": {
-            "columns": columns,
-            "numericColumns": numeric_columns,
-        },
-        "summary": summary,
-    }
-
-
-def _build_diagnostics_payload(state: StateManager, run_path: Path) -> Dict[str, Any]:
-    validation = state.read("validation_report") or {}
-    analytics_validation = state.read("analytics_validation") or {}
-    identity = _ensure_identity_card(state, run_path)
-    confidence = state.read("confidence_report") or {}
-    mode = state.read("run_mode") or "strict"
-    analysis_intent = state.read("analysis_intent") or {}
-    analysis_intent_value = analysis_intent.get("intent") or "exploratory"
-    regression_status = state.read("regression_status") or "not_started"
-    run_health = state.read("run_health_summary") or {}
-    target_candidate = analysis_intent.get("target_candidate") or {
-        "column": None,
-        "reason": "no_usable_target_found",
-        "confidence": 0.0,
-        "detected": False,
-    }
-
-    columns = _normalize_columns(identity.get("columns") or identity.get("fields") or {})
-    time_tokens = ("date", "time", "day", "week", "month", "quarter", "year", "period", "timestamp")
-
-    def _column_has_time(name: str, meta: dict | None) -> bool:
-        label = (name or '').lower()
-        dtype = str((meta or {}).get('dtype') or (meta or {}).get('type') or '').lower()
-        return any(token in label for token in time_tokens) or any(token in dtype for token in time_tokens)
-
-    has_time = any(_column_has_time(name, meta if isinstance(meta, dict) else None) for name, meta in columns.items())
-
-    reasons = []
-    if validation.get("mode") == "limitations":
-        reasons.append("Validation: limitations mode")
-    if validation.get("target_column") in [None, ""]:
-        reasons.append("Validation: missing target column")
-    if not has_time:
-        reasons.append("Identity: time fields not detected")
-    if confidence.get("confidence_label") == "low":
-        reasons.append("Confidence: low")
-
-    schema_scan = state.read("schema_scan_output")
-    if not isinstance(schema_scan, dict):
-        schema_scan = {}
-    manifest_data = _load_json_file(Path(run_path) / "run_manifest.json") if run_path else {}
-    warnings = (manifest_data or {}).get("warnings", [])
-
-    return {
-        "mode": mode,
-        "validation": validation,
-        "analytics_validation": analytics_validation,
-        "identity": identity,
-        "confidence": confidence,
-        "analysis_intent": analysis_intent_value,
-        "target_candidate": target_candidate,
-        "reasons": reasons,
-        "regression_status": regression_status,
-        "run_health_summary": run_health,
-        "warnings": warnings,
-        "data_quality": {
-            "score": schema_scan.get("quality_score", 0.4)
-        }
-    }
-
-
 def _build_snapshot_payload(run_id: str, lite: bool) -> tuple[Dict[str, Any], str]:
+    """Live snapshot of a run rebuilt from its artifacts (used while the run is in progress)."""
     run_path = DATA_DIR / "runs" / run_id
-    state = StateManager(str(run_path))
-    manifest = _load_json_file(run_path / "run_manifest.json")
-    if not manifest:
-        # Manifest may not exist for older runs; build a minimal fallback
-        report_exists = (run_path / "final_report.md").exists()
-        if not report_exists and not any(run_path.iterdir()):
-            raise FileNotFoundError("Run not found or not yet complete")
-        manifest = {"steps": {}, "artifacts": {}, "warnings": [], "trust": None,
-                    "render_policy": {"allow_report": report_exists}, "view_policies": {}}
-
-    diagnostics = _build_diagnostics_payload(state, run_path)
-    identity_payload = _build_identity_payload(state, run_path)
-    curated_kpis = {
-        "rows": identity_payload.get("summary", {}).get("row_count"),
-        "columns": identity_payload.get("summary", {}).get("column_count"),
-        "data_quality_score": diagnostics.get("data_quality", {}).get("score")
-            or identity_payload.get("identity", {}).get("quality_score"),
-        "completeness": identity_payload.get("summary", {}).get("quality", {}).get("avg_null_pct"),
-    }
-
-    payload: Dict[str, Any] = {
-        "run_id": run_id,
-        "generated_at": _iso_now(),
-        "lite": lite,
-        "manifest": manifest,
-        "diagnostics": diagnostics,
-        "identity": identity_payload,
-        "curated_kpis": curated_kpis,
-        "render_policy": manifest.get("render_policy"),
-        "view_policies": manifest.get("view_policies"),
-        "trust": manifest.get("trust"),
-        "run_warnings": manifest.get("warnings"),
-    }
-
-    if not lite:
-        report_path = run_path / "final_report.md"
-        payload["report_markdown"] = report_path.read_text(encoding="utf-8") if report_path.exists() else ""
-        governed_report = _load_json_file(run_path / "artifacts" / "governed_report.json")
-        if governed_report:
-            payload["governed_report"] = governed_report
-            payload["evidence_map"] = governed_report.get("evidence") or {}
-        else:
-            payload["governed_report"] = None
-            payload["evidence_map"] = {}
-        payload["enhanced_analytics"] = state.read("enhanced_analytics") or None
-        payload["model_artifacts"] = {
-            "importance_report": state.read("importance_report"),
-            "regression_coefficients_report": state.read("regression_coefficients_report"),
-            "baseline_metrics": state.read("baseline_metrics"),
-            "model_fit_report": state.read("model_fit_report"),
-            "collinearity_report": state.read("collinearity_report"),
-            "leakage_report": state.read("leakage_report"),
-            "feature_governance_report": state.read("feature_governance_report"),
-            "feature_importance": (state.read("regression_insights") or {}).get("feature_importance")
-                or (state.read("enhanced_analytics") or {}).get("feature_importance"),
-            "coefficients": (state.read("regression_insights") or {}).get("coefficients")
-                or (state.read("enhanced_analytics") or {}).get("coefficients"),
-            "shap_explanations": state.read("shap_explanations"),
-            "onnx_export": state.read("onnx_export"),
-            "drift_report": state.read("drift_report"),
-        }
-        # LLM-generated smart narrative
-        payload["smart_narrative"] = state.read("smart_narrative") or None
-
-        # Interpretation layer artifacts
-        payload["deep_insights"] = state.read("deep_insights") or _load_json_file(run_path / "artifacts" / "deep_insights.json")
-        payload["hypotheses"] = state.read("hypotheses") or _load_json_file(run_path / "artifacts" / "hypotheses.json")
-        payload["executive_narrative"] = state.read("executive_narrative") or _load_json_file(run_path / "artifacts" / "executive_narrative.json")
+    payload = build_snapshot_payload(run_path, lite=lite, run_id=run_id)
+    return payload, live_snapshot_etag(run_path, lite)
 
-    etag = _snapshot_etag(run_path, lite)
-    return payload, etag
 
 limiter = Limiter(key_func=get_remote_address)
 
@@ -465,6 +287,9 @@ async def _initialize_app():
             for run_path in run_dirs[:10]:
                 run_id = run_path.name
                 try:
+                    # Sealed runs get their stored snapshots written (once); live ones a cache entry
+                    if sealed_snapshot(run_path, "lite", run_id=run_id):
+                        continue
                     payload, etag = _build_snapshot_payload(run_id, lite=True)
                     snapshot_cache.set(f"{run_id}:lite", payload, etag)
                     _snapshot_redis_set(f"{run_id}:lite", json.dumps(payload), etag)
@@ -549,61 +374,10 @@ def _validate_upload(file: UploadFile) -> None:
         )
 
 
-def _normalize_columns(columns: Any) -> Dict[str, Any]:
-    if isinstance(columns, dict):
-        return columns
-    normalized: Dict[str, Any] = {}
-    if isinstance(columns, list):
-        for idx, col in enumerate(columns):
-            if not isinstance(col, dict):
-                continue
-            name = col.get("name") or col.get("column") or f"column_{idx}"
-            if not name:
-                continue
-            normalized[str(name)] = col
-    return normalized
-
-
-def _is_numeric_dtype(meta: Dict[str, Any]) -> bool:
-    dtype = str(meta.get("dtype") or meta.get("type") or "").lower()
-    numeric_tokens = ("int", "float", "double", "decimal", "number")
-    return any(token in dtype for token in numeric_tokens)
-
-
-def _ensure_identity_card(state: StateManager, run_path: Path) -> Dict[str, Any]:
-    identity = state.read("dataset_identity_card")
-    if isinstance(identity, dict) and identity:
-        return identity
-
-    card_path = Path(run_path) / "artifacts" / "dataset_identity_card.json"
-    if card_path.exists():
-        try:
-            with open(card_path, "r", encoding="utf-8") as f:
-                identity = json.load(f)
-                state.write("dataset_identity_card", identity)
-                return identity
-        except Exception as exc:
-            logger.warning(f"[IDENTITY] Failed to load dataset_identity_card.json: {exc}")
-
-    try:
-        rebuild_governance_artifacts(state)
-        identity = state.read("dataset_identity_card")
-        if isinstance(identity, dict):
-            return identity
-    except Exception as exc:
-        logger.warning(f"[IDENTITY] Unable to rebuild identity artifacts: {exc}")
-
-    return {}
-
-
 class TimelineSelection(BaseModel):
     column: Optional[str] = None
 
 
-def _iso_now():
-    return datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
-
-
 def _safe_upload_path(original_name: str) -> Path:
     """Return a unique, sanitized destination for an uploaded file."""
     name = Path(original_name or "uploaded")
@@ -627,6 +401,11 @@ class DatasetIdentity(BaseModel):
     detected_capabilities: Dict[str, bool]
     warnings: list[str]
     sheets: List[str] = []
+    row_count_exact: bool = True
+    row_count_bounds: Optional[List[Optional[int]]] = None
+    row_count_method: Optional[str] = None
+    sampled_rows: Optional[int] = None
+    quality_bounds: Optional[List[float]] = None
 
 
 def _infer_type(series):
@@ -721,6 +500,34 @@ def _generate_warnings(df):
         pass
     return warnings
 
+def _preview_identity(source, file_ext: str, sheet_name: Optional[str] = None) -> Dict[str, Any]:
+    """Identity card from a bounded sample of the file (see intake.preview)."""
+    from intake.preview import quality_bounds, sample_dataset
+
+    sample = sample_dataset(source, file_ext, sheet_name=sheet_name)
+    df = sample.df
+    logger.info(
+        f"[PREVIEW] Sampled {len(df)} rows, {len(df.columns)} columns "
+        f"({sample.bytes_read}/{sample.file_size} bytes); rows ~{sample.row_count}"
+    )
+    return {
+        "row_count": sample.row_count,
+        "column_count": len(df.columns),
+        "file_type": file_ext.replace('.', '').upper(),
+        "schema_map": _build_schema_map(df),
+        "quality_score": _calculate_quality_score(df),
+        "critical_gaps": _detect_gaps(df),
+        "detected_capabilities": _detect_capabilities(df),
+        "warnings": _generate_warnings(df),
+        "sheets": sample.sheets,
+        "row_count_exact": sample.row_count_exact,
+        "row_count_bounds": list(sample.row_count_bounds),
+        "row_count_method": sample.row_count_method,
+        "sampled_rows": len(df),
+        "quality_bounds": quality_bounds(df),
+    }
+
+
 @app.post("/run/preview", response_model=DatasetIdentity, tags=["Execution"])
 async def preview_dataset(
     file: UploadFile = File(...),
@@ -745,67 +552,14 @@ async def preview_dataset(
             }
         )
 
-    temp_path = DATA_DIR / f"preview_{uuid.uuid4().hex}{file_ext}"
-    
     # OPERATION UNSINKABLE - Layer 2: The Safety Net
     # Global try/except ensures we NEVER return 500 errors
     try:
-        # Save uploaded file with encoding fallback
-        try:
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-        except UnicodeDecodeError:
-            logger.warning("[SAFETY_NET] UTF-8 decode failed, trying latin-1")
-            file.file.seek(0)
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-        
-        logger.info(f"[PREVIEW] Reading {file_ext} file: {file.filename}")
-
-        # Read file based on extension
-        sheet_names: List[str] = []
-        try:
-            if file_ext == '.csv':
-                df = pd.read_csv(temp_path, on_bad_lines='warn', engine='python')
-            elif file_ext in {'.tsv', '.txt'}:
-                df = pd.read_csv(temp_path, sep='\t', on_bad_lines='warn', engine='python')
-            elif file_ext in {'.xls', '.xlsx'}:
-                xl = pd.ExcelFile(temp_path)
-                sheet_names = xl.sheet_names
-                _sheet = sheet_name if sheet_name and sheet_name in sheet_names else sheet_names[0]
-                logger.info(f"[PREVIEW] Excel sheets: {sheet_names}. Reading: '{_sheet}'")
-                df = xl.parse(_sheet)
-            elif file_ext == '.parquet':
-                df = pd.read_parquet(temp_path)
-            elif file_ext == '.json':
-                df = pd.read_json(temp_path)
-            else:
-                df = pd.DataFrame()
-        except Exception as read_error:
-            logger.error(f"[PREVIEW] File read error: {str(read_error)}")
-            # Fallback: Try reading without on_bad_lines for older pandas versions
-            if file_ext == '.csv':
-                df = pd.read_csv(temp_path)
-            elif file_ext in {'.tsv', '.txt'}:
-                df = pd.read_csv(temp_path, sep='\t')
-            else:
-                raise read_error
+        logger.info(f"[PREVIEW] Sampling {file_ext} file: {file.filename}")
 
-        logger.info(f"[PREVIEW] Successfully read {len(df)} rows, {len(df.columns)} columns")
+        # Bounded read straight from the upload spool, off the event loop
+        identity = await asyncio.to_thread(_preview_identity, file.file, file_ext, sheet_name)
 
-        # Build identity card
-        identity = {
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "file_type": file_ext.replace('.', '').upper(),
-            "schema_map": _build_schema_map(df),
-            "quality_score": _calculate_quality_score(df),
-            "critical_gaps": _detect_gaps(df),
-            "detected_capabilities": _detect_capabilities(df),
-            "warnings": _generate_warnings(df),
-            "sheets": sheet_names,
-        }
-        
         logger.info(f"[PREVIEW] Quality score: {identity['quality_score']:.2f}")
         return identity
         
@@ -831,12 +585,6 @@ async def preview_dataset(
             "mode": "safe_mode",
             "error_log": str(e)
         }
-    finally:
-        if temp_path.exists():
-            try:
-                temp_path.unlink()
-            except:
-                pass
 
 
 def _parse_bool(value: Any) -> Optional[bool]:
@@ -1060,6 +808,18 @@ async def debug_snapshot_cache():
     }
 
 
+@app.get("/debug/llm-cache", tags=["System"])
+async def debug_llm_cache():
+    """Hit/miss counters and size of the persistent LLM response cache, plus this process's call limiter."""
+    from core.llm import limiter_stats
+    from core.llm_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False, "limiter": limiter_stats()}
+    return {"enabled": True, "path": str(cache.path), "metrics": cache.stats(), "limiter": limiter_stats()}
+
+
 class RunResponse(BaseModel):
     run_id: str
     message: str
@@ -1076,41 +836,18 @@ async def preview_dataset(request: Request, file: UploadFile = File(...)):
     """
     _validate_upload(file)
 
-    file_path = _safe_upload_path(file.filename)
-
     try:
-        # Save file temporarily
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        from intake.preview import column_summary, quality_bounds, sample_dataset
 
-        # Import data loader
-        from intake.loader import DataLoader
-
-        # Load and analyze dataset
-        loader = DataLoader(str(file_path))
-        df = loader.load()
+        # Bounded sample straight from the upload spool, off the event loop
+        sample = await asyncio.to_thread(sample_dataset, file.file, Path(file.filename).suffix)
+        df = sample.df
 
         if df is None or df.empty:
             raise HTTPException(status_code=400, detail="Could not load dataset or dataset is empty")
 
         # Build schema map
-        schema_map = []
-        for col in df.columns:
-            dtype = df[col].dtype
-            if dtype in ['int64', 'float64', 'int32', 'float32']:
-                col_type = "Numeric"
-            elif dtype == 'bool':
-                col_type = "Boolean"
-            elif dtype == 'datetime64[ns]':
-                col_type = "DateTime"
-            else:
-                col_type = "String"
-
-            schema_map.append({
-                "name": col,
-                "type": col_type,
-                "dtype": str(dtype)
-            })
+        schema_map = await asyncio.to_thread(column_summary, df)
 
         # Detect capabilities
         numeric_cols = [c for c in schema_map if c["type"] == "Numeric"]
@@ -1123,12 +860,16 @@ async def preview_dataset(request: Request, file: UploadFile = File(...)):
             for col in schema_map
         )
 
-        # Calculate quality score (simple version)
+        # Quality score from the sample, with bounds for the rows not read
         missing_ratio = df.isnull().sum().sum() / (len(df) * len(df.columns))
         quality_score = 1.0 - missing_ratio
 
         return {
-            "row_count": len(df),
+            "row_count": sample.row_count,
+            "row_count_exact": sample.row_count_exact,
+            "row_count_bounds": list(sample.row_count_bounds),
+            "row_count_method": sample.row_count_method,
+            "sampled_rows": len(df),
             "column_count": len(df.columns),
             "schema_map": schema_map,
             "detected_capabilities": {
@@ -1136,16 +877,14 @@ async def preview_dataset(request: Request, file: UploadFile = File(...)):
                 "has_time_series": len(datetime_cols) > 0,
                 "has_financial_columns": has_financial
             },
-            "quality_score": round(quality_score, 3)
+            "quality_score": round(quality_score, 3),
+            "quality_bounds": quality_bounds(df),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
-    finally:
-        # Clean up temporary file
-        file_path.unlink(missing_ok=True)
 
 
 @app.post("/run", response_model=RunResponse, tags=["Execution"])
@@ -1218,6 +957,59 @@ async def trigger_run(
         file_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"ACE Execution Failed: {str(e)}")
 
+@app.post("/run/{run_id}/rerun", response_model=RunResponse, tags=["Execution"])
+async def rerun_from_step(
+    run_id: str,
+    target_column: Optional[str] = Form(None),
+    feature_whitelist: Optional[str] = Form(None),
+    model_type: Optional[str] = Form(None),
+    include_categoricals: Optional[str] = Form(None),
+    fast_mode: Optional[str] = Form(None),
+    from_step: Optional[str] = Form(None),
+):
+    """
+    Re-run an existing run with changed modeling parameters, without a new upload.
+
+    The new run shares the source run's dataset and ingestion, keeps every
+    step the changes do not affect, and re-runs the rest (plus ``from_step``
+    and everything downstream of it, when given).
+    """
+    _validate_run_id(run_id)
+    from core.pipeline_map import PIPELINE_SEQUENCE
+
+    if from_step and from_step not in PIPELINE_SEQUENCE:
+        raise HTTPException(status_code=400, detail=f"Unknown step '{from_step}'")
+
+    run_path = DATA_DIR / "runs" / run_id
+    source = StateManager(str(run_path))
+    active_dataset = source.read("active_dataset") or {}
+    if not run_path.is_dir() or not active_dataset.get("path"):
+        raise HTTPException(status_code=404, detail="Run not found or not yet ingested")
+
+    run_config = dict(source.read("run_config") or {})
+    run_config.update(
+        _build_run_config(
+            target_column=target_column,
+            feature_whitelist=feature_whitelist,
+            model_type=model_type,
+            include_categoricals=include_categoricals,
+            fast_mode=fast_mode,
+        ) or {}
+    )
+
+    if not job_queue:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    rerun = {"source_run_id": run_id, "source_run_path": str(run_path.resolve()), "from_step": from_step}
+    new_run_id = job_queue.enqueue(active_dataset["path"], run_config=run_config or None, rerun=rerun)
+    logger.info(f"[API] Re-run {new_run_id} of {run_id} enqueued")
+    return {
+        "run_id": new_run_id,
+        "message": f"Re-run of {run_id} queued. Unaffected steps are reused.",
+        "status": "queued",
+    }
+
+
 # REMOVED: Plural route - use /run/{run_id}/status instead
 # async def get_progress(run_id: str):
     _validate_run_id(run_id)
@@ -1255,13 +1047,64 @@ async def trigger_run(
 @app.get("/run/{run_id}/snapshot", tags=["Artifacts"])
 @limiter.limit("30/minute")
 async def get_snapshot(request: Request, run_id: str, lite: bool = False):
-    """Return the full snapshot payload for a completed run."""
+    """
+    Return the snapshot payload for a run.
+
+    Sealed runs are served from the pre-serialised, pre-compressed files
+    written at completion (strong ETag); in-progress runs are rebuilt live
+    behind the short-lived snapshot cache. Both answer If-None-Match with 304.
+    """
     _validate_run_id(run_id)
+    run_path = DATA_DIR / "runs" / run_id
+    if not run_path.is_dir():
+        raise HTTPException(status_code=404, detail="Run not found or not yet complete")
+    variant = "lite" if lite else "full"
+    if_none_match = request.headers.get("if-none-match")
+
+    try:
+        stored = await asyncio.to_thread(sealed_snapshot, run_path, variant, run_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Run not found or not yet complete")
+    except Exception as exc:
+        logger.warning(f"[SNAPSHOT] Stored snapshot unavailable for {run_id}, serving live: {exc}")
+        stored = None
+
+    if stored:
+        headers = {"ETag": stored["etag"], "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(if_none_match, stored["etag"]):
+            return Response(status_code=304, headers=headers)
+        encoding = choose_encoding(request.headers.get("accept-encoding"), list(stored["files"]))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return FileResponse(
+            snapshot_dir(run_path) / stored["files"][encoding],
+            media_type="application/json",
+            headers=headers,
+        )
+
+    key = f"{run_id}:{variant}"
+    etag = live_snapshot_etag(run_path, lite)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    payload = snapshot_cache.get(key, etag)
+    if payload is not None:
+        snapshot_metrics["memory_hit"] += 1
+        return JSONResponse(content=payload, headers=headers)
+    cached, cached_etag = _snapshot_redis_get(key)
+    if cached and cached_etag == etag:
+        snapshot_metrics["redis_hit"] += 1
+        return Response(content=cached, media_type="application/json", headers=headers)
+
+    snapshot_metrics["miss"] += 1
     try:
-        payload, etag = _build_snapshot_payload(run_id, lite=lite)
+        payload, etag = await asyncio.to_thread(_build_snapshot_payload, run_id, lite)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Run not found or not yet complete")
-    return JSONResponse(content=payload, headers={"ETag": etag})
+    snapshot_cache.set(key, payload, etag)
+    _snapshot_redis_set(key, json.dumps(payload), etag)
+    return JSONResponse(content=payload, headers={**headers, "ETag": etag})
 
 
 @app.post("/run/{run_id}/ask", tags=["Artifacts"])
@@ -0,0 +1,271 @@
+"""
+Agent execution backends for the orchestrator.
+
+Agents are plain scripts (``agents/<name>.py <run_path>``). The original
+"subprocess" backend starts a fresh interpreter per step, which re-imports
+pandas, sklearn, statsmodels and the LLM SDK every time. The "worker" backend
+forks each step from a forkserver that has those modules pre-imported, so a
+step starts in milliseconds while still getting its own process (crash and
+timeout isolation, no state shared between agents). Both backends give the
+agent the same environment: the worker receives the caller's full environment
+per call rather than the one the forkserver happened to start with.
+
+Select the backend with ACE_AGENT_EXECUTION_MODE=worker|subprocess. As with
+any multiprocessing start method other than fork, an entry script that drives
+the orchestrator must keep its work under ``if __name__ == "__main__":``.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+EXECUTION_MODE_ENV = "ACE_AGENT_EXECUTION_MODE"
+DEFAULT_EXECUTION_MODE = "worker"
+# Seconds the orchestrator will wait for the step; agents may scale their work to it
+STEP_BUDGET_ENV = "ACE_STEP_TIME_BUDGET"
+# After SIGTERM on timeout, seconds an agent gets to flush its artifacts before SIGKILL
+TERMINATE_GRACE_SECONDS = 5
+# Threads one agent step may use (overrides PerformanceConfig.agent_threads)
+AGENT_THREADS_ENV = "ACE_AGENT_THREADS"
+# Thread-pool sizes honoured by OpenMP, BLAS (numpy/scipy/sklearn) and joblib
+THREAD_LIMIT_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "LOKY_MAX_CPU_COUNT")
+
+# Imported once in the forkserver; every forked agent inherits them warm.
+# Missing optional modules are skipped by multiprocessing.
+WORKER_PRELOAD_MODULES: List[str] = [
+    "numpy",
+    "pandas",
+    "scipy.stats",
+    "sklearn.cluster",
+    "sklearn.ensemble",
+    "sklearn.linear_model",
+    "sklearn.model_selection",
+    "sklearn.preprocessing",
+    "sklearn.inspection",
+    "statsmodels.api",
+    "google.genai",
+    "core.state_manager",
+    "core.run_manifest",
+    "core.analytics",
+    "core.llm",
+]
+
+_context_lock = threading.Lock()
+_worker_context = None
+
+
+def resolve_execution_mode() -> str:
+    """Return the configured execution mode, falling back to subprocess where forkserver is unavailable."""
+    mode = (os.getenv(EXECUTION_MODE_ENV) or DEFAULT_EXECUTION_MODE).strip().lower()
+    if mode == "worker" and "forkserver" not in multiprocessing.get_all_start_methods():
+        return "subprocess"
+    return mode if mode in {"worker", "subprocess"} else "subprocess"
+
+
+def resolve_agent_threads(default: int) -> int:
+    """Return the per-agent thread limit, letting the environment override the config default."""
+    raw = os.getenv(AGENT_THREADS_ENV)
+    try:
+        value = int(raw) if raw else int(default)
+    except ValueError:
+        value = int(default)
+    return max(1, value)
+
+
+def thread_limit_env(threads: int) -> Dict[str, str]:
+    """Environment variables that cap an agent's thread pools at ``threads``."""
+    return {name: str(threads) for name in THREAD_LIMIT_VARS}
+
+
+def _get_worker_context():
+    global _worker_context
+    with _context_lock:
+        if _worker_context is None:
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload(WORKER_PRELOAD_MODULES)
+            _worker_context = ctx
+        return _worker_context
+
+
+def _apply_environment(env: Dict[str, str], agent_script: str) -> None:
+    """
+    Make this forked worker look like ``python agent_script`` started with ``env``.
+
+    The environment is replaced, not merged, and sys.path gets the script
+    directory and PYTHONPATH entries a fresh interpreter would have. Project
+    modules preloaded in the forkserver read settings (API keys, LLM limits,
+    write-behind) from the environment at import, so they are dropped and
+    re-imported under this step's environment; third-party modules stay warm.
+    """
+    os.environ.clear()
+    os.environ.update(env)
+
+    entries = [str(Path(agent_script).resolve().parent)]
+    entries += [entry for entry in env.get("PYTHONPATH", "").split(os.pathsep) if entry]
+    sys.path[:] = entries + [entry for entry in sys.path if entry not in entries]
+
+    for name in [name for name in sys.modules if name == "core" or name.startswith("core.")]:
+        del sys.modules[name]
+
+    # BLAS pools were sized when the forkserver imported numpy; resize them to the limit
+    threads = env.get("OMP_NUM_THREADS")
+    if threads and threads.isdigit():
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            pass
+        else:
+            threadpool_limits(int(threads))
+
+
+def _worker_entry(
+    agent_script: str,
+    run_path: str,
+    env: Dict[str, str],
+    stdout_path: str,
+    stderr_path: str,
+    started_at,
+) -> None:
+    """Run one agent script as __main__ inside a forked worker, capturing fd-level output."""
+    started_at.value = time.time()
+    out_fd = os.open(stdout_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    err_fd = os.open(stderr_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+
+    _apply_environment(env, agent_script)
+    backend_dir = str(Path(agent_script).resolve().parent.parent)
+    if backend_dir not in sys.path:
+        sys.path.append(backend_dir)
+    sys.argv = [agent_script, run_path]
+
+    from core.state_manager import flush_on_terminate
+    flush_on_terminate()
+
+    code = 0
+    try:
+        runpy.run_path(agent_script, run_name="__main__")
+    except SystemExit as exc:
+        if exc.code is None:
+            code = 0
+        elif isinstance(exc.code, int):
+            code = exc.code
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        # os._exit skips atexit, so persist write-behind artifacts here (step boundary)
+        try:
+            from core.state_manager import flush_pending_writes
+            flush_pending_writes()
+        except Exception as exc:
+            print(f"[AgentRuntime] Failed to flush buffered artifacts: {exc}", file=sys.stderr)
+            code = code or 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(code)
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def run_agent_in_worker(
+    agent_script: str,
+    run_path: str,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Execute an agent script in a process forked from the warm forkserver.
+
+    Mirrors ``subprocess.run(..., capture_output=True, text=True, env=env,
+    timeout=...)``: the agent runs with exactly ``env`` (the caller's current
+    environment when None), returns a CompletedProcess with decoded
+    stdout/stderr and raises
+    subprocess.TimeoutExpired after killing the worker when the budget runs out.
+    The returned object also carries ``startup_seconds``, the time from launch
+    until the agent script started executing.
+    """
+    ctx = _get_worker_context()
+    fd_out, stdout_path = tempfile.mkstemp(prefix="ace_agent_", suffix=".out")
+    fd_err, stderr_path = tempfile.mkstemp(prefix="ace_agent_", suffix=".err")
+    os.close(fd_out)
+    os.close(fd_err)
+
+    started_at = ctx.Value("d", 0.0, lock=False)
+    launched_at = time.time()
+    process = ctx.Process(
+        target=_worker_entry,
+        args=(agent_script, run_path, dict(os.environ if env is None else env), stdout_path, stderr_path, started_at),
+        name=f"ace-agent-{Path(agent_script).stem}",
+        daemon=False,
+    )
+    process.start()
+    process.join(timeout)
+
+    if process.is_alive():
+        process.terminate()  # SIGTERM: the agent flushes buffered artifacts and exits
+        process.join(TERMINATE_GRACE_SECONDS)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        stdout = _read_text(stdout_path)
+        stderr = _read_text(stderr_path)
+        raise subprocess.TimeoutExpired([agent_script, run_path], timeout, output=stdout, stderr=stderr)
+
+    stdout = _read_text(stdout_path)
+    stderr = _read_text(stderr_path)
+    returncode = process.exitcode if process.exitcode is not None else 1
+    result = subprocess.CompletedProcess([agent_script, run_path], returncode, stdout, stderr)
+    result.startup_seconds = round(started_at.value - launched_at, 3) if started_at.value else None
+    return result
+
+
+def run_agent_subprocess(
+    agent_script: str,
+    run_path: str,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Execute an agent script in a fresh interpreter.
+
+    Same contract as ``subprocess.run(..., capture_output=True, text=True,
+    timeout=...)``, except that on timeout the agent is sent SIGTERM and given
+    TERMINATE_GRACE_SECONDS to flush its buffered artifacts before it is killed.
+    """
+    args = [sys.executable, agent_script, run_path]
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                stdout, stderr = process.communicate(timeout=TERMINATE_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+            raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
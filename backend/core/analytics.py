@@ -1,10 +1,12 @@
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
 from sklearn.ensemble import IsolationForest
 from typing import Dict, List, Optional
+from joblib import Parallel, delayed
+from ace_v4.performance.config import PerformanceConfig
+from .cluster_selection import select_k
+from .data_loader import iter_dataset_batches
 from .schema_utils import pick_first_role_column
 
 def load_data(path: str) -> pd.DataFrame:
@@ -167,37 +169,33 @@ def run_universal_clustering(df: pd.DataFrame, schema_map):
     df_scaled = apply_normalization(df_cluster, norm_plan)
     
     # 3. Auto-K Selection
-    best_k = 3
-    best_score = -1
-    best_labels = None
-    best_model = None
-    
     # If dataset is small, limit K
     max_k = min(8, len(df))
     if max_k < 3:
         max_k = 3
     
-    print(f"   Universal Clustering on {valid_features} (K={start_k}-{max_k})...")
+    print(f"   Universal Clustering on {valid_features} (K=3-{max_k})...")
     
-    for k in range(3, max_k + 1):
-        if len(df_scaled) < k:
-            continue  # Not enough samples for this k
-        model = KMeans(n_clusters=k, random_state=42, n_init=10)
-        labels = model.fit_predict(df_scaled)
-        if len(set(labels)) < 2: continue # Skip if only 1 cluster found
-        score = silhouette_score(df_scaled, labels)
-        
-        if score > best_score:
-            best_score = score
-            best_k = k
-            best_labels = labels
-            best_model = model
+    config = PerformanceConfig()
+    X = df_scaled.to_numpy(dtype=np.float64)
+    selection = select_k(
+        X,
+        range(3, max_k + 1),
+        minibatch_rows=config.clustering_minibatch_rows,
+        silhouette_sample=config.clustering_silhouette_sample,
+        patience=config.clustering_patience,
+    )
+    best_k = selection.k
+    best_score = selection.score
             
-    if best_labels is None:
+    if selection.model is None:
         # Fallback to single cluster
         best_k = 1
-        best_labels = np.zeros(len(df))
+        best_labels = np.zeros(len(df), dtype=int)
         best_score = 0.0
+    else:
+        # Single labelling pass over every row
+        best_labels = selection.model.predict(X)
 
     # 4. Schema-Aware Fingerprinting
     df_out = df.copy()
@@ -257,100 +255,129 @@ def run_universal_clustering(df: pd.DataFrame, schema_map):
     return {
         "k": best_k,
         "silhouette": best_score,
+        "k_scores": {str(k): round(v, 4) for k, v in selection.scores.items()},
+        "method": selection.method,
         "sizes": sizes,
         "fingerprints": fingerprints,
-        "labels": best_labels.tolist()
+        "labels": best_labels
     }
 
-def detect_universal_anomalies(df: pd.DataFrame, schema_map):
+def _score_anomalies(iso: IsolationForest, X: np.ndarray, chunk_rows: int) -> np.ndarray:
+    """IsolationForest decision scores for X, computed over row chunks on all cores."""
+    if len(X) <= chunk_rows:
+        return iso.decision_function(X)
+    chunks = Parallel(n_jobs=-1, prefer="threads")(
+        delayed(iso.decision_function)(X[start:start + chunk_rows])
+        for start in range(0, len(X), chunk_rows)
+    )
+    return np.concatenate(chunks)
+
+
+def detect_universal_anomalies(df: pd.DataFrame, schema_map, data_path: Optional[str] = None, config: Optional[PerformanceConfig] = None):
     """
     Universal Anomaly Detection using SchemaMap.
     1. Select anomaly features.
-    2. Run Isolation Forest.
-    3. Characterize anomalies using semantic roles.
+    2. Fit Isolation Forest on a bounded random subsample.
+    3. Score every row in parallel chunks. When ``df`` was capped at
+       max_analysis_rows and ``data_path`` is given, the whole dataset is
+       streamed from disk so flags and scores cover every row.
+    4. Characterize anomalies using semantic roles (one vectorized pass).
     """
+    config = config or PerformanceConfig()
+
     # 1. Feature Selection
     features = schema_map.feature_plan.anomaly_features
     if not features:
         features = schema_map.basic_types.numeric
         
-    valid_features = [f for f in features if f in df.columns]
+    valid_features = list(dict.fromkeys(f for f in features if f in df.columns))
     if not valid_features:
         return {"total_count": 0, "anomalies": [], "indices": [], "drivers": {}, "role_deviations": {}}
 
-    # Safely convert to numeric, dropping columns that fail conversion
-    df_anom = pd.DataFrame()
-    for col in valid_features:
-        try:
-            numeric_col = pd.to_numeric(df[col], errors='coerce')
-            # Skip columns where >50% of values couldn't be converted
-            if numeric_col.isna().mean() < 0.5:
-                df_anom[col] = numeric_col
-        except Exception:
-            continue  # Skip problematic columns
+    # Convert all candidate columns at once; skip columns where >50% of
+    # values couldn't be converted
+    numeric = df[valid_features].apply(pd.to_numeric, errors="coerce")
+    df_anom = numeric.loc[:, numeric.isna().mean() < 0.5]
 
     if df_anom.empty:
         return {"total_count": 0, "anomalies": [], "indices": [], "drivers": {}, "role_deviations": {}}
 
     # Update valid_features to only include successfully converted columns
     valid_features = list(df_anom.columns)
-    df_anom = df_anom.fillna(df_anom.mean())
+    fill_values = df_anom.mean()
+    X = df_anom.fillna(fill_values).to_numpy(dtype=np.float64)
     
     # IsolationForest requires at least two samples
-    if df_anom.empty or len(df_anom) < 2:
+    if len(X) < 2:
         return {"total_count": 0, "anomalies": []}
     
-    # 2. Isolation Forest
-    iso = IsolationForest(contamination=0.05, random_state=42)
-    preds = iso.fit_predict(df_anom) # -1 is anomaly
+    # 2. Isolation Forest, fitted on a bounded random subsample
+    rng = np.random.default_rng(42)
+    fit_rows = X if len(X) <= config.anomaly_fit_rows else X[rng.choice(len(X), size=config.anomaly_fit_rows, replace=False)]
+    iso = IsolationForest(contamination=0.05, random_state=42, n_jobs=-1)
+    iso.fit(fit_rows)
+
+    # 3. Scoring. Negative decision scores are exactly what predict() labels -1.
+    # Characterization needs only per-column sums and counts, so it streams too.
+    stream = data_path is not None and len(df) >= config.max_analysis_rows
+    batches = (
+        (
+            batch.reindex(columns=valid_features).apply(pd.to_numeric, errors="coerce")
+            for batch in iter_dataset_batches(data_path, columns=valid_features, config=config)
+        )
+        if stream
+        else [df_anom]
+    )
+    score_parts = []
+    total_sum = np.zeros(len(valid_features))
+    total_count = np.zeros(len(valid_features))
+    anom_sum = np.zeros(len(valid_features))
+    anom_count = np.zeros(len(valid_features))
+    for batch in batches:
+        values = batch.to_numpy(dtype=np.float64)
+        batch_scores = _score_anomalies(iso, batch.fillna(fill_values).to_numpy(dtype=np.float64), config.anomaly_score_chunk_rows)
+        score_parts.append(batch_scores)
+        present = ~np.isnan(values)
+        observed = np.where(present, values, 0.0)
+        batch_flags = batch_scores < 0
+        total_sum += observed.sum(axis=0)
+        total_count += present.sum(axis=0)
+        anom_sum += observed[batch_flags].sum(axis=0)
+        anom_count += present[batch_flags].sum(axis=0)
+    scores = np.concatenate(score_parts) if score_parts else np.empty(0)
+    flags = scores < 0
     
-    anom_indices = np.where(preds == -1)[0]
+    anom_indices = np.flatnonzero(flags)
     if len(anom_indices) == 0:
-        return {"total_count": 0, "anomalies": []}
-        
-    anomalies_df = df.iloc[anom_indices].copy()
-    
-    # 3. Characterization
-    # We want to group anomalies by "reason"
-    # e.g. "High Risk-Like", "Low Value-Like"
-    
-    # Calculate global means for comparison
-    global_means = df[valid_features].mean()
-    
-    characterized_anomalies = []
+        return {"total_count": 0, "anomalies": [], "flags": flags, "scores": scores}
     
-    # We'll summarize the top 5 most distinct anomalies or groups
-    # For simplicity in this version, we'll return a summary of the group
-    
-    # Let's find the features that deviate most for the anomaly group as a whole
-    anom_means = anomalies_df[valid_features].mean()
-    deviations = {}
-    
-    for col in valid_features:
-        if global_means[col] == 0: continue
-        pct_diff = (anom_means[col] - global_means[col]) / global_means[col]
-        deviations[col] = pct_diff
+    # 4. Characterization
+    # Deviation of the anomaly group's mean from the global mean, per feature
+    with np.errstate(divide="ignore", invalid="ignore"):
+        global_means = total_sum / total_count
+        anom_means = anom_sum / anom_count
+        pct_diff = (anom_means - global_means) / global_means
+    deviations = pd.Series(pct_diff, index=valid_features)
+    deviations = deviations[(global_means != 0) & np.isfinite(pct_diff)]
         
     # Map deviations to roles
     role_deviations = {}
     for role, cols in schema_map.semantic_roles.model_dump().items():
         if role in ["id_fields", "time_fields", "categorical_descriptors"]: continue
-        
-        role_diffs = []
-        for col in cols:
-            if col in deviations:
-                role_diffs.append(deviations[col])
-        
-        if role_diffs:
-            role_deviations[role] = float(np.mean(role_diffs))
+        role_diffs = deviations.reindex(cols).dropna()
+        if len(role_diffs):
+            role_deviations[role] = float(role_diffs.mean())
 
     # Identify top drivers
-    drivers = sorted(deviations.items(), key=lambda x: abs(x[1]), reverse=True)[:3]
+    drivers = deviations.reindex(deviations.abs().sort_values(ascending=False).index[:3])
     
     summary = {
-        "total_count": int(len(anomalies_df)),
+        "total_count": int(len(anom_indices)),
         "indices": anom_indices.tolist(),
-        "drivers": {k: float(v) for k, v in drivers},
+        "flags": flags,
+        "scores": scores,
+        "rows_scored": int(len(scores)),
+        "drivers": {k: float(v) for k, v in drivers.items()},
         "role_deviations": role_deviations
     }
     
@@ -0,0 +1,97 @@
+"""
+Incremental K selection for KMeans segmentation.
+
+Candidate k values are scored on a fixed row sample with silhouette, each k is
+warm-started from the previous k's centroids, MiniBatchKMeans takes over on
+tall frames, and the sweep stops once the score stops improving.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+
+@dataclass
+class KSelection:
+    model: Union[KMeans, MiniBatchKMeans, None]
+    k: int
+    score: float
+    scores: Dict[int, float] = field(default_factory=dict)
+    method: str = "kmeans"
+    stopped_early: bool = False
+
+
+def _next_centroid(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """The row farthest from every existing centroid (deterministic k-means++ step)."""
+    distances = ((X[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+    return X[int(distances.argmax())]
+
+
+def select_k(
+    X: np.ndarray,
+    k_values: Iterable[int],
+    minibatch_rows: int = 50_000,
+    silhouette_sample: int = 10_000,
+    patience: int = 2,
+    random_state: int = 42,
+) -> KSelection:
+    """
+    Fit KMeans for increasing k and keep the best by sampled silhouette.
+
+    Args:
+        X: Scaled feature matrix
+        k_values: Candidate cluster counts, ascending
+        minibatch_rows: Use MiniBatchKMeans when X has at least this many rows
+        silhouette_sample: Rows used to score every k (the same rows each time)
+        patience: Stop after this many consecutive k without improvement
+        random_state: Seed for sampling and the first k's initialisation
+
+    Returns:
+        KSelection with the fitted best model; callers label all rows with a
+        single ``model.predict(X)``.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    rng = np.random.default_rng(random_state)
+    if len(X) > silhouette_sample:
+        score_rows = X[np.sort(rng.choice(len(X), size=silhouette_sample, replace=False))]
+    else:
+        score_rows = X
+    use_minibatch = len(X) >= minibatch_rows
+    method = "minibatch_kmeans" if use_minibatch else "kmeans"
+
+    best = KSelection(model=None, k=1, score=-1.0, method=method)
+    previous: Optional[np.ndarray] = None
+    since_improvement = 0
+    for k in sorted(set(k_values)):
+        if k < 2 or len(X) < k:
+            continue
+        if previous is None:
+            init, n_init = "k-means++", (3 if use_minibatch else 10)
+        else:
+            # Previous centroids plus one new seed; the farthest-point search
+            # runs on the scoring sample to stay bounded on tall frames.
+            init = np.vstack([previous, _next_centroid(score_rows, previous)])
+            n_init = 1
+        if use_minibatch:
+            model = MiniBatchKMeans(n_clusters=k, init=init, n_init=n_init, batch_size=4096, random_state=random_state)
+        else:
+            model = KMeans(n_clusters=k, init=init, n_init=n_init, random_state=random_state)
+        model.fit(X)
+        previous = model.cluster_centers_
+
+        labels = model.predict(score_rows)
+        if len(np.unique(labels)) < 2:
+            continue
+        score = float(silhouette_score(score_rows, labels))
+        best.scores[k] = score
+        if score > best.score:
+            best.model, best.k, best.score = model, k, score
+            since_improvement = 0
+        else:
+            since_improvement += 1
+            if since_improvement >= patience:
+                best.stopped_early = True
+                break
+    return best
@@ -0,0 +1,264 @@
+"""
+Shared column-statistics engine.
+
+Moments, extremes, quartiles and IQR outlier counts for every numeric column
+of a frame in vectorised NumPy passes over blocks of columns, with optional
+sampled normality tests run in parallel. Each block is converted to floats on
+its own and reuses one scratch buffer, so memory stays near one block beyond
+the frame itself.
+
+Results are keyed by a hash of the column contents, so profiling, the scanner
+and enhanced analytics share one result even when each holds its own copy of
+the data. When the orchestrator points ACE_COLUMN_STATS_DIR at the run's
+artifacts, results are also saved there and later agents load them instead of
+recomputing.
+"""
+import hashlib
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import stats
+
+_CACHE_SIZE = 4
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+NORMALITY_SAMPLE = 5000
+# Directory where results persist between agents of one run (set by the orchestrator)
+COLUMN_STATS_DIR_ENV = "ACE_COLUMN_STATS_DIR"
+# Float values converted and processed at a time
+BLOCK_BYTES = 64 * 1024 * 1024
+
+_ARRAY_FIELDS = (
+    "count", "mean", "std", "std_pop", "min", "max", "skew", "kurtosis", "q25", "q50", "q75", "outlier_count"
+)
+
+
+@dataclass
+class ColumnStats:
+    columns: list
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray  # sample std (ddof=1), as Series.std()
+    std_pop: np.ndarray  # population std (ddof=0)
+    min: np.ndarray
+    max: np.ndarray
+    skew: np.ndarray  # biased, as scipy.stats.skew
+    kurtosis: np.ndarray  # Fisher, biased, as scipy.stats.kurtosis
+    q25: np.ndarray
+    q50: np.ndarray
+    q75: np.ndarray
+    outlier_count: np.ndarray  # outside the 1.5 * IQR fences
+    normality: Dict[str, Tuple[float, float, str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._index = {col: i for i, col in enumerate(self.columns)}
+
+    def column(self, name) -> Dict[str, Any]:
+        """Plain-float statistics for one column (NaN where undefined)."""
+        i = self._index[name]
+        return {
+            "count": int(self.count[i]),
+            "mean": float(self.mean[i]),
+            "std": float(self.std[i]),
+            "std_pop": float(self.std_pop[i]),
+            "min": float(self.min[i]),
+            "max": float(self.max[i]),
+            "skew": float(self.skew[i]),
+            "kurtosis": float(self.kurtosis[i]),
+            "q25": float(self.q25[i]),
+            "q50": float(self.q50[i]),
+            "q75": float(self.q75[i]),
+            "outlier_count": int(self.outlier_count[i]),
+        }
+
+
+def _moments(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Statistics for one block of columns, using one scratch buffer the size of ``values``."""
+    present = ~np.isnan(values)
+    count = present.sum(axis=0)
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        work = np.where(present, values, 0.0)
+        mean = work.sum(axis=0) / count
+        # Central moments: center in place, then einsum sums the products without temporaries
+        np.subtract(work, mean, out=work)
+        work[~present] = 0.0
+        m2 = np.einsum("ij,ij->j", work, work) / count
+        m3 = np.einsum("ij,ij,ij->j", work, work, work) / count
+        np.square(work, out=work)
+        m4 = np.einsum("ij,ij->j", work, work) / count
+        np.copyto(work, values)
+        q25, q50, q75 = np.nanquantile(work, [0.25, 0.5, 0.75], axis=0, overwrite_input=True)
+        iqr = q75 - q25
+        outliers = np.count_nonzero(values < q25 - 1.5 * iqr, axis=0)
+        outliers += np.count_nonzero(values > q75 + 1.5 * iqr, axis=0)
+        flat = m2 <= 0
+        skew = np.where(flat, np.nan, m3 / m2 ** 1.5)
+        kurtosis = np.where(flat, np.nan, m4 / m2 ** 2 - 3.0)
+        return {
+            "count": count,
+            "mean": mean,
+            "std": np.sqrt(m2 * count / (count - 1)),
+            "std_pop": np.sqrt(m2),
+            "min": np.nanmin(values, axis=0),
+            "max": np.nanmax(values, axis=0),
+            "skew": skew,
+            "kurtosis": kurtosis,
+            "q25": q25,
+            "q50": q50,
+            "q75": q75,
+            "outlier_count": outliers,
+        }
+
+
+def _shapiro(column: np.ndarray, sample: int, seed: int) -> Tuple[float, float, str]:
+    data = column[~np.isnan(column)]
+    test = "shapiro"
+    if len(data) > sample:
+        data = np.random.default_rng(seed).choice(data, size=sample, replace=False)
+        test = "shapiro_sampled"
+    stat, p_value = stats.shapiro(data)
+    return float(stat), float(p_value), test
+
+
+def _normality(values: np.ndarray, columns: list, sample: int, random_state: int, n_jobs: int):
+    """Shapiro-Wilk per column (sampled above ``sample`` rows), columns tested concurrently."""
+    testable = [i for i in range(len(columns)) if np.count_nonzero(~np.isnan(values[:, i])) >= 3]
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_shapiro)(values[:, i], sample, random_state) for i in testable
+    )
+    return {columns[i]: result for i, result in zip(testable, results)}
+
+
+def _column_blocks(frame: pd.DataFrame, columns: list):
+    """Yield (columns, float matrix) for blocks of about BLOCK_BYTES."""
+    width = max(1, BLOCK_BYTES // max(1, 8 * len(frame)))
+    for start in range(0, len(columns), width):
+        block = columns[start:start + width]
+        yield block, frame[block].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def dataset_hash(frame: pd.DataFrame, columns: Sequence, version: Optional[str] = None) -> str:
+    """Content hash of ``columns`` of ``frame`` (values, dtypes and names; not the index)."""
+    digest = hashlib.sha256(repr([(col, str(frame[col].dtype)) for col in columns]).encode("utf-8"))
+    digest.update(repr((len(frame), version)).encode("utf-8"))
+    for col in columns:
+        digest.update(pd.util.hash_pandas_object(frame[col], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _artifact_path(key: str) -> Optional[Path]:
+    directory = os.getenv(COLUMN_STATS_DIR_ENV)
+    return Path(directory) / f"{key}.npz" if directory else None
+
+
+def _load_artifact(key: str, columns: list) -> Optional[ColumnStats]:
+    path = _artifact_path(key)
+    if path is None or not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            result = ColumnStats(columns=columns, **{name: data[name] for name in _ARRAY_FIELDS})
+            if "normality_column" in data:
+                result.normality = {
+                    columns[int(i)]: (float(stat), float(p_value), str(test))
+                    for i, stat, p_value, test in zip(
+                        data["normality_column"], data["normality_stat"], data["normality_p"], data["normality_test"]
+                    )
+                }
+    except (OSError, KeyError, ValueError, IndexError) as exc:
+        print(f"[ColumnStats] Ignoring unreadable {path}: {exc}")
+        return None
+    return result
+
+
+def _save_artifact(key: str, result: ColumnStats) -> None:
+    path = _artifact_path(key)
+    if path is None:
+        return
+    arrays = {name: getattr(result, name) for name in _ARRAY_FIELDS}
+    if result.normality:
+        tested = list(result.normality.items())
+        arrays["normality_column"] = np.array([result.columns.index(col) for col, _ in tested])
+        arrays["normality_stat"] = np.array([stat for _, (stat, _, _) in tested])
+        arrays["normality_p"] = np.array([p_value for _, (_, p_value, _) in tested])
+        arrays["normality_test"] = np.array([test for _, (_, _, test) in tested])
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+    except OSError as exc:
+        print(f"[ColumnStats] Could not save {path}: {exc}")
+
+
+def compute_column_stats(
+    frame: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    normality: bool = False,
+    normality_sample: int = NORMALITY_SAMPLE,
+    random_state: int = 42,
+    n_jobs: int = -1,
+    version: Optional[str] = None,
+) -> ColumnStats:
+    """
+    Statistics for ``columns`` (default: the numeric columns) of ``frame``.
+
+    Values are read block by block as floats; booleans count as 0/1 and
+    anything non-numeric must be coerced by the caller. Normality tests are
+    only run when asked for and are added to a cached result on first request.
+
+    Results are cached by dataset_hash, so equal data hits the cache whichever
+    frame object holds it and a frame modified in place is recomputed;
+    ``version`` remains as an extra cache key component.
+    """
+    if columns is None:
+        columns = frame.select_dtypes(include=[np.number, "bool"]).columns
+    columns = list(columns)
+    key = dataset_hash(frame, columns, version)
+    with _cache_lock:
+        result = _cache.get(key)
+        if result is not None:
+            _cache.move_to_end(key)
+    if result is None:
+        result = _load_artifact(key, columns)
+    if result is not None and (result.normality or not normality):
+        _remember(key, result)
+        return result
+
+    computed = result is None
+    parts, tested = [], {}
+    for block, values in _column_blocks(frame, columns):
+        if computed:
+            parts.append(_moments(values))
+        if normality:
+            tested.update(_normality(values, block, normality_sample, random_state, n_jobs))
+    if computed:
+        arrays = {
+            name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0)
+            for name in _ARRAY_FIELDS
+        }
+        result = ColumnStats(columns=columns, **arrays)
+    if normality:
+        result.normality = tested
+
+    _save_artifact(key, result)
+    _remember(key, result)
+    return result
+
+
+def _remember(key: str, result: ColumnStats) -> None:
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
@@ -0,0 +1,155 @@
+"""
+Shared correlation kernel.
+
+Pearson, Spearman and pairwise-complete observation counts for a numeric
+frame, computed with matrix products and cached per dataset version and
+column set so enhanced analytics, the redundancy report and regression
+collinearity checks reuse one result instead of recomputing it.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .column_stats import dataset_hash
+
+_CACHE_SIZE = 4
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def pearson_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation of the columns of ``values``.
+
+    NaNs are handled pairwise-complete (as DataFrame.corr): per-pair sums are
+    null-mask products, so the whole matrix costs a handful of p x p GEMMs.
+    Pairs with fewer than two shared rows or zero variance are NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Centering on the column mean leaves r unchanged and keeps the
+        # one-pass sums below free of cancellation.
+        centered = values - np.nanmean(values, axis=0)
+        if present.all():
+            scale = np.sqrt((centered ** 2).sum(axis=0))
+            standardized = centered / scale
+            corr = standardized.T @ standardized
+            np.fill_diagonal(corr, np.where(scale > 0, 1.0, np.nan))
+            return np.clip(corr, -1.0, 1.0)
+
+        mask = present.astype(np.float64)
+        x = np.where(present, centered, 0.0)
+        n = mask.T @ mask
+        sums = x.T @ mask  # sums[i, j]: sum of column i over rows where j is present too
+        squares = (x ** 2).T @ mask
+        cross = x.T @ x
+        cov = cross - sums * sums.T / n
+        var = squares - sums ** 2 / n
+        corr = cov / np.sqrt(var * var.T)
+    corr[(n < 2) | ~(var > 0) | ~(var.T > 0)] = np.nan
+    diagonal = np.diagonal(corr).copy()
+    np.fill_diagonal(corr, np.where(np.isnan(diagonal), np.nan, 1.0))
+    return np.clip(corr, -1.0, 1.0)
+
+
+def pairwise_counts(frame: pd.DataFrame) -> np.ndarray:
+    """Rows where both columns are present, for every column pair (null-mask dot product)."""
+    present = frame.notna().to_numpy(dtype=np.float64)
+    return np.rint(present.T @ present).astype(np.int64)
+
+
+@dataclass
+class CorrelationKernel:
+    columns: list
+    pearson: np.ndarray
+    counts: np.ndarray
+    spearman: Optional[np.ndarray] = None
+
+    def frame(self, method: str = "pearson") -> pd.DataFrame:
+        matrix = self.spearman if method == "spearman" else self.pearson
+        return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+    def strength(self, method: str = "pearson") -> np.ndarray:
+        """Absolute correlation; ``max`` takes the larger of Pearson and Spearman."""
+        if method == "max":
+            if self.spearman is None:
+                return np.abs(self.pearson)
+            return np.fmax(np.abs(self.pearson), np.abs(self.spearman))
+        matrix = self.spearman if method == "spearman" else self.pearson
+        return np.abs(matrix)
+
+    def pairs(self, threshold: float, method: str = "pearson", strict: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Upper-triangle index pairs whose absolute correlation reaches ``threshold``.
+
+        Args:
+            threshold: Cut-off on |r|
+            method: ``pearson``, ``spearman`` or ``max``
+            strict: Require |r| > threshold instead of >=
+
+        Returns:
+            (rows, cols) index arrays in row-major order of the upper triangle
+        """
+        strength = np.nan_to_num(self.strength(method), nan=0.0)
+        hits = strength > threshold if strict else strength >= threshold
+        return np.nonzero(np.triu(hits, k=1))
+
+
+def _fill(frame: pd.DataFrame, fill: Optional[str]) -> pd.DataFrame:
+    if fill == "mean":
+        return frame.fillna(frame.mean())
+    if fill == "median":
+        return frame.fillna(frame.median())
+    return frame
+
+
+def correlation_kernel(
+    frame: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    fill: Optional[str] = None,
+    spearman: bool = False,
+    version: Optional[str] = None,
+) -> CorrelationKernel:
+    """
+    Correlations for ``columns`` of ``frame``, computed once per dataset version.
+
+    Counts always come from the frame's own null mask, so they stay
+    pairwise-complete even when ``fill`` (``mean`` or ``median``) imputes the
+    values that feed the coefficients. Spearman ranks every column once and
+    reuses the Pearson kernel; with missing values left in place that differs
+    slightly from DataFrame.corr, which re-ranks each pair.
+
+    The cache is keyed on the content hash of the selected columns, so equal
+    data shares one kernel and a frame modified in place gets a new one.
+    """
+    columns = list(frame.columns if columns is None else columns)
+    key = (dataset_hash(frame, columns, version), tuple(columns), fill)
+    with _cache_lock:
+        kernel = _cache.get(key)
+        if kernel is not None:
+            _cache.move_to_end(key)
+            if kernel.spearman is not None or not spearman:
+                return kernel
+
+    subset = frame[columns]
+    values = _fill(subset, fill)
+    if kernel is None:
+        kernel = CorrelationKernel(
+            columns=columns,
+            pearson=pearson_matrix(values.to_numpy(dtype=np.float64)),
+            counts=pairwise_counts(subset),
+        )
+    if spearman and kernel.spearman is None:
+        kernel.spearman = pearson_matrix(values.rank().to_numpy(dtype=np.float64))
+
+    with _cache_lock:
+        _cache[key] = kernel
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return kernel
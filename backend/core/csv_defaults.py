@@ -33,6 +33,30 @@ DEFAULT_NULL_SENTINELS: Sequence[str] = [
     "__________",
 ]
 
+# Strings pandas.read_csv treats as missing by default (keep_default_na=True);
+# engines that bypass pandas use this list to stay consistent with it.
+PANDAS_DEFAULT_NA_VALUES: Sequence[str] = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
 POLARS_CSV_KWARGS: Dict[str, object] = {
     "null_values": list(DEFAULT_NULL_SENTINELS),
     "ignore_errors": True,
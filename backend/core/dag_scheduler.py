@@ -0,0 +1,162 @@
+"""
+Dependency-driven scheduling for pipeline steps.
+
+Each step declares the artifacts it reads and writes (STEP_ARTIFACTS in
+core.pipeline_map). Walking PIPELINE_SEQUENCE in order, a step depends on an
+earlier step when it reads what that step writes, writes what it reads, or
+writes the same artifact. Honouring those edges gives the same artifacts the
+serial order would, while steps with no hazard between them (the LLM
+interpretation chain and regression/personas, for example) run side by side.
+
+Select the scheduler with ACE_PIPELINE_SCHEDULER=dag|sequential and cap the
+number of steps in flight with ACE_PIPELINE_CONCURRENCY.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+SCHEDULER_MODE_ENV = "ACE_PIPELINE_SCHEDULER"
+DEFAULT_SCHEDULER_MODE = "dag"
+CONCURRENCY_ENV = "ACE_PIPELINE_CONCURRENCY"
+
+
+def resolve_scheduler_mode() -> str:
+    """Return the configured pipeline scheduler ("dag" or "sequential")."""
+    mode = (os.getenv(SCHEDULER_MODE_ENV) or DEFAULT_SCHEDULER_MODE).strip().lower()
+    return mode if mode in {"dag", "sequential"} else "sequential"
+
+
+def resolve_max_concurrency(default: int) -> int:
+    """Return the step concurrency limit, letting the environment override the config default."""
+    raw = os.getenv(CONCURRENCY_ENV)
+    try:
+        value = int(raw) if raw else int(default)
+    except ValueError:
+        value = int(default)
+    return max(1, value)
+
+
+def build_step_dependencies(
+    sequence: Sequence[str],
+    step_artifacts: Mapping[str, Mapping[str, Iterable[str]]],
+    implicit_reads: Iterable[str] = (),
+) -> Dict[str, Set[str]]:
+    """
+    Derive each step's upstream steps from its declared artifacts.
+
+    Only earlier steps in ``sequence`` can become dependencies, so the result is
+    always acyclic. A step without a declaration depends on every earlier step,
+    which keeps undeclared agents exactly where the serial pipeline ran them.
+
+    Args:
+        sequence: Steps in canonical (serial) order
+        step_artifacts: {step: {"reads": [...], "writes": [...]}}
+        implicit_reads: Artifacts every step reads through orchestrator guards
+
+    Returns:
+        Mapping of step -> set of steps that must finish first
+    """
+    extra_reads = set(implicit_reads)
+    deps: Dict[str, Set[str]] = {}
+    for idx, step in enumerate(sequence):
+        declared = step_artifacts.get(step)
+        earlier = sequence[:idx]
+        if declared is None:
+            deps[step] = set(earlier)
+            continue
+        reads = set(declared.get("reads") or []) | extra_reads
+        writes = set(declared.get("writes") or [])
+        upstream: Set[str] = set()
+        for prior in earlier:
+            prior_declared = step_artifacts.get(prior)
+            if prior_declared is None:
+                upstream.add(prior)
+                continue
+            prior_reads = set(prior_declared.get("reads") or []) | extra_reads
+            prior_writes = set(prior_declared.get("writes") or [])
+            if prior_writes & reads or prior_writes & writes or prior_reads & writes:
+                upstream.add(prior)
+        deps[step] = upstream
+    return deps
+
+
+class DagScheduler:
+    """
+    Run steps on a thread pool as soon as all of their upstream steps have finished.
+
+    ``run_step(step)`` returns True to keep scheduling, or False to halt: steps
+    already running are allowed to finish, nothing new is started. Any finished
+    step (completed, failed or skipped) satisfies its dependents; deciding what a
+    failure means is left to the caller, as in the serial loop.
+    """
+
+    def __init__(self, dependencies: Mapping[str, Iterable[str]], max_concurrency: int = 4):
+        self.dependencies = {step: set(upstream) for step, upstream in dependencies.items()}
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    def ready_steps(self, pending: Sequence[str], finished: Set[str], running: Set[str]) -> List[str]:
+        """Pending steps whose upstream steps are all finished, in pending order."""
+        return [
+            step for step in pending
+            if step not in running
+            and step not in finished
+            and self.dependencies.get(step, set()) <= finished
+        ]
+
+    def run(
+        self,
+        pending: Sequence[str],
+        run_step: Callable[[str], bool],
+        finished: Optional[Iterable[str]] = None,
+    ) -> Dict[str, object]:
+        """
+        Execute ``pending`` steps respecting dependencies and the concurrency limit.
+
+        Args:
+            pending: Steps still to run, in canonical order
+            run_step: Callback executing one step; False halts scheduling
+            finished: Steps already done before this call (resume)
+
+        Returns:
+            {"finished": [...], "not_started": [...], "halted": bool}
+        """
+        pending = list(pending)
+        known = set(pending) | set(finished or [])
+        # Upstream steps outside this run (unknown or already done) never block.
+        done: Set[str] = set(finished or [])
+        done |= {dep for step in pending for dep in self.dependencies.get(step, set()) if dep not in known}
+
+        order: List[str] = []
+        halted = False
+        first_error: Optional[BaseException] = None
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="ace-step") as executor:
+            while True:
+                if not halted and first_error is None:
+                    slots = self.max_concurrency - len(running)
+                    for step in self.ready_steps(pending, done, set(running.values()))[:max(slots, 0)]:
+                        running[executor.submit(run_step, step)] = step
+
+                if not running:
+                    break
+
+                completed, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in completed:
+                    step = running.pop(future)
+                    done.add(step)
+                    order.append(step)
+                    try:
+                        if future.result() is False:
+                            halted = True
+                    except BaseException as exc:
+                        if first_error is None:
+                            first_error = exc
+
+        if first_error is not None:
+            raise first_error
+
+        not_started = [step for step in pending if step not in done]
+        return {"finished": order, "not_started": not_started, "halted": halted}
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
 import pandas as pd
 
@@ -9,19 +9,149 @@ from .csv_defaults import PANDAS_CSV_KWARGS, POLARS_CSV_KWARGS
 from ace_v4.performance.config import PerformanceConfig
 from ace_v4.performance.io import ChunkedCSVReader
 
+# Canonical typed columnar copy written next to cleaned_uploaded.csv at ingestion
+COLUMNAR_SUFFIX = ".parquet"
+
+
+def columnar_path_for(data_path: str) -> Path:
+    """Return the path of the columnar copy that belongs to a cleaned dataset."""
+    return Path(data_path).with_suffix(COLUMNAR_SUFFIX)
+
+
+def resolve_columnar_copy(data_path: str) -> Optional[Path]:
+    """
+    Find an up-to-date columnar copy for a dataset.
+
+    A copy is only trusted when it is at least as new as the source file, so a
+    cleaned CSV rewritten after ingestion never gets shadowed by stale Parquet.
+    """
+    source = Path(data_path)
+    if source.suffix.lower() == COLUMNAR_SUFFIX:
+        return source if source.exists() else None
+
+    candidate = columnar_path_for(data_path)
+    if not candidate.exists():
+        return None
+    try:
+        if source.exists() and candidate.stat().st_mtime < source.stat().st_mtime:
+            return None
+    except OSError:
+        return None
+    return candidate
+
+
+def write_columnar_dataset(
+    cleaned_path: str,
+    df: Optional[pd.DataFrame] = None,
+) -> Optional[str]:
+    """
+    Write the canonical Parquet copy of a cleaned dataset.
+
+    Uses the in-memory frame when available (keeps sanitizer dtypes exactly),
+    otherwise converts the cleaned CSV with DuckDB. Returns the Parquet path, or
+    None when neither writer succeeds; agents then keep reading the CSV.
+
+    Args:
+        cleaned_path: Path to the cleaned CSV
+        df: Optional cleaned DataFrame matching the CSV contents
+
+    Returns:
+        Path to the columnar copy or None
+    """
+    target = columnar_path_for(cleaned_path)
+    tmp_path = target.with_name(f"{target.name}.tmp")
+
+    if df is not None:
+        try:
+            df.to_parquet(tmp_path, index=False, compression="zstd")
+            os.replace(tmp_path, target)
+            return str(target)
+        except Exception as exc:
+            print(f"[DataLoader] In-memory Parquet write failed ({exc}); converting CSV instead")
+            tmp_path.unlink(missing_ok=True)
+
+    try:
+        from intake.fast_ingest import csv_to_parquet_duckdb
+
+        csv_to_parquet_duckdb(cleaned_path, str(tmp_path))
+        os.replace(tmp_path, target)
+        return str(target)
+    except Exception as exc:
+        print(f"[DataLoader] Columnar copy unavailable ({exc}); agents will read CSV")
+        tmp_path.unlink(missing_ok=True)
+        return None
+
+
+def _load_columnar(
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    max_rows: Optional[int] = None,
+) -> pd.DataFrame:
+    """Read a Parquet dataset memory-mapped, projecting columns and bounding rows."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    if columns is not None:
+        available = set(parquet_file.schema_arrow.names)
+        columns = [c for c in columns if c in available]
+
+    total_rows = parquet_file.metadata.num_rows
+    if max_rows is None or total_rows <= max_rows:
+        table = parquet_file.read(columns=columns, use_threads=True)
+    else:
+        batches = []
+        loaded = 0
+        for batch in parquet_file.iter_batches(batch_size=min(max_rows, 65_536), columns=columns):
+            batches.append(batch)
+            loaded += batch.num_rows
+            if loaded >= max_rows:
+                break
+        table = pa.Table.from_batches(batches).slice(0, max_rows)
+    return table.to_pandas()
+
+
+def _load_csv_fast(
+    data_path: str,
+    columns: Optional[Sequence[str]] = None,
+    max_rows: Optional[int] = None,
+) -> pd.DataFrame:
+    """Multi-threaded CSV parse through polars, honouring the shared null sentinels."""
+    import polars as pl
+
+    separator = "\t" if Path(data_path).suffix.lower() in {".tsv", ".txt"} else ","
+    frame = pl.read_csv(
+        data_path,
+        separator=separator,
+        n_rows=max_rows,
+        columns=list(columns) if columns is not None else None,
+        infer_schema_length=10_000,
+        **POLARS_CSV_KWARGS,
+    )
+    return frame.to_pandas()
+
 
 def smart_load_dataset(
     data_path: str,
     config: Optional[PerformanceConfig] = None,
     max_rows: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fast_mode: bool = False,
+    prefer_parquet: bool = True,
 ) -> pd.DataFrame:
     """
     Intelligently load a dataset with automatic sampling for large files.
 
+    When ingestion left a columnar copy next to the CSV, it is opened
+    memory-mapped and only the requested columns are materialised.
+
     Args:
         data_path: Path to the CSV file
         config: Performance configuration (uses defaults if None)
         max_rows: Maximum rows to load (uses config.max_analysis_rows if None)
+        columns: Optional subset of columns to load
+        fast_mode: Parse CSV with polars instead of the pandas python engine
+        prefer_parquet: Read the run's columnar copy when one is available
 
     Returns:
         DataFrame with the loaded data
@@ -39,6 +169,24 @@ def smart_load_dataset(
     size_class = reader.classify_size(data_path)
 
     max_rows = max_rows or config.max_analysis_rows
+    row_limit = max_rows if size_class == "large" else None
+
+    columnar_path = resolve_columnar_copy(data_path) if prefer_parquet else None
+    if columnar_path is not None:
+        try:
+            df = _load_columnar(columnar_path, columns=columns, max_rows=row_limit)
+            print(f"[DataLoader] Loaded {len(df)} rows, {len(df.columns)} columns from columnar copy")
+            return df
+        except Exception as exc:
+            print(f"[DataLoader] Columnar read failed ({exc}); falling back to CSV")
+
+    if fast_mode and Path(data_path).suffix.lower() in {".csv", ".tsv", ".txt"}:
+        try:
+            df = _load_csv_fast(data_path, columns=columns, max_rows=row_limit)
+            print(f"[DataLoader] Loaded {len(df)} rows (fast mode)")
+            return df
+        except Exception as exc:
+            print(f"[DataLoader] Fast CSV read failed ({exc}); falling back to pandas")
 
     if size_class == "large":
         print(f"[DataLoader] Large file detected ({file_size_mb:.1f} MB). Sampling {max_rows} rows for analysis.")
@@ -49,9 +197,52 @@ def smart_load_dataset(
         df = reader.read_full(data_path, read_kwargs=dict(PANDAS_CSV_KWARGS))
         print(f"[DataLoader] Loaded {len(df)} rows")
 
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
     return df
 
 
+def iter_dataset_batches(
+    data_path: str,
+    columns: Optional[Sequence[str]] = None,
+    batch_rows: Optional[int] = None,
+    config: Optional[PerformanceConfig] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a whole dataset in row batches, in file order.
+
+    Reads the columnar copy memory-mapped when one exists, otherwise parses the
+    CSV in chunks. Use this for passes that must see every row of datasets
+    larger than ``max_analysis_rows``.
+    """
+    config = config or PerformanceConfig()
+    batch_rows = batch_rows or config.chunk_size
+
+    columnar_path = resolve_columnar_copy(data_path)
+    if columnar_path is not None:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(columnar_path, memory_map=True)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [c for c in columns if c in available]
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    separator = "\t" if Path(data_path).suffix.lower() in {".tsv", ".txt"} else ","
+    wanted = set(columns) if columns is not None else None
+    reader = pd.read_csv(
+        data_path,
+        sep=separator,
+        usecols=(lambda name: name in wanted) if wanted is not None else None,
+        chunksize=batch_rows,
+        **PANDAS_CSV_KWARGS,
+    )
+    for chunk in reader:
+        yield chunk
+
+
 def calculate_file_timeout(data_path: str, config: Optional[PerformanceConfig] = None) -> int:
     """
     Calculate appropriate timeout for processing a file based on its size.
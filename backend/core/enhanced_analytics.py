@@ -12,7 +12,6 @@ Provides:
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
-from scipy import stats
 from scipy.stats import pearsonr, spearmanr, chi2_contingency
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
@@ -21,6 +20,9 @@ import warnings
 import re
 import math
 
+from .column_stats import compute_column_stats
+from .correlation import correlation_kernel
+
 warnings.filterwarnings('ignore')
 
 
@@ -72,16 +74,18 @@ def _coerce_numeric(series: pd.Series) -> pd.Series:
 class EnhancedAnalytics:
     """Advanced analytics engine for comprehensive data analysis"""
 
-    def __init__(self, df: pd.DataFrame, schema_map: Optional[Dict] = None):
+    def __init__(self, df: pd.DataFrame, schema_map: Optional[Dict] = None, state_manager=None):
         """
         Initialize with dataframe and optional schema map
 
         Args:
             df: Input dataframe
             schema_map: Schema mapping for semantic understanding
+            state_manager: Optional state manager for leakage warnings
         """
         self.df = df.copy()
         self.schema_map = schema_map
+        self.state_manager = state_manager
         self.numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
         self.categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
 
@@ -95,72 +99,69 @@ class EnhancedAnalytics:
         if len(self.numeric_cols) < 2:
             return {"available": False, "reason": "Insufficient numeric columns"}
 
-        numeric_df = self.df[self.numeric_cols].fillna(self.df[self.numeric_cols].mean())
-
-        # Pearson correlation (linear relationships)
-        pearson_corr = numeric_df.corr(method='pearson')
-
-        # Spearman correlation (monotonic relationships)
-        spearman_corr = numeric_df.corr(method='spearman')
+        # Pearson (linear) and Spearman (monotonic) on mean-filled values;
+        # n per pair is pairwise-complete on the raw columns.
+        kernel = correlation_kernel(self.df, self.numeric_cols, fill="mean", spearman=True)
+        pearson_corr = kernel.frame("pearson")
+        spearman_corr = kernel.frame("spearman")
+        strength = kernel.strength("max")
 
         # Find strong correlations and potential leakage
         strong_correlations = []
         suspicious_leakage = []
         correlation_ci = []
-        
-        for i in range(len(pearson_corr.columns)):
-            for j in range(i + 1, len(pearson_corr.columns)):
-                col1, col2 = pearson_corr.columns[i], pearson_corr.columns[j]
-                pearson_val = pearson_corr.iloc[i, j]
-                spearman_val = spearman_corr.iloc[i, j]
-                
-                max_corr = max(abs(pearson_val), abs(spearman_val))
-
-                # LEAKAGE CHECK: Perfect or near-perfect correlation (r > 0.99)
-                # This usually indicates one variable is derived from the other (e.g. income -> reward_points)
-                if max_corr > 0.99:
-                    suspicious_leakage.append(f"{col1} ↔ {col2} (r={max_corr:.4f})")
-                    # Downgrade reliability context in metadata if state manager exists
-                    if self.state_manager:
-                        self.state_manager.add_warning(
-                            "DATA_LEAKAGE_POSSIBLE",
-                            f"Likely data leakage detected: {col1} and {col2} are perfectly correlated.",
-                        )
 
-                # Consider correlation strong if |r| > 0.5
-                if max_corr > 0.5:
-                    n = int(self.df[[col1, col2]].dropna().shape[0])
-                    ci_low = None
-                    ci_high = None
-                    if n > 3 and abs(pearson_val) < 1:
-                        z = np.arctanh(float(pearson_val))
-                        se = 1.0 / np.sqrt(n - 3)
-                        z_low = z - 1.96 * se
-                        z_high = z + 1.96 * se
-                        ci_low = float(np.tanh(z_low))
-                        ci_high = float(np.tanh(z_high))
-                    correlation_ci.append(
-                        {
-                            "feature1": col1,
-                            "feature2": col2,
-                            "pearson": float(pearson_val),
-                            "ci_low": ci_low,
-                            "ci_high": ci_high,
-                            "n": n,
-                        }
-                    )
-                    strong_correlations.append({
-                        "feature1": col1,
-                        "feature2": col2,
-                        "pearson": float(pearson_val),
-                        "spearman": float(spearman_val),
-                        "pearson_ci_low": ci_low,
-                        "pearson_ci_high": ci_high,
-                        "n": n,
-                        "strength": self._correlation_strength(max_corr),
-                        "direction": "positive" if pearson_val > 0 else "negative",
-                        "is_leakage": max_corr > 0.99
-                    })
+        # LEAKAGE CHECK: Perfect or near-perfect correlation (r > 0.99)
+        # This usually indicates one variable is derived from the other (e.g. income -> reward_points)
+        for i, j in zip(*kernel.pairs(0.99, method="max", strict=True)):
+            col1, col2 = kernel.columns[i], kernel.columns[j]
+            suspicious_leakage.append(f"{col1} ↔ {col2} (r={strength[i, j]:.4f})")
+            # Downgrade reliability context in metadata if state manager exists
+            if self.state_manager:
+                self.state_manager.add_warning(
+                    "DATA_LEAKAGE_POSSIBLE",
+                    f"Likely data leakage detected: {col1} and {col2} are perfectly correlated.",
+                )
+
+        # Consider correlation strong if |r| > 0.5
+        rows, cols = kernel.pairs(0.5, method="max", strict=True)
+        pearson_vals = kernel.pearson[rows, cols]
+        counts = kernel.counts[rows, cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            half_width = 1.96 / np.sqrt(counts - 3)
+            z = np.arctanh(pearson_vals)
+        has_ci = (counts > 3) & (np.abs(pearson_vals) < 1)
+        ci_lows = np.tanh(z - half_width)
+        ci_highs = np.tanh(z + half_width)
+        for k, (i, j) in enumerate(zip(rows, cols)):
+            col1, col2 = kernel.columns[i], kernel.columns[j]
+            pearson_val = float(pearson_vals[k])
+            n = int(counts[k])
+            max_corr = float(strength[i, j])
+            ci_low = float(ci_lows[k]) if has_ci[k] else None
+            ci_high = float(ci_highs[k]) if has_ci[k] else None
+            correlation_ci.append(
+                {
+                    "feature1": col1,
+                    "feature2": col2,
+                    "pearson": pearson_val,
+                    "ci_low": ci_low,
+                    "ci_high": ci_high,
+                    "n": n,
+                }
+            )
+            strong_correlations.append({
+                "feature1": col1,
+                "feature2": col2,
+                "pearson": pearson_val,
+                "spearman": float(kernel.spearman[i, j]),
+                "pearson_ci_low": ci_low,
+                "pearson_ci_high": ci_high,
+                "n": n,
+                "strength": self._correlation_strength(max_corr),
+                "direction": "positive" if pearson_val > 0 else "negative",
+                "is_leakage": max_corr > 0.99
+            })
 
         # Sort by strength
         strong_correlations.sort(key=lambda x: max(abs(x['pearson']), abs(x['spearman'])), reverse=True)
@@ -187,63 +188,43 @@ class EnhancedAnalytics:
         if not self.numeric_cols:
             return {"available": False, "reason": "No numeric columns"}
 
+        # Moments, quartiles and outlier counts for all columns in one pass;
+        # Shapiro-Wilk (sampled above 5000 rows) runs per column in parallel.
+        column_stats = compute_column_stats(self.df, self.numeric_cols, normality=True)
         distributions = {}
 
         for col in self.numeric_cols:
-            data = self.df[col].dropna()
-
-            if len(data) < 3:
+            col_stats = column_stats.column(col)
+            n = col_stats["count"]
+            if n < 3:
                 continue
 
-            # Basic statistics
-            mean_val = float(data.mean())
-            median_val = float(data.median())
-            std_val = float(data.std())
-
-            # Distribution shape
-            skewness = float(stats.skew(data))
-            kurtosis = float(stats.kurtosis(data))
-
-            # Normality test (Shapiro-Wilk for small samples, Anderson for large)
-            if len(data) <= 5000:
-                stat, p_value = stats.shapiro(data)
-                normality_test = "shapiro"
-            else:
-                # Use sample for large datasets
-                sample = data.sample(min(5000, len(data)), random_state=42)
-                stat, p_value = stats.shapiro(sample)
-                normality_test = "shapiro_sampled"
-
+            skewness = col_stats["skew"]
+            kurtosis = col_stats["kurtosis"]
+            _, p_value, _ = column_stats.normality.get(col, (np.nan, np.nan, "shapiro"))
             is_normal = p_value > 0.05
 
             # Distribution type
             dist_type = self._classify_distribution(skewness, kurtosis, is_normal)
 
-            # Quartiles for box plot
-            q1 = float(data.quantile(0.25))
-            q3 = float(data.quantile(0.75))
-            iqr = q3 - q1
-
-            # Outlier bounds
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
-            outlier_count = int(((data < lower_bound) | (data > upper_bound)).sum())
+            q1, median_val, q3 = col_stats["q25"], col_stats["q50"], col_stats["q75"]
+            outlier_count = col_stats["outlier_count"]
 
             distributions[col] = {
-                "mean": mean_val,
+                "mean": col_stats["mean"],
                 "median": median_val,
-                "std": std_val,
-                "min": float(data.min()),
-                "max": float(data.max()),
+                "std": col_stats["std"],
+                "min": col_stats["min"],
+                "max": col_stats["max"],
                 "skewness": skewness,
                 "kurtosis": kurtosis,
                 "is_normal": is_normal,
                 "normality_p_value": float(p_value),
                 "distribution_type": dist_type,
                 "quartiles": {"q1": q1, "q2": median_val, "q3": q3},
-                "iqr": iqr,
+                "iqr": q3 - q1,
                 "outlier_count": outlier_count,
-                "outlier_percentage": float(outlier_count / len(data) * 100)
+                "outlier_percentage": float(outlier_count / n * 100)
             }
 
         return {
@@ -267,22 +248,16 @@ class EnhancedAnalytics:
 
         redundant_pairs = []
         if len(self.numeric_cols) >= 2:
-            numeric_df = self.df[self.numeric_cols].fillna(self.df[self.numeric_cols].mean())
-            corr = numeric_df.corr(method="pearson")
-            cols = list(corr.columns)
-            for i in range(len(cols)):
-                for j in range(i + 1, len(cols)):
-                    value = corr.iloc[i, j]
-                    if not _is_number(value):
-                        continue
-                    if abs(float(value)) >= 0.98:
-                        redundant_pairs.append(
-                            {
-                                "feature1": cols[i],
-                                "feature2": cols[j],
-                                "correlation": float(value),
-                            }
-                        )
+            # Same cached kernel as compute_correlation_matrix
+            kernel = correlation_kernel(self.df, self.numeric_cols, fill="mean")
+            redundant_pairs = [
+                {
+                    "feature1": kernel.columns[i],
+                    "feature2": kernel.columns[j],
+                    "correlation": float(kernel.pearson[i, j]),
+                }
+                for i, j in zip(*kernel.pairs(0.98))
+            ]
             redundant_pairs.sort(key=lambda x: abs(x["correlation"]), reverse=True)
 
         return {
@@ -468,10 +443,11 @@ class EnhancedAnalytics:
 
         # Consistency checks (coefficient of variation for numeric)
         consistency_scores = {}
+        column_stats = compute_column_stats(self.df, self.numeric_cols)
         for col in self.numeric_cols:
-            data = self.df[col].dropna()
-            if len(data) > 0 and data.mean() != 0:
-                cv = float(data.std() / data.mean())
+            col_stats = column_stats.column(col)
+            if col_stats["count"] > 0 and col_stats["mean"] != 0:
+                cv = float(col_stats["std"] / col_stats["mean"])
                 consistency_scores[col] = {
                     "coefficient_of_variation": cv,
                     "is_consistent": cv < 1.0  # Low CV means more consistent
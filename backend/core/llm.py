@@ -4,13 +4,28 @@ LLM Client with retry and backoff for ACE V4.
 Features:
 - Retry with exponential backoff for transient failures
 - Configurable retry attempts and delays
+- Persistent response cache shared by every call site (core.llm_cache)
+- Concurrency limit and token-bucket rate limit on provider calls, shared by
+  every process through Redis when it is configured (core.llm_quota), per
+  process otherwise
+- Coalescing of identical in-flight prompts
+- Async wrappers and an ``llm_map`` helper to fan out independent calls
 - Graceful fallback to mock responses
 """
 
+import asyncio
 import json
+import threading
 import time
 import os
-from typing import Generator, Optional
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Union
+
+from core.llm_cache import LLMCache, get_llm_cache, should_cache
+from core.llm_quota import RedisSemaphore, RedisTokenBucket, shared_limits_client
 
 try:
     from google import genai
@@ -41,6 +56,11 @@ INITIAL_BACKOFF_SECONDS = float(os.getenv("LLM_INITIAL_BACKOFF", "1.0"))
 MAX_BACKOFF_SECONDS = float(os.getenv("LLM_MAX_BACKOFF", "30.0"))
 BACKOFF_MULTIPLIER = 2.0
 
+# Provider quota: simultaneous requests and requests per minute (0 = no rate limit).
+# Deployment-wide when Redis is available (see core.llm_quota), else per process.
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "300"))
+
 # Retryable error patterns
 RETRYABLE_ERRORS = [
     "rate limit",
@@ -99,7 +119,250 @@ def _retry_with_backoff(func, *args, **kwargs):
     raise last_error
 
 
-def call_llm_json(system_prompt: str, user_prompt: str, model_name: str = MODEL_NAME) -> dict:
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+_limits: Optional[SimpleNamespace] = None
+_limits_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+_limiter_stats = {"calls": 0, "coalesced": 0, "throttled_seconds": 0.0}
+_map_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _process_limits() -> SimpleNamespace:
+    return SimpleNamespace(
+        scope="process",
+        slots=threading.BoundedSemaphore(MAX_CONCURRENCY),
+        bucket=TokenBucket(REQUESTS_PER_MINUTE / 60.0, MAX_CONCURRENCY),
+    )
+
+
+def _get_limits() -> SimpleNamespace:
+    """The concurrency slots and rate bucket, built on first use: in Redis when reachable, else in process."""
+    global _limits
+    with _limits_lock:
+        if _limits is None:
+            shared = shared_limits_client()
+            if shared is None:
+                _limits = _process_limits()
+            else:
+                _limits = SimpleNamespace(
+                    scope="redis",
+                    slots=RedisSemaphore(shared, MAX_CONCURRENCY),
+                    bucket=RedisTokenBucket(shared, REQUESTS_PER_MINUTE / 60.0, MAX_CONCURRENCY),
+                )
+        return _limits
+
+
+def _fall_back_to_process_limits(exc: Exception) -> SimpleNamespace:
+    """Redis failed mid-run: keep calling the provider under per-process limits rather than failing."""
+    global _limits
+    print(f"[LLM] Shared rate limits failed ({exc}); limits now apply per process")
+    with _limits_lock:
+        if _limits is None or _limits.scope != "process":
+            _limits = _process_limits()
+        return _limits
+
+
+def configure_limits(max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None) -> None:
+    """Replace the concurrency and rate limits (defaults: current settings); rebuilt on the next call."""
+    global MAX_CONCURRENCY, REQUESTS_PER_MINUTE, _limits
+    if max_concurrency is not None:
+        MAX_CONCURRENCY = max(1, int(max_concurrency))
+    if requests_per_minute is not None:
+        REQUESTS_PER_MINUTE = float(requests_per_minute)
+    with _limits_lock:
+        _limits = None
+
+
+def limiter_stats() -> Dict[str, Any]:
+    """
+    Limits in force and where they are enforced ("redis" or "process"), plus
+    this process's provider calls, calls coalesced onto an identical in-flight
+    one, and time spent throttled.
+    """
+    return {
+        "max_concurrency": MAX_CONCURRENCY,
+        "requests_per_minute": REQUESTS_PER_MINUTE,
+        "scope": _get_limits().scope,
+        "in_flight": len(_inflight),
+        **_limiter_stats,
+    }
+
+
+def _take_rate_token() -> float:
+    limits = _get_limits()
+    try:
+        return limits.bucket.acquire()
+    except Exception as exc:
+        if limits.scope == "process":
+            raise
+        return _fall_back_to_process_limits(exc).bucket.acquire()
+
+
+def _limited(func: Callable[[], str]) -> str:
+    """Run one provider request inside the rate limit and a concurrency slot."""
+    waited = _take_rate_token()
+    limits = _get_limits()
+    try:
+        limits.slots.acquire()
+    except Exception as exc:
+        if limits.scope == "process":
+            raise
+        limits = _fall_back_to_process_limits(exc)
+        limits.slots.acquire()
+    try:
+        with _inflight_lock:
+            _limiter_stats["calls"] += 1
+            _limiter_stats["throttled_seconds"] += waited
+        return func()
+    finally:
+        limits.slots.release()
+
+
+def _coalesced(key: str, fetch: Callable[[], str]) -> str:
+    """Share one fetch between concurrent callers asking for the same key."""
+    with _inflight_lock:
+        pending = _inflight.get(key)
+        owner = pending is None
+        if owner:
+            pending = _inflight[key] = Future()
+        else:
+            _limiter_stats["coalesced"] += 1
+    if not owner:
+        return pending.result()
+    try:
+        text = fetch()
+    except BaseException as exc:
+        pending.set_exception(exc)
+        raise
+    else:
+        pending.set_result(text)
+        return text
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+class OfflineClient:
+    """
+    Stand-in for genai.Client in offline tests.
+
+    ``responder`` maps a prompt (and the call's config) to the response text;
+    every request is recorded in ``calls``.
+    """
+
+    def __init__(self, responder: Callable[[str, Dict], str]):
+        self.responder = responder
+        self.calls = []
+        self.models = self
+
+    def generate_content(self, model: str, contents: str, config: Optional[Dict] = None):
+        self.calls.append({"model": model, "contents": contents, "config": config})
+        return SimpleNamespace(text=self.responder(contents, config or {}))
+
+
+def set_client(new_client):
+    """Swap the module's Gemini client (e.g. for an OfflineClient); returns the previous one."""
+    global client
+    previous, client = client, new_client
+    return previous
+
+
+def _cache_get(store: Optional[LLMCache], key: str) -> Optional[str]:
+    """Cached response text, treating a store that cannot be read as a miss."""
+    if store is None:
+        return None
+    try:
+        return store.get(key)
+    except (sqlite3.Error, OSError) as exc:
+        print(f"[LLM] Response cache read failed, calling the provider: {exc}")
+        return None
+
+
+def _cache_put(store: Optional[LLMCache], key: str, text: str, model: str) -> None:
+    """Store a response; a store that cannot be written is skipped, the response still returns."""
+    if store is None:
+        return
+    try:
+        store.put(key, text, model=model)
+    except (sqlite3.Error, OSError) as exc:
+        print(f"[LLM] Response cache write skipped: {exc}")
+
+
+def generate(
+    prompt: str,
+    config: Dict,
+    model_name: str = MODEL_NAME,
+    parse: Optional[Callable[[str], object]] = None,
+    cache: Optional[bool] = None,
+):
+    """
+    One generate_content round-trip with retries, served from the response cache when possible.
+
+    ``parse`` turns the response text into the caller's result; a response it
+    rejects raises and is never cached. A cache that cannot be read or written
+    (locked, corrupt, disk full) is bypassed rather than failing the call.
+    Every attempt goes through the rate and concurrency limits, and a prompt identical to one
+    already in flight waits for that response instead of sending its own
+    (unless ``cache=False`` asks for a fresh sample).
+    """
+    key = LLMCache.key(model_name, prompt, config)
+    store = get_llm_cache() if should_cache(config.get("temperature"), cache) else None
+    text = _cache_get(store, key)
+    if text is not None:
+        return parse(text) if parse else text
+
+    def _make_call():
+        response = client.models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config=config or None
+        )
+        return response.text
+
+    def _fetch():
+        return _retry_with_backoff(_limited, _make_call)
+
+    text = _fetch() if cache is False else _coalesced(key, _fetch)
+    result = parse(text) if parse else text
+    if text:
+        _cache_put(store, key, text, model_name)
+    return result
+
+
+def call_llm_json(
+    system_prompt: str,
+    user_prompt: str,
+    model_name: str = MODEL_NAME,
+    cache: Optional[bool] = None,
+) -> dict:
     """
     Call Gemini and return parsed JSON with retry support.
 
@@ -107,6 +370,7 @@ def call_llm_json(system_prompt: str, user_prompt: str, model_name: str = MODEL_
         system_prompt: System context/instructions
         user_prompt: User query
         model_name: Model to use
+        cache: Force the response cache on/off (default: temperature policy)
 
     Returns:
         Parsed JSON response as dict
@@ -133,14 +397,8 @@ def call_llm_json(system_prompt: str, user_prompt: str, model_name: str = MODEL_
         "max_output_tokens": 8192,
     }
 
-    def _make_call():
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config=config
-        )
-
-        text = response.text.strip()
+    def _parse(text):
+        text = text.strip()
 
         # allow the model to optionally wrap in ```json fences
         if text.startswith("```"):
@@ -151,14 +409,14 @@ def call_llm_json(system_prompt: str, user_prompt: str, model_name: str = MODEL_
         return json.loads(text)
 
     try:
-        return _retry_with_backoff(_make_call)
+        return generate(prompt, config, model_name=model_name, parse=_parse, cache=cache)
     except json.JSONDecodeError as e:
         raise ValueError(f"Gemini returned invalid JSON: {e}")
     except Exception as e:
         raise ValueError(f"Gemini API error after {MAX_RETRIES} retries: {e}")
 
 
-def ask_gemini(prompt: str, thinking_level: str = "LOW", json_mode: bool = False) -> str:
+def ask_gemini(prompt: str, thinking_level: str = "LOW", json_mode: bool = False, cache: Optional[bool] = None) -> str:
     """
     Simple helper for text responses with retry support.
 
@@ -166,6 +424,7 @@ def ask_gemini(prompt: str, thinking_level: str = "LOW", json_mode: bool = False
         prompt: The prompt to send
         thinking_level: LOW or HIGH (ignored for flash model)
         json_mode: If True, requests JSON response
+        cache: Force the response cache on/off (default: temperature policy)
 
     Returns:
         Response text from the model
@@ -180,16 +439,8 @@ def ask_gemini(prompt: str, thinking_level: str = "LOW", json_mode: bool = False
     if json_mode:
         config["response_mime_type"] = "application/json"
 
-    def _make_call():
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-            config=config or None
-        )
-        return response.text
-
     try:
-        return _retry_with_backoff(_make_call)
+        return generate(prompt, config, cache=cache)
     except Exception as e:
         # Graceful fallback for non-critical text calls
         print(f"[LLM] Warning: ask_gemini failed after retries: {e}")
@@ -244,6 +495,7 @@ def call_gemini(
     temperature: float = 0.3,
     max_tokens: int = 4096,
     parse_json: bool = False,
+    cache: Optional[bool] = None,
 ) -> str | dict:
     """
     Flexible Gemini API call for insight generation.
@@ -253,6 +505,8 @@ def call_gemini(
         temperature: Creativity level (0.0-1.0)
         max_tokens: Maximum output tokens
         parse_json: If True, parse response as JSON
+        cache: Force the response cache on/off; by default calls above
+            ACE_LLM_CACHE_MAX_TEMPERATURE are not cached
         
     Returns:
         Response text or parsed dict if parse_json=True
@@ -268,14 +522,8 @@ def call_gemini(
     if parse_json:
         config["response_mime_type"] = "application/json"
     
-    def _make_call():
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-            config=config,
-        )
-        
-        text = response.text.strip()
+    def _parse(text):
+        text = text.strip()
         
         # Clean markdown code fences if present
         if text.startswith("```"):
@@ -290,7 +538,7 @@ def call_gemini(
         return text
     
     try:
-        return _retry_with_backoff(_make_call)
+        return generate(prompt, config, parse=_parse, cache=cache)
     except json.JSONDecodeError as e:
         if parse_json:
             print(f"[LLM] JSON parse error: {e}")
@@ -303,6 +551,51 @@ def call_gemini(
         return f"ERROR: {e}"
 
 
+async def acall_gemini(prompt: str, **kwargs) -> str | dict:
+    """Async ``call_gemini``: runs on the LLM worker pool, under the same limits."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_worker_pool(), partial(call_gemini, prompt, **kwargs))
+
+
+async def allm_map(prompts: Sequence[Union[str, Dict[str, Any]]], **defaults) -> List[str | dict]:
+    """Async ``llm_map``."""
+    calls = [dict(defaults, prompt=item) if isinstance(item, str) else {**defaults, **item} for item in prompts]
+    return await asyncio.gather(*(acall_gemini(**call) for call in calls))
+
+
+def llm_map(prompts: Sequence[Union[str, Dict[str, Any]]], **defaults) -> List[str | dict]:
+    """
+    Issue independent ``call_gemini`` calls all at once; results come back in input order.
+
+    Args:
+        prompts: Prompt strings, or dicts of call_gemini arguments (including
+            ``prompt``) for calls that need their own settings
+        **defaults: call_gemini arguments shared by every call
+
+    Returns:
+        One result per prompt, as call_gemini would return it (failures come
+        back as call_gemini's error values rather than raising)
+    """
+    if not prompts:
+        return []
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(allm_map(prompts, **defaults))
+    # Called from inside an event loop (e.g. an API handler): run the batch on its own loop
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(asyncio.run, allm_map(prompts, **defaults)).result()
+
+
+def _worker_pool() -> ThreadPoolExecutor:
+    # Sized above the concurrency limit so coalesced and throttled waits don't starve real calls
+    global _map_pool
+    with _inflight_lock:
+        if _map_pool is None:
+            _map_pool = ThreadPoolExecutor(max_workers=max(32, MAX_CONCURRENCY * 2), thread_name_prefix="llm")
+        return _map_pool
+
+
 def call_gemini_stream(
     prompt: str,
     temperature: float = 0.3,
@@ -330,6 +623,8 @@ def call_gemini_stream(
     }
 
     try:
+        # Streams count against the request quota but don't hold a concurrency slot
+        _take_rate_token()
         response = client.models.generate_content_stream(
             model=MODEL_NAME,
             contents=prompt,
@@ -0,0 +1,205 @@
+"""
+Persistent, content-addressed cache of LLM responses.
+
+Responses are stored in SQLite (shared by the API, the worker and the agent
+subprocesses) under a hash of model, prompt, temperature, max tokens and JSON
+mode. Entries expire after a TTL and the least recently used ones are evicted
+once the store grows past its size bound. Hit/miss counters are persisted in
+the same database so they cover every process.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+LLM_CACHE_ENV = "ACE_LLM_CACHE"
+LLM_CACHE_PATH_ENV = "ACE_LLM_CACHE_PATH"
+LLM_CACHE_TTL_ENV = "ACE_LLM_CACHE_TTL_HOURS"
+LLM_CACHE_SIZE_ENV = "ACE_LLM_CACHE_MB"
+# Calls with a higher temperature are treated as creative and not cached
+LLM_CACHE_MAX_TEMPERATURE_ENV = "ACE_LLM_CACHE_MAX_TEMPERATURE"
+
+DEFAULT_CACHE_PATH = Path("data") / "cache" / "llm_cache.db"
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_SIZE_MB = 256
+DEFAULT_MAX_TEMPERATURE = 1.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def llm_cache_enabled() -> bool:
+    return os.getenv(LLM_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def should_cache(temperature: Optional[float], cache: Optional[bool] = None) -> bool:
+    """
+    Whether a call is cached: ``cache`` forces it either way, otherwise calls
+    up to ACE_LLM_CACHE_MAX_TEMPERATURE are (model-default temperature counts
+    as cacheable).
+    """
+    if cache is not None:
+        return cache and llm_cache_enabled()
+    if not llm_cache_enabled():
+        return False
+    return temperature is None or temperature <= _env_float(LLM_CACHE_MAX_TEMPERATURE_ENV, DEFAULT_MAX_TEMPERATURE)
+
+
+class LLMCache:
+    """SQLite-backed response store with TTL expiry and size-bounded LRU eviction."""
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.path = Path(path or os.getenv(LLM_CACHE_PATH_ENV) or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_float(LLM_CACHE_TTL_ENV, DEFAULT_TTL_HOURS) * 3600
+        self.max_bytes = max_bytes if max_bytes is not None else int(_env_float(LLM_CACHE_SIZE_ENV, DEFAULT_SIZE_MB) * 1024 * 1024)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._session() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextmanager
+    def _session(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(model: str, prompt: str, config: Optional[Dict[str, Any]] = None) -> str:
+        config = config or {}
+        payload = {
+            "model": model,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "temperature": config.get("temperature"),
+            "max_tokens": config.get("max_output_tokens"),
+            "json": config.get("response_mime_type") == "application/json",
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response text, or None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock, self._session() as conn:
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count(conn, "misses")
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count(conn, "hits")
+            return row[0]
+
+    def put(self, key: str, response: str, model: Optional[str] = None) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._session() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._count(conn, "writes")
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        expired = conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+        if expired or evicted:
+            self._count(conn, "evictions", expired + evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock, self._session() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "writes": counters.get("writes", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock, self._session() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM counters")
+
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache, or None when caching is disabled or the store cannot be opened."""
+    global _default_cache
+    if not llm_cache_enabled():
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = LLMCache()
+            except (sqlite3.Error, OSError) as exc:
+                print(f"[LLM] Response cache unavailable: {exc}")
+                return None
+        return _default_cache
+
+
+def set_llm_cache(cache: Optional[LLMCache]) -> Optional[LLMCache]:
+    """Replace the process-wide cache (e.g. with a temporary one in tests); returns the previous one."""
+    global _default_cache
+    with _default_lock:
+        previous, _default_cache = _default_cache, cache
+    return previous
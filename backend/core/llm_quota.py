@@ -0,0 +1,156 @@
+"""
+LLM provider quota shared across processes.
+
+The concurrency and requests-per-minute limits in core.llm protect a quota
+that belongs to the API key, while LLM calls come from many processes: every
+agent step runs in its own process, DAG steps run side by side, and the worker
+runs several jobs at once. When Redis is configured (LLM_LIMITS_REDIS_URL, or
+REDIS_URL as used by the job queue) the token bucket and the concurrency slots
+live there, so the limits hold for the whole deployment. Without Redis they
+are per process (see core.llm.TokenBucket).
+
+Both structures are updated by Lua scripts, so each acquire is atomic, and they
+use the Redis server clock, so hosts with skewed clocks share one bucket.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+SHARED_LIMITS_ENV = "LLM_SHARED_LIMITS"
+LIMITS_REDIS_URL_ENV = "LLM_LIMITS_REDIS_URL"
+KEY_PREFIX = "ace:llm:quota"
+# A slot whose holder died is reclaimed after this long (well above one provider call)
+SLOT_LEASE_SECONDS = 300
+# How often a caller waiting for a free slot checks again
+SLOT_POLL_SECONDS = 0.05
+
+# Refill by elapsed server time, take one token if available, otherwise return the wait
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+# Drop expired leases, then take a slot if fewer than the limit are held
+_ACQUIRE_SLOT_LUA = """
+local limit = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < limit then
+  redis.call('ZADD', KEYS[1], now + lease, ARGV[3])
+  redis.call('EXPIRE', KEYS[1], math.ceil(lease) + 60)
+  return 1
+end
+return 0
+"""
+
+
+def shared_limits_client():
+    """Redis client for the shared limits, or None when they are disabled or Redis is unreachable."""
+    if os.getenv(SHARED_LIMITS_ENV, "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    url = os.getenv(LIMITS_REDIS_URL_ENV) or os.getenv("REDIS_URL")
+    if not url:
+        return None
+    try:
+        import redis
+
+        client = redis.from_url(url, decode_responses=True, socket_connect_timeout=2)
+        client.ping()
+        return client
+    except Exception as exc:
+        print(f"[LLM] Shared rate limits unavailable ({exc}); limits apply per process")
+        return None
+
+
+class RedisTokenBucket:
+    """Token bucket stored in Redis: ``rate`` tokens per second, bursts of up to ``capacity``."""
+
+    def __init__(self, client, rate: float, capacity: float, name: str = "default"):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.key = f"{KEY_PREFIX}:bucket:{name}"
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            delay = float(self._script(keys=[self.key], args=[self.rate, self.capacity]))
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class RedisSemaphore:
+    """
+    Counting semaphore stored in Redis, usable as a context manager.
+
+    Holders are leases in a sorted set scored by expiry, so a slot held by a
+    process that died is freed after SLOT_LEASE_SECONDS.
+    """
+
+    def __init__(self, client, limit: int, name: str = "default", lease_seconds: float = SLOT_LEASE_SECONDS):
+        self.limit = max(1, int(limit))
+        self.lease_seconds = lease_seconds
+        self.key = f"{KEY_PREFIX}:slots:{name}"
+        self._client = client
+        self._script = client.register_script(_ACQUIRE_SLOT_LUA)
+        self._held = threading.local()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        token = uuid.uuid4().hex
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not int(self._script(keys=[self.key], args=[self.limit, self.lease_seconds, token])):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(SLOT_POLL_SECONDS)
+        self._tokens().append(token)
+        return True
+
+    def release(self) -> None:
+        tokens = self._tokens()
+        if not tokens:
+            return
+        token = tokens.pop()
+        try:
+            self._client.zrem(self.key, token)
+        except Exception as exc:
+            # The lease still expires on its own
+            print(f"[LLM] Could not release shared LLM slot: {exc}")
+
+    def _tokens(self):
+        if not hasattr(self._held, "tokens"):
+            self._held.tokens = []
+        return self._held.tokens
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
@@ -6,7 +6,10 @@ from 60s to ~8s on cache misses.
 """
 
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+import atexit
 import multiprocessing as mp
+import sys
 import numpy as np
 import pandas as pd
 from sklearn.cluster import KMeans, MiniBatchKMeans
@@ -42,23 +45,80 @@ def get_optimal_workers() -> int:
         return workers
 
 
+# Pool kept alive across calls so each K sweep does not pay process start-up again
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool, replacing it if the size changed or a worker died."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != max_workers or getattr(_POOL, "_broken", False):
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context())
+        _POOL_WORKERS = max_workers
+    return _POOL
+
+
+def _pool_is_forked(pool: ProcessPoolExecutor) -> bool:
+    return pool._mp_context.get_start_method() == "fork"
+
+
+def shutdown_pool() -> None:
+    """Stop the persistent clustering pool (also run at interpreter exit)."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    _POOL = None
+    _POOL_WORKERS = 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _attach_shared(name: str, forked: bool) -> shared_memory.SharedMemory:
+    """
+    Attach to the parent's block without letting this process's tracker own it.
+
+    Forked workers share the parent's resource tracker, where attaching only
+    re-adds the parent's own registration; unregistering there would drop it,
+    so the parent's unlink warns and a crashed parent would leak the block.
+    Spawned and forkserver workers have their own tracker, which must forget
+    the block or it would unlink it when the worker exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if not forked:
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
 def _train_single_kmeans(args: Tuple) -> Dict[str, Any]:
     """
     Worker function for parallel K-Means training.
     
-    Must be a top-level function for pickling by ProcessPoolExecutor.
+    Must be a top-level function for pickling by ProcessPoolExecutor. The
+    scaled matrix is read from shared memory, so only its name travels with
+    the task, and only the centroids come back - the parent assigns labels
+    for the winning k.
     
     Args:
-        args: Tuple of (k, df_array, feature_names, random_state, fast_mode)
+        args: Tuple of (k, shm_name, shape, dtype, random_state, fast_mode, forked)
         
     Returns:
-        Dict with k, score, labels, and error (if any)
+        Dict with k, score, centroids, inertia and error (if any)
     """
-    k, df_array, feature_names, random_state, fast_mode = args
+    k, shm_name, shape, dtype, random_state, fast_mode, forked = args
     
+    shm = None
     try:
-        # Reconstruct DataFrame from numpy array
-        df_scaled = pd.DataFrame(df_array, columns=feature_names)
+        shm = _attach_shared(shm_name, forked)
+        data = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
         
         if fast_mode:
             # Fast mode: MiniBatchKMeans
@@ -69,16 +129,15 @@ def _train_single_kmeans(args: Tuple) -> Dict[str, Any]:
                 n_init="auto",
                 max_iter=100
             )
-            model.fit(df_scaled)
-            labels_full = model.predict(df_scaled)
+            model.fit(data)
             
             # Sample for silhouette (expensive O(n²) operation)
-            if len(df_scaled) > 20000:
-                sil_subset = df_scaled.sample(n=20000, random_state=random_state)
-                sil_labels = model.predict(sil_subset)
+            if len(data) > 20000:
+                rng = np.random.default_rng(random_state)
+                sil_subset = data[np.sort(rng.choice(len(data), size=20000, replace=False))]
             else:
-                sil_subset = df_scaled
-                sil_labels = labels_full
+                sil_subset = data
+            sil_labels = model.predict(sil_subset)
             
             # Calculate silhouette score
             if len(set(sil_labels)) > 1:
@@ -94,27 +153,26 @@ def _train_single_kmeans(args: Tuple) -> Dict[str, Any]:
                 n_init=3,  # Reduced from 10 for parallel efficiency
                 max_iter=300
             )
-            labels_full = model.fit_predict(df_scaled)
+            labels_full = model.fit_predict(data)
             
             # Check if we got valid clusters
             if len(set(labels_full)) < 2:
                 return {
                     "k": k,
                     "score": -1.0,
-                    "labels": None,
                     "centroids": None,
                     "error": "Insufficient clusters formed"
                 }
             
             # Calculate silhouette score
-            score = silhouette_score(df_scaled, labels_full)
+            score = silhouette_score(data, labels_full)
+            del labels_full
         
         # Return results
         return {
             "k": k,
             "score": float(score),
-            "labels": labels_full.tolist(),
-            "centroids": model.cluster_centers_.tolist(),
+            "centroids": model.cluster_centers_,
             "inertia": float(model.inertia_),
             "error": None
         }
@@ -124,10 +182,24 @@ def _train_single_kmeans(args: Tuple) -> Dict[str, Any]:
         return {
             "k": k,
             "score": -1.0,
-            "labels": None,
             "centroids": None,
             "error": str(e)
         }
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+def _assign_labels(data: np.ndarray, centroids: np.ndarray, chunk_rows: int = 65536) -> np.ndarray:
+    """Nearest-centroid labels (what KMeans.predict returns), in bounded-memory chunks."""
+    labels = np.empty(len(data), dtype=np.int32)
+    centroid_sq = (centroids ** 2).sum(axis=1)
+    for start in range(0, len(data), chunk_rows):
+        block = data[start:start + chunk_rows]
+        # ||x - c||^2 up to the per-row constant ||x||^2
+        distances = centroid_sq - 2.0 * block @ centroids.T
+        labels[start:start + chunk_rows] = distances.argmin(axis=1)
+    return labels
 
 
 def run_parallel_clustering(
@@ -140,6 +212,10 @@ def run_parallel_clustering(
     """
     Run K-Means clustering in parallel for multiple K values.
     
+    The scaled matrix is published once through shared memory and the K
+    sweep runs on a persistent process pool, so memory stays flat as the
+    number of K values grows.
+    
     Args:
         df_scaled: Normalized dataframe ready for clustering
         min_k: Minimum number of clusters to test
@@ -148,7 +224,8 @@ def run_parallel_clustering(
         max_workers: Number of parallel workers (auto-detect if None)
         
     Returns:
-        Dict with best_k, best_score, best_labels, and all_results
+        Dict with best_k, best_score, best_labels, best_centroids and
+        all_results (per-K score, inertia and error only)
     """
     # Determine number of workers
     if max_workers is None:
@@ -168,24 +245,27 @@ def run_parallel_clustering(
             "error": "Insufficient samples"
         }
     
+    k_values = range(min_k, max_k + 1)
     logger.info(f"Running parallel clustering: K={min_k}-{max_k}, workers={max_workers}, fast_mode={fast_mode}")
     
-    # Prepare arguments for parallel execution
-    # Convert DataFrame to numpy array for pickling
-    df_array = df_scaled.values
-    feature_names = df_scaled.columns.tolist()
+    # Publish the matrix once; tasks carry only the block name
+    source = np.ascontiguousarray(df_scaled.to_numpy(dtype=np.float64))
     random_state = 42
-    
-    k_values = range(min_k, max_k + 1)
-    args_list = [
-        (k, df_array, feature_names, random_state, fast_mode)
-        for k in k_values
-    ]
-    
-    # Run parallel training
+    shm = shared_memory.SharedMemory(create=True, size=max(1, source.nbytes))
     results = []
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all jobs
+    try:
+        data = np.ndarray(source.shape, dtype=source.dtype, buffer=shm.buf)
+        data[:] = source
+        del source
+        
+        # Run parallel training
+        executor = _get_pool(max_workers)
+        forked = _pool_is_forked(executor)
+        args_list = [
+            (k, shm.name, data.shape, data.dtype.str, random_state, fast_mode, forked)
+            for k in k_values
+        ]
+        
         future_to_k = {
             executor.submit(_train_single_kmeans, args): args[0]
             for args in args_list
@@ -196,7 +276,6 @@ def run_parallel_clustering(
             k = future_to_k[future]
             try:
                 result = future.result(timeout=300)  # 5 min timeout per K
-                results.append(result)
                 
                 if result["error"]:
                     logger.warning(f"K={k}: {result['error']}")
@@ -205,43 +284,56 @@ def run_parallel_clustering(
                     
             except Exception as e:
                 logger.error(f"K={k} failed with exception: {e}")
-                results.append({
+                result = {
                     "k": k,
                     "score": -1.0,
-                    "labels": None,
                     "centroids": None,
                     "error": str(e)
-                })
-    
-    # Find best result
-    valid_results = [r for r in results if r["score"] > -1.0]
-    
-    if not valid_results:
-        logger.error("All clustering attempts failed")
-        return {
-            "best_k": 1,
-            "best_score": 0.0,
-            "best_labels": [0] * n_samples,
-            "all_results": results,
-            "error": "All clustering attempts failed"
-        }
-    
-    # Select best by silhouette score
-    best_result = max(valid_results, key=lambda x: x["score"])
+                }
+            results.append(result)
+        
+        # Find best result
+        valid_results = [r for r in results if r["score"] > -1.0]
+        
+        if not valid_results:
+            logger.error("All clustering attempts failed")
+            return {
+                "best_k": 1,
+                "best_score": 0.0,
+                "best_labels": [0] * n_samples,
+                "all_results": _summaries(results),
+                "error": "All clustering attempts failed"
+            }
+        
+        # Select best by silhouette score
+        best_result = max(valid_results, key=lambda x: x["score"])
+        best_centroids = np.asarray(best_result["centroids"])
+        best_labels = _assign_labels(data, best_centroids)
+    finally:
+        shm.close()
+        shm.unlink()
     
     logger.info(f"Best clustering: K={best_result['k']}, score={best_result['score']:.3f}")
     
     return {
         "best_k": best_result["k"],
         "best_score": best_result["score"],
-        "best_labels": best_result["labels"],
-        "best_centroids": best_result["centroids"],
+        "best_labels": best_labels.tolist(),
+        "best_centroids": best_centroids.tolist(),
         "best_inertia": best_result.get("inertia"),
-        "all_results": results,
+        "all_results": _summaries(results),
         "error": None
     }
 
 
+def _summaries(results) -> list:
+    """Per-K results without the centroid arrays."""
+    return sorted(
+        ({key: value for key, value in result.items() if key != "centroids"} for result in results),
+        key=lambda item: item["k"],
+    )
+
+
 def should_use_parallel(n_samples: int, n_features: int) -> bool:
     """
     Determine if parallel processing is worth the overhead.
@@ -23,6 +23,129 @@ PIPELINE_SEQUENCE = [
     "trust_evaluation",
 ]
 
+# Artifacts each step reads and writes (StateManager names; *_pending artifacts are
+# listed under the name the orchestrator promotes them to). The DAG scheduler turns
+# these into step dependencies, so keep them in sync when an agent starts reading
+# or writing something new.
+STEP_ARTIFACTS = {
+    "type_identifier": {
+        "reads": ["active_dataset", "analysis_intent", "data_profile"],
+        "writes": ["data_type", "data_type_identification", "dataset_classification", "data_profile"],
+    },
+    "scanner": {
+        "reads": ["active_dataset"],
+        "writes": ["schema_scan_output", "data_profile"],
+    },
+    "interpreter": {
+        "reads": ["schema_scan_output"],
+        "writes": ["schema_map"],
+    },
+    "validator": {
+        "reads": ["active_dataset", "data_type", "data_type_identification", "ingestion_meta", "run_config", "schema_map"],
+        "writes": ["validation_report", "data_validation_report"],
+    },
+    "overseer": {
+        "reads": ["active_dataset", "schema_map"],
+        "writes": ["overseer_output"],
+    },
+    "regression": {
+        "reads": ["active_dataset", "run_config", "schema_map"],
+        "writes": [
+            "regression_insights", "regression_status", "regression_skip_reason", "shap_explanations",
+            "onnx_export", "drift_report", "feature_governance_report", "baseline_metrics",
+            "model_fit_report", "collinearity_report", "leakage_report", "importance_report",
+            "regression_coefficients_report",
+        ],
+    },
+    "time_series": {
+        "reads": ["active_dataset", "run_config", "schema_map"],
+        "writes": ["time_series_analysis"],
+    },
+    "sentry": {
+        # overseer_output is only a fallback input and sentry has always run
+        # alongside overseer, so it is deliberately not declared here.
+        "reads": ["active_dataset", "schema_map"],
+        "writes": ["anomalies"],
+    },
+    "personas": {
+        "reads": ["overseer_output", "regression_insights", "schema_map", "shap_explanations"],
+        "writes": ["personas"],
+    },
+    "fabricator": {
+        "reads": ["personas", "schema_map"],
+        "writes": ["strategies"],
+    },
+    "raw_data_sampler": {
+        "reads": ["active_dataset", "anomalies", "data_profile"],
+        "writes": ["raw_samples"],
+    },
+    "deep_insight": {
+        "reads": [
+            "data_profile", "enhanced_analytics", "anomalies", "time_series_analysis",
+            "trust_object", "data_type", "schema_map", "data_validation_report",
+        ],
+        "writes": ["deep_insights"],
+    },
+    "dot_connector": {
+        "reads": ["deep_insights", "raw_samples"],
+        "writes": ["dot_connections"],
+    },
+    "hypothesis_engine": {
+        "reads": ["deep_insights", "dot_connections", "raw_samples"],
+        "writes": ["hypotheses"],
+    },
+    "so_what_deepener": {
+        "reads": ["deep_insights", "dot_connections", "hypotheses"],
+        "writes": ["deep_implications"],
+    },
+    "story_framer": {
+        "reads": ["deep_implications", "deep_insights", "dot_connections", "hypotheses", "raw_samples"],
+        "writes": ["story_narrative"],
+    },
+    "executive_narrator": {
+        "reads": [
+            "anomalies", "data_profile", "deep_implications", "deep_insights", "dot_connections",
+            "enhanced_analytics", "hypotheses", "story_narrative", "time_series_analysis", "trust_object",
+        ],
+        "writes": ["executive_narrative"],
+    },
+    "expositor": {
+        "reads": [
+            "active_dataset", "analysis_intent", "anomalies", "collinearity_report", "data_type",
+            "dataset_identity_card", "deep_insights", "drift_report", "executive_narrative",
+            "importance_report", "leakage_report", "model_fit_report", "onnx_export", "overseer_output",
+            "personas", "regression_coefficients_report", "regression_insights", "regression_status",
+            "schema_map", "schema_scan_output", "shap_explanations", "strategies", "validation_report",
+        ],
+        "writes": ["final_report", "enhanced_analytics", "report_charts", "technical_report"],
+    },
+    "trust_evaluation": {
+        "reads": ["data_profile", "validation_report", "final_report"],
+        "writes": ["trust_object"],
+    },
+}
+
+# Read by the orchestrator itself before launching any step (eligibility,
+# validation guard, data type allowlist).
+STEP_GUARD_READS = ["analysis_intent", "validation_report", "data_type_identification"]
+
+# run_config keys each step reads (every step that declares "run_config" above).
+# The run cache keys steps on these, so a step not listed here is reused across
+# runs that differ only in config. Keys missing from every entry conservatively
+# affect all steps.
+STEP_CONFIG_KEYS = {
+    "validator": ["target_column"],
+    "regression": [
+        "target_column", "task_intent", "feature_whitelist", "model_type",
+        "include_categoricals", "fast_mode",
+    ],
+    "time_series": ["fast_mode"],
+}
+
+# Keys that only select what ingestion reads; they change the dataset
+# fingerprint instead of any step's inputs.
+INGESTION_CONFIG_KEYS = ["sheet_name"]
+
 # Optional descriptions for clarity if you want UI to show it
 PIPELINE_DESCRIPTIONS = {
     "type_identifier": "Identify dataset domain/type from schema and content",
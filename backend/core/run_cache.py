@@ -0,0 +1,401 @@
+"""
+Content-addressed cache of completed pipeline runs.
+
+A run is keyed by its dataset fingerprint, normalised run_config and pipeline
+version. Each step additionally gets its own key from the config keys it reads
+(STEP_CONFIG_KEYS) and the keys of the steps whose artifacts it reads
+(STEP_ARTIFACTS), so a config change only invalidates the steps downstream of
+what it touches.
+
+Completed runs are indexed per dataset fingerprint. A new run over the same
+data is seeded from the best matching earlier run: the artifacts of every step
+whose key matches are hard-linked into the new run folder and those steps are
+marked complete, so the orchestrator's resume logic skips them.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: the thread lock still serialises one process
+    fcntl = None
+
+import core.cache
+from core.cache import load_cache, save_cache
+from core.pipeline_map import INGESTION_CONFIG_KEYS, PIPELINE_SEQUENCE, STEP_ARTIFACTS, STEP_CONFIG_KEYS
+from core.run_manifest import PIPELINE_VERSION
+
+RUN_CACHE_ENV = "ACE_RUN_CACHE"
+# Earlier runs remembered per dataset fingerprint
+MAX_RUNS_PER_DATASET = 8
+
+# Files owned by the run itself; never taken over from a cached run
+RUN_LOCAL_FILES = {
+    "orchestrator_state.json",
+    "progress.json",
+    "run_manifest.json",
+    "manifest_seal.json",
+    "final_status.json",
+    "run_config.json",
+}
+# Run-local directories (API snapshots embed the run id and are rebuilt per run)
+RUN_LOCAL_DIRS = {"snapshots"}
+
+# Outputs other than StateManager artifacts, per step that writes them
+# (a trailing slash covers a directory)
+STEP_FILES = {
+    "executive_narrator": ["executive_report.md"],
+    "expositor": ["final_report.md", "technical_report.md", "artifacts/charts/"],
+}
+
+# Written by ingestion in orchestrate_new_run; a forked run shares them with
+# its source (the cleaned dataset files are added from active_dataset)
+INGESTION_FILES = [
+    "sanitizer_report.json",
+    "active_dataset.json",
+    "ingestion_meta.json",
+    "intake_meta.json",
+    "dataset_identity_card.json",
+    "task_contract.json",
+    "confidence_report.json",
+    "artifacts/schema_profile.json",
+    "artifacts/baseline_profile.json",
+    "artifacts/drift_report.json",
+    "artifacts/dataset_identity_card.json",
+    "artifacts/task_contract.json",
+    "artifacts/confidence_report.json",
+]
+
+_thread_lock = threading.Lock()
+
+
+def run_cache_enabled() -> bool:
+    return os.getenv(RUN_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def normalize_run_config(run_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Drop unset values and ingestion-only keys and put lists in a stable order.
+
+    Two configs that normalise to the same dict drive the pipeline the same way.
+    """
+    normalized: Dict[str, Any] = {}
+    for key, value in (run_config or {}).items():
+        if value is None or value == [] or value == {} or key in INGESTION_CONFIG_KEYS:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(value, key=str)
+        normalized[key] = value
+    return normalized
+
+
+def run_cache_key(
+    dataset_fingerprint: str,
+    run_config: Optional[Dict[str, Any]],
+    pipeline_version: str = PIPELINE_VERSION,
+) -> str:
+    return _digest(
+        {
+            "dataset": dataset_fingerprint,
+            "config": normalize_run_config(run_config),
+            "pipeline_version": pipeline_version,
+        }
+    )
+
+
+def step_data_dependencies(sequence: Iterable[str] = PIPELINE_SEQUENCE) -> Dict[str, Set[str]]:
+    """
+    Earlier steps whose written artifacts each step reads.
+
+    Unlike the scheduler's dependencies this ignores write-after-read ordering
+    and the orchestrator's guard reads: a step that passes its guards runs on
+    the same inputs whatever the guards looked at.
+    """
+    sequence = list(sequence)
+    deps: Dict[str, Set[str]] = {}
+    for idx, step in enumerate(sequence):
+        declared = STEP_ARTIFACTS.get(step)
+        earlier = sequence[:idx]
+        if declared is None:
+            deps[step] = set(earlier)
+            continue
+        reads = set(declared.get("reads") or [])
+        deps[step] = {
+            prior for prior in earlier
+            if prior not in STEP_ARTIFACTS or set(STEP_ARTIFACTS[prior].get("writes") or []) & reads
+        }
+    return deps
+
+
+def step_cache_keys(
+    dataset_fingerprint: str,
+    run_config: Optional[Dict[str, Any]],
+    pipeline_version: str = PIPELINE_VERSION,
+    sequence: Iterable[str] = PIPELINE_SEQUENCE,
+) -> Dict[str, str]:
+    """Cache key of every pipeline step for this dataset and config."""
+    config = normalize_run_config(run_config)
+    declared_keys = {key for keys in STEP_CONFIG_KEYS.values() for key in keys}
+    undeclared = {key: value for key, value in config.items() if key not in declared_keys}
+    deps = step_data_dependencies(sequence)
+    keys: Dict[str, str] = {}
+    for step in deps:
+        step_config = {key: config[key] for key in STEP_CONFIG_KEYS.get(step, []) if key in config}
+        step_config.update(undeclared)
+        keys[step] = _digest(
+            {
+                "dataset": dataset_fingerprint,
+                "pipeline_version": pipeline_version,
+                "step": step,
+                "config": step_config,
+                "upstream": sorted(keys[prior] for prior in deps[step]),
+            }
+        )
+    return keys
+
+
+def downstream_steps(steps: Iterable[str], sequence: Iterable[str] = PIPELINE_SEQUENCE) -> List[str]:
+    """``steps`` and every step that (transitively) reads their artifacts, in pipeline order."""
+    deps = step_data_dependencies(sequence)
+    affected = set(steps)
+    for step in deps:
+        if deps[step] & affected:
+            affected.add(step)
+    return [step for step in deps if step in affected]
+
+
+def reusable_steps(
+    keys: Dict[str, str],
+    cached_keys: Dict[str, str],
+    deps: Optional[Dict[str, Set[str]]] = None,
+) -> List[str]:
+    """Steps whose key matches the cached one and whose inputs are all reused too."""
+    deps = deps if deps is not None else step_data_dependencies(keys)
+    steps: List[str] = []
+    for step in keys:
+        # A step is only reused on top of reused inputs, never on a rerun's
+        if cached_keys.get(step) == keys[step] and deps.get(step, set()) <= set(steps):
+            steps.append(step)
+    return steps
+
+
+def _index_key(dataset_fingerprint: str) -> str:
+    return f"run_cache_{dataset_fingerprint}"
+
+
+@contextmanager
+def _index_lock(dataset_fingerprint: str):
+    """
+    Hold the run index of one dataset exclusively.
+
+    Runs finish in the API process, in worker job threads and in separate
+    worker processes, so threads are serialised here and processes by an
+    flock on a file next to the index; a read-modify-write of the index then
+    never drops another process's entry.
+    """
+    with _thread_lock:
+        if fcntl is None:
+            yield
+            return
+        core.cache.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        lock_path = core.cache.CACHE_DIR / f"{_index_key(dataset_fingerprint)}.lock"
+        with open(lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def record_completed_run(
+    run_path: str,
+    run_id: str,
+    dataset_fingerprint: str,
+    run_config: Optional[Dict[str, Any]],
+    steps_completed: Iterable[str],
+    failed_steps: Iterable[str] = (),
+    pipeline_version: str = PIPELINE_VERSION,
+) -> Dict[str, Any]:
+    """Index a finished run so later runs over the same dataset can reuse its steps."""
+    keys = step_cache_keys(dataset_fingerprint, run_config, pipeline_version)
+    failed = set(failed_steps)
+    succeeded = [step for step in steps_completed if step in keys and step not in failed]
+    entry = {
+        "run_id": run_id,
+        "run_path": str(run_path),
+        "run_key": run_cache_key(dataset_fingerprint, run_config, pipeline_version),
+        "pipeline_version": pipeline_version,
+        "complete": not failed and len(succeeded) == len(keys),
+        "step_keys": {step: keys[step] for step in succeeded},
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    with _index_lock(dataset_fingerprint):
+        index = load_cache(_index_key(dataset_fingerprint)) or {}
+        runs = [run for run in index.get("runs", []) if run.get("run_id") != run_id]
+        runs.append(entry)
+        save_cache(_index_key(dataset_fingerprint), {"runs": runs[-MAX_RUNS_PER_DATASET:]})
+    return entry
+
+
+def find_cached_run(
+    dataset_fingerprint: str,
+    run_config: Optional[Dict[str, Any]],
+    pipeline_version: str = PIPELINE_VERSION,
+    exclude_run_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Best earlier run to seed a new run from, or None.
+
+    A complete run with the same run key wins outright; otherwise the run
+    sharing the most step keys is returned. The result carries
+    ``reusable_steps`` (in pipeline order) and ``full_hit``.
+    """
+    with _index_lock(dataset_fingerprint):
+        index = load_cache(_index_key(dataset_fingerprint)) or {}
+    keys = step_cache_keys(dataset_fingerprint, run_config, pipeline_version)
+    run_key = run_cache_key(dataset_fingerprint, run_config, pipeline_version)
+    deps = step_data_dependencies()
+
+    best = None
+    best_steps: List[str] = []
+    for run in reversed(index.get("runs", [])):
+        if run.get("run_id") == exclude_run_id or run.get("pipeline_version") != pipeline_version:
+            continue
+        if not Path(run.get("run_path", "")).is_dir():
+            continue
+        steps = reusable_steps(keys, run.get("step_keys") or {}, deps)
+        if run.get("complete") and run.get("run_key") == run_key and len(steps) == len(keys):
+            best, best_steps = run, steps
+            break
+        if len(steps) > len(best_steps):
+            best, best_steps = run, steps
+    if best is None or not best_steps:
+        return None
+    return {**best, "reusable_steps": best_steps, "full_hit": len(best_steps) == len(keys)}
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link ``src`` to ``dst``, copying when linking is not possible."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _is_wanted(relative: str, wanted: Set[str]) -> bool:
+    return relative in wanted or any(entry.endswith("/") and relative.startswith(entry) for entry in wanted)
+
+
+def _sidecar_refs(payload: Any) -> Set[str]:
+    """Relative paths of the .npy sidecars an artifact references (StateManager.write_array refs)."""
+    if isinstance(payload, dict):
+        if payload.get("format") == "npy" and isinstance(payload.get("path"), str):
+            return {payload["path"]}
+        return {ref for value in payload.values() for ref in _sidecar_refs(value)}
+    if isinstance(payload, list):
+        return {ref for value in payload for ref in _sidecar_refs(value)}
+    return set()
+
+
+def _shareable(relative: Path) -> bool:
+    # StateManager replaces JSON artifacts and .npy sidecars atomically, so a
+    # hard link is never written through. Reports, charts and datasets may be
+    # rewritten in place and are copied instead.
+    return (len(relative.parts) == 1 and relative.suffix == ".json") or relative.suffix == ".npy"
+
+
+def materialize_run(
+    source_run_path: str,
+    run_path: str,
+    steps: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """
+    Bring a cached run's outputs into ``run_path``.
+
+    With ``steps=None`` every file of the source run is taken over. Otherwise
+    only the JSON artifacts and STEP_FILES written by ``steps`` (minus
+    anything a re-running step also writes) and the array sidecars those
+    artifacts reference are. Files the new run already has and run-local
+    bookkeeping files are never overwritten.
+
+    Returns the relative paths brought in.
+    """
+    source = Path(source_run_path)
+    target = Path(run_path)
+    wanted: Optional[Set[str]] = None
+    if steps is not None:
+        reused = set(steps)
+        rerun_writes = {
+            name for step, declared in STEP_ARTIFACTS.items() if step not in reused
+            for name in declared.get("writes") or []
+        }
+        wanted = {
+            f"{name}.json" for step in reused for name in (STEP_ARTIFACTS.get(step, {}).get("writes") or [])
+            if name not in rerun_writes
+        }
+        wanted.update(entry for step in reused for entry in STEP_FILES.get(step, []))
+        for name in [entry for entry in wanted if entry.endswith(".json")]:
+            try:
+                wanted |= _sidecar_refs(json.loads((source / name).read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+
+    brought: List[str] = []
+    for path in sorted(source.rglob("*")):
+        if not path.is_file() or path.name.endswith(".tmp"):
+            continue
+        relative = path.relative_to(source)
+        if relative.parts[0] in RUN_LOCAL_DIRS or relative.as_posix() in RUN_LOCAL_FILES or (target / relative).exists():
+            continue
+        if wanted is not None and not _is_wanted(relative.as_posix(), wanted):
+            continue
+        if _shareable(relative):
+            _link_or_copy(path, target / relative)
+        else:
+            (target / relative).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target / relative)
+        brought.append(str(relative))
+    return brought
+
+
+def materialize_ingestion(source_run_path: str, run_path: str) -> List[str]:
+    """
+    Link a run's ingestion outputs and cleaned dataset into ``run_path``.
+
+    Paths inside active_dataset and ingestion_meta still point at the source
+    run; callers rewrite them for the new folder.
+    """
+    source = Path(source_run_path)
+    target = Path(run_path)
+    names = list(INGESTION_FILES)
+    try:
+        active = json.loads((source / "active_dataset.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        active = {}
+    for key in ("path", "columnar_path"):
+        if active.get(key) and Path(active[key]).resolve().parent == source.resolve():
+            names.append(Path(active[key]).name)
+
+    brought: List[str] = []
+    for name in names:
+        path = source / name
+        if not path.is_file() or (target / name).exists():
+            continue
+        _link_or_copy(path, target / name)
+        brought.append(name)
+    return brought
@@ -226,6 +226,32 @@ def initialize_manifest(
     return manifest
 
 
+def inherit_manifest(
+    run_path: str | Path,
+    source_run_path: str | Path,
+    steps: Iterable[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Carry a cached run's step results and routing into this run's manifest.
+
+    Identity fields (run id, timestamps, fingerprint, commit) stay this run's
+    own; the manifest is left unsealed so remaining steps can still update it.
+    """
+    manifest = _read_manifest(run_path)
+    source = _read_manifest(source_run_path)
+    if not manifest or not source:
+        return None
+    for step in steps:
+        if step in source.get("steps", {}):
+            manifest["steps"][step] = dict(source["steps"][step])
+    for key in ("artifacts", "warnings", "trust", "analysis_allowed", "analysis_suppressed", "render_policy", "view_policies"):
+        if key in source:
+            manifest[key] = source[key]
+    manifest["reused_from_run_id"] = source.get("run_id")
+    _write_manifest(run_path, manifest)
+    return manifest
+
+
 def update_step_status(
     run_path: str | Path,
     step: str,
@@ -0,0 +1,417 @@
+"""
+Run snapshots: the payload behind GET /run/{run_id}/snapshot.
+
+While a run is in progress its snapshot is rebuilt from the run's artifacts on
+request. Once the manifest is sealed the run no longer changes, so the lite and
+full payloads are serialised once into ``<run>/snapshots/``, together with
+pre-compressed copies (gzip, plus zstd and brotli when those packages are
+installed) and a strong ETag over the uncompressed body. The API then streams
+the stored bytes without reading or parsing any artifact.
+"""
+import gzip
+import hashlib
+import json
+import math
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.run_manifest import read_manifest
+from core.state_manager import StateManager
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd encoding is skipped without it
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional: br encoding is skipped without it
+    brotli = None
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_INDEX = "index.json"
+SNAPSHOT_VARIANTS = {"lite": True, "full": False}
+
+# Content-Encoding -> (file suffix, compressor); identity is always stored
+ENCODERS: Dict[str, tuple] = {"gzip": (".gz", lambda body: gzip.compress(body, compresslevel=9, mtime=0))}
+if zstandard is not None:
+    ENCODERS["zstd"] = (".zst", lambda body: zstandard.ZstdCompressor(level=19).compress(body))
+if brotli is not None:
+    ENCODERS["br"] = (".br", lambda body: brotli.compress(body, quality=11))
+
+TIME_TOKENS = ("date", "time", "day", "week", "month", "quarter", "year", "period", "timestamp")
+
+
+def _iso_now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+def load_json_file(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def normalize_columns(columns: Any) -> Dict[str, Any]:
+    if isinstance(columns, dict):
+        return columns
+    normalized: Dict[str, Any] = {}
+    if isinstance(columns, list):
+        for idx, col in enumerate(columns):
+            if not isinstance(col, dict):
+                continue
+            name = col.get("name") or col.get("column") or f"column_{idx}"
+            if not name:
+                continue
+            normalized[str(name)] = col
+    return normalized
+
+
+def is_numeric_dtype(meta: Dict[str, Any]) -> bool:
+    dtype = str(meta.get("dtype") or meta.get("type") or "").lower()
+    numeric_tokens = ("int", "float", "double", "decimal", "number")
+    return any(token in dtype for token in numeric_tokens)
+
+
+def ensure_identity_card(state: StateManager, run_path: Path) -> Dict[str, Any]:
+    identity = state.read("dataset_identity_card")
+    if isinstance(identity, dict) and identity:
+        return identity
+
+    card_path = Path(run_path) / "artifacts" / "dataset_identity_card.json"
+    if card_path.exists():
+        try:
+            with open(card_path, "r", encoding="utf-8") as f:
+                identity = json.load(f)
+                state.write("dataset_identity_card", identity)
+                return identity
+        except Exception as exc:
+            print(f"[IDENTITY] Failed to load dataset_identity_card.json: {exc}")
+
+    try:
+        from core.governance import rebuild_governance_artifacts
+
+        rebuild_governance_artifacts(state)
+        identity = state.read("dataset_identity_card")
+        if isinstance(identity, dict):
+            return identity
+    except Exception as exc:
+        print(f"[IDENTITY] Unable to rebuild identity artifacts: {exc}")
+
+    return {}
+
+
+def build_identity_payload(state: StateManager, run_path: Path) -> Dict[str, Any]:
+    identity = ensure_identity_card(state, run_path)
+    columns = normalize_columns(identity.get("columns") or identity.get("fields") or {})
+    numeric_columns = [name for name, meta in columns.items() if is_numeric_dtype(meta)]
+    summary = {
+        "row_count": identity.get("row_count"),
+        "column_count": identity.get("column_count"),
+        "critical_gap_score": identity.get("critical_gap_score"),
+        "is_safe_mode": identity.get("is_safe_mode"),
+        "drift_status": identity.get("drift_status"),
+        "quality": identity.get("quality"),
+        "data_type": identity.get("data_type"),
+    }
+    return {
+        "identity": identity,
+        "profile": {
+            "columns": columns,
+            "numericColumns": numeric_columns,
+        },
+        "summary": summary,
+    }
+
+
+def build_diagnostics_payload(state: StateManager, run_path: Path) -> Dict[str, Any]:
+    validation = state.read("validation_report") or {}
+    analytics_validation = state.read("analytics_validation") or {}
+    identity = ensure_identity_card(state, run_path)
+    confidence = state.read("confidence_report") or {}
+    mode = state.read("run_mode") or "strict"
+    analysis_intent = state.read("analysis_intent") or {}
+    analysis_intent_value = analysis_intent.get("intent") or "exploratory"
+    regression_status = state.read("regression_status") or "not_started"
+    run_health = state.read("run_health_summary") or {}
+    target_candidate = analysis_intent.get("target_candidate") or {
+        "column": None,
+        "reason": "no_usable_target_found",
+        "confidence": 0.0,
+        "detected": False,
+    }
+
+    columns = normalize_columns(identity.get("columns") or identity.get("fields") or {})
+
+    def _column_has_time(name: str, meta: dict | None) -> bool:
+        label = (name or '').lower()
+        dtype = str((meta or {}).get('dtype') or (meta or {}).get('type') or '').lower()
+        return any(token in label for token in TIME_TOKENS) or any(token in dtype for token in TIME_TOKENS)
+
+    has_time = any(_column_has_time(name, meta if isinstance(meta, dict) else None) for name, meta in columns.items())
+
+    reasons = []
+    if validation.get("mode") == "limitations":
+        reasons.append("Validation: limitations mode")
+    if validation.get("target_column") in [None, ""]:
+        reasons.append("Validation: missing target column")
+    if not has_time:
+        reasons.append("Identity: time fields not detected")
+    if confidence.get("confidence_label") == "low":
+        reasons.append("Confidence: low")
+
+    schema_scan = state.read("schema_scan_output")
+    if not isinstance(schema_scan, dict):
+        schema_scan = {}
+    manifest_data = load_json_file(Path(run_path) / "run_manifest.json") if run_path else {}
+    warnings = (manifest_data or {}).get("warnings", [])
+
+    return {
+        "mode": mode,
+        "validation": validation,
+        "analytics_validation": analytics_validation,
+        "identity": identity,
+        "confidence": confidence,
+        "analysis_intent": analysis_intent_value,
+        "target_candidate": target_candidate,
+        "reasons": reasons,
+        "regression_status": regression_status,
+        "run_health_summary": run_health,
+        "warnings": warnings,
+        "data_quality": {
+            "score": schema_scan.get("quality_score", 0.4)
+        }
+    }
+
+
+def build_snapshot_payload(run_path: Path, lite: bool, run_id: Optional[str] = None) -> Dict[str, Any]:
+    """Assemble a run's snapshot from its artifacts; raises FileNotFoundError for an empty run folder."""
+    run_path = Path(run_path)
+    run_id = run_id or run_path.name
+    state = StateManager(str(run_path))
+    manifest = load_json_file(run_path / "run_manifest.json")
+    if not manifest:
+        # Manifest may not exist for older runs; build a minimal fallback
+        report_exists = (run_path / "final_report.md").exists()
+        if not report_exists and not any(run_path.iterdir()):
+            raise FileNotFoundError("Run not found or not yet complete")
+        manifest = {"steps": {}, "artifacts": {}, "warnings": [], "trust": None,
+                    "render_policy": {"allow_report": report_exists}, "view_policies": {}}
+
+    diagnostics = build_diagnostics_payload(state, run_path)
+    identity_payload = build_identity_payload(state, run_path)
+    curated_kpis = {
+        "rows": identity_payload.get("summary", {}).get("row_count"),
+        "columns": identity_payload.get("summary", {}).get("column_count"),
+        "data_quality_score": diagnostics.get("data_quality", {}).get("score")
+            or identity_payload.get("identity", {}).get("quality_score"),
+        "completeness": (identity_payload.get("summary", {}).get("quality") or {}).get("avg_null_pct"),
+    }
+
+    payload: Dict[str, Any] = {
+        "run_id": run_id,
+        "generated_at": _iso_now(),
+        "lite": lite,
+        "manifest": manifest,
+        "diagnostics": diagnostics,
+        "identity": identity_payload,
+        "curated_kpis": curated_kpis,
+        "render_policy": manifest.get("render_policy"),
+        "view_policies": manifest.get("view_policies"),
+        "trust": manifest.get("trust"),
+        "run_warnings": manifest.get("warnings"),
+    }
+
+    if not lite:
+        report_path = run_path / "final_report.md"
+        payload["report_markdown"] = report_path.read_text(encoding="utf-8") if report_path.exists() else ""
+        governed_report = load_json_file(run_path / "artifacts" / "governed_report.json")
+        if governed_report:
+            payload["governed_report"] = governed_report
+            payload["evidence_map"] = governed_report.get("evidence") or {}
+        else:
+            payload["governed_report"] = None
+            payload["evidence_map"] = {}
+        enhanced = state.read("enhanced_analytics") or {}
+        regression = state.read("regression_insights") or {}
+        payload["enhanced_analytics"] = enhanced or None
+        payload["model_artifacts"] = {
+            "importance_report": state.read("importance_report"),
+            "regression_coefficients_report": state.read("regression_coefficients_report"),
+            "baseline_metrics": state.read("baseline_metrics"),
+            "model_fit_report": state.read("model_fit_report"),
+            "collinearity_report": state.read("collinearity_report"),
+            "leakage_report": state.read("leakage_report"),
+            "feature_governance_report": state.read("feature_governance_report"),
+            "feature_importance": regression.get("feature_importance") or enhanced.get("feature_importance"),
+            "coefficients": regression.get("coefficients") or enhanced.get("coefficients"),
+            "shap_explanations": state.read("shap_explanations"),
+            "onnx_export": state.read("onnx_export"),
+            "drift_report": state.read("drift_report"),
+        }
+        # LLM-generated smart narrative
+        payload["smart_narrative"] = state.read("smart_narrative") or None
+
+        # Interpretation layer artifacts
+        payload["deep_insights"] = state.read("deep_insights") or load_json_file(run_path / "artifacts" / "deep_insights.json")
+        payload["hypotheses"] = state.read("hypotheses") or load_json_file(run_path / "artifacts" / "hypotheses.json")
+        payload["executive_narrative"] = state.read("executive_narrative") or load_json_file(run_path / "artifacts" / "executive_narrative.json")
+
+    return payload
+
+
+def live_snapshot_etag(run_path: Path, lite: bool) -> str:
+    """Cheap ETag for an in-progress run, from the mtimes and sizes of the files that drive its snapshot."""
+    files = [
+        run_path / "run_manifest.json",
+        run_path / "validation_report.json",
+        run_path / "confidence_report.json",
+        run_path / "dataset_identity_card.json",
+    ]
+    if not lite:
+        files.extend(
+            [
+                run_path / "final_report.md",
+                run_path / "enhanced_analytics.json",
+                run_path / "artifacts" / "governed_report.json",
+            ]
+        )
+    hasher = hashlib.sha1()
+    for path in files:
+        if not path.exists():
+            continue
+        stat = path.stat()
+        hasher.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+    return f"\"{hasher.hexdigest()}\""
+
+
+def _finite(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def encode_snapshot(payload: Dict[str, Any]) -> bytes:
+    """Serialise a payload the way JSONResponse does (NaN/inf become null instead of failing)."""
+    options = {"ensure_ascii": False, "allow_nan": False, "separators": (",", ":"), "default": str}
+    try:
+        text = json.dumps(payload, **options)
+    except ValueError:
+        text = json.dumps(_finite(payload), **options)
+    return text.encode("utf-8")
+
+
+def strong_etag(body: bytes) -> str:
+    return f"\"{hashlib.sha256(body).hexdigest()[:32]}\""
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def snapshot_dir(run_path: str | Path) -> Path:
+    return Path(run_path) / SNAPSHOT_DIR
+
+
+def read_snapshot_index(run_path: str | Path) -> Optional[Dict[str, Any]]:
+    return load_json_file(snapshot_dir(run_path) / SNAPSHOT_INDEX)
+
+
+def materialize_snapshots(run_path: str | Path, run_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write the lite and full snapshots of a sealed run, pre-serialised and
+    pre-compressed, and return the index describing them.
+    """
+    run_path = Path(run_path)
+    manifest = read_manifest(run_path) or {}
+    target = snapshot_dir(run_path)
+    target.mkdir(parents=True, exist_ok=True)
+
+    variants: Dict[str, Any] = {}
+    for variant, lite in SNAPSHOT_VARIANTS.items():
+        body = encode_snapshot(build_snapshot_payload(run_path, lite=lite, run_id=run_id))
+        files = {"identity": f"{variant}.json"}
+        _write_atomic(target / files["identity"], body)
+        for encoding, (suffix, compress) in ENCODERS.items():
+            files[encoding] = f"{variant}.json{suffix}"
+            _write_atomic(target / files[encoding], compress(body))
+        variants[variant] = {
+            "etag": strong_etag(body),
+            "size": len(body),
+            "files": files,
+        }
+
+    index = {
+        "run_id": run_id or run_path.name,
+        "sealed_at": manifest.get("sealed_at"),
+        "materialized_at": _iso_now(),
+        "variants": variants,
+    }
+    # Written last: readers only trust snapshots listed in a complete index
+    _write_atomic(target / SNAPSHOT_INDEX, json.dumps(index, indent=2).encode("utf-8"))
+    return index
+
+
+def sealed_snapshot(run_path: str | Path, variant: str, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Stored snapshot entry for a sealed run, materialising it first when it is
+    missing or predates the seal; None while the run is still in progress.
+    """
+    manifest = read_manifest(run_path)
+    sealed_at = (manifest or {}).get("sealed_at")
+    if not sealed_at:
+        return None
+    index = read_snapshot_index(run_path)
+    if not index or index.get("sealed_at") != sealed_at or variant not in index.get("variants", {}):
+        index = materialize_snapshots(run_path, run_id=run_id)
+    return index["variants"].get(variant)
+
+
+def choose_encoding(accept_encoding: Optional[str], available: List[str]) -> str:
+    """Pick the best stored encoding the client accepts (ties go to the smaller format), else identity."""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    wildcard = accepted.get("*")
+    best, best_q = "identity", 0.0
+    for encoding in ("br", "zstd", "gzip"):
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, wildcard or 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
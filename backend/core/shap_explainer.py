@@ -5,14 +5,22 @@ Following the CANDLE framework pattern from strategic docs:
 SHAP values are passed directly to the LLM, which generates diagnostic
 reasoning based on these game-theoretic feature attributions.
 """
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 import warnings
 
+from anti_gravity.core.importance import ranking_stability
+
 # Lazy import SHAP to avoid slow startup
 _shap = None
 
+# Fitted explainers keyed by (id(model), model_type). The model itself is kept
+# alongside so a recycled id can never hand back another model's explainer.
+_EXPLAINER_CACHE: "OrderedDict[Tuple[int, str], Tuple[Any, Any]]" = OrderedDict()
+_EXPLAINER_CACHE_SIZE = 8
+
 def _get_shap():
     """Lazy-load SHAP to avoid slow import at startup."""
     global _shap
@@ -22,6 +30,62 @@ def _get_shap():
     return _shap
 
 
+def _build_explainer(model: Any, X_background: pd.DataFrame, model_type: str) -> Any:
+    shap = _get_shap()
+    if model_type == "tree":
+        try:
+            return shap.TreeExplainer(model, X_background)
+        except Exception:
+            pass
+    if model_type in ("tree", "linear") and hasattr(model, "coef_"):
+        try:
+            return shap.LinearExplainer(model, X_background)
+        except Exception:
+            pass
+    # Model-agnostic fallback. The permutation explainer costs O(features)
+    # model calls per row, where KernelExplainer grows quadratically.
+    predict = model.predict_proba if hasattr(model, "predict_proba") else model.predict
+    return shap.explainers.Permutation(predict, X_background)
+
+
+def get_explainer(model: Any, X_train: pd.DataFrame, model_type: str = "tree", n_background: int = 50) -> Any:
+    """
+    Return a fitted SHAP explainer for ``model``, building it at most once.
+
+    The importance, narrative and single-prediction paths all go through here,
+    so the regression step fits one explainer per model.
+    """
+    key = (id(model), model_type)
+    cached = _EXPLAINER_CACHE.get(key)
+    if cached is not None and cached[0] is model:
+        _EXPLAINER_CACHE.move_to_end(key)
+        return cached[1]
+
+    if X_train.shape[0] > n_background:
+        X_background = X_train.sample(n=n_background, random_state=42)
+    else:
+        X_background = X_train
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        explainer = _build_explainer(model, X_background, model_type)
+
+    _EXPLAINER_CACHE[key] = (model, explainer)
+    while len(_EXPLAINER_CACHE) > _EXPLAINER_CACHE_SIZE:
+        _EXPLAINER_CACHE.popitem(last=False)
+    return explainer
+
+
+def _explain(explainer: Any, X: pd.DataFrame) -> Tuple[Any, Any]:
+    """Return (shap_values, expected_value) for any explainer kind."""
+    shap = _get_shap()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if isinstance(explainer, shap.explainers.Permutation):
+            explanation = explainer(X, max_evals=max(500, 2 * X.shape[1] + 1))
+            return explanation.values, np.asarray(explanation.base_values).mean(axis=0)
+        return explainer.shap_values(X), getattr(explainer, "expected_value", 0.0)
+
+
 def compute_shap_explanations(
     model: Any,
     X_train: pd.DataFrame,
@@ -44,14 +108,6 @@ def compute_shap_explanations(
     Returns:
         Dict with SHAP values, feature importance, and explanations
     """
-    shap = _get_shap()
-    
-    # Sample if too large
-    if X_train.shape[0] > n_background:
-        X_background = X_train.sample(n=n_background, random_state=42)
-    else:
-        X_background = X_train
-    
     if X_explain is None:
         if X_train.shape[0] > max_samples:
             X_explain = X_train.sample(n=max_samples, random_state=42)
@@ -60,22 +116,8 @@ def compute_shap_explanations(
     elif X_explain.shape[0] > max_samples:
         X_explain = X_explain.sample(n=max_samples, random_state=42)
     
-    # Select appropriate explainer
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        
-        if model_type == "tree":
-            try:
-                explainer = shap.TreeExplainer(model, X_background)
-            except Exception:
-                # Fallback to Kernel explainer
-                explainer = shap.KernelExplainer(model.predict, X_background)
-        elif model_type == "linear":
-            explainer = shap.LinearExplainer(model, X_background)
-        else:
-            explainer = shap.KernelExplainer(model.predict, X_background)
-        
-        shap_values = explainer.shap_values(X_explain)
+    explainer = get_explainer(model, X_train, model_type=model_type, n_background=n_background)
+    shap_values, expected_value = _explain(explainer, X_explain)
     
     # Handle multi-output models (classification)
     if isinstance(shap_values, list):
@@ -90,8 +132,13 @@ def compute_shap_explanations(
     # Ensure 2D (samples x features)
     shap_values = np.atleast_2d(shap_values)
     
-    # Compute mean absolute SHAP importance
-    feature_importance = np.abs(shap_values).mean(axis=0)
+    # Compute mean absolute SHAP importance, with a normal-approximation 95% CI
+    # over the explained rows so callers can tell whether the ranking is stable
+    abs_values = np.abs(shap_values)
+    feature_importance = abs_values.mean(axis=0)
+    half_width = 1.96 * abs_values.std(axis=0, ddof=1) / np.sqrt(len(abs_values)) if len(abs_values) > 1 else np.zeros_like(feature_importance)
+    ci_low = feature_importance - half_width
+    ci_high = feature_importance + half_width
     feature_names = list(X_explain.columns)
     
     # Compute directional impact (average SHAP, not absolute)
@@ -106,6 +153,8 @@ def compute_shap_explanations(
         importance_data.append({
             "feature": name,
             "importance": imp,
+            "ci_low": float(max(0.0, ci_low[idx])),
+            "ci_high": float(ci_high[idx]),
             "direction": direction,
             "impact_magnitude": impact_mag,
         })
@@ -114,7 +163,6 @@ def compute_shap_explanations(
     importance_ranking = sorted(importance_data, key=lambda x: x["importance"], reverse=True)
     
     # Get expected value (handle array for multi-class)
-    expected_value = explainer.expected_value if hasattr(explainer, 'expected_value') else 0.0
     if isinstance(expected_value, np.ndarray):
         expected_value = float(expected_value[-1])  # Take positive class
     else:
@@ -124,6 +172,7 @@ def compute_shap_explanations(
         "shap_values": shap_values,
         "feature_names": feature_names,
         "importance_ranking": importance_ranking[:10],
+        "ranking_stability": ranking_stability(feature_names, feature_importance, ci_low, ci_high),
         "base_value": expected_value,
         "explained_samples": len(X_explain),
     }
@@ -140,29 +189,16 @@ def explain_single_prediction(
     
     Returns feature contributions that drove this specific prediction.
     """
-    shap = _get_shap()
-    
-    # Create explainer
-    X_background = X_train.sample(n=min(50, len(X_train)), random_state=42)
-    
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        
-        if model_type == "tree":
-            try:
-                explainer = shap.TreeExplainer(model, X_background)
-            except Exception:
-                explainer = shap.KernelExplainer(model.predict, X_background)
-        else:
-            explainer = shap.KernelExplainer(model.predict, X_background)
-        
-        # Explain single instance
-        instance_df = instance.to_frame().T
-        shap_values = explainer.shap_values(instance_df)
+    explainer = get_explainer(model, X_train, model_type=model_type)
+    instance_df = instance.to_frame().T.astype(X_train.dtypes.to_dict())
+    shap_values, expected_value = _explain(explainer, instance_df)
     
     # Handle multi-output
     if isinstance(shap_values, list):
         shap_values = shap_values[-1]
+    shap_values = np.asarray(shap_values)
+    if shap_values.ndim == 3:
+        shap_values = shap_values[:, :, -1]
     
     shap_values = shap_values.flatten()
     feature_names = list(instance.index)
@@ -176,7 +212,7 @@ def explain_single_prediction(
     
     return {
         "prediction": float(model.predict(instance_df)[0]),
-        "base_value": float(explainer.expected_value[-1]) if hasattr(explainer, 'expected_value') and isinstance(explainer.expected_value, np.ndarray) else (float(explainer.expected_value) if hasattr(explainer, 'expected_value') else 0.0),
+        "base_value": float(np.ravel(expected_value)[-1]),
         "contributions": [
             {
                 "feature": name,
@@ -218,8 +254,9 @@ def generate_shap_narrative(
         second = shap_result["importance_ranking"][1]
         feature2 = second["feature"].replace("_", " ").title()
         ratio = top["importance"] / second["importance"] if second["importance"] > 0 else 1
+        separated = (shap_result.get("ranking_stability") or {}).get("top_feature_separated", True)
         
-        if ratio > 2:
+        if ratio > 2 and separated:
             lines.append(
                 f"**{feature2}** is the second most important, but contributes "
                 f"{ratio:.1f}x less influence."
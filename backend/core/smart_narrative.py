@@ -5,32 +5,14 @@ This module uses Gemini to generate human-readable, contextual narratives
 from raw analytics data, similar to how an AI analyst would interpret the data.
 """
 
-import os
 import json
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
-# Use the same google-genai SDK as llm.py for consistency
-try:
-    from google import genai
-    _gemini_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-    if _gemini_key:
-        client = genai.Client(api_key=_gemini_key)
-    else:
-        client = genai.Client()
-    GENAI_AVAILABLE = True
-except ImportError:
-    genai = None
-    client = None
-    GENAI_AVAILABLE = False
-    print("[SmartNarrative] google-genai not installed")
-except Exception as e:
-    genai = None
-    client = None
-    GENAI_AVAILABLE = False
-    print(f"[SmartNarrative] Failed to initialize Gemini client: {e}")
-
-MODEL_NAME = "gemini-2.0-flash"
+# Calls go through core.llm so they share its client, retries and response cache
+from core import llm
+
+MODEL_NAME = llm.MODEL_NAME
 
 
 @dataclass
@@ -62,7 +44,7 @@ def generate_smart_narrative(
     Returns:
         Dict containing the generated narrative sections
     """
-    if not GENAI_AVAILABLE:
+    if llm.client is None:
         return _generate_fallback_narrative(snapshot)
 
     try:
@@ -281,17 +263,7 @@ GUIDELINES:
 Return ONLY valid JSON, no markdown fences or explanation."""
 
     try:
-        # Use the client-based API (consistent with llm.py)
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-            config={
-                "temperature": 0.3,
-                "max_output_tokens": 4096,
-            }
-        )
-
-        text = response.text.strip()
+        text = llm.generate(prompt, {"temperature": 0.3, "max_output_tokens": 4096}).strip()
 
         # Clean up response if wrapped in markdown
         if text.startswith("```"):
@@ -1,7 +1,26 @@
+import atexit
 import json
+import math
 import os
+import signal
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Agents (and only agents) get this set by the orchestrator: artifacts are kept
+# in memory and written when the step ends instead of on every write() call.
+WRITE_BEHIND_ENV = "ACE_STATE_WRITE_BEHIND"
+CACHE_LIMIT_ENV = "ACE_STATE_CACHE_MB"
+DEFAULT_CACHE_LIMIT_MB = 128
+# Per-row outputs (labels, flags, scores) live here as .npy sidecars
+ARRAY_DIR = "arrays"
 
 
 class _NumpyEncoder(json.JSONEncoder):
@@ -21,11 +40,210 @@ class _NumpyEncoder(json.JSONEncoder):
             pass
         return super().default(obj)
 
+
+def _has_non_finite(obj: Any) -> bool:
+    """True when ``obj`` holds a NaN or infinite float anywhere."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    dtype = getattr(obj, "dtype", None)
+    if dtype is not None and getattr(dtype, "kind", "") in "fc":
+        import numpy as np
+        return not bool(np.isfinite(obj).all())
+    return False
+
+
+def _dumps(data: Any) -> bytes:
+    """
+    Compact JSON bytes; orjson when available, json + _NumpyEncoder for anything
+    it rejects. orjson writes NaN/Infinity as null, so payloads holding them go
+    through json as well and keep the NaN/Infinity tokens artifacts always had.
+    """
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            payload = None
+        # Without a null in the output there can be no NaN either, so the walk is rarely needed
+        if payload is not None and (b"null" not in payload or not _has_non_finite(data)):
+            return payload
+    return json.dumps(data, separators=(",", ":"), cls=_NumpyEncoder).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity written by the json module
+    return json.loads(raw)
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class _ArtifactCache:
+    """
+    Process-wide cache of artifact file contents, keyed by path.
+
+    Entries are validated against (mtime_ns, size, inode) on every lookup, so a
+    file rewritten by another process is re-read. Raw bytes are cached rather
+    than parsed objects so callers can freely mutate what read() returns.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int, int], bytes]]" = OrderedDict()
+        self._size = 0
+        # Re-entrant: the SIGTERM flush can interrupt the main thread inside put()
+        self._lock = threading.RLock()
+
+    def get(self, path: Path, signature: Tuple[int, int, int]) -> Optional[bytes]:
+        key = str(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, path: Path, signature: Optional[Tuple[int, int, int]], payload: bytes) -> None:
+        if signature is None or len(payload) > self.max_bytes:
+            self.discard(path)
+            return
+        key = str(path)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (signature, payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def discard(self, path: Path) -> None:
+        with self._lock:
+            previous = self._entries.pop(str(path), None)
+            if previous is not None:
+                self._size -= len(previous[1])
+
+
+def _cache_limit_bytes() -> int:
+    try:
+        return int(float(os.getenv(CACHE_LIMIT_ENV, DEFAULT_CACHE_LIMIT_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_CACHE_LIMIT_MB * 1024 * 1024
+
+
+_artifact_cache = _ArtifactCache(_cache_limit_bytes())
+_manifest_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+_manifest_lock = threading.Lock()
+
+# Buffered write-behind payloads: path -> serialized bytes (None marks a pending delete)
+_pending_writes: "OrderedDict[str, Optional[bytes]]" = OrderedDict()
+# Re-entrant for the same reason as _ArtifactCache._lock
+_pending_lock = threading.RLock()
+_atexit_registered = False
+
+
+def _write_behind_default() -> bool:
+    return os.getenv(WRITE_BEHIND_ENV, "").strip().lower() in {"1", "true", "yes"}
+
+
+def flush_pending_writes(run_path: Optional[str] = None) -> int:
+    """
+    Persist buffered write-behind artifacts (all runs, or one run folder).
+
+    Called at step boundaries: when an agent process exits (atexit, or the
+    worker runtime before it hard-exits) and when it is terminated for running
+    past its step budget (see ``flush_on_terminate``). Returns the number of
+    files touched.
+    """
+    prefix = str(Path(run_path)) + os.sep if run_path else None
+    with _pending_lock:
+        keys = [k for k in _pending_writes if prefix is None or k.startswith(prefix)]
+        batch = [(k, _pending_writes.pop(k)) for k in keys]
+    for key, payload in batch:
+        path = Path(key)
+        if payload is None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                pass
+            continue
+        _atomic_write_bytes(path, payload)
+        _artifact_cache.put(path, _signature(path), payload)
+    return len(batch)
+
+
+def _flush_at_exit() -> None:
+    try:
+        flush_pending_writes()
+    except Exception as exc:
+        print(f"[StateManager] Failed to flush buffered artifacts at exit: {exc}")
+        # The step must not report success with its artifacts missing
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(1)
+
+
+def flush_on_terminate() -> None:
+    """
+    Persist buffered artifacts when this process receives SIGTERM.
+
+    The orchestrator terminates an agent that runs past its step budget (and
+    only kills it if it has not exited after a grace period), so artifacts
+    the agent already wrote survive the timeout. Installable from the main
+    thread only; a no-op elsewhere.
+    """
+    if threading.current_thread() is not threading.main_thread() or not hasattr(signal, "SIGTERM"):
+        return
+
+    def _terminate(signum, frame):
+        _flush_at_exit()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(128 + signum)
+
+    signal.signal(signal.SIGTERM, _terminate)
+
+
+if _write_behind_default():
+    # Agent subprocess started with write-behind on
+    flush_on_terminate()
+
+
 class StateManager:
-    def __init__(self, run_path: str, redis_url: Optional[str] = None):
+    def __init__(self, run_path: str, redis_url: Optional[str] = None, write_behind: Optional[bool] = None):
         self.run_path = Path(run_path)
         self.redis_client = None
         self.run_id = self.run_path.name
+        self.write_behind = _write_behind_default() if write_behind is None else write_behind
         
         # Auto-detect Redis URL from env if not provided
         if not redis_url:
@@ -41,14 +259,36 @@ class StateManager:
     def _get_redis_key(self, name: str) -> str:
         return f"ace:run:{self.run_id}:{name}"
 
+    def _manifest_view(self) -> Optional[Dict[str, Any]]:
+        """Parsed run manifest for read-only checks, re-read only when the file changes."""
+        from core.run_manifest import _manifest_path
+
+        path = _manifest_path(self.run_path)
+        signature = _signature(path)
+        if signature is None:
+            return None
+        key = str(path)
+        with _manifest_lock:
+            cached = _manifest_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        try:
+            manifest = _loads(path.read_bytes())
+        except Exception:
+            return None
+        with _manifest_lock:
+            _manifest_cache[key] = (signature, manifest)
+        return manifest
+
     def write(self, name: str, data: Any):
         """
-        Writes data to a JSON file in the run folder AND Redis (if available).
+        Writes data to a JSON file in the run folder.
+
+        Files are replaced atomically. In write-behind mode the serialized
+        artifact is buffered and persisted by flush()/flush_pending_writes();
+        reads in this process see it immediately.
         """
-        from core.run_manifest import get_artifact_step, get_artifact_type, register_artifact
-        from core.run_manifest import update_render_policy, update_step_status, _read_manifest, remove_artifact
-        from core.invariants import run_invariants
-        from core.run_manifest import read_manifest
+        from core.run_manifest import get_artifact_step
         if name == "regression_insights":
             regression_status = self.read("regression_status") or "not_started"
             if regression_status != "success":
@@ -61,7 +301,7 @@ class StateManager:
                 print(f"[StateManager] Refusing to persist invalid artifact: {name}")
                 return
         artifact_step = get_artifact_step(name)
-        manifest = _read_manifest(self.run_path)
+        manifest = self._manifest_view() if artifact_step else None
         if artifact_step and manifest:
             step_status = (manifest.get("steps") or {}).get(artifact_step, {}).get("status")
             # Allow writing during "running" (normal agent execution) or "success" (post-finalize)
@@ -71,17 +311,27 @@ class StateManager:
         if artifact_step and isinstance(data, dict) and data.get("valid") is False:
             print(f"[StateManager] Refusing to persist invalid artifact: {name}")
             return
-        # 1. Write to Disk
-        filename = f"{name}.json"
-        path = self.run_path / filename
-        tmp_path = self.run_path / f"{filename}.tmp"
-        
+
         # Handle Pydantic models
         if hasattr(data, "model_dump"):
             data = data.model_dump()
-        
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, cls=_NumpyEncoder)
+
+        path = self.run_path / f"{name}.json"
+        payload = _dumps(data)
+        if self.write_behind:
+            global _atexit_registered
+            with _pending_lock:
+                _pending_writes[str(path)] = payload
+                if not _atexit_registered:
+                    atexit.register(_flush_at_exit)
+                    _atexit_registered = True
+            return
+
+        if _pending_writes:
+            with _pending_lock:
+                _pending_writes.pop(str(path), None)
+        _atomic_write_bytes(path, payload)
+        _artifact_cache.put(path, _signature(path), payload)
 
     def read(self, name: str) -> Optional[Any]:
         """
@@ -89,15 +339,28 @@ class StateManager:
         """
         if name == "data_validation_report":
             print("[StateManager] WARNING: data_validation_report is deprecated; use validation_report instead.")
-        # 1. Try Disk
         path = self.run_path / f"{name}.json"
-        if path.exists():
+        # 0. Buffered (write-behind) value from this process
+        if _pending_writes:
+            with _pending_lock:
+                pending = _pending_writes.get(str(path), False)
+            if pending is None:
+                return None
+            if pending is not False:
+                return _loads(pending)
+
+        # 1. Try Disk (through the in-process cache)
+        signature = _signature(path)
+        if signature is not None:
+            raw = _artifact_cache.get(path, signature)
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                if raw is None:
+                    raw = path.read_bytes()
+                    _artifact_cache.put(path, signature, raw)
+                return _loads(raw)
             except Exception:
-                pass # Corrupt file, fall back to Redis
-        
+                _artifact_cache.discard(path)  # Corrupt file, fall back to Redis
+
         # 2. Try Redis
         if self.redis_client:
             try:
@@ -114,7 +377,13 @@ class StateManager:
         """
         Checks if a state file exists (Disk or Redis).
         """
-        if (self.run_path / f"{name}.json").exists():
+        path = self.run_path / f"{name}.json"
+        if _pending_writes:
+            with _pending_lock:
+                pending = _pending_writes.get(str(path), False)
+            if pending is not False:
+                return pending is not None
+        if path.exists():
             return True
             
         if self.redis_client:
@@ -125,17 +394,80 @@ class StateManager:
     def delete(self, name: str) -> None:
         """Remove a state file and any cached Redis entry for this key."""
         path = self.run_path / f"{name}.json"
-        if path.exists():
-            try:
-                path.unlink()
-            except Exception:
-                pass
+        _artifact_cache.discard(path)
+        if self.write_behind:
+            with _pending_lock:
+                if str(path) in _pending_writes or path.exists():
+                    _pending_writes[str(path)] = None
+        else:
+            with _pending_lock:
+                _pending_writes.pop(str(path), None)
+            if path.exists():
+                try:
+                    path.unlink()
+                except Exception:
+                    pass
         if self.redis_client:
             try:
                 self.redis_client.delete(self._get_redis_key(name))
             except Exception:
                 pass
+
+    def flush(self) -> int:
+        """Persist this run's buffered write-behind artifacts."""
+        return flush_pending_writes(str(self.run_path))
     
+    def array_path(self, name: str) -> Path:
+        return self.run_path / ARRAY_DIR / f"{name}.npy"
+
+    def write_array(self, name: str, values: Any, dtype: Any = None) -> Dict[str, Any]:
+        """
+        Store a per-row array as a typed .npy sidecar and return its reference.
+
+        Embed the returned dict in a JSON artifact instead of the values
+        themselves. Sidecars are written immediately (atomically), also in
+        write-behind mode, so a reference is never ahead of its file.
+        """
+        import numpy as np
+
+        array = np.ascontiguousarray(values, dtype=dtype)
+        path = self.array_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, array, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        return {
+            "format": "npy",
+            "path": f"{ARRAY_DIR}/{path.name}",
+            "dtype": array.dtype.str,
+            "length": int(array.shape[0]) if array.ndim else 1,
+        }
+
+    def read_array(self, ref: Any, mmap: bool = True) -> Optional[Any]:
+        """
+        Load a sidecar written by write_array, memory-mapped read-only by default.
+
+        ``ref`` is the sidecar name or the reference dict stored in an artifact.
+        Returns None when the sidecar does not exist.
+        """
+        import numpy as np
+
+        if isinstance(ref, dict):
+            path = self.run_path / ref.get("path", "")
+        else:
+            path = self.array_path(str(ref))
+        if not path.is_file():
+            return None
+        return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+
     def get_file_path(self, filename: str) -> str:
         """
         Returns the full path for a file within the run directory.
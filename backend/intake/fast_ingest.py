@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import hashlib
 import duckdb
 import polars as pl
@@ -8,7 +9,13 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from core.csv_defaults import POLARS_CSV_KWARGS
+from core.csv_defaults import DEFAULT_NULL_SENTINELS, POLARS_CSV_KWARGS
+
+# Restrict DuckDB type sniffing to what pandas infers from CSV so the columnar
+# copy and a CSV re-read agree on dtypes (dates stay strings, as in pandas).
+DUCKDB_TYPE_CANDIDATES = ["BOOLEAN", "BIGINT", "DOUBLE", "VARCHAR"]
+# Malformed lines listed in the sanitizer report (all of them are counted)
+REJECTED_LINE_SAMPLES = 20
 
 
 def sha256_file(path: str, chunk_size: int = 8 * 1024 * 1024) -> str:
@@ -37,9 +44,11 @@ def build_sample_csv(path: str, n_rows: int) -> pl.DataFrame:
     )
 
 
-def csv_to_parquet_duckdb(csv_path: str, parquet_path: str) -> None:
+def csv_to_parquet_duckdb(csv_path: str, parquet_path: str, threads: int = 4) -> None:
     """
     Convert CSV to parquet via DuckDB COPY for fast downstream reads.
+    Streams straight from the CSV scan into the parquet writer, so the table is
+    never materialised in memory.
     """
     csv_p = Path(csv_path)
     parquet_p = Path(parquet_path)
@@ -47,15 +56,168 @@ def csv_to_parquet_duckdb(csv_path: str, parquet_path: str) -> None:
 
     con = duckdb.connect(database=":memory:")
     try:
-        con.execute("PRAGMA threads=4")
+        con.execute(f"PRAGMA threads={int(threads)}")
+        con.execute(
+            "COPY (SELECT * FROM read_csv_auto($1, SAMPLE_SIZE=-1, nullstr=$2, auto_type_candidates=$3)) "
+            "TO $4 (FORMAT PARQUET, COMPRESSION ZSTD)",
+            [str(csv_p), list(DEFAULT_NULL_SENTINELS), DUCKDB_TYPE_CANDIDATES, str(parquet_p)],
+        )
+    finally:
+        con.close()
+
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _rejected_lines(con) -> Tuple[int, List[Dict[str, Any]]]:
+    """Lines the latest store_rejects scan skipped: their count and the first few with the error."""
+    scan = con.execute("SELECT max(scan_id) FROM reject_scans").fetchone()[0]
+    if scan is None:
+        return 0, []
+    count = con.execute(
+        "SELECT count(DISTINCT line) FROM reject_errors WHERE scan_id = $1", [scan]
+    ).fetchone()[0]
+    samples = con.execute(
+        "SELECT line, any_value(error_type), any_value(error_message) FROM reject_errors "
+        "WHERE scan_id = $1 GROUP BY line ORDER BY line LIMIT $2",
+        [scan, REJECTED_LINE_SAMPLES],
+    ).fetchall()
+    return int(count), [
+        {"line": int(line), "error_type": str(error_type), "error": str(message)}
+        for line, error_type, message in samples
+    ]
+
+
+def sanitize_csv_duckdb(
+    csv_path: str,
+    cleaned_csv_path: str,
+    parquet_path: str,
+    missing_tokens: Sequence[str],
+    sep: str = ",",
+    threads: int = 4,
+    memory_limit_mb: Optional[int] = None,
+    temp_dir: Optional[str] = None,
+    numeric_ratio: float = 0.6,
+    high_missing_ratio: float = 0.9,
+) -> Dict[str, Any]:
+    """
+    Sanitize a CSV with DuckDB and write the run's Parquet and cleaned CSV copies.
+
+    Applies the DataSanitizer rules as two streaming SQL passes instead of a
+    pandas round-trip: one aggregate pass decides per column whether it is
+    multi-line, numeric-coercible or droppable, and one COPY writes the typed
+    Parquet file. The cleaned CSV is then exported from the Parquet copy.
+    Parsing is multi-threaded and DuckDB spills to temp_dir once
+    memory_limit_mb is reached, so peak memory stays bounded.
+
+    Malformed lines (wrong field count, bad quoting) are skipped, as pandas'
+    on_bad_lines does, but recorded: ``rows_rejected`` counts them, and
+    ``rejected_lines`` lists the first REJECTED_LINE_SAMPLES with DuckDB's error.
+    ``rows_before`` includes them, so rows_before - rows_after is the loss.
+
+    Returns a sanitizer report with the same keys as DataSanitizer.sanitize,
+    plus ``rows_rejected`` and ``rejected_lines``.
+    """
+    parquet_p = Path(parquet_path)
+    parquet_p.parent.mkdir(parents=True, exist_ok=True)
+
+    con = duckdb.connect(database=":memory:")
+    try:
+        con.execute(f"PRAGMA threads={int(threads)}")
+        if memory_limit_mb:
+            con.execute(f"SET memory_limit='{int(memory_limit_mb)}MB'")
+        if temp_dir:
+            Path(temp_dir).mkdir(parents=True, exist_ok=True)
+            con.execute(f"SET temp_directory={_quote_literal(temp_dir)}")
+
+        source = (
+            f"read_csv({_quote_literal(csv_path)}, delim={_quote_literal(sep)}, header=true, "
+            "all_varchar=true, store_rejects=true)"
+        )
+        columns = [row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+        tokens = ", ".join(_quote_literal(t) for t in dict.fromkeys(missing_tokens))
+
+        def _value(col: str) -> str:
+            ident = _quote_ident(col)
+            return f"CASE WHEN {ident} IN ({tokens}) THEN NULL ELSE {ident} END"
+
+        cleaned = ", ".join(f"{_value(col)} AS v{idx}" for idx, col in enumerate(columns))
+        stats_exprs = ["count(*)"]
+        for idx in range(len(columns)):
+            value = f"v{idx}"
+            stats_exprs += [
+                f"count({value})",
+                f"count(TRY_CAST({value} AS DOUBLE))",
+                f"count(CASE WHEN NOT contains({value}, '.') AND TRY_CAST({value} AS BIGINT) IS NOT NULL THEN 1 END)",
+                f"count(CASE WHEN lower({value}) IN ('true', 'false') THEN 1 END)",
+                f"coalesce(bool_or(contains({value}, chr(10))), false)",
+            ]
+        # fetchall closes the result, which is when DuckDB writes the reject tables
+        stats = con.execute(
+            f"SELECT {', '.join(stats_exprs)} FROM (SELECT {cleaned} FROM {source})"
+        ).fetchall()[0]
+        total_rows = int(stats[0])
+        rejected, rejected_lines = _rejected_lines(con)
+
+        report: Dict[str, Any] = {
+            "rows_before": total_rows + rejected,
+            "cols_before": len(columns),
+            "multiline_columns": [],
+            "numeric_converted": [],
+            "dropped_all_null": [],
+            "dropped_high_missing": [],
+            "rows_rejected": rejected,
+            "rejected_lines": rejected_lines,
+        }
+
+        select_exprs = []
+        for idx, col in enumerate(columns):
+            non_null, numeric, integer, boolean, multiline = stats[1 + idx * 5: 6 + idx * 5]
+            value = _value(col)
+            remaining = non_null
+            if non_null == 0:
+                report["dropped_all_null"].append(col)
+                continue
+            if integer == non_null:
+                expr = f"TRY_CAST({value} AS BIGINT)"
+            elif numeric == non_null:
+                expr = f"TRY_CAST({value} AS DOUBLE)"
+            elif boolean == non_null:
+                expr = f"TRY_CAST({value} AS BOOLEAN)"
+            elif total_rows and numeric / total_rows >= numeric_ratio:
+                expr = f"TRY_CAST({value} AS DOUBLE)"
+                remaining = numeric
+                report["numeric_converted"].append(col)
+            elif multiline:
+                expr = f"replace(replace({value}, chr(13), ' '), chr(10), ' ')"
+                report["multiline_columns"].append(col)
+            else:
+                expr = value
+            if total_rows and (total_rows - remaining) / total_rows > high_missing_ratio:
+                report["dropped_high_missing"].append(col)
+                continue
+            select_exprs.append(f"{expr} AS {_quote_ident(col)}")
+
+        if not select_exprs:
+            raise ValueError("No usable columns left after sanitization")
+
         con.execute(
-            "CREATE TABLE t AS SELECT * FROM read_csv_auto(?, SAMPLE_SIZE=-1)",
-            [str(csv_p)],
+            f"COPY (SELECT {', '.join(select_exprs)} FROM {source}) "
+            f"TO {_quote_literal(str(parquet_p))} (FORMAT PARQUET, COMPRESSION ZSTD)"
         )
         con.execute(
-            "COPY t TO ? (FORMAT PARQUET, COMPRESSION ZSTD)",
-            [str(parquet_p)],
+            f"COPY (SELECT * FROM read_parquet({_quote_literal(str(parquet_p))})) "
+            f"TO {_quote_literal(cleaned_csv_path)} (HEADER, DELIMITER ',')"
         )
     finally:
         con.close()
 
+    report["rows_after"] = total_rows
+    report["cols_after"] = len(select_exprs)
+    return report
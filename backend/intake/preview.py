@@ -0,0 +1,467 @@
+"""
+Bounded-cost dataset preview.
+
+Reads a byte-bounded head of an upload plus a few random seeks into its body,
+never the whole file, and derives the identity-card inputs from that sample:
+a row count (exact for the head, estimated for the rest from the bytes per
+record seen in the seek windows) with 95% bounds, and per-column types and
+missing ratios with Wilson intervals. Delimited files whose quoted fields
+span lines cannot be sampled by seeking (a window may start inside a record),
+so those are sampled from the head only and their row count has no upper
+bound; ``row_count_method`` says which applies. Works on a path or directly on
+a seekable binary file object (e.g. an UploadFile's spool), so the preview
+does not have to copy the upload to disk first.
+"""
+import io
+import json
+import math
+import os
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional: without it parquet previews load the file
+    pq = None
+
+HEAD_BYTES = 1024 * 1024
+SEEK_COUNT = 8
+SEEK_BYTES = 64 * 1024
+SHEET_SAMPLE_ROWS = 5000
+Z_95 = 1.96
+
+DELIMITERS = {".csv": ",", ".tsv": "\t", ".txt": "\t"}
+
+# How PreviewSample.row_count was obtained
+ROW_COUNT_EXACT = "exact"            # counted, or recorded by the format
+ROW_COUNT_SAMPLED = "sampled"        # head + seek windows, 95% bounds
+ROW_COUNT_HEAD_ONLY = "head_only"    # extrapolated from the head, no upper bound
+
+Source = Union[str, Path, IO[bytes]]
+
+
+@dataclass
+class PreviewSample:
+    """Rows sampled from a dataset and what they say about the whole file."""
+
+    df: pd.DataFrame
+    row_count: int
+    row_count_exact: bool
+    row_count_bounds: Tuple[int, Optional[int]]
+    file_size: int
+    bytes_read: int
+    sheets: List[str] = field(default_factory=list)
+    row_count_method: str = ""
+
+    def __post_init__(self):
+        if not self.row_count_method:
+            self.row_count_method = ROW_COUNT_EXACT if self.row_count_exact else ROW_COUNT_SAMPLED
+
+
+@contextmanager
+def _open(source: Source):
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as fh:
+            yield fh
+    else:
+        yield source
+
+
+def _file_size(fh: IO[bytes]) -> int:
+    fh.seek(0, os.SEEK_END)
+    size = fh.tell()
+    fh.seek(0)
+    return size
+
+
+def wilson_interval(successes: float, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """95% Wilson score interval for a proportion observed in ``n`` trials."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, round(centre - half, 4)), min(1.0, round(centre + half, 4))
+
+
+def estimate_row_count(
+    head_rows: int,
+    remaining_bytes: int,
+    windows: List[Tuple[int, int]],
+    z: float = Z_95,
+) -> Tuple[int, Tuple[int, Optional[int]]]:
+    """
+    Rows in a file whose head holds ``head_rows`` and whose other
+    ``remaining_bytes`` were sampled by seek ``windows`` of (bytes, records).
+
+    Bytes per record is a ratio estimate over the windows; its standard error
+    is taken across windows (records inside one window are not independent),
+    so with fewer than two windows there is no upper bound.
+    """
+    windows = [(b, n) for b, n in windows if n > 0]
+    if remaining_bytes <= 0:
+        return head_rows, (head_rows, head_rows)
+    if not windows:
+        return head_rows, (head_rows, None)
+    total_bytes = sum(b for b, _ in windows)
+    total_records = sum(n for _, n in windows)
+    ratio = total_bytes / total_records
+    estimate = head_rows + round(remaining_bytes / ratio)
+    if len(windows) < 2:
+        return estimate, (head_rows + 1, None)
+    k = len(windows)
+    mean_records = total_records / k
+    spread = sum((b - ratio * n) ** 2 for b, n in windows) / (k - 1)
+    se = math.sqrt(spread / k) / mean_records
+    lower = head_rows + math.floor(remaining_bytes / (ratio + z * se))
+    upper_ratio = ratio - z * se
+    upper = head_rows + math.ceil(remaining_bytes / upper_ratio) if upper_ratio > 0 else None
+    return estimate, (lower, upper)
+
+
+def _seek_offsets(start: int, size: int) -> List[int]:
+    """
+    One random window per equal stratum of [start, size), never overlapping;
+    seeded by the size so a file always previews the same way.
+    """
+    span = SEEK_BYTES
+    count = min(SEEK_COUNT, (size - start) // span)
+    if count <= 0:
+        return []
+    rng = random.Random(size)
+    stride = (size - start) / count
+    return [int(start + stride * i + rng.random() * (stride - span)) for i in range(count)]
+
+
+def _read_window(fh: IO[bytes], offset: int) -> bytes:
+    fh.seek(offset)
+    return fh.read(SEEK_BYTES)
+
+
+def _whole_lines(chunk: bytes) -> bytes:
+    """Complete lines of a window (the partial first and last line are dropped)."""
+    first, last = chunk.find(b"\n"), chunk.rfind(b"\n")
+    if first < 0 or first == last:
+        return b""
+    return chunk[first + 1:last + 1]
+
+
+def _record_ends(body: bytes) -> np.ndarray:
+    """Offsets of the newlines in ``body`` that end a record, i.e. lie outside double quotes."""
+    data = np.frombuffer(body, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord("\n"))
+    # An escaped quote ("") adds two, so parity still tells inside from outside
+    inside = np.cumsum(data == ord('"'))[newlines] % 2 == 1
+    return newlines[~inside]
+
+
+def _read_head(fh: IO[bytes], size: int) -> bytes:
+    head = fh.read(HEAD_BYTES)
+    if size - len(head) <= SEEK_BYTES:
+        head += fh.read()  # the tail fits in one seek's budget: read the file whole
+    return head
+
+
+def _sample_lines(
+    fh: IO[bytes], size: int, skip_header: bool, quoted: bool = False
+) -> Tuple[bytes, bytes, int, int, Optional[List[Tuple[int, int]]], int]:
+    """
+    Head plus random-seek lines of a line-oriented file.
+
+    Returns (header, sampled lines, complete lines in the head, file bytes
+    after them, (bytes, lines) per seek window, bytes read). With ``quoted``,
+    once the head or a seek window shows quoted fields containing newlines,
+    the head is returned alone, cut at its last complete record, with None for
+    the windows: seek windows aligned on newlines would start inside records.
+    """
+    head = _read_head(fh, size)
+    header_end = head.find(b"\n") + 1 if skip_header else 0
+    if skip_header and header_end == 0 and len(head) < size:
+        raise ValueError(f"Header row is longer than the {HEAD_BYTES} byte preview budget")
+    header = head[:header_end]
+    if len(head) >= size:
+        body = head[header_end:]
+        if body and not body.endswith(b"\n"):
+            body += b"\n"
+        return header, body, body.count(b"\n"), 0, [], len(head)
+
+    body = head[header_end:head.rfind(b"\n") + 1]
+
+    def head_records(bytes_read):
+        ends = _record_ends(body)
+        records = body[:ends[-1] + 1] if len(ends) else b""
+        return header, records, len(ends), size - len(header) - len(records), None, bytes_read
+
+    if quoted and b'"' in body and len(_record_ends(body)) != body.count(b"\n"):
+        return head_records(len(head))
+    blocks = [body]
+    windows = []
+    bytes_read = len(head)
+    for offset in _seek_offsets(len(head), size):
+        block = _whole_lines(_read_window(fh, offset))
+        if quoted and b'"' in block and any(line.count(b'"') % 2 for line in block.split(b"\n")):
+            return head_records(bytes_read + SEEK_BYTES)
+        blocks.append(block)
+        windows.append((len(block), block.count(b"\n")))
+        bytes_read += SEEK_BYTES
+    remaining = size - len(header) - len(body)
+    return header, b"".join(blocks), body.count(b"\n"), remaining, windows, bytes_read
+
+
+def _sample_delimited(fh: IO[bytes], size: int, sep: str) -> PreviewSample:
+    header, body, head_rows, remaining, windows, bytes_read = _sample_lines(fh, size, skip_header=True, quoted=True)
+    df = pd.read_csv(
+        io.BytesIO(header + body),
+        sep=sep,
+        on_bad_lines="skip",
+        encoding_errors="replace",
+        low_memory=False,
+    )
+    if not remaining:
+        return PreviewSample(df, len(df), True, (len(df), len(df)), size, bytes_read)
+    if windows is None:
+        # Multi-line records: extrapolate the head's bytes per record, with no upper bound
+        estimate = head_rows + round(remaining * head_rows / len(body)) if head_rows else 0
+        return PreviewSample(
+            df, max(estimate, head_rows + 1), False, (head_rows + 1, None), size, bytes_read,
+            row_count_method=ROW_COUNT_HEAD_ONLY,
+        )
+    estimate, bounds = estimate_row_count(head_rows, remaining, windows)
+    return PreviewSample(df, estimate, False, bounds, size, bytes_read)
+
+
+def _decode_records(text: str, pos: int) -> Tuple[List[Any], List[int], int]:
+    """
+    Decode consecutive JSON array elements from ``pos`` until the buffer runs
+    out; returns them with the offset each one starts at and where the last ends.
+    """
+    decoder = json.JSONDecoder()
+    records, starts = [], []
+    end = pos
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            break
+        try:
+            record, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            break  # truncated by the read budget
+        records.append(record)
+        starts.append(pos)
+        pos = end
+    return records, starts, end
+
+
+def _record_period(text: str, starts: List[int]) -> Tuple[int, int]:
+    """(bytes, records) from the first record's start to the last one's: whole records plus separators."""
+    if len(starts) < 2:
+        return 0, 0
+    return len(text[starts[0]:starts[-1]].encode("utf-8")), len(starts) - 1
+
+
+def _array_window(chunk: bytes) -> Tuple[List[Any], Tuple[int, int]]:
+    """
+    Records of a flat JSON array found in a seek window, and the bytes they span.
+
+    The window starts mid-record, so decoding is attempted from each of the
+    first few ``{`` until one yields a run of records.
+    """
+    text = chunk.decode("utf-8", errors="ignore")
+    pos = text.find("{")
+    for _ in range(8):
+        if pos < 0:
+            break
+        records, starts, _ = _decode_records(text, pos)
+        if len(records) > 1:
+            return records, _record_period(text, starts)
+        pos = text.find("{", pos + 1)
+    return [], (0, 0)
+
+
+def _is_flat(records: List[Any]) -> bool:
+    return bool(records) and all(
+        isinstance(r, dict) and not any(isinstance(v, (dict, list)) for v in r.values())
+        for r in records
+    )
+
+
+def _sample_json(fh: IO[bytes], size: int) -> PreviewSample:
+    head = _read_head(fh, size)
+    stripped = head.lstrip()
+    if len(head) >= size:
+        df = pd.read_json(io.BytesIO(head), lines=_looks_like_lines(stripped))
+        return PreviewSample(df, len(df), True, (len(df), len(df)), size, len(head))
+
+    if stripped.startswith(b"["):
+        text = head.decode("utf-8", errors="ignore")
+        records, starts, end = _decode_records(text, text.index("[") + 1)
+        head_rows, bytes_read, windows = len(records), len(head), []
+        # Seek windows can only be aligned on record boundaries when records hold no nested values
+        if _is_flat(records):
+            for offset in _seek_offsets(len(head), size):
+                window_records, period = _array_window(_read_window(fh, offset))
+                records.extend(window_records)
+                windows.append(period)
+                bytes_read += SEEK_BYTES
+        else:
+            windows.append(_record_period(text, starts))
+        df = pd.json_normalize(records, max_level=0)
+        remaining = size - len(text[:end].encode("utf-8"))
+        estimate, bounds = estimate_row_count(head_rows, remaining, windows)
+        return PreviewSample(df, estimate, False, bounds, size, bytes_read)
+
+    if _looks_like_lines(stripped):
+        fh.seek(0)
+        _, body, head_rows, remaining, windows, bytes_read = _sample_lines(fh, size, skip_header=False)
+        records = []
+        for line in body.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        df = pd.json_normalize(records, max_level=0)
+        estimate, bounds = estimate_row_count(head_rows, remaining, windows)
+        return PreviewSample(df, estimate, False, bounds, size, bytes_read)
+
+    # A single column-oriented object has no record boundaries to sample on
+    fh.seek(0)
+    df = pd.read_json(fh)
+    return PreviewSample(df, len(df), True, (len(df), len(df)), size, size)
+
+
+def _looks_like_lines(head: bytes) -> bool:
+    first = head.split(b"\n", 1)[0].strip()
+    if not first.startswith(b"{") or b"\n" not in head.strip():
+        return False
+    try:
+        json.loads(first)
+    except ValueError:
+        return False
+    return True
+
+
+def _sheet_row_count(xl: pd.ExcelFile, sheet: str) -> Optional[int]:
+    """Data rows declared by the workbook (openpyxl dimension / xlrd nrows), when it records them."""
+    try:
+        book = xl.book
+        if hasattr(book, "sheet_by_name"):
+            return max(book.sheet_by_name(sheet).nrows - 1, 0)
+        max_row = book[sheet].max_row
+        return max(max_row - 1, 0) if max_row else None
+    except Exception:
+        return None
+
+
+def _sample_excel(fh: IO[bytes], size: int, sheet_name: Optional[str]) -> PreviewSample:
+    xl = pd.ExcelFile(fh)
+    sheets = list(xl.sheet_names)
+    sheet = sheet_name if sheet_name in sheets else sheets[0]
+    df = xl.parse(sheet, nrows=SHEET_SAMPLE_ROWS)
+    declared = _sheet_row_count(xl, sheet)
+    if len(df) < SHEET_SAMPLE_ROWS:
+        total, exact, bounds = len(df), True, (len(df), len(df))
+    elif declared is not None:
+        total, exact, bounds = declared, False, (len(df), declared)
+    else:
+        total, exact, bounds = len(df), False, (len(df), None)
+    return PreviewSample(df, total, exact, bounds, size, size, sheets=sheets)
+
+
+def _sample_parquet(fh: IO[bytes], size: int) -> PreviewSample:
+    if pq is None:
+        df = pd.read_parquet(fh)
+        return PreviewSample(df, len(df), True, (len(df), len(df)), size, size)
+    parquet = pq.ParquetFile(fh)
+    total = parquet.metadata.num_rows
+    batch = next(parquet.iter_batches(batch_size=SHEET_SAMPLE_ROWS), None)
+    if batch is None:
+        df = parquet.schema_arrow.empty_table().to_pandas()
+    else:
+        df = batch.to_pandas()
+    # Row count comes from the footer, so it is exact even though only one batch is read
+    return PreviewSample(df, total, True, (total, total), size, fh.tell())
+
+
+def sample_dataset(source: Source, file_ext: str, sheet_name: Optional[str] = None) -> PreviewSample:
+    """
+    Sample a dataset for preview within a fixed read budget.
+
+    Args:
+        source: Path, or a seekable binary file object (left open)
+        file_ext: Extension deciding the format (".csv", ".json", ...)
+        sheet_name: Excel sheet to sample (default: the first)
+
+    Returns:
+        PreviewSample; ``row_count`` is exact when the whole file fit in the
+        budget or the format records it, otherwise an estimate with bounds
+    """
+    file_ext = file_ext.lower()
+    with _open(source) as fh:
+        size = _file_size(fh)
+        if file_ext in DELIMITERS:
+            return _sample_delimited(fh, size, DELIMITERS[file_ext])
+        if file_ext == ".json":
+            return _sample_json(fh, size)
+        if file_ext in {".xls", ".xlsx"}:
+            return _sample_excel(fh, size, sheet_name)
+        if file_ext == ".parquet":
+            return _sample_parquet(fh, size)
+    raise ValueError(f"Unsupported file type for preview: {file_ext}")
+
+
+def _type_matches(series: pd.Series) -> Tuple[str, int]:
+    """Inferred type and how many of the non-null sampled values agree with it."""
+    values = series.dropna()
+    if pd.api.types.is_bool_dtype(series):
+        return "Boolean", len(values)
+    if pd.api.types.is_numeric_dtype(series):
+        return "Numeric", len(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "DateTime", len(values)
+    numeric = int(pd.to_numeric(values, errors="coerce").notna().sum()) if len(values) else 0
+    if values.size and numeric / values.size >= 0.95:
+        return "Numeric", numeric
+    return "String", len(values)
+
+
+def column_summary(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Per-column type and missing ratio from a sample, with 95% bounds.
+
+    ``type_confidence`` is the Wilson lower bound on the share of values in
+    the full column that fit the inferred type, given the sampled ones.
+    """
+    n = len(df)
+    summary = []
+    for col in df.columns:
+        series = df[col]
+        missing = int(series.isnull().sum())
+        col_type, matching = _type_matches(series)
+        present = n - missing
+        summary.append({
+            "name": str(col),
+            "type": col_type,
+            "dtype": str(series.dtype),
+            "missing_ratio": round(missing / n, 4) if n else 0.0,
+            "missing_bounds": list(wilson_interval(missing, n)),
+            "type_confidence": wilson_interval(matching, present)[0] if present else 0.0,
+        })
+    return summary
+
+
+def quality_bounds(df: pd.DataFrame) -> List[float]:
+    """95% bounds on completeness (1 - missing cell ratio), counting each sampled row as one trial."""
+    n = len(df)
+    if n == 0 or len(df.columns) == 0:
+        return [0.0, 1.0]
+    missing_ratio = float(df.isnull().to_numpy().mean())
+    lower, upper = wilson_interval(missing_ratio * n, n)
+    return [round(1 - upper, 4), round(1 - lower, 4)]
@@ -6,6 +6,8 @@ from typing import Dict, List, Tuple, Optional, Any
 import numpy as np
 import pandas as pd
 
+from core.column_stats import compute_column_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -91,6 +93,9 @@ def _profile_dataframe_full(df: pd.DataFrame, target_column: Optional[str] = Non
         "column_count": int(len(df.columns)),
         "columns": {},
     }
+    numeric_stats = compute_column_stats(
+        df, [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    )
 
     for col in df.columns:
         series = df[col]
@@ -101,15 +106,16 @@ def _profile_dataframe_full(df: pd.DataFrame, target_column: Optional[str] = Non
         }
 
         if pd.api.types.is_numeric_dtype(series):
+            col_stats = numeric_stats.column(col)
             col_profile.update(
                 {
-                    "min": _safe_float(series.min()),
-                    "max": _safe_float(series.max()),
-                    "mean": _safe_float(series.mean()),
-                    "std": _safe_float(series.std(ddof=0)),
-                    "p25": _safe_float(series.quantile(0.25)),
-                    "p50": _safe_float(series.quantile(0.5)),
-                    "p75": _safe_float(series.quantile(0.75)),
+                    "min": _safe_float(col_stats["min"]),
+                    "max": _safe_float(col_stats["max"]),
+                    "mean": _safe_float(col_stats["mean"]),
+                    "std": _safe_float(col_stats["std_pop"]),
+                    "p25": _safe_float(col_stats["q25"]),
+                    "p50": _safe_float(col_stats["q50"]),
+                    "p75": _safe_float(col_stats["q75"]),
                 }
             )
         else:
@@ -10,6 +10,9 @@ import pandas as pd
 
 from ace_v4.performance.config import PerformanceConfig
 from ace_v4.performance.io import ChunkedCSVReader
+from agents.data_sanitizer import MISSING_TOKENS, NUMERIC_COERCE_RATIO, HIGH_MISSING_RATIO
+from core.csv_defaults import PANDAS_DEFAULT_NA_VALUES
+from core.data_loader import columnar_path_for, write_columnar_dataset
 from intake.profiling import profile_dataframe, compute_drift_report, compute_sample_drift, compute_recency_drift, save_json
 from jobs.progress import ProgressTracker
 
@@ -75,6 +78,30 @@ def _datetime_candidate_values(series: pd.Series) -> pd.Series:
     return values[values.str.contains(_DATE_LIKE_PATTERN, na=False)]
 
 
+def _stream_with_duckdb(
+    upload_path: str,
+    run_path: str,
+    cleaned_path: Path,
+    cfg: PerformanceConfig,
+) -> Dict:
+    """Sanitize the upload with DuckDB straight into the run's Parquet and cleaned CSV."""
+    from intake.fast_ingest import sanitize_csv_duckdb
+
+    sep = "\t" if Path(upload_path).suffix.lower() in {".tsv", ".txt"} else ","
+    return sanitize_csv_duckdb(
+        upload_path,
+        str(cleaned_path),
+        str(columnar_path_for(str(cleaned_path))),
+        missing_tokens=list(PANDAS_DEFAULT_NA_VALUES) + list(MISSING_TOKENS),
+        sep=sep,
+        threads=cfg.max_workers,
+        memory_limit_mb=cfg.memory_soft_limit_mb,
+        temp_dir=str(Path(run_path) / "cache" / "duckdb_tmp"),
+        numeric_ratio=NUMERIC_COERCE_RATIO,
+        high_missing_ratio=HIGH_MISSING_RATIO,
+    )
+
+
 def prepare_run_data(
     upload_path: str,
     run_path: str,
@@ -84,8 +111,9 @@ def prepare_run_data(
     """
     Prepare dataset for a run:
     - sample for type inference and quick inspection
-    - stream the full file into cleaned_uploaded.csv with chunking
-    Returns path to cleaned CSV and metadata (sample path, dtypes, rows).
+    - sanitize the full file into cleaned_uploaded.csv and its typed columnar
+      copy (DuckDB for delimited files, pandas chunking otherwise)
+    Returns path to cleaned CSV and metadata (sample path, dtypes, rows, columnar path).
     """
     cfg = config or PerformanceConfig()
     reader = ChunkedCSVReader(cfg)
@@ -222,20 +250,37 @@ def prepare_run_data(
             },
         )
 
-    for idx, chunk in enumerate(reader.iter_chunks(upload_path)):
-        write_header = idx == 0
-        chunk.to_csv(cleaned_path, mode="w" if write_header else "a", index=False, header=write_header)
-        total_rows += len(chunk)
-        chunks += 1
-        if progress and idx % 1 == 0:
-            progress.update(
-                "ingestion",
-                {
-                    "status": "streaming",
-                    "chunks_written": chunks,
-                    "rows_processed": total_rows,
-                },
-            )
+    engine = "pandas"
+    sanitizer_report = None
+    columnar_path = None
+    if cfg.ingest_engine == "duckdb" and Path(upload_path).suffix.lower() in {".csv", ".tsv", ".txt"}:
+        try:
+            sanitizer_report = _stream_with_duckdb(upload_path, run_path, cleaned_path, cfg)
+            columnar_path = str(columnar_path_for(str(cleaned_path)))
+            total_rows = sanitizer_report["rows_after"]
+            engine = "duckdb"
+            if sanitizer_report.get("rows_rejected"):
+                print(f"[Ingestion] Skipped {sanitizer_report['rows_rejected']} malformed rows (see sanitizer_report)")
+        except Exception as e:
+            print(f"[Ingestion] DuckDB ingestion failed ({e}); falling back to chunked pandas")
+            sanitizer_report = None
+
+    if engine == "pandas":
+        for idx, chunk in enumerate(reader.iter_chunks(upload_path)):
+            write_header = idx == 0
+            chunk.to_csv(cleaned_path, mode="w" if write_header else "a", index=False, header=write_header)
+            total_rows += len(chunk)
+            chunks += 1
+            if progress and idx % 1 == 0:
+                progress.update(
+                    "ingestion",
+                    {
+                        "status": "streaming",
+                        "chunks_written": chunks,
+                        "rows_processed": total_rows,
+                    },
+                )
+        columnar_path = write_columnar_dataset(str(cleaned_path))
 
     if progress:
         progress.update(
@@ -244,6 +289,7 @@ def prepare_run_data(
                 "status": "completed",
                 "chunks_written": chunks,
                 "rows_processed": total_rows,
+                "engine": engine,
                 "sample_path": str(sample_path),
             },
         )
@@ -256,11 +302,9 @@ def prepare_run_data(
         "drift_report": str(drift_report_path),
         "drift_status": drift_report.get("status", "none"),
         "coercion_report": str(coercion_path),
+        "columnar_path": columnar_path,
+        "engine": engine,
+        "rows_rejected": (sanitizer_report or {}).get("rows_rejected", 0),
+        "sanitizer_report": sanitizer_report,
     }
     return str(cleaned_path), meta
-
-
-
-
-
-
@@ -0,0 +1,172 @@
+"""
+Resource-aware admission control for the job worker.
+
+Each job's memory cost is estimated from its input file size, the same way
+calculate_file_timeout scales its deadline. Its CPU cost is what one pipeline
+run can keep busy: the steps the DAG scheduler runs at once times the threads
+each agent is allowed. Jobs are admitted only while the worker's global memory
+budget has headroom and enough CPU slots are free.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ace_v4.performance.config import PerformanceConfig
+from core.agent_runtime import resolve_agent_threads
+from core.dag_scheduler import resolve_max_concurrency, resolve_scheduler_mode
+from core.data_loader import calculate_file_timeout
+
+# Overrides for the worker's memory budget and concurrency
+WORKER_MEMORY_ENV = "ACE_WORKER_MEMORY_MB"
+WORKER_MAX_JOBS_ENV = "ACE_WORKER_MAX_JOBS"
+# Share of physical memory the worker may commit to jobs when no budget is set
+DEFAULT_MEMORY_FRACTION = 0.8
+
+
+@dataclass(frozen=True)
+class JobCost:
+    memory_mb: float
+    cpus: int
+    timeout_seconds: int
+
+
+def _env_number(name: str) -> Optional[float]:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def job_cpu_cost(config: PerformanceConfig) -> int:
+    """CPUs one pipeline run can occupy: concurrent steps times threads per agent."""
+    steps = resolve_max_concurrency(config.max_concurrent_steps) if resolve_scheduler_mode() == "dag" else 1
+    return steps * resolve_agent_threads(config.agent_threads)
+
+
+def _total_memory_mb() -> Optional[float]:
+    try:
+        import psutil
+        return psutil.virtual_memory().total / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _available_memory_mb() -> Optional[float]:
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+class AdmissionController:
+    """
+    Tracks the memory and CPU committed to running jobs.
+
+    A job that does not fit waits until running jobs release enough budget.
+    When nothing is running a job is always admitted, so a single job larger
+    than the whole budget still makes progress.
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: Optional[float] = None,
+        max_jobs: Optional[int] = None,
+        config: Optional[PerformanceConfig] = None,
+        cpu_count: Optional[int] = None,
+    ):
+        self.config = config or PerformanceConfig()
+        cpus = cpu_count or os.cpu_count() or 1
+        if memory_budget_mb is None:
+            memory_budget_mb = _env_number(WORKER_MEMORY_ENV)
+        if memory_budget_mb is None:
+            total = _total_memory_mb()
+            memory_budget_mb = total * DEFAULT_MEMORY_FRACTION if total else self.config.memory_soft_limit_mb
+        self.cpu_slots = max(1, cpus)
+        # A job wider than the machine still runs, alone
+        self.job_cpus = min(job_cpu_cost(self.config), self.cpu_slots)
+        if max_jobs is None:
+            env_jobs = _env_number(WORKER_MAX_JOBS_ENV)
+            max_jobs = int(env_jobs) if env_jobs else self.cpu_slots // self.job_cpus
+        self.memory_budget_mb = float(memory_budget_mb)
+        self.max_jobs = max(1, int(max_jobs))
+        self.memory_used_mb = 0.0
+        self.cpus_used = 0
+        self.running = 0
+        self._cond = threading.Condition()
+
+    def estimate(self, file_path: Optional[str]) -> JobCost:
+        """Memory, CPU and timeout for a job over ``file_path``."""
+        try:
+            size_mb = os.path.getsize(file_path) / (1024 * 1024) if file_path else 0.0
+        except OSError:
+            size_mb = 0.0
+        # Agents sample files above large_file_size_mb, so memory stops growing there
+        scaled_mb = min(size_mb, self.config.large_file_size_mb)
+        memory = self.config.job_base_memory_mb + scaled_mb * self.config.job_memory_per_mb
+        return JobCost(
+            memory_mb=float(memory),
+            cpus=self.job_cpus,
+            timeout_seconds=calculate_file_timeout(file_path, self.config),
+        )
+
+    def _fits(self, cost: JobCost) -> bool:
+        if self.running == 0:
+            return True
+        if self.running >= self.max_jobs:
+            return False
+        if self.memory_used_mb + cost.memory_mb > self.memory_budget_mb:
+            return False
+        if self.cpus_used + cost.cpus > self.cpu_slots:
+            return False
+        available = _available_memory_mb()
+        return available is None or cost.memory_mb <= available
+
+    def _minimum_cost(self) -> JobCost:
+        return JobCost(float(self.config.job_base_memory_mb), self.job_cpus, 0)
+
+    def wait_for_capacity(self, timeout: float) -> bool:
+        """Wait until a minimum-cost job could start (checked before pulling from the queue)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._fits(self._minimum_cost()), timeout=timeout)
+
+    def admit(self, cost: JobCost, timeout: Optional[float] = None) -> bool:
+        """Reserve ``cost``, waiting up to ``timeout`` seconds for headroom."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._fits(cost):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.memory_used_mb += cost.memory_mb
+            self.cpus_used += cost.cpus
+            self.running += 1
+            return True
+
+    def release(self, cost: JobCost) -> None:
+        with self._cond:
+            self.memory_used_mb = max(0.0, self.memory_used_mb - cost.memory_mb)
+            self.cpus_used = max(0, self.cpus_used - cost.cpus)
+            self.running = max(0, self.running - 1)
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "running": self.running,
+                "max_jobs": self.max_jobs,
+                "memory_used_mb": round(self.memory_used_mb, 1),
+                "memory_budget_mb": round(self.memory_budget_mb, 1),
+                "cpus_used": self.cpus_used,
+                "cpu_slots": self.cpu_slots,
+                "job_cpus": self.job_cpus,
+            }
+
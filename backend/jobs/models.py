@@ -1,7 +1,7 @@
 import json
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 
 class JobStatus(str, Enum):
@@ -21,6 +21,8 @@ class Job:
     message: Optional[str] = None
     run_path: Optional[str] = None
     run_config: Optional[Any] = field(default=None)
+    # {"source_run_id", "source_run_path", "from_step"} for runs forked from an existing run
+    rerun: Optional[Dict[str, Any]] = field(default=None)
 
     @classmethod
     def from_row(cls, row: tuple):
@@ -9,53 +9,101 @@ import redis
 import json
 import uuid
 import os
+import socket
 import threading
 import time
+from dataclasses import fields
 from typing import Optional, List
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from .models import Job, JobStatus
 
 
 # Job timeout configuration
 JOB_TIMEOUT_MINUTES = int(os.getenv("JOB_TIMEOUT_MINUTES", "120"))  # Default 120 min
 CLEANUP_INTERVAL_SECONDS = 60  # Check for stuck jobs every minute
+# A worker whose liveness key has not been refreshed for this long is presumed dead
+WORKER_TTL_SECONDS = 120
+# The keepalive thread refreshes the key this often, whatever the worker is busy with
+KEEPALIVE_INTERVAL_SECONDS = WORKER_TTL_SECONDS / 4
+# Bump when the index layout changes; older state is re-indexed once on connect
+INDEX_VERSION = "1"
+
+_FINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
+_JOB_FIELDS = {f.name for f in fields(Job)}
+
+
+def _job_from_dict(job_dict: dict) -> Job:
+    return Job(**{k: v for k, v in job_dict.items() if k in _JOB_FIELDS})
+
+
+def _timestamp(iso_value: Optional[str]) -> float:
+    try:
+        return datetime.fromisoformat(iso_value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return time.time()
 
 
 class RedisJobQueue:
     """
     Redis-based job queue for ACE analysis pipeline.
-    
-    Uses Redis lists for queue and hashes for job state storage.
+
+    Job records live in one hash (O(1) lookup by run_id). The queue list holds
+    run_ids; a worker claims one by atomically moving it into its own
+    processing list, and it stays there until the job reaches a final status,
+    so a job claimed by a worker that dies is put back on the queue instead of
+    being lost. Secondary indexes keep status listing and stuck-job detection
+    off the full hash:
+
+    - ``ace:jobs:status:<status>``: sorted set of run_ids by last update
+    - ``ace:jobs:created``: sorted set of all run_ids by creation time
+    - ``ace:jobs:heartbeats``: sorted set of running run_ids by last heartbeat
+
     Designed for Railway multi-service architecture.
     """
-    
-    def __init__(self, redis_url: Optional[str] = None):
+
+    def __init__(self, redis_url: Optional[str] = None, client=None, worker_id: Optional[str] = None):
         """
         Initialize Redis connection.
-        
+
         Args:
             redis_url: Redis connection URL (defaults to REDIS_URL env var)
+            client: Ready Redis client (e.g. fakeredis in tests); skips redis_url
+            worker_id: Name of this consumer's processing list (defaults to host:pid:random)
         """
+        # Redis keys
+        self.queue_key = "ace:jobs:queue"
+        self.state_key = "ace:jobs:state"
+        self.created_key = "ace:jobs:created"
+        self.heartbeat_key = "ace:jobs:heartbeats"
+        self.claims_key = "ace:jobs:claims"
+        self.index_version_key = "ace:jobs:index_version"
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.processing_key = self._processing_key(self.worker_id)
+        self._keepalive: Optional[threading.Thread] = None
+        self._keepalive_stop = threading.Event()
+        self._keepalive_lock = threading.Lock()
+
+        if client is not None:
+            self.redis = client
+            self._ensure_indexes()
+            return
+
         url = redis_url or os.getenv("REDIS_URL")
-        
+
         if not url:
             raise ValueError(
                 "REDIS_URL environment variable not set. "
                 "Please configure Redis service in Railway and link it to this service."
             )
-        
+
         print(f"[RedisQueue] Connecting to Redis...")
-        
+
         try:
             self.redis = redis.from_url(url, decode_responses=True, socket_connect_timeout=5)
         except Exception as e:
             print(f"[RedisQueue] Failed to create Redis client: {e}")
             raise
-        
-        # Redis keys
-        self.queue_key = "ace:jobs:queue"
-        self.state_key = "ace:jobs:state"
-        
+
         # Test connection
         try:
             self.redis.ping()
@@ -67,21 +115,110 @@ class RedisJobQueue:
         except Exception as e:
             print(f"[RedisQueue] Unexpected error during Redis ping: {e}")
             raise
-    
-    def enqueue(self, file_path: str, run_config: Optional[dict] = None) -> str:
+
+        self._ensure_indexes()
+
+    # ------------------------------------------------------------------
+    # Keys and indexes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _status_key(status: str) -> str:
+        return f"ace:jobs:status:{status}"
+
+    @staticmethod
+    def _processing_key(worker_id: str) -> str:
+        return f"ace:jobs:processing:{worker_id}"
+
+    @staticmethod
+    def _worker_key(worker_id: str) -> str:
+        return f"ace:jobs:worker:{worker_id}"
+
+    def _index(self, pipe, run_id: str, job_data: dict, previous_status: Optional[str] = None):
+        """Queue index updates for a job's current record on ``pipe``."""
+        status = job_data.get("status")
+        updated = _timestamp(job_data.get("updated_at"))
+        for other in JobStatus:
+            if other.value != status and (previous_status is None or other.value == previous_status):
+                pipe.zrem(self._status_key(other.value), run_id)
+        pipe.zadd(self._status_key(status), {run_id: updated})
+        if status == JobStatus.RUNNING.value:
+            pipe.zadd(self.heartbeat_key, {run_id: updated})
+        else:
+            pipe.zrem(self.heartbeat_key, run_id)
+
+    def _ensure_indexes(self):
+        """Build the secondary indexes once for state written before they existed."""
+        if self.redis.get(self.index_version_key) == INDEX_VERSION:
+            return
+        all_jobs = self.redis.hgetall(self.state_key)
+        pipe = self.redis.pipeline()
+        for run_id, job_json in all_jobs.items():
+            try:
+                job_data = json.loads(job_json)
+            except ValueError:
+                continue
+            pipe.zadd(self.created_key, {run_id: _timestamp(job_data.get("created_at"))})
+            self._index(pipe, run_id, job_data)
+        pipe.set(self.index_version_key, INDEX_VERSION)
+        pipe.execute()
+        if all_jobs:
+            print(f"[RedisQueue] Indexed {len(all_jobs)} existing jobs")
+
+    def _touch_worker(self):
+        self.redis.set(self._worker_key(self.worker_id), "1", ex=WORKER_TTL_SECONDS)
+
+    def start_keepalive(self):
+        """
+        Keep this worker's liveness key fresh from a background thread.
+
+        Polls and job heartbeats alone leave gaps (a job still initialising, or
+        the worker waiting for admission capacity) long enough for the key to
+        expire and the worker's claims to be requeued while it is still alive.
+        Started by the first ``fetch_next``; idempotent.
+        """
+        with self._keepalive_lock:
+            if self._keepalive is not None and self._keepalive.is_alive():
+                return
+            self._touch_worker()
+            self._keepalive_stop.clear()
+
+            def keepalive_loop():
+                while not self._keepalive_stop.wait(KEEPALIVE_INTERVAL_SECONDS):
+                    try:
+                        self._touch_worker()
+                    except Exception as e:
+                        print(f"[RedisQueue] Keepalive error for worker {self.worker_id}: {e}")
+
+            self._keepalive = threading.Thread(target=keepalive_loop, daemon=True, name="worker-keepalive")
+            self._keepalive.start()
+
+    def stop_keepalive(self):
+        """Stop refreshing the liveness key; claims are requeued once it expires."""
+        self._keepalive_stop.set()
+        if self._keepalive is not None:
+            self._keepalive.join(timeout=2)
+            self._keepalive = None
+
+    # ------------------------------------------------------------------
+    # Producer / consumer
+    # ------------------------------------------------------------------
+
+    def enqueue(self, file_path: str, run_config: Optional[dict] = None, rerun: Optional[dict] = None) -> str:
         """
         Create and enqueue a new job.
-        
+
         Args:
             file_path: Path to uploaded file
             run_config: Optional run configuration
-            
+            rerun: Source run to fork instead of ingesting ``file_path`` (see Job.rerun)
+
         Returns:
             Job ID (run_id)
         """
         job_id = str(uuid.uuid4())[:8]
         now = datetime.now(timezone.utc).isoformat()
-        
+
         job_data = {
             "run_id": job_id,
             "file_path": file_path,
@@ -90,53 +227,94 @@ class RedisJobQueue:
             "updated_at": now,
             "run_config": run_config or {},
             "message": None,
-            "run_path": None
+            "run_path": None,
+            "rerun": rerun,
         }
-        
-        # Add to queue (FIFO using LPUSH/BRPOP)
-        self.redis.lpush(self.queue_key, json.dumps(job_data))
-        
+
+        pipe = self.redis.pipeline()
         # Store in state hash for quick lookup
-        self.redis.hset(self.state_key, job_id, json.dumps(job_data))
-        
+        pipe.hset(self.state_key, job_id, json.dumps(job_data))
+        pipe.zadd(self.created_key, {job_id: _timestamp(now)})
+        self._index(pipe, job_id, job_data)
+        # Add to queue (FIFO: LPUSH here, claimed from the right)
+        pipe.lpush(self.queue_key, job_id)
+        pipe.execute()
+
         print(f"[RedisQueue] Enqueued job {job_id}")
         return job_id
-    
+
+    def _claim(self, timeout: int) -> Optional[str]:
+        try:
+            return self.redis.blmove(self.queue_key, self.processing_key, timeout, "RIGHT", "LEFT")
+        except redis.ResponseError:
+            # Redis < 6.2
+            return self.redis.brpoplpush(self.queue_key, self.processing_key, timeout)
+
     def fetch_next(self, timeout: int = 5) -> Optional[Job]:
         """
-        Fetch next job from queue (blocking).
-        
+        Claim the next job from the queue (blocking).
+
+        The run_id moves atomically into this worker's processing list and stays
+        there until the job reaches a final status (see ``update_status``).
+        Entries for jobs that are no longer queued (already picked up again
+        elsewhere, finished or deleted) are dropped instead of run twice.
+
         Args:
             timeout: Seconds to wait for job (0 = wait forever)
-            
+
         Returns:
             Job object or None if timeout
         """
-        # Check queue length before blocking
-        queue_len = self.redis.llen(self.queue_key)
-        print(f"[RedisQueue] Polling queue (length: {queue_len})...")
-        
-        result = self.redis.brpop(self.queue_key, timeout=timeout)
-        if not result:
-            print(f"[RedisQueue] No job available (timeout after {timeout}s)")
+        self.start_keepalive()
+        entry = self._claim(timeout)
+        if not entry:
             return None
-        
-        _, job_json = result
-        job_dict = json.loads(job_json)
-        
-        print(f"[RedisQueue] Fetched job {job_dict['run_id']}")
-        return Job(**job_dict)
-    
+
+        if entry.startswith("{"):
+            # Full JSON payload queued before run_ids were used
+            legacy = json.loads(entry)
+            run_id = legacy["run_id"]
+            pipe = self.redis.pipeline()
+            pipe.lrem(self.processing_key, 1, entry)
+            pipe.lpush(self.processing_key, run_id)
+            pipe.hsetnx(self.state_key, run_id, entry)
+            pipe.execute()
+        else:
+            run_id = entry
+
+        job_json = self.redis.hget(self.state_key, run_id)
+        if not job_json:
+            print(f"[RedisQueue] Claimed job {run_id} has no state; dropping it")
+            self.redis.lrem(self.processing_key, 1, run_id)
+            return None
+        job_data = json.loads(job_json)
+        if job_data.get("status") != JobStatus.QUEUED.value:
+            print(f"[RedisQueue] Claimed job {run_id} is already {job_data.get('status')}; dropping it")
+            self.redis.lrem(self.processing_key, 1, run_id)
+            return None
+        self.redis.hset(self.claims_key, run_id, self.processing_key)
+
+        print(f"[RedisQueue] Fetched job {run_id}")
+        return _job_from_dict(job_data)
+
+    def _ack(self, pipe, run_id: str, claim: Optional[str]):
+        if claim:
+            pipe.lrem(claim, 1, run_id)
+        pipe.hdel(self.claims_key, run_id)
+
     def update_status(
-        self, 
-        run_id: str, 
-        status: JobStatus, 
+        self,
+        run_id: str,
+        status: JobStatus,
         message: Optional[str] = None,
         run_path: Optional[str] = None
     ):
         """
         Update job status in Redis.
-        
+
+        Final statuses also release the job from the claiming worker's
+        processing list.
+
         Args:
             run_id: Job ID
             status: New status
@@ -147,79 +325,168 @@ class RedisJobQueue:
         if not job_json:
             print(f"[RedisQueue] Job {run_id} not found in state")
             return
-        
+
         job_data = json.loads(job_json)
+        previous_status = job_data.get("status")
         job_data["status"] = status.value
         job_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        
+
         if message:
             job_data["message"] = message
         if run_path:
             job_data["run_path"] = run_path
-        
-        self.redis.hset(self.state_key, run_id, json.dumps(job_data))
+
+        claim = self.redis.hget(self.claims_key, run_id) if status.value in _FINAL_STATUSES else None
+        pipe = self.redis.pipeline()
+        pipe.hset(self.state_key, run_id, json.dumps(job_data))
+        self._index(pipe, run_id, job_data, previous_status)
+        if status.value in _FINAL_STATUSES:
+            self._ack(pipe, run_id, claim)
+        pipe.execute()
         print(f"[RedisQueue] Updated job {run_id} status to {status.value}")
-    
+
+    def heartbeat(self, run_id: str):
+        """
+        Update job's updated_at timestamp to prevent timeout.
+        Should be called periodically by long-running jobs; also keeps this
+        worker's claims from being treated as orphaned.
+
+        Args:
+            run_id: Job ID
+        """
+        self._touch_worker()
+        job_json = self.redis.hget(self.state_key, run_id)
+        if not job_json:
+            return
+
+        job_data = json.loads(job_json)
+        now = datetime.now(timezone.utc)
+        job_data["updated_at"] = now.isoformat()
+        pipe = self.redis.pipeline()
+        pipe.hset(self.state_key, run_id, json.dumps(job_data))
+        if job_data.get("status") == JobStatus.RUNNING.value:
+            pipe.zadd(self.heartbeat_key, {run_id: now.timestamp()})
+        pipe.execute()
+
+    # ------------------------------------------------------------------
+    # Lookups and listings
+    # ------------------------------------------------------------------
+
     def get_job(self, run_id: str) -> Optional[Job]:
         """
         Get job by ID.
-        
+
         Args:
             run_id: Job ID
-            
+
         Returns:
             Job object or None if not found
         """
         job_json = self.redis.hget(self.state_key, run_id)
         if not job_json:
             return None
-        
+
         job_dict = json.loads(job_json)
-        return Job(**job_dict)
-    
-    def get_all_jobs(self) -> list[Job]:
+        return _job_from_dict(job_dict)
+
+    def _load_jobs(self, run_ids: List[str]) -> List[Job]:
+        if not run_ids:
+            return []
+        jobs = []
+        for job_json in self.redis.hmget(self.state_key, run_ids):
+            if job_json:
+                jobs.append(_job_from_dict(json.loads(job_json)))
+        return jobs
+
+    def list_jobs(self, status: Optional[JobStatus] = None, offset: int = 0, limit: int = 50) -> List[Job]:
         """
-        Get all jobs from state.
-        
+        One page of jobs, newest first.
+
+        Args:
+            status: Only jobs currently in this status (all jobs if None)
+            offset: Jobs to skip
+            limit: Page size
+        """
+        key = self._status_key(status.value) if status is not None else self.created_key
+        run_ids = self.redis.zrevrange(key, offset, offset + limit - 1)
+        return self._load_jobs(run_ids)
+
+    def count_jobs(self, status: Optional[JobStatus] = None) -> int:
+        key = self._status_key(status.value) if status is not None else self.created_key
+        return int(self.redis.zcard(key))
+
+    def get_all_jobs(self, page_size: int = 500) -> list[Job]:
+        """
+        Get all jobs from state, newest first.
+
+        Reads the creation index page by page; prefer ``list_jobs`` for
+        anything that runs often.
+
         Returns:
             List of Job objects
         """
-        all_jobs = self.redis.hgetall(self.state_key)
-        return [Job(**json.loads(job_json)) for job_json in all_jobs.values()]
-    
+        jobs: List[Job] = []
+        offset = 0
+        while True:
+            page = self.list_jobs(offset=offset, limit=page_size)
+            jobs.extend(page)
+            if len(page) < page_size:
+                return jobs
+            offset += page_size
+
     def delete_job(self, run_id: str):
         """
         Delete job from state.
-        
+
         Args:
             run_id: Job ID
         """
-        self.redis.hdel(self.state_key, run_id)
+        claim = self.redis.hget(self.claims_key, run_id)
+        pipe = self.redis.pipeline()
+        pipe.hdel(self.state_key, run_id)
+        pipe.zrem(self.created_key, run_id)
+        pipe.zrem(self.heartbeat_key, run_id)
+        for status in JobStatus:
+            pipe.zrem(self._status_key(status.value), run_id)
+        self._ack(pipe, run_id, claim)
+        pipe.execute()
         print(f"[RedisQueue] Deleted job {run_id}")
-    
+
     def get_queue_length(self) -> int:
         """
         Get number of jobs waiting in queue.
-        
+
         Returns:
             Queue length
         """
         return self.redis.llen(self.queue_key)
-    
+
     def clear_queue(self):
         """Clear all jobs from queue (for testing)."""
         self.redis.delete(self.queue_key)
         print(f"[RedisQueue] Cleared queue")
-    
+
     def clear_state(self):
         """Clear all job state (for testing)."""
-        self.redis.delete(self.state_key)
+        keys = [self.state_key, self.created_key, self.heartbeat_key, self.claims_key, self.index_version_key]
+        keys.extend(self._status_key(status.value) for status in JobStatus)
+        self.redis.delete(*keys)
         print(f"[RedisQueue] Cleared state")
 
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _stale_running(self, timeout_minutes: int) -> List[str]:
+        cutoff = time.time() - timeout_minutes * 60
+        return self.redis.zrangebyscore(self.heartbeat_key, "-inf", cutoff)
+
     def cleanup_stuck_jobs(self, timeout_minutes: int = JOB_TIMEOUT_MINUTES) -> List[str]:
         """
         Find and fail jobs that have been running longer than timeout.
 
+        A range query on the heartbeat index; only the stale jobs are read.
+
         Args:
             timeout_minutes: Maximum allowed runtime in minutes
 
@@ -227,38 +494,19 @@ class RedisJobQueue:
             List of job IDs that were cleaned up
         """
         cleaned = []
-        cutoff = datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
-
-        all_jobs = self.redis.hgetall(self.state_key)
-        for run_id, job_json in all_jobs.items():
+        for run_id in self._stale_running(timeout_minutes):
             try:
-                job_data = json.loads(job_json)
-                status = job_data.get("status")
-
-                # Only check running jobs
-                if status != JobStatus.RUNNING.value:
-                    continue
-
-                # Check if job has been running too long
-                updated_at = job_data.get("updated_at")
-                if not updated_at:
+                job = self.get_job(run_id)
+                if job is None or job.status != JobStatus.RUNNING.value:
+                    self.redis.zrem(self.heartbeat_key, run_id)
                     continue
-
-                # Parse the timestamp
-                try:
-                    job_time = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    continue
-
-                if job_time < cutoff:
-                    # Job has timed out - mark as failed
-                    job_data["status"] = JobStatus.FAILED.value
-                    job_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-                    job_data["message"] = f"Job timed out after {timeout_minutes} minutes"
-                    self.redis.hset(self.state_key, run_id, json.dumps(job_data))
-                    cleaned.append(run_id)
-                    print(f"[RedisQueue] Cleaned up stuck job {run_id} (timeout after {timeout_minutes} min)")
-
+                self.update_status(
+                    run_id,
+                    JobStatus.FAILED,
+                    message=f"Job timed out after {timeout_minutes} minutes",
+                )
+                cleaned.append(run_id)
+                print(f"[RedisQueue] Cleaned up stuck job {run_id} (timeout after {timeout_minutes} min)")
             except Exception as e:
                 print(f"[RedisQueue] Error checking job {run_id}: {e}")
 
@@ -274,50 +522,54 @@ class RedisJobQueue:
         Returns:
             List of stuck Job objects
         """
-        stuck = []
-        cutoff = datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
-
-        all_jobs = self.redis.hgetall(self.state_key)
-        for run_id, job_json in all_jobs.items():
-            try:
-                job_data = json.loads(job_json)
-                status = job_data.get("status")
+        jobs = self._load_jobs(self._stale_running(timeout_minutes))
+        return [job for job in jobs if job.status == JobStatus.RUNNING.value]
 
-                if status != JobStatus.RUNNING.value:
-                    continue
-
-                updated_at = job_data.get("updated_at")
-                if not updated_at:
-                    continue
-
-                try:
-                    job_time = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    continue
-
-                if job_time < cutoff:
-                    stuck.append(Job(**job_data))
-
-            except Exception as e:
-                print(f"[RedisQueue] Error checking job {run_id}: {e}")
-
-        return stuck
-
-    def heartbeat(self, run_id: str):
+    def requeue_orphaned_jobs(self) -> List[str]:
         """
-        Update job's updated_at timestamp to prevent timeout.
-        Should be called periodically by long-running jobs.
+        Return jobs claimed by dead workers to the queue.
 
-        Args:
-            run_id: Job ID
-        """
-        job_json = self.redis.hget(self.state_key, run_id)
-        if not job_json:
-            return
+        A worker is dead once its liveness key (refreshed by its keepalive
+        thread) expires. Jobs it claimed but never started go back on the
+        queue; jobs it was running are left to ``cleanup_stuck_jobs``. The
+        status check and the move run in one WATCHed transaction, so a job
+        that starts (or a worker that comes back) meanwhile is left alone.
 
-        job_data = json.loads(job_json)
-        job_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        self.redis.hset(self.state_key, run_id, json.dumps(job_data))
+        Returns:
+            Job IDs put back on the queue
+        """
+        requeued = []
+        prefix = self._processing_key("")
+        for processing_key in self.redis.scan_iter(match=f"{prefix}*"):
+            worker_id = processing_key[len(prefix):]
+            if self.redis.exists(self._worker_key(worker_id)):
+                continue
+            for run_id in self.redis.lrange(processing_key, 0, -1):
+                if self._requeue_claim(processing_key, worker_id, run_id):
+                    requeued.append(run_id)
+                    print(f"[RedisQueue] Requeued job {run_id} from dead worker {worker_id}")
+        return requeued
+
+    def _requeue_claim(self, processing_key: str, worker_id: str, run_id: str) -> bool:
+        """Move one still-queued job from a dead worker's list back to the queue."""
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(self.state_key, self._worker_key(worker_id))
+                if pipe.exists(self._worker_key(worker_id)):
+                    return False
+                job_json = pipe.hget(self.state_key, run_id)
+                status = json.loads(job_json).get("status") if job_json else None
+                if status == JobStatus.RUNNING.value:
+                    return False  # left to cleanup_stuck_jobs
+                pipe.multi()
+                pipe.lrem(processing_key, 1, run_id)
+                if status == JobStatus.QUEUED.value:
+                    pipe.hdel(self.claims_key, run_id)
+                    pipe.rpush(self.queue_key, run_id)  # front of the FIFO
+                pipe.execute()
+            except redis.WatchError:
+                return False
+        return status == JobStatus.QUEUED.value
 
 
 def start_cleanup_thread(queue: 'RedisJobQueue'):
@@ -334,6 +586,9 @@ def start_cleanup_thread(queue: 'RedisJobQueue'):
                 cleaned = queue.cleanup_stuck_jobs()
                 if cleaned:
                     print(f"[RedisQueue] Cleanup thread cleaned {len(cleaned)} stuck jobs")
+                requeued = queue.requeue_orphaned_jobs()
+                if requeued:
+                    print(f"[RedisQueue] Cleanup thread requeued {len(requeued)} orphaned jobs")
             except Exception as e:
                 print(f"[RedisQueue] Cleanup thread error: {e}")
 
@@ -2,7 +2,9 @@ import os
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # Add backend directory to path if not already there
 backend_dir = Path(__file__).parent.parent
@@ -10,10 +12,11 @@ if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
 from core.run_utils import create_run_folder
-from jobs.models import JobStatus
+from jobs.admission import AdmissionController, JobCost
+from jobs.models import Job, JobStatus
 from jobs.progress import ProgressTracker
 from jobs.redis_queue import RedisJobQueue  # Changed from SQLite queue
-from orchestrator import orchestrate_new_run, main_loop
+from orchestrator import fork_run, orchestrate_new_run, main_loop
 
 POLL_INTERVAL = 0.5   # jobs picked up 4× faster after queuing
 HEARTBEAT_INTERVAL = 30  # Send heartbeat every 30 seconds during processing
@@ -62,32 +65,47 @@ except Exception as e:
     sys.exit(1)
 
 
-def process_job():
-    """Fetch and process next job from Redis queue."""
-    job = queue.fetch_next(timeout=5)  # Blocking pop with 5s timeout
-    if not job:
-        return False
+def run_job(job: Job, cost: Optional[JobCost] = None, admission: Optional[AdmissionController] = None):
+    """Run one fetched job to completion, releasing its admission reservation at the end."""
+    try:
+        _run_job(job)
+    except Exception as exc:
+        queue.update_status(job.run_id, JobStatus.FAILED, message=str(exc))
+        _log(f"Job {job.run_id} crashed: {exc}")
+    finally:
+        if admission is not None and cost is not None:
+            admission.release(cost)
+
 
+def _run_job(job: Job):
     _log(f"Picked job {job.run_id} -> {job.file_path}")
 
     if not Path(job.file_path).exists():
         queue.update_status(job.run_id, JobStatus.FAILED, message="File missing")
         _log(f"File missing for job {job.run_id}")
-        return True
+        return
 
     try:
-        run_id, run_path = orchestrate_new_run(
-            job.file_path, run_config=job.run_config, run_id=job.run_id
-        )
+        if job.rerun:
+            run_id, run_path = fork_run(
+                job.rerun["source_run_path"],
+                run_config=job.run_config,
+                run_id=job.run_id,
+                from_step=job.rerun.get("from_step"),
+            )
+        else:
+            run_id, run_path = orchestrate_new_run(
+                job.file_path, run_config=job.run_config, run_id=job.run_id
+            )
     except Exception as exc:
         queue.update_status(job.run_id, JobStatus.FAILED, message=str(exc))
         _log(f"Failed to initialize run {job.run_id}: {exc}")
-        return True
+        return
 
     if not run_path:
         queue.update_status(job.run_id, JobStatus.FAILED, message="Run initialization failed")
         _log(f"Run path missing for job {job.run_id}")
-        return True
+        return
 
     queue.update_status(job.run_id, JobStatus.RUNNING, run_path=run_path)
 
@@ -111,17 +129,45 @@ def process_job():
         # Stop heartbeat thread when job completes or fails
         heartbeat.stop()
 
+
+def process_job():
+    """Fetch and process next job from Redis queue (one at a time)."""
+    job = queue.fetch_next(timeout=5)  # Blocking pop with 5s timeout
+    if not job:
+        return False
+    run_job(job)
     return True
 
 
-def worker_loop():
-    _log("Worker started (Redis queue). Polling for jobs...")
+def worker_loop(admission: Optional[AdmissionController] = None):
+    """
+    Pull jobs and run as many at once as the admission policy allows.
+
+    Jobs run on threads: the pipeline's heavy work happens in agent
+    subprocesses, so the threads mostly wait. A job is only pulled from the
+    queue when a minimum-cost job would fit, and is started once its own
+    estimated cost fits in the remaining memory and CPU budget.
+    """
+    admission = admission or AdmissionController()
+    # Stay visibly alive while jobs initialise or wait for capacity, not only while polling
+    queue.start_keepalive()
+    _log(f"Worker started (Redis queue). Admission: {admission.snapshot()}. Polling for jobs...")
+    executor = ThreadPoolExecutor(max_workers=admission.max_jobs, thread_name_prefix="ace-job")
+    waiting = None
     while True:
         try:
-            processed = process_job()
-            if not processed:
-                # No job available, brpop already waited
-                pass
+            if waiting is None:
+                if not admission.wait_for_capacity(timeout=POLL_INTERVAL):
+                    continue
+                job = queue.fetch_next(timeout=5)  # Blocking pop with 5s timeout
+                if not job:
+                    continue
+                waiting = (job, admission.estimate(job.file_path))
+            job, cost = waiting
+            if admission.admit(cost, timeout=POLL_INTERVAL):
+                waiting = None
+                _log(f"Admitted job {job.run_id} (~{cost.memory_mb:.0f} MB, {cost.cpus} CPUs): {admission.snapshot()}")
+                executor.submit(run_job, job, cost, admission)
         except Exception as e:
             _log(f"Worker error: {e}")
             time.sleep(POLL_INTERVAL)
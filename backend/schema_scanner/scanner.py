@@ -1,12 +1,12 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import skew
 from pathlib import Path
 import json
 import warnings
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent))
+from core.column_stats import compute_column_stats
 from core.data_loader import smart_load_dataset
 from ace_v4.performance.config import PerformanceConfig
 
@@ -101,30 +101,29 @@ def scan_dataset(file_path: str, sample_size: int = 5, corr_threshold: float = 0
             # Fallback for other types (bool, etc)
             result["basic_types"]["categorical"].append(col)
 
-    # Numeric stats
+    # Numeric stats: one vectorised pass over all numeric columns
+    # Force conversion to ensure we handle mixed types that passed the try/except check
+    numeric_df = df[result["basic_types"]["numeric"]].apply(pd.to_numeric, errors="coerce")
+    numeric_stats = compute_column_stats(numeric_df, list(numeric_df.columns))
     for col in result["basic_types"]["numeric"]:
-        # Force conversion to ensure we handle mixed types that passed the try/except check
-        series = pd.to_numeric(df[col], errors="coerce")
-        
+        col_stats = numeric_stats.column(col)
+
         # Skip if all NaNs
-        if series.dropna().empty:
+        if col_stats["count"] == 0:
             continue
-            
+
         result["stats"][col] = {
-            "mean": float(series.mean()),
-            "median": float(series.median()),
-            "std": float(series.std()),
-            "min": float(series.min()),
-            "max": float(series.max()),
-            "skew": float(skew(series.dropna())) if series.dropna().shape[0] > 1 else 0,
-            "missing_rate": float(series.isna().mean())
+            "mean": col_stats["mean"],
+            "median": col_stats["q50"],
+            "std": col_stats["std"],
+            "min": col_stats["min"],
+            "max": col_stats["max"],
+            "skew": col_stats["skew"] if col_stats["count"] > 1 else 0,
+            "missing_rate": 1.0 - col_stats["count"] / len(df) if len(df) else 0.0,
         }
 
     # Correlations - PHASE 9: Dimensionality Gate
     if len(result["basic_types"]["numeric"]) > 1:
-        # Select only numeric columns for correlation
-        numeric_df = df[result["basic_types"]["numeric"]].apply(pd.to_numeric, errors='coerce')
-        
         # DIMENSIONALITY GATE: Handle high-dimensional datasets efficiently
         n_numeric = len(result["basic_types"]["numeric"])
         DIMENSIONALITY_THRESHOLD = 500
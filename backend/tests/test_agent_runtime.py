@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.agent_runtime import resolve_execution_mode, run_agent_in_worker, run_agent_subprocess
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="forkserver workers are POSIX-only")
+
+
+def _write_agent(tmp_path, body):
+    script = tmp_path / "agents" / "fake_agent.py"
+    script.parent.mkdir(parents=True, exist_ok=True)
+    script.write_text(body)
+    return str(script)
+
+
+def test_worker_captures_output_and_exit_code(tmp_path):
+    script = _write_agent(
+        tmp_path,
+        "import sys\n"
+        "if __name__ == '__main__':\n"
+        "    print('ran for', sys.argv[1])\n"
+        "    print('warning', file=sys.stderr)\n"
+        "    sys.exit(3)\n",
+    )
+    result = run_agent_in_worker(script, "run-123", timeout=60)
+    assert result.returncode == 3
+    assert "ran for run-123" in result.stdout
+    assert "warning" in result.stderr
+    assert result.startup_seconds is not None
+
+
+def test_worker_reports_uncaught_exception(tmp_path):
+    script = _write_agent(tmp_path, "raise RuntimeError('boom')\n")
+    result = run_agent_in_worker(script, "run-123", timeout=60)
+    assert result.returncode == 1
+    assert "RuntimeError: boom" in result.stderr
+
+
+def test_worker_timeout_kills_process(tmp_path):
+    script = _write_agent(tmp_path, "import time\ntime.sleep(30)\n")
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_agent_in_worker(script, "run-123", timeout=1)
+
+
+def test_execution_mode_env_override(monkeypatch):
+    monkeypatch.setenv("ACE_AGENT_EXECUTION_MODE", "subprocess")
+    assert resolve_execution_mode() == "subprocess"
+    monkeypatch.setenv("ACE_AGENT_EXECUTION_MODE", "bogus")
+    assert resolve_execution_mode() == "subprocess"
+
+
+_BUFFERED_AGENT = (
+    "import sys, time\n"
+    "sys.path.insert(0, {backend!r})\n"
+    "from core.state_manager import StateManager\n"
+    "if __name__ == '__main__':\n"
+    "    StateManager(sys.argv[1]).write('partial_output', {{'rows': 3}})\n"
+    "    time.sleep(30)\n"
+)
+
+
+def test_timed_out_agents_flush_buffered_artifacts(tmp_path, monkeypatch):
+    backend = str(Path(__file__).resolve().parent.parent)
+    script = _write_agent(tmp_path, _BUFFERED_AGENT.format(backend=backend))
+    env = dict(os.environ, ACE_STATE_WRITE_BEHIND="1")
+
+    worker_run = tmp_path / "worker_run"
+    worker_run.mkdir()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_agent_in_worker(script, str(worker_run), env, timeout=8)
+    assert json.loads((worker_run / "partial_output.json").read_text()) == {"rows": 3}
+
+    subprocess_run = tmp_path / "subprocess_run"
+    subprocess_run.mkdir()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_agent_subprocess(script, str(subprocess_run), env=env, timeout=8)
+    assert json.loads((subprocess_run / "partial_output.json").read_text()) == {"rows": 3}
+
+
+_ENV_AGENT = (
+    "import json, os, sys\n"
+    "sys.path.insert(0, {backend!r})\n"
+    "from core import llm\n"
+    "if __name__ == '__main__':\n"
+    "    print(json.dumps({{'marker': os.environ.get('ACE_TEST_MARKER'),\n"
+    "                      'removed': 'ACE_TEST_REMOVED' in os.environ,\n"
+    "                      'llm_concurrency': llm.MAX_CONCURRENCY}}))\n"
+)
+
+
+def test_worker_and_subprocess_agents_see_the_same_environment(tmp_path, monkeypatch):
+    backend = str(Path(__file__).resolve().parent.parent)
+    script = _write_agent(tmp_path, _ENV_AGENT.format(backend=backend))
+    # Present when the forkserver starts, absent from the per-call environment
+    monkeypatch.setenv("ACE_TEST_REMOVED", "1")
+    run_agent_in_worker(script, "warm-up", timeout=60)
+
+    env = {key: value for key, value in os.environ.items() if key != "ACE_TEST_REMOVED"}
+    env.update(ACE_TEST_MARKER="per-call", LLM_MAX_CONCURRENCY="3", ACE_LLM_CACHE="0")
+    worker = run_agent_in_worker(script, "run-123", env, timeout=60)
+    fresh = run_agent_subprocess(script, "run-123", env=env, timeout=60)
+
+    assert worker.returncode == 0, worker.stderr
+    assert fresh.returncode == 0, fresh.stderr
+    seen = json.loads(worker.stdout.strip().splitlines()[-1])
+    assert seen == json.loads(fresh.stdout.strip().splitlines()[-1])
+    assert seen == {"marker": "per-call", "removed": False, "llm_concurrency": 3}
@@ -0,0 +1,34 @@
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.datasets import make_blobs
+
+from core.cluster_selection import select_k
+
+
+def test_selects_true_k_and_scores_each_candidate():
+    X, _ = make_blobs(n_samples=1500, centers=4, n_features=3, cluster_std=0.5, random_state=1)
+    selection = select_k(X, range(3, 9), patience=10)
+
+    assert selection.k == 4
+    assert selection.method == "kmeans"
+    assert set(selection.scores) == set(range(3, 9))
+    assert selection.model.predict(X).shape == (1500,)
+
+
+def test_stops_early_once_score_stops_improving():
+    X, _ = make_blobs(n_samples=1500, centers=3, n_features=3, cluster_std=0.4, random_state=2)
+    selection = select_k(X, range(3, 9), patience=2)
+
+    assert selection.k == 3
+    assert selection.stopped_early
+    assert max(selection.scores) == 5
+
+
+def test_switches_to_minibatch_and_samples_silhouette():
+    X, _ = make_blobs(n_samples=6000, centers=5, n_features=4, cluster_std=0.5, random_state=3)
+    selection = select_k(X, range(3, 7), minibatch_rows=5000, silhouette_sample=1000)
+
+    assert selection.method == "minibatch_kmeans"
+    assert isinstance(selection.model, MiniBatchKMeans)
+    assert selection.k == 5
+    assert len(np.unique(selection.model.predict(X))) == 5
@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from anti_gravity.core.collinearity import compute_collinearity, correlated_pairs, vif_from_correlation
+
+
+def _reference_vif(frame):
+    """Per-feature regressions, as the governance step used to compute VIF."""
+    filled = frame.fillna(frame.median(numeric_only=True))
+    result = {}
+    for col in filled.columns:
+        x = filled.drop(columns=[col])
+        r2 = LinearRegression().fit(x, filled[col]).score(x, filled[col])
+        result[col] = float("inf") if r2 >= 0.9999 else 1.0 / (1.0 - r2)
+    return result
+
+
+def _frame(rows=500, seed=7):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(rows, 6))
+    frame = pd.DataFrame(base, columns=[f"x{i}" for i in range(6)])
+    frame["mix"] = 0.7 * frame["x0"] + 0.3 * frame["x1"] + rng.normal(scale=0.05, size=rows)
+    frame["scaled"] = frame["x2"] * 1000 + 5e6
+    frame.loc[frame.sample(frac=0.05, random_state=1).index, "x3"] = np.nan
+    return frame
+
+
+def test_vif_matches_per_feature_regressions():
+    frame = _frame().drop(columns=["scaled"])
+    expected = _reference_vif(frame)
+    vif, condition = vif_from_correlation(frame)
+
+    assert vif.keys() == expected.keys()
+    for col, value in expected.items():
+        assert math.isclose(vif[col], value, rel_tol=1e-6), col
+    assert condition > 1
+
+
+def test_exact_collinearity_is_infinite_and_pairs_are_found():
+    frame = _frame()
+    result = compute_collinearity(frame)
+
+    assert math.isinf(result["vif_by_feature"]["x2"])
+    assert math.isinf(result["vif_by_feature"]["scaled"])
+    assert result["vif_by_feature"]["x4"] < 1.1
+    assert math.isinf(result["max_vif"])
+    pairs = [(p["feature1"], p["feature2"]) for p in result["correlated_pairs"]]
+    assert pairs == [("x2", "scaled")]
+
+
+def test_pairs_use_pairwise_complete_correlation():
+    frame = _frame()
+    frame.loc[:10, "scaled"] = np.nan
+    expected = frame.corr()
+    for col1, col2, value in correlated_pairs(frame, threshold=0.5):
+        assert math.isclose(value, expected.loc[col1, col2], rel_tol=1e-9)
+
+
+def test_row_sampling_bounds_work_on_tall_frames():
+    frame = _frame(rows=20_000)
+    sampled = compute_collinearity(frame.drop(columns=["scaled"]), max_rows=5_000)
+    full = _reference_vif(frame.drop(columns=["scaled"]))
+    assert sampled["rows_used"] == 5_000
+    assert math.isclose(sampled["vif_by_feature"]["mix"], full["mix"], rel_tol=0.15)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from core import column_stats
+from core.column_stats import compute_column_stats
+
+
+def _frame(rows=400, seed=5):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "normal": rng.normal(size=rows),
+            "skewed": np.exp(rng.normal(size=rows)),
+            "ints": rng.integers(0, 50, size=rows),
+            "flag": rng.random(rows) > 0.5,
+        }
+    )
+    frame.loc[:19, "skewed"] = np.nan
+    return frame
+
+
+def test_matches_per_column_pandas_and_scipy():
+    frame = _frame()
+    result = compute_column_stats(frame, ["normal", "skewed", "ints"])
+
+    for col in ["normal", "skewed", "ints"]:
+        data = frame[col].dropna()
+        got = result.column(col)
+        assert got["count"] == len(data)
+        assert np.isclose(got["mean"], data.mean())
+        assert np.isclose(got["std"], data.std())
+        assert np.isclose(got["std_pop"], data.std(ddof=0))
+        assert np.isclose(got["skew"], stats.skew(data))
+        assert np.isclose(got["kurtosis"], stats.kurtosis(data))
+        for q, key in [(0.25, "q25"), (0.5, "q50"), (0.75, "q75")]:
+            assert np.isclose(got[key], data.quantile(q))
+        iqr = data.quantile(0.75) - data.quantile(0.25)
+        outside = (data < data.quantile(0.25) - 1.5 * iqr) | (data > data.quantile(0.75) + 1.5 * iqr)
+        assert got["outlier_count"] == int(outside.sum())
+
+
+def test_default_columns_include_booleans_and_constant_is_nan_shape():
+    frame = _frame(rows=50)
+    frame["flat"] = 3.0
+    result = compute_column_stats(frame)
+
+    assert result.columns == ["normal", "skewed", "ints", "flag", "flat"]
+    assert 0.0 <= result.column("flag")["mean"] <= 1.0
+    assert np.isnan(result.column("flat")["skew"])
+    assert result.column("flat")["std"] == 0.0
+
+
+def test_normality_is_sampled_and_added_to_cached_result():
+    frame = pd.DataFrame({"normal": np.random.default_rng(1).normal(size=8_000), "tiny": [1.0, 2.0] + [np.nan] * 7_998})
+    plain = compute_column_stats(frame)
+    assert plain.normality == {}
+
+    tested = compute_column_stats(frame, normality=True, n_jobs=2)
+    assert tested is plain
+    _, p_value, test = tested.normality["normal"]
+    assert test == "shapiro_sampled"
+    assert p_value > 0.01
+    assert "tiny" not in tested.normality
+    assert compute_column_stats(frame, version="changed") is not plain
+
+
+def test_blocks_and_content_keyed_cache(monkeypatch):
+    frame = _frame()
+    whole = compute_column_stats(frame, ["normal", "skewed", "ints"])
+
+    # One column per block gives the same numbers
+    monkeypatch.setattr(column_stats, "BLOCK_BYTES", 8)
+    column_stats._cache.clear()
+    blocked = compute_column_stats(frame, ["normal", "skewed", "ints"])
+    for name in ("mean", "std", "skew", "kurtosis", "q50", "outlier_count"):
+        assert np.allclose(getattr(blocked, name), getattr(whole, name), equal_nan=True)
+
+    # Equal data in another frame is a hit; data changed in place is not
+    assert compute_column_stats(frame.copy(), ["normal", "skewed", "ints"]) is blocked
+    frame.loc[0, "normal"] = 100.0
+    assert compute_column_stats(frame, ["normal", "skewed", "ints"]) is not blocked
+
+
+def test_results_persist_for_later_agents(tmp_path, monkeypatch):
+    monkeypatch.setenv("ACE_COLUMN_STATS_DIR", str(tmp_path))
+    frame = _frame()
+    first = compute_column_stats(frame, normality=True)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    # A later agent process: empty memory cache, statistics read back instead of recomputed
+    column_stats._cache.clear()
+    monkeypatch.setattr(column_stats, "_moments", lambda values: pytest.fail("recomputed"))
+    monkeypatch.setattr(column_stats, "_normality", lambda *args: pytest.fail("recomputed"))
+    loaded = compute_column_stats(frame.copy(), normality=True)
+    assert loaded.columns == first.columns
+    assert loaded.column("skewed") == pytest.approx(first.column("skewed"), nan_ok=True)
+    assert loaded.normality == first.normality
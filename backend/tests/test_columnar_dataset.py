@@ -0,0 +1,56 @@
+import os
+import time
+
+import pandas as pd
+
+from core.data_loader import (
+    columnar_path_for,
+    resolve_columnar_copy,
+    smart_load_dataset,
+    write_columnar_dataset,
+)
+
+
+def _write_clean_csv(tmp_path):
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "amount": [10.5, None, 30.0, 42.25],
+            "segment": ["a", "b", None, "a"],
+        }
+    )
+    path = tmp_path / "cleaned_uploaded.csv"
+    df.to_csv(path, index=False)
+    return path, df
+
+
+def test_columnar_copy_projects_columns(tmp_path):
+    csv_path, df = _write_clean_csv(tmp_path)
+    columnar = write_columnar_dataset(str(csv_path), df)
+
+    assert columnar == str(columnar_path_for(str(csv_path)))
+    loaded = smart_load_dataset(str(csv_path), columns=["amount", "missing_col"])
+    assert list(loaded.columns) == ["amount"]
+    assert loaded["amount"].tolist()[0] == 10.5
+    assert pd.isna(loaded["amount"].iloc[1])
+
+
+def test_columnar_copy_from_csv_matches_pandas_read(tmp_path):
+    csv_path, _ = _write_clean_csv(tmp_path)
+    assert write_columnar_dataset(str(csv_path)) is not None
+
+    from_parquet = smart_load_dataset(str(csv_path))
+    from_csv = smart_load_dataset(str(csv_path), prefer_parquet=False)
+    assert list(from_parquet.columns) == list(from_csv.columns)
+    assert from_parquet.isna().equals(from_csv.isna())
+    for col in from_csv.columns:
+        assert from_parquet[col].dropna().tolist() == from_csv[col].dropna().tolist()
+
+
+def test_stale_columnar_copy_is_ignored(tmp_path):
+    csv_path, df = _write_clean_csv(tmp_path)
+    write_columnar_dataset(str(csv_path), df)
+
+    later = time.time() + 5
+    os.utime(csv_path, (later, later))
+    assert resolve_columnar_copy(str(csv_path)) is None
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from core.correlation import correlation_kernel, pearson_matrix
+
+
+def _frame(rows=500, seed=4):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(loc=1_000.0, size=rows)
+    return pd.DataFrame(
+        {
+            "base": base,
+            "scaled": base * 3 + rng.normal(scale=0.01, size=rows),
+            "noise": rng.normal(size=rows),
+            "skewed": np.exp(rng.normal(size=rows)),
+        }
+    )
+
+
+def test_pearson_matches_pandas_with_missing_values():
+    frame = _frame()
+    frame.loc[:40, "scaled"] = np.nan
+    frame.loc[100:130, "noise"] = np.nan
+
+    np.testing.assert_allclose(pearson_matrix(frame.to_numpy()), frame.corr().to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_constant_column_is_nan():
+    frame = _frame(rows=50)
+    frame["flat"] = 2.0
+    corr = pearson_matrix(frame.to_numpy())
+
+    assert np.isnan(corr[-1]).all()
+    assert np.isnan(corr[:, -1]).all()
+
+
+def test_counts_are_pairwise_complete_and_spearman_matches_filled_frame():
+    frame = _frame()
+    frame.loc[:9, "base"] = np.nan
+    frame.loc[5:14, "noise"] = np.nan
+    kernel = correlation_kernel(frame, fill="mean", spearman=True)
+
+    counts = kernel.frame("pearson").copy()
+    counts[:] = kernel.counts
+    assert counts.loc["base", "noise"] == len(frame.dropna(subset=["base", "noise"]))
+    assert counts.loc["base", "skewed"] == len(frame) - 10
+    filled = frame.fillna(frame.mean())
+    np.testing.assert_allclose(kernel.spearman, filled.corr(method="spearman").to_numpy(), rtol=1e-9)
+
+
+def test_kernel_is_cached_per_frame_and_columns():
+    frame = _frame()
+    first = correlation_kernel(frame, fill="mean")
+    assert first.spearman is None
+    with_ranks = correlation_kernel(frame, fill="mean", spearman=True)
+
+    assert with_ranks is first
+    assert with_ranks.spearman is not None
+    assert correlation_kernel(frame, fill="mean") is first
+    assert correlation_kernel(frame, ["base", "noise"], fill="mean") is not first
+    assert correlation_kernel(frame, fill="mean", version="v2") is not first
+
+
+def test_kernel_cache_follows_frame_content():
+    frame = _frame()
+    first = correlation_kernel(frame)
+
+    assert correlation_kernel(frame.copy()) is first
+    frame.loc[0, "base"] = 1e6
+    changed = correlation_kernel(frame)
+    assert changed is not first
+    np.testing.assert_allclose(changed.pearson, frame.corr().to_numpy(), rtol=1e-9)
+
+
+def test_pairs_threshold_upper_triangle():
+    kernel = correlation_kernel(_frame())
+    rows, cols = kernel.pairs(0.99)
+
+    assert [(kernel.columns[i], kernel.columns[j]) for i, j in zip(rows, cols)] == [("base", "scaled")]
+    assert len(kernel.pairs(1.0, strict=True)[0]) == 0
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+
+import orchestrator
+from core.dag_scheduler import DagScheduler, build_step_dependencies
+from core.pipeline_map import PIPELINE_SEQUENCE, STEP_ARTIFACTS, STEP_GUARD_READS
+
+
+def _ancestors(deps, step):
+    seen, stack = set(), list(deps[step])
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(deps[node])
+    return seen
+
+
+def test_pipeline_dependencies_let_interpretation_overlap_modelling():
+    deps = build_step_dependencies(PIPELINE_SEQUENCE, STEP_ARTIFACTS, STEP_GUARD_READS)
+
+    assert set(deps) == set(PIPELINE_SEQUENCE)
+    interpretation = _ancestors(deps, "story_framer") | {"story_framer"}
+    assert not interpretation & {"regression", "personas", "fabricator"}
+    assert {"validator", "sentry", "time_series", "deep_insight"} <= interpretation
+    assert "personas" in deps["fabricator"]
+    assert _ancestors(deps, "expositor") == set(PIPELINE_SEQUENCE) - {"expositor", "trust_evaluation"}
+    assert "expositor" in deps["trust_evaluation"]
+
+
+def test_undeclared_step_waits_for_everything_before_it():
+    deps = build_step_dependencies(["a", "b", "c"], {"a": {"writes": ["x"]}, "b": {"reads": ["y"]}})
+    assert deps == {"a": set(), "b": set(), "c": {"a", "b"}}
+
+
+def test_scheduler_respects_dependencies_and_concurrency_limit():
+    deps = {"a": set(), "b": set(), "c": set(), "d": {"a", "b"}}
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    started, finished = [], []
+
+    def run_step(step):
+        with lock:
+            started.append(step)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+            finished.append(step)
+        return True
+
+    outcome = DagScheduler(deps, max_concurrency=2).run(["a", "b", "c", "d"], run_step)
+
+    assert sorted(outcome["finished"]) == ["a", "b", "c", "d"]
+    assert active["peak"] == 2
+    assert started.index("d") > max(finished.index("a"), finished.index("b"))
+
+
+def test_scheduler_halt_stops_new_steps():
+    deps = {"a": set(), "b": {"a"}}
+    outcome = DagScheduler(deps, max_concurrency=2).run(["a", "b"], lambda step: step != "a")
+    assert outcome == {"finished": ["a"], "not_started": ["b"], "halted": True}
+
+
+def test_main_loop_dag_mode_runs_independent_steps_concurrently(monkeypatch, tmp_path):
+    sequence = ["load", "left", "right", "merge"]
+    artifacts = {
+        "load": {"writes": ["base"]},
+        "left": {"reads": ["base"], "writes": ["left_out"]},
+        "right": {"reads": ["base"], "writes": ["right_out"]},
+        "merge": {"reads": ["left_out", "right_out"], "writes": ["merged"]},
+    }
+    monkeypatch.setattr(orchestrator, "PIPELINE_SEQUENCE", sequence)
+    monkeypatch.setattr(orchestrator, "PIPELINE_DESCRIPTIONS", {step: step for step in sequence})
+    monkeypatch.setattr(orchestrator, "STEP_ARTIFACTS", artifacts)
+    monkeypatch.setenv("ACE_PIPELINE_SCHEDULER", "dag")
+    monkeypatch.setattr(orchestrator, "RETRY_BACKOFF", 0)
+
+    run_path = tmp_path / "run"
+    run_path.mkdir()
+    state_path = run_path / "orchestrator_state.json"
+    orchestrator.initialize_state("dag-run", str(state_path), str(run_path / "data.csv"))
+
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+
+    def fake_agent(step, _run_path):
+        calls.append(step)
+        if step in {"left", "right"}:
+            barrier.wait()  # only returns if both branches are in flight together
+        return True, "ok", ""
+
+    monkeypatch.setattr(orchestrator, "run_agent", fake_agent)
+    orchestrator.main_loop(str(run_path))
+
+    with open(state_path, "r", encoding="utf-8") as fh:
+        final_state = json.load(fh)
+    assert final_state["status"] == "complete"
+    assert calls[0] == "load" and calls[-1] == "merge"
+    assert all(final_state["steps"][step]["status"] == "completed" for step in sequence)
+
+
+def test_main_loop_dag_mode_still_reports_when_validator_blocks(monkeypatch, tmp_path):
+    sequence = ["load", "validator", "analyse", "report"]
+    artifacts = {
+        "load": {"writes": ["base"]},
+        "validator": {"reads": ["base"], "writes": ["data_validation_report"]},
+        "analyse": {"reads": ["data_validation_report"], "writes": ["analysis"]},
+        "report": {"reads": ["analysis"], "writes": ["final_report"]},
+    }
+    monkeypatch.setattr(orchestrator, "PIPELINE_SEQUENCE", sequence)
+    monkeypatch.setattr(orchestrator, "PIPELINE_DESCRIPTIONS", {step: step for step in sequence})
+    monkeypatch.setattr(orchestrator, "STEP_ARTIFACTS", artifacts)
+    monkeypatch.setenv("ACE_PIPELINE_SCHEDULER", "dag")
+    monkeypatch.setattr(orchestrator, "RETRY_BACKOFF", 0)
+
+    run_path = tmp_path / "run"
+    run_path.mkdir()
+    state_path = run_path / "orchestrator_state.json"
+    orchestrator.initialize_state("dag-blocked", str(state_path), str(run_path / "data.csv"))
+
+    calls = []
+
+    def fake_agent(step, agent_run_path):
+        calls.append(step)
+        if step == "validator":
+            orchestrator.StateManager(agent_run_path).write("data_validation_report", {"can_proceed": False})
+        return True, "ok", ""
+
+    monkeypatch.setattr(orchestrator, "run_agent", fake_agent)
+    orchestrator.main_loop(str(run_path))
+
+    with open(state_path, "r", encoding="utf-8") as fh:
+        final_state = json.load(fh)
+    # Like the sequential loop, a validation block does not stop the report from being written
+    assert calls == ["load", "validator", "analyse", "report"]
+    assert final_state["status"] == "complete_with_errors"
+    assert final_state["next_step"] == "complete"
+    assert final_state["blocked_step"] == "validator"
+    assert orchestrator.StateManager(str(run_path)).read("final_status")["status"] == "complete_with_errors"
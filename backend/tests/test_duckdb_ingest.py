@@ -0,0 +1,67 @@
+import pandas as pd
+
+from agents.data_sanitizer import DataSanitizer, MISSING_TOKENS
+from core.csv_defaults import PANDAS_DEFAULT_NA_VALUES
+from intake.fast_ingest import sanitize_csv_duckdb
+
+
+def _write_upload(tmp_path):
+    df = pd.DataFrame(
+        {
+            "id": list(range(20)),
+            "amount": [i * 1.5 for i in range(20)],
+            "mostly_numeric": [str(i) for i in range(16)] + ["x", "y", "NA", "."],
+            "segment": ["a", "b", "NA", "."] * 5,
+            "notes": ["line one\nline two"] + ["plain"] * 19,
+            "empty": [""] * 20,
+            "sparse": ["v"] + [""] * 19,
+        }
+    )
+    path = tmp_path / "upload.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_duckdb_sanitizer_matches_pandas_sanitizer(tmp_path):
+    upload = _write_upload(tmp_path)
+    cleaned_csv = tmp_path / "cleaned_uploaded.csv"
+    parquet = tmp_path / "cleaned_uploaded.parquet"
+
+    report = sanitize_csv_duckdb(
+        str(upload),
+        str(cleaned_csv),
+        str(parquet),
+        missing_tokens=list(PANDAS_DEFAULT_NA_VALUES) + list(MISSING_TOKENS),
+        threads=2,
+        memory_limit_mb=256,
+        temp_dir=str(tmp_path / "spill"),
+    )
+    expected_df, expected = DataSanitizer().sanitize(pd.read_csv(upload))
+
+    for key in ("numeric_converted", "multiline_columns", "dropped_all_null", "dropped_high_missing", "rows_after", "cols_after"):
+        assert report[key] == expected[key], key
+
+    result = pd.read_parquet(parquet)
+    assert list(result.columns) == list(expected_df.columns)
+    assert result["mostly_numeric"].dtype.kind == "f"
+    assert result["notes"].iloc[0] == "line one line two"
+    assert result["segment"].isna().sum() == expected_df["segment"].isna().sum()
+    assert len(pd.read_csv(cleaned_csv)) == 20
+
+
+def test_malformed_rows_are_counted_not_silently_dropped(tmp_path):
+    upload = tmp_path / "upload.csv"
+    upload.write_text("id,amount\n1,10\n2,20,extra\n3,30\n4\n5,50\n", encoding="utf-8")
+
+    report = sanitize_csv_duckdb(
+        str(upload),
+        str(tmp_path / "cleaned_uploaded.csv"),
+        str(tmp_path / "cleaned_uploaded.parquet"),
+        missing_tokens=list(MISSING_TOKENS),
+    )
+
+    assert report["rows_after"] == 3
+    assert report["rows_rejected"] == 2
+    assert report["rows_before"] == 5
+    assert [entry["line"] for entry in report["rejected_lines"]] == [3, 5]
+    assert pd.read_parquet(tmp_path / "cleaned_uploaded.parquet")["id"].tolist() == [1, 3, 5]
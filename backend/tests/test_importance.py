@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression, LogisticRegression
+
+from anti_gravity.core.importance import (
+    approximate_permutation_importance,
+    ranking_stability,
+    rows_for_error_bound,
+    stratified_subsample,
+)
+
+
+def test_rows_for_error_bound_shrinks_with_looser_bound():
+    assert rows_for_error_bound(0.01) == 9604
+    assert rows_for_error_bound(0.05) == 500
+    assert rows_for_error_bound(0.02) < rows_for_error_bound(0.01)
+
+
+def test_stratified_subsample_keeps_class_shares():
+    y = pd.Series([1] * 1000 + [0] * 9000)
+    X = pd.DataFrame({"a": np.arange(len(y))})
+    X_sub, y_sub = stratified_subsample(X, y, 1000, classification=True)
+
+    assert abs(len(X_sub) - 1000) <= 2
+    assert abs(y_sub.mean() - 0.1) < 0.005
+    assert (X_sub.index == y_sub.index).all()
+
+
+def test_approximate_importance_uses_bounded_sample_and_reports_ci():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(30_000, 3)), columns=["strong", "weak", "noise"])
+    y = 5 * X["strong"] + 0.5 * X["weak"] + rng.normal(scale=0.1, size=len(X))
+    model = LinearRegression().fit(X, y)
+
+    result = approximate_permutation_importance(model, X, y, scoring="r2", n_repeats=5, target_error=0.02)
+
+    assert result["rows_used"] < result["rows_available"]
+    assert np.argmax(result["mean"]) == 0
+    assert (result["ci_low"] <= result["mean"]).all() and (result["mean"] <= result["ci_high"]).all()
+    stability = ranking_stability(list(X.columns), result["mean"], result["ci_low"], result["ci_high"])
+    assert stability["top_feature_separated"]
+
+
+def test_ranking_stability_flags_overlapping_intervals():
+    means = np.array([0.30, 0.29, 0.05])
+    stability = ranking_stability(["a", "b", "c"], means, means - 0.02, means + 0.02)
+
+    assert not stability["stable"]
+    assert not stability["top_feature_separated"]
+    assert stability["overlapping_pairs"] == [["a", "b"]]
+
+
+def test_classification_importance_runs_on_subsample():
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(5_000, 2)), columns=["signal", "noise"])
+    y = (X["signal"] > 0).astype(int)
+    model = LogisticRegression().fit(X, y)
+
+    result = approximate_permutation_importance(
+        model, X, y, scoring="accuracy", n_repeats=3, classification=True, target_error=0.03
+    )
+
+    assert result["rows_used"] <= 1_100
+    assert result["mean"][0] > result["mean"][1]
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from ace_v4.performance.config import PerformanceConfig
+from jobs.admission import AdmissionController, JobCost
+
+
+@pytest.fixture(autouse=True)
+def pipeline_settings(monkeypatch):
+    for name in ("ACE_PIPELINE_SCHEDULER", "ACE_PIPELINE_CONCURRENCY", "ACE_AGENT_THREADS"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def _controller(**kwargs):
+    config = PerformanceConfig(
+        job_base_memory_mb=500, job_memory_per_mb=10, max_concurrent_steps=1, agent_threads=2, large_file_size_mb=100
+    )
+    return AdmissionController(config=config, **kwargs)
+
+
+def test_estimate_scales_with_file_size_and_caps_at_sampling_threshold(tmp_path):
+    small = tmp_path / "small.csv"
+    small.write_bytes(b"x" * (2 * 1024 * 1024))
+    controller = _controller(memory_budget_mb=10_000, cpu_count=8)
+
+    cost = controller.estimate(str(small))
+    assert cost.memory_mb == 520
+    assert cost.cpus == 2
+    assert cost.timeout_seconds > PerformanceConfig().base_timeout_seconds
+    assert controller.estimate(str(tmp_path / "missing.csv")).memory_mb == 500
+
+
+def test_max_jobs_follows_cores():
+    assert _controller(memory_budget_mb=10_000, cpu_count=8).max_jobs == 4
+    assert _controller(memory_budget_mb=10_000, cpu_count=1).max_jobs == 1
+
+
+def test_cpu_cost_follows_pipeline_concurrency_and_agent_threads(monkeypatch):
+    config = PerformanceConfig(max_concurrent_steps=4, agent_threads=2)
+    controller = AdmissionController(config=config, memory_budget_mb=10_000, cpu_count=32)
+    assert controller.estimate(None).cpus == 8
+    assert controller.max_jobs == 4
+
+    monkeypatch.setenv("ACE_PIPELINE_CONCURRENCY", "3")
+    monkeypatch.setenv("ACE_AGENT_THREADS", "4")
+    assert AdmissionController(config=config, memory_budget_mb=10_000, cpu_count=32).estimate(None).cpus == 12
+
+    # The sequential scheduler runs one step at a time
+    monkeypatch.setenv("ACE_PIPELINE_SCHEDULER", "sequential")
+    assert AdmissionController(config=config, memory_budget_mb=10_000, cpu_count=32).estimate(None).cpus == 4
+
+    # A job wider than the machine is priced at the whole machine and runs alone
+    monkeypatch.delenv("ACE_PIPELINE_SCHEDULER")
+    small_host = AdmissionController(config=config, memory_budget_mb=10_000, cpu_count=8)
+    assert small_host.estimate(None).cpus == 8
+    assert small_host.max_jobs == 1
+
+
+def test_memory_budget_limits_concurrency():
+    controller = _controller(memory_budget_mb=1_000, cpu_count=16)
+    cost = JobCost(memory_mb=400, cpus=2, timeout_seconds=60)
+
+    assert controller.admit(cost, timeout=0)
+    assert controller.admit(cost, timeout=0)
+    assert not controller.admit(cost, timeout=0)
+    controller.release(cost)
+    assert controller.admit(cost, timeout=0)
+
+
+def test_oversized_job_runs_alone():
+    controller = _controller(memory_budget_mb=1_000, cpu_count=16)
+    huge = JobCost(memory_mb=5_000, cpus=2, timeout_seconds=60)
+    small = JobCost(memory_mb=100, cpus=2, timeout_seconds=60)
+
+    assert controller.admit(huge, timeout=0)
+    assert not controller.admit(small, timeout=0)
+    assert not controller.wait_for_capacity(timeout=0)
+
+
+def test_waiting_admission_wakes_on_release():
+    controller = _controller(memory_budget_mb=1_000, cpu_count=16)
+    cost = JobCost(memory_mb=800, cpus=2, timeout_seconds=60)
+    assert controller.admit(cost, timeout=0)
+
+    timer = threading.Timer(0.05, controller.release, args=(cost,))
+    timer.start()
+    assert controller.admit(cost, timeout=5)
+    timer.join()
+    assert controller.snapshot()["running"] == 1
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from core import llm
+from core.llm_cache import LLMCache, set_llm_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    store = LLMCache(tmp_path / "llm.db", ttl_seconds=3600, max_bytes=1_000_000)
+    previous = set_llm_cache(store)
+    yield store
+    set_llm_cache(previous)
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    client = llm.OfflineClient(lambda prompt, config: json.dumps({"echo": prompt}))
+    monkeypatch.setattr(llm, "client", client)
+    return client
+
+
+def test_repeat_calls_are_served_from_cache(cache, offline):
+    first = llm.call_gemini("summarise", temperature=0.4, parse_json=True)
+    second = llm.call_gemini("summarise", temperature=0.4, parse_json=True)
+
+    assert first == second == {"echo": "summarise"}
+    assert len(offline.calls) == 1
+    assert cache.stats()["hits"] == 1
+
+    llm.call_gemini("summarise", temperature=0.2, parse_json=True)
+    llm.call_llm_json("system", "summarise")
+    llm.call_llm_json("system", "summarise")
+    assert len(offline.calls) == 3
+
+
+def test_creative_and_opted_out_calls_are_not_cached(cache, offline, monkeypatch):
+    monkeypatch.setenv("ACE_LLM_CACHE_MAX_TEMPERATURE", "0.5")
+    llm.call_gemini("story", temperature=0.8)
+    llm.call_gemini("story", temperature=0.8)
+    llm.ask_gemini("persona", cache=False)
+    llm.ask_gemini("persona", cache=False)
+
+    assert len(offline.calls) == 4
+    assert cache.stats()["entries"] == 0
+
+
+def test_unparseable_responses_are_not_cached(cache, monkeypatch):
+    client = llm.OfflineClient(lambda prompt, config: "not json")
+    monkeypatch.setattr(llm, "client", client)
+
+    assert "error" in llm.call_gemini("bad", parse_json=True)
+    assert "error" in llm.call_gemini("bad", parse_json=True)
+    assert len(client.calls) == 2
+
+
+def test_ttl_expiry_and_lru_eviction(tmp_path):
+    store = LLMCache(tmp_path / "llm.db", ttl_seconds=3600, max_bytes=25)
+    store.put("a", "x" * 10)
+    store.put("b", "y" * 10)
+    assert store.get("a") == "x" * 10  # "b" is now least recently used
+    store.put("c", "z" * 10)
+
+    assert store.get("b") is None
+    assert store.get("a") == "x" * 10 and store.get("c") == "z" * 10
+    assert store.stats()["evictions"] == 1
+
+    store.ttl_seconds = -1
+    assert store.get("a") is None
+
+
+def test_key_covers_model_and_generation_settings():
+    base = LLMCache.key("m", "prompt", {"temperature": 0.3, "max_output_tokens": 100})
+    assert base == LLMCache.key("m", "prompt", {"max_output_tokens": 100, "temperature": 0.3})
+    assert base != LLMCache.key("m2", "prompt", {"temperature": 0.3, "max_output_tokens": 100})
+    assert base != LLMCache.key("m", "prompt", {"temperature": 0.3, "max_output_tokens": 100, "response_mime_type": "application/json"})
+    assert base != LLMCache.key("m", "prompt", {"temperature": 0.4, "max_output_tokens": 100})
+
+
+def test_cache_failures_fall_back_to_the_provider(cache, offline, monkeypatch):
+    import sqlite3
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "get", locked)
+    monkeypatch.setattr(cache, "put", locked)
+    assert llm.call_gemini("summarise", temperature=0.4, parse_json=True) == {"echo": "summarise"}
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(cache, "put", disk_full)
+    assert llm.call_gemini("summarise", temperature=0.4, parse_json=True) == {"echo": "summarise"}
+    assert len(offline.calls) == 2
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core import llm, llm_quota
+from core.llm import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setenv("ACE_LLM_CACHE", "0")
+    monkeypatch.setenv("LLM_SHARED_LIMITS", "0")
+    previous = llm.MAX_CONCURRENCY, llm.REQUESTS_PER_MINUTE
+    llm.configure_limits()
+    yield
+    llm.configure_limits(*previous)
+
+
+class SlowResponder:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, config):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return f"answer to {prompt}"
+
+
+@pytest.fixture
+def responder(monkeypatch):
+    slow = SlowResponder()
+    client = llm.OfflineClient(slow)
+    monkeypatch.setattr(llm, "client", client)
+    return slow, client
+
+
+def test_llm_map_keeps_order_and_respects_concurrency(responder):
+    slow, client = responder
+    llm.configure_limits(max_concurrency=3, requests_per_minute=0)
+
+    prompts = [f"p{i}" for i in range(9)]
+    results = llm.llm_map(prompts, temperature=0.2)
+
+    assert results == [f"answer to p{i}" for i in range(9)]
+    assert len(client.calls) == 9
+    assert 1 < slow.peak <= 3
+
+
+def test_per_call_settings_override_defaults(responder):
+    _, client = responder
+    llm.llm_map([{"prompt": "a", "max_tokens": 100}, "b"], temperature=0.2, max_tokens=50)
+
+    tokens = {call["contents"]: call["config"]["max_output_tokens"] for call in client.calls}
+    assert tokens == {"a": 100, "b": 50}
+
+
+def test_identical_in_flight_prompts_are_coalesced(responder):
+    _, client = responder
+    llm.configure_limits(max_concurrency=8, requests_per_minute=0)
+    before = llm.limiter_stats()["coalesced"]
+
+    results = llm.llm_map(["same"] * 5 + ["other"], temperature=0.2)
+
+    assert results[:5] == ["answer to same"] * 5
+    assert len(client.calls) == 2
+    assert llm.limiter_stats()["coalesced"] - before == 4
+
+
+def test_opted_out_calls_are_not_coalesced(responder):
+    _, client = responder
+    llm.llm_map(["same"] * 3, temperature=0.2, cache=False)
+    assert len(client.calls) == 3
+
+
+def test_llm_map_inside_running_loop(responder):
+    async def handler():
+        direct = await llm.acall_gemini("x", temperature=0.2)
+        return direct, llm.llm_map(["y"], temperature=0.2)
+
+    assert asyncio.run(handler()) == ("answer to x", ["answer to y"])
+
+
+def test_token_bucket_paces_requests_after_burst():
+    bucket = TokenBucket(rate=20.0, capacity=2)
+    started = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert time.monotonic() - started >= 0.09
+    assert TokenBucket(rate=0, capacity=1).acquire() == 0.0
+
+
+@pytest.fixture
+def shared_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeServer()
+
+
+def test_redis_token_bucket_is_shared_between_processes(shared_redis):
+    import fakeredis
+
+    # Two clients stand in for two agent processes drawing on one API key
+    first = llm_quota.RedisTokenBucket(fakeredis.FakeRedis(server=shared_redis), rate=20.0, capacity=2)
+    second = llm_quota.RedisTokenBucket(fakeredis.FakeRedis(server=shared_redis), rate=20.0, capacity=2)
+    assert first.acquire() == 0.0
+    assert second.acquire() == 0.0
+    # The burst is spent for both, so the next caller waits for a refill
+    assert first.acquire() > 0.0
+
+
+def test_redis_semaphore_caps_holders_across_clients(shared_redis):
+    import fakeredis
+
+    first = llm_quota.RedisSemaphore(fakeredis.FakeRedis(server=shared_redis), limit=1)
+    second = llm_quota.RedisSemaphore(fakeredis.FakeRedis(server=shared_redis), limit=1)
+    assert first.acquire(timeout=0.1)
+    assert not second.acquire(timeout=0.1)
+    first.release()
+    assert second.acquire(timeout=0.1)
+    second.release()
+
+
+def test_limits_use_redis_when_configured(monkeypatch, shared_redis, responder):
+    import fakeredis
+
+    monkeypatch.setenv("LLM_SHARED_LIMITS", "1")
+    monkeypatch.setattr(llm, "shared_limits_client", lambda: fakeredis.FakeRedis(server=shared_redis, decode_responses=True))
+    llm.configure_limits(max_concurrency=2, requests_per_minute=0)
+
+    assert llm.limiter_stats()["scope"] == "redis"
+    results = llm.llm_map([f"q{i}" for i in range(6)])
+    assert results == [f"answer to q{i}" for i in range(6)]
+    assert 1 < responder[0].peak <= 2
+
+
+def test_limits_are_per_process_without_redis():
+    assert llm.limiter_stats()["scope"] == "process"
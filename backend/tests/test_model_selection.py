@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from sklearn.dummy import DummyRegressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.tree import DecisionTreeRegressor
+
+from anti_gravity.core.model_selection import select_best_model
+
+
+def _linear_frame(rows, seed=3):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 5)), columns=[f"x{i}" for i in range(5)])
+    y = pd.Series(X.to_numpy() @ np.array([2.0, -1.0, 0.5, 0.0, 3.0]) + rng.normal(scale=0.1, size=rows))
+    return X, y
+
+
+def test_full_cv_picks_best_and_records_timing():
+    X, y = _linear_frame(400)
+    candidates = {"dummy": DummyRegressor(), "linear": LinearRegression()}
+    best, info = select_best_model(candidates, X, y, scoring="r2", cv_folds=3, n_jobs=2)
+
+    assert best == "linear"
+    assert info["strategy"] == "cross_validation"
+    assert info["rounds"] == 1
+    for name in candidates:
+        assert info[name]["cv_score"] is not None
+        assert info[name]["fit_seconds"] >= 0
+        assert info[name]["rows_evaluated"] == 400
+    assert info["linear"]["cv_score"] > info["dummy"]["cv_score"]
+
+
+def test_successive_halving_drops_losers_on_subsample():
+    X, y = _linear_frame(40_000)
+    candidates = {
+        "dummy": DummyRegressor(),
+        "stump": DecisionTreeRegressor(max_depth=1),
+        "linear": LinearRegression(),
+        "forest": RandomForestRegressor(n_estimators=5, max_depth=3, random_state=0),
+    }
+    best, info = select_best_model(candidates, X, y, scoring="r2", cv_folds=3, halving_min_rows=20_000)
+
+    assert best == "linear"
+    assert info["strategy"] == "successive_halving"
+    assert info["rounds"] >= 2
+    assert "eliminated_at_rows" in info["dummy"]
+    assert info["dummy"]["eliminated_at_rows"] < len(X)
+    assert info["linear"]["rows_evaluated"] == len(X)
+
+
+def test_failed_candidate_falls_back_to_default():
+    X, y = _linear_frame(200)
+    # Continuous target makes the classifier fail every fold.
+    best, info = select_best_model({"logistic_regression": LogisticRegression()}, X, y, scoring="r2", cv_folds=3, default="logistic_regression")
+
+    assert best == "logistic_regression"
+    assert info["logistic_regression"]["cv_score"] is None
+    assert info["logistic_regression"]["error"] == "CV failed"
+
+
+def test_default_workers_follow_the_agent_cpu_cap(monkeypatch):
+    # The orchestrator caps each agent through LOKY_MAX_CPU_COUNT (ACE_AGENT_THREADS)
+    monkeypatch.setenv("LOKY_MAX_CPU_COUNT", "1")
+    X, y = _linear_frame(200)
+    _, info = select_best_model({"dummy": DummyRegressor(), "linear": LinearRegression()}, X, y, scoring="r2", cv_folds=3)
+    assert info["parallel_jobs"] == 1
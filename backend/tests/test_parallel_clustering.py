@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_blobs
+
+from core import parallel_clustering
+from core.parallel_clustering import _assign_labels, run_parallel_clustering
+
+
+def _blobs(rows=900, centers=4):
+    X, _ = make_blobs(n_samples=rows, centers=centers, n_features=3, cluster_std=0.4, random_state=0)
+    return pd.DataFrame(X, columns=["a", "b", "c"])
+
+
+def test_sweep_returns_labels_only_for_best_k():
+    frame = _blobs()
+    result = run_parallel_clustering(frame, min_k=2, max_k=6, fast_mode=False, max_workers=2)
+
+    assert result["error"] is None
+    assert result["best_k"] == 4
+    assert len(result["best_labels"]) == len(frame)
+    assert len(result["best_centroids"]) == 4
+    assert [r["k"] for r in result["all_results"]] == [2, 3, 4, 5, 6]
+    assert all("labels" not in r and "centroids" not in r for r in result["all_results"])
+
+
+def test_pool_is_reused_between_calls():
+    frame = _blobs(rows=300, centers=3)
+    run_parallel_clustering(frame, min_k=2, max_k=3, max_workers=2)
+    pool = parallel_clustering._POOL
+    run_parallel_clustering(frame, min_k=2, max_k=4, max_workers=2)
+
+    assert parallel_clustering._POOL is pool
+    parallel_clustering.shutdown_pool()
+
+
+def test_assign_labels_matches_nearest_centroid():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(1000, 4))
+    centroids = rng.normal(size=(5, 4))
+    expected = ((data[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+
+    assert (_assign_labels(data, centroids, chunk_rows=128) == expected).all()
+
+
+def test_sweep_leaves_the_resource_tracker_quiet():
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # Fresh interpreter: the tracker reports unlink/unregister mismatches on its stderr at exit
+    script = (
+        "import numpy as np, pandas as pd\n"
+        "from core.parallel_clustering import run_parallel_clustering, shutdown_pool\n"
+        "frame = pd.DataFrame(np.random.default_rng(0).normal(size=(300, 3)), columns=list('abc'))\n"
+        "for _ in range(2):\n"
+        "    assert run_parallel_clustering(frame, min_k=2, max_k=4, max_workers=2)['error'] is None\n"
+        "shutdown_pool()\n"
+    )
+    backend = Path(__file__).resolve().parent.parent
+    result = subprocess.run([sys.executable, "-c", script], cwd=backend, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "KeyError" not in result.stderr and "leaked shared_memory" not in result.stderr, result.stderr
@@ -0,0 +1,140 @@
+import io
+import json
+
+import pytest
+
+from intake import preview
+from intake.preview import column_summary, quality_bounds, sample_dataset, wilson_interval
+
+
+def _write_csv(path, rows):
+    lines = ["id,amount,city"]
+    for i in range(rows):
+        amount = "" if i % 10 == 0 else f"{i * 1.5:.2f}"
+        lines.append(f"{i},{amount},city_{i % 37}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_small_file_is_read_whole_and_exact(tmp_path):
+    path = tmp_path / "small.csv"
+    _write_csv(path, 200)
+
+    sample = sample_dataset(path, ".csv")
+    assert sample.row_count == 200 and sample.row_count_exact
+    assert sample.bytes_read == sample.file_size
+    assert list(sample.df.columns) == ["id", "amount", "city"]
+
+
+def test_large_file_reads_a_bounded_sample(tmp_path, monkeypatch):
+    monkeypatch.setattr(preview, "HEAD_BYTES", 32 * 1024)
+    monkeypatch.setattr(preview, "SEEK_BYTES", 4 * 1024)
+    path = tmp_path / "large.csv"
+    _write_csv(path, 60_000)
+
+    sample = sample_dataset(path, ".csv")
+    lower, upper = sample.row_count_bounds
+
+    assert not sample.row_count_exact
+    assert sample.bytes_read <= 32 * 1024 + preview.SEEK_COUNT * 4 * 1024
+    assert sample.bytes_read < sample.file_size / 10
+    assert lower <= 60_000 <= upper
+    assert sample.row_count_method == preview.ROW_COUNT_SAMPLED
+    assert abs(sample.row_count - 60_000) / 60_000 < 0.1
+    # Rows from the random seeks come from deep in the file
+    assert sample.df["id"].max() > 30_000
+
+
+def _write_multiline_csv(path, rows, multiline_from=0):
+    lines = ["id,note,amount"]
+    for i in range(rows):
+        note = f'"first line {i}\nsecond, line"' if i >= multiline_from and i % 3 == 0 else f"plain {i}"
+        lines.append(f"{i},{note},{i * 2}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_quoted_newlines_fall_back_to_head_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(preview, "HEAD_BYTES", 32 * 1024)
+    monkeypatch.setattr(preview, "SEEK_BYTES", 4 * 1024)
+    path = tmp_path / "notes.csv"
+    _write_multiline_csv(path, 50_000)
+
+    sample = sample_dataset(path, ".csv")
+    lower, upper = sample.row_count_bounds
+
+    assert sample.row_count_method == preview.ROW_COUNT_HEAD_ONLY
+    assert not sample.row_count_exact
+    assert upper is None and lower <= 50_000
+    # Only a rough extrapolation (rows get longer as ids grow), hence no upper bound
+    assert abs(sample.row_count - 50_000) / 50_000 < 0.25
+    assert sample.df["id"].dtype.kind == "i"
+    assert sample.df["id"].tolist() == list(range(len(sample.df)))
+
+
+def test_quoted_newlines_past_the_head_are_detected_in_seek_windows(tmp_path, monkeypatch):
+    monkeypatch.setattr(preview, "HEAD_BYTES", 32 * 1024)
+    monkeypatch.setattr(preview, "SEEK_BYTES", 4 * 1024)
+    path = tmp_path / "notes.csv"
+    _write_multiline_csv(path, 50_000, multiline_from=5_000)
+
+    sample = sample_dataset(path, ".csv")
+    assert sample.row_count_method == preview.ROW_COUNT_HEAD_ONLY
+    assert sample.row_count_bounds[1] is None
+    assert sample.df["id"].dtype.kind == "i"
+
+
+def test_upload_file_object_is_sampled_in_place(tmp_path):
+    path = tmp_path / "data.tsv"
+    path.write_text("a\tb\n1\tx\n2\ty\n")
+    spool = io.BytesIO(path.read_bytes())
+
+    sample = sample_dataset(spool, ".tsv")
+    assert sample.row_count == 2
+    assert not spool.closed
+
+
+def test_json_lines_and_arrays(tmp_path, monkeypatch):
+    monkeypatch.setattr(preview, "HEAD_BYTES", 8 * 1024)
+    monkeypatch.setattr(preview, "SEEK_BYTES", 2 * 1024)
+    records = [{"id": i, "value": i % 7} for i in range(5000)]
+
+    lines = tmp_path / "rows.json"
+    lines.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    sample = sample_dataset(lines, ".json")
+    assert sample.row_count_bounds[0] <= 5000 <= sample.row_count_bounds[1]
+    assert list(sample.df.columns) == ["id", "value"]
+
+    array = tmp_path / "array.json"
+    array.write_text(json.dumps(records))
+    sample = sample_dataset(array, ".json")
+    assert not sample.row_count_exact
+    assert sample.row_count_bounds[0] <= 5000 <= sample.row_count_bounds[1]
+    assert sample.df["id"].tolist()[:3] == [0, 1, 2]
+
+
+def test_column_types_and_missing_bounds(tmp_path):
+    path = tmp_path / "small.csv"
+    _write_csv(path, 500)
+    df = sample_dataset(path, ".csv").df
+
+    columns = {c["name"]: c for c in column_summary(df)}
+    assert columns["amount"]["type"] == "Numeric"
+    assert columns["city"]["type"] == "String"
+    lower, upper = columns["amount"]["missing_bounds"]
+    assert lower < columns["amount"]["missing_ratio"] < upper
+    assert 0.98 < columns["id"]["type_confidence"] < 1.0
+
+    q_lower, q_upper = quality_bounds(df)
+    assert q_lower < 1 - df.isnull().to_numpy().mean() < q_upper
+
+
+def test_wilson_interval_edges():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    lower, upper = wilson_interval(0, 100)
+    assert lower == 0.0 and 0 < upper < 0.05
+
+
+def test_unsupported_extension(tmp_path):
+    path = tmp_path / "x.bin"
+    path.write_bytes(b"\x00")
+    with pytest.raises(ValueError):
+        sample_dataset(path, ".bin")
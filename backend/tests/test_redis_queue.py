@@ -0,0 +1,149 @@
+import json
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from jobs.models import JobStatus
+from jobs import redis_queue
+from jobs.redis_queue import RedisJobQueue
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _queue(server, worker_id="w1"):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    return RedisJobQueue(client=client, worker_id=worker_id)
+
+
+def test_fifo_claim_moves_job_into_processing_list(server):
+    queue = _queue(server)
+    first = queue.enqueue("/tmp/a.csv")
+    second = queue.enqueue("/tmp/b.csv")
+
+    job = queue.fetch_next(timeout=1)
+    assert job.run_id == first
+    assert queue.redis.lrange(queue.processing_key, 0, -1) == [first]
+    assert queue.get_queue_length() == 1
+
+    queue.update_status(first, JobStatus.RUNNING, run_path="/runs/a")
+    assert queue.redis.lrange(queue.processing_key, 0, -1) == [first]
+    queue.update_status(first, JobStatus.COMPLETED, run_path="/runs/a")
+    assert queue.redis.lrange(queue.processing_key, 0, -1) == []
+    assert queue.fetch_next(timeout=1).run_id == second
+
+
+def test_status_indexes_and_pagination(server):
+    queue = _queue(server)
+    ids = [queue.enqueue(f"/tmp/{i}.csv") for i in range(5)]
+    queue.update_status(ids[0], JobStatus.RUNNING)
+    queue.update_status(ids[1], JobStatus.FAILED, message="boom")
+
+    assert queue.count_jobs(JobStatus.QUEUED) == 3
+    assert queue.count_jobs(JobStatus.RUNNING) == 1
+    assert [job.run_id for job in queue.list_jobs(JobStatus.FAILED)] == [ids[1]]
+    assert queue.count_jobs() == 5
+
+    page = queue.list_jobs(offset=0, limit=2) + queue.list_jobs(offset=2, limit=2) + queue.list_jobs(offset=4, limit=2)
+    assert sorted(job.run_id for job in page) == sorted(ids)
+    assert len(queue.get_all_jobs(page_size=2)) == 5
+
+
+def test_stuck_jobs_found_by_heartbeat_range(server):
+    queue = _queue(server)
+    stale = queue.enqueue("/tmp/stale.csv")
+    fresh = queue.enqueue("/tmp/fresh.csv")
+    queue.update_status(stale, JobStatus.RUNNING)
+    queue.update_status(fresh, JobStatus.RUNNING)
+    queue.redis.zadd(queue.heartbeat_key, {stale: time.time() - 3600})
+
+    assert [job.run_id for job in queue.get_stuck_jobs(timeout_minutes=30)] == [stale]
+    assert queue.cleanup_stuck_jobs(timeout_minutes=30) == [stale]
+    assert queue.get_job(stale).status == JobStatus.FAILED.value
+    assert queue.count_jobs(JobStatus.RUNNING) == 1
+
+    queue.redis.zadd(queue.heartbeat_key, {fresh: time.time() - 3600})
+    queue.heartbeat(fresh)
+    assert queue.get_stuck_jobs(timeout_minutes=30) == []
+
+
+def test_job_claimed_by_dead_worker_is_requeued(server):
+    dead = _queue(server, worker_id="dead")
+    run_id = dead.enqueue("/tmp/a.csv")
+    assert dead.fetch_next(timeout=1).run_id == run_id
+    dead.stop_keepalive()
+    dead.redis.delete(dead._worker_key("dead"))
+
+    alive = _queue(server, worker_id="alive")
+    assert alive.requeue_orphaned_jobs() == [run_id]
+    assert alive.fetch_next(timeout=1).run_id == run_id
+    assert dead.redis.llen(dead.processing_key) == 0
+
+
+def test_live_worker_claims_are_left_alone(server):
+    worker = _queue(server, worker_id="busy")
+    run_id = worker.enqueue("/tmp/a.csv")
+    worker.fetch_next(timeout=1)
+
+    assert _queue(server, worker_id="other").requeue_orphaned_jobs() == []
+    assert worker.redis.lrange(worker.processing_key, 0, -1) == [run_id]
+
+
+def test_keepalive_refreshes_liveness_while_worker_is_busy(server, monkeypatch):
+    monkeypatch.setattr(redis_queue, "KEEPALIVE_INTERVAL_SECONDS", 0.05)
+    worker = _queue(server, worker_id="busy")
+    run_id = worker.enqueue("/tmp/a.csv")
+    worker.fetch_next(timeout=1)
+
+    # The job is still initialising (QUEUED) and the worker does not poll
+    worker.redis.delete(worker._worker_key("busy"))
+    time.sleep(0.2)
+    assert _queue(server, worker_id="other").requeue_orphaned_jobs() == []
+    assert worker.redis.lrange(worker.processing_key, 0, -1) == [run_id]
+    worker.stop_keepalive()
+
+
+def test_jobs_no_longer_queued_are_not_claimed_again(server):
+    first = _queue(server, worker_id="first")
+    run_id = first.enqueue("/tmp/a.csv")
+    first.fetch_next(timeout=1)
+    first.update_status(run_id, JobStatus.RUNNING, run_path="/runs/a")
+    # A stale requeue put the running job back on the queue
+    first.redis.rpush(first.queue_key, run_id)
+
+    second = _queue(server, worker_id="second")
+    assert second.fetch_next(timeout=1) is None
+    assert second.redis.llen(second.processing_key) == 0
+    assert second.redis.hget(second.claims_key, run_id) == first.processing_key
+
+    first.update_status(run_id, JobStatus.COMPLETED, run_path="/runs/a")
+    first.redis.rpush(first.queue_key, run_id)
+    assert second.fetch_next(timeout=1) is None
+    first.stop_keepalive()
+    second.stop_keepalive()
+
+
+def test_existing_state_and_legacy_payloads_are_indexed(server):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    legacy = {
+        "run_id": "old1",
+        "file_path": "/tmp/old.csv",
+        "status": "queued",
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "updated_at": "2024-01-01T00:00:00+00:00",
+        "run_config": {},
+        "message": None,
+        "run_path": None,
+    }
+    client.hset("ace:jobs:state", "old1", json.dumps(legacy))
+    client.lpush("ace:jobs:queue", json.dumps(legacy))
+
+    queue = RedisJobQueue(client=client, worker_id="w1")
+    assert queue.count_jobs(JobStatus.QUEUED) == 1
+    job = queue.fetch_next(timeout=1)
+    assert job.run_id == "old1"
+    assert queue.redis.lrange(queue.processing_key, 0, -1) == ["old1"]
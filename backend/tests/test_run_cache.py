@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+
+import core.cache
+from core.pipeline_map import PIPELINE_SEQUENCE
+from core.run_cache import downstream_steps, find_cached_run, materialize_run, record_completed_run, step_cache_keys
+
+FINGERPRINT = "f" * 64
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.cache, "CACHE_DIR", tmp_path / "cache")
+
+
+def _changed(before, after):
+    return {step for step in before if before[step] != after[step]}
+
+
+def test_target_change_only_invalidates_dependent_steps():
+    base = step_cache_keys(FINGERPRINT, {"target_column": "sales"})
+    changed = _changed(base, step_cache_keys(FINGERPRINT, {"target_column": "profit"}))
+
+    assert {"validator", "regression", "personas", "fabricator", "expositor", "trust_evaluation"} <= changed
+    assert not changed & {"type_identifier", "scanner", "interpreter", "overseer", "time_series", "sentry"}
+    assert _changed(base, step_cache_keys(FINGERPRINT, {"target_column": "sales", "fast_mode": True})) >= {"time_series"}
+    assert _changed(base, step_cache_keys(FINGERPRINT, {"target_column": "sales", "custom": 1})) == set(PIPELINE_SEQUENCE)
+
+
+def test_downstream_steps_follow_artifact_readers():
+    affected = downstream_steps(["overseer"])
+    assert affected[0] == "overseer"
+    assert {"personas", "fabricator", "expositor", "trust_evaluation"} <= set(affected)
+    assert not set(affected) & {"scanner", "validator", "regression", "sentry"}
+
+
+def test_config_normalisation():
+    keys = step_cache_keys(FINGERPRINT, {"feature_whitelist": ["b", "a"], "model_type": None, "sheet_name": "S1"})
+    assert keys == step_cache_keys(FINGERPRINT, {"feature_whitelist": ["a", "b"]})
+
+
+def test_full_and_partial_hits(tmp_path):
+    source = tmp_path / "runs" / "a"
+    source.mkdir(parents=True)
+    record_completed_run(str(source), "a", FINGERPRINT, {"target_column": "sales"}, PIPELINE_SEQUENCE)
+
+    full = find_cached_run(FINGERPRINT, {"target_column": "sales"})
+    assert full["run_id"] == "a" and full["full_hit"]
+
+    partial = find_cached_run(FINGERPRINT, {"target_column": "profit"})
+    assert not partial["full_hit"]
+    assert "overseer" in partial["reusable_steps"]
+    assert "regression" not in partial["reusable_steps"]
+    assert find_cached_run(FINGERPRINT, {"target_column": "sales"}, exclude_run_id="a") is None
+    assert find_cached_run("0" * 64, {"target_column": "sales"}) is None
+
+
+def test_failed_upstream_is_not_reused_underneath(tmp_path):
+    source = tmp_path / "runs" / "a"
+    source.mkdir(parents=True)
+    record_completed_run(str(source), "a", FINGERPRINT, None, PIPELINE_SEQUENCE, failed_steps=["interpreter"])
+
+    reusable = find_cached_run(FINGERPRINT, None)["reusable_steps"]
+    assert "scanner" in reusable
+    assert "interpreter" not in reusable
+    assert "overseer" not in reusable
+
+
+def test_materialize_links_reused_artifacts_only(tmp_path):
+    source, target = tmp_path / "src", tmp_path / "dst"
+    (source / "arrays").mkdir(parents=True)
+    target.mkdir()
+    for name in ["overseer_output", "regression_insights", "orchestrator_state", "active_dataset"]:
+        (source / f"{name}.json").write_text(json.dumps({"name": name}))
+    (source / "overseer_output.json").write_text(
+        json.dumps({"clusters": {"labels_ref": {"format": "npy", "path": "arrays/cluster_labels.npy"}}})
+    )
+    (source / "anomalies.json").write_text(json.dumps({"flags_ref": {"format": "npy", "path": "arrays/anomaly_flags.npy"}}))
+    (source / "arrays" / "cluster_labels.npy").write_bytes(b"npy")
+    (source / "arrays" / "anomaly_flags.npy").write_bytes(b"npy")
+    (source / "final_report.md").write_text("# report")
+    (target / "active_dataset.json").write_text("{}")
+
+    # Only the sidecars the reused steps' artifacts reference come along
+    brought = materialize_run(str(source), str(target), steps=["overseer"])
+    assert sorted(brought) == ["arrays/cluster_labels.npy", "overseer_output.json"]
+    assert os.path.samefile(source / "overseer_output.json", target / "overseer_output.json")
+
+    everything = materialize_run(str(source), str(tmp_path / "full"))
+    assert "final_report.md" in everything and "regression_insights.json" in everything
+    assert "orchestrator_state.json" not in everything
+    assert not os.path.samefile(source / "final_report.md", tmp_path / "full" / "final_report.md")
+    assert (target / "active_dataset.json").read_text() == "{}"
+
+
+def test_concurrent_processes_do_not_lose_index_entries(tmp_path):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("spawn")
+    runs = [ctx.Process(target=_record_in_process, args=(str(tmp_path / "cache"), str(tmp_path), i)) for i in range(6)]
+    for process in runs:
+        process.start()
+    for process in runs:
+        process.join(60)
+        assert process.exitcode == 0
+
+    index = core.cache.load_cache(f"run_cache_{FINGERPRINT}")
+    assert sorted(run["run_id"] for run in index["runs"]) == [f"run{i}" for i in range(6)]
+
+
+def _record_in_process(cache_dir, root, number):
+    from pathlib import Path
+
+    core.cache.CACHE_DIR = Path(cache_dir)
+    for attempt in range(5):
+        # Re-recording the same run rewrites the index several times per process
+        record_completed_run(root, f"run{number}", FINGERPRINT, {"attempt": attempt}, PIPELINE_SEQUENCE)
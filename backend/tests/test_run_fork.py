@@ -0,0 +1,78 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import orchestrator
+from core.pipeline_map import PIPELINE_SEQUENCE
+from core.run_manifest import initialize_manifest
+from core.state_manager import StateManager
+
+
+@pytest.fixture
+def source_run(tmp_path, monkeypatch):
+    runs = tmp_path / "runs"
+
+    def create_run_folder(base_dir=None, run_id=None):
+        path = runs / (run_id or "fork")
+        path.mkdir(parents=True, exist_ok=True)
+        return path.name, str(path)
+
+    monkeypatch.setattr(orchestrator, "create_run_folder", create_run_folder)
+    monkeypatch.setenv("ACE_STATE_WRITE_BEHIND", "0")
+
+    run_path = runs / "source"
+    (run_path / "artifacts").mkdir(parents=True)
+    (run_path / "cleaned_uploaded.csv").write_text("a,b\n1,2\n")
+    (run_path / "artifacts" / "schema_profile.json").write_text("{}")
+    state_manager = StateManager(str(run_path))
+    state_manager.write("active_dataset", {"path": str(run_path / "cleaned_uploaded.csv")})
+    state_manager.write("ingestion_meta", {"rows": 1, "schema_profile": str(run_path / "artifacts" / "schema_profile.json")})
+    state_manager.write("run_config", {"target_column": "sales"})
+    for name in ["overseer_output", "anomalies", "model_fit_report", "validation_report"]:
+        state_manager.write(name, {"from": "source"})
+
+    state_path = run_path / "orchestrator_state.json"
+    state = orchestrator.initialize_state("source", str(state_path), str(run_path / "cleaned_uploaded.csv"))
+    state["run_config"] = {"target_column": "sales"}
+    state["steps_completed"] = ["ingestion"] + PIPELINE_SEQUENCE
+    state["status"] = "complete"
+    orchestrator.save_state(str(state_path), state)
+    initialize_manifest(run_path, "source", "f" * 64)
+    return run_path
+
+
+def _state(run_path):
+    return json.loads((Path(run_path) / "orchestrator_state.json").read_text())
+
+
+def test_target_change_resumes_at_validator_with_upstream_linked(source_run):
+    run_id, run_path = orchestrator.fork_run(str(source_run), {"target_column": "profit"}, run_id="fork1")
+    state = _state(run_path)
+
+    assert state["current_step"] == "validator"
+    assert {"scanner", "interpreter", "overseer", "sentry", "time_series"} <= set(state["steps_completed"])
+    assert "regression" in state["rerun_steps"] and "regression" not in state["steps_completed"]
+    assert os.path.samefile(source_run / "overseer_output.json", Path(run_path) / "overseer_output.json")
+    assert not (Path(run_path) / "model_fit_report.json").exists()
+    assert os.path.samefile(source_run / "cleaned_uploaded.csv", Path(run_path) / "cleaned_uploaded.csv")
+
+    forked = StateManager(run_path)
+    assert forked.read("active_dataset")["path"] == str(Path(run_path) / "cleaned_uploaded.csv")
+    assert forked.read("run_config") == {"target_column": "profit"}
+    assert json.loads((source_run / "active_dataset.json").read_text())["path"].startswith(str(source_run))
+
+
+def test_from_step_reruns_that_step_and_its_readers(source_run):
+    _, run_path = orchestrator.fork_run(str(source_run), {"target_column": "sales"}, run_id="fork2", from_step="sentry")
+    state = _state(run_path)
+
+    assert state["current_step"] == "sentry"
+    assert "overseer" in state["steps_completed"]
+    assert {"sentry", "raw_data_sampler", "expositor"} <= set(state["rerun_steps"])
+    assert not (Path(run_path) / "anomalies.json").exists()
+
+
+def test_unknown_source_is_rejected(tmp_path):
+    assert orchestrator.fork_run(str(tmp_path / "missing")) == (None, None)
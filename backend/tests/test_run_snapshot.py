@@ -0,0 +1,87 @@
+import gzip
+import json
+
+import pytest
+
+from core.run_manifest import seal_manifest
+from core.run_snapshot import (
+    choose_encoding,
+    encode_snapshot,
+    etag_matches,
+    materialize_snapshots,
+    read_snapshot_index,
+    sealed_snapshot,
+    snapshot_dir,
+)
+
+
+@pytest.fixture
+def run_path(tmp_path):
+    path = tmp_path / "runs" / "abc123"
+    (path / "artifacts").mkdir(parents=True)
+    (path / "run_manifest.json").write_text(
+        json.dumps({"run_id": "abc123", "render_policy": {}, "view_policies": {}, "trust": {}, "warnings": []}),
+        encoding="utf-8",
+    )
+    (path / "dataset_identity_card.json").write_text(
+        json.dumps({"row_count": 10, "column_count": 2, "columns": {"a": {"dtype": "int"}, "day": {"dtype": "str"}}}),
+        encoding="utf-8",
+    )
+    (path / "regression_insights.json").write_text(json.dumps({"feature_importance": [{"feature": "a"}]}))
+    (path / "final_report.md").write_text("# Report\n", encoding="utf-8")
+    return path
+
+
+def test_in_progress_runs_are_not_materialised(run_path):
+    assert sealed_snapshot(run_path, "lite") is None
+    assert not snapshot_dir(run_path).exists()
+
+
+def test_sealed_run_snapshots_are_stored_once(run_path):
+    seal_manifest(run_path)
+
+    full = sealed_snapshot(run_path, "full")
+    index = read_snapshot_index(run_path)
+    assert index["run_id"] == "abc123" and set(index["variants"]) == {"lite", "full"}
+
+    body = (snapshot_dir(run_path) / full["files"]["identity"]).read_bytes()
+    assert gzip.decompress((snapshot_dir(run_path) / full["files"]["gzip"]).read_bytes()) == body
+    payload = json.loads(body)
+    assert payload["report_markdown"] == "# Report\n"
+    assert payload["model_artifacts"]["feature_importance"] == [{"feature": "a"}]
+    assert "report_markdown" not in json.loads((snapshot_dir(run_path) / "lite.json").read_bytes())
+
+    # Served from the index afterwards, even if artifacts are touched
+    (run_path / "final_report.md").write_text("# Edited\n", encoding="utf-8")
+    assert sealed_snapshot(run_path, "full") == full
+
+
+def test_index_from_before_the_seal_is_rebuilt(run_path):
+    materialize_snapshots(run_path)
+    assert read_snapshot_index(run_path)["sealed_at"] is None
+
+    seal_manifest(run_path)
+    sealed_snapshot(run_path, "lite")
+    assert read_snapshot_index(run_path)["sealed_at"] is not None
+
+
+def test_encoding_and_etag_negotiation():
+    available = ["identity", "gzip", "zstd"]
+    assert choose_encoding("gzip, deflate, br, zstd", available) == "zstd"
+    assert choose_encoding("gzip;q=1.0, zstd;q=0.5", available) == "gzip"
+    assert choose_encoding("br", available) == "identity"
+    assert choose_encoding("*", ["identity", "gzip"]) == "gzip"
+    assert choose_encoding(None, available) == "identity"
+
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"other"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_non_finite_numbers_encode_as_null():
+    assert json.loads(encode_snapshot({"score": float("nan"), "items": [float("inf"), 1.5]})) == {
+        "score": None,
+        "items": [None, 1.5],
+    }
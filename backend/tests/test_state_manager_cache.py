@@ -0,0 +1,75 @@
+import json
+import os
+
+import numpy as np
+
+from core.state_manager import StateManager, flush_pending_writes
+
+
+def test_read_sees_external_rewrite_and_returns_independent_copies(tmp_path):
+    state = StateManager(str(tmp_path), write_behind=False)
+    state.write("schema_map", {"columns": ["a"], "count": np.int64(1)})
+
+    first = state.read("schema_map")
+    first["columns"].append("mutated")
+    assert state.read("schema_map") == {"columns": ["a"], "count": 1}
+
+    # Another process replaces the file; the cache must notice.
+    path = tmp_path / "schema_map.json"
+    path.write_text(json.dumps({"columns": ["b", "c"], "count": 2}), encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000))
+    assert state.read("schema_map")["columns"] == ["b", "c"]
+
+
+def test_write_is_compact_and_legacy_nan_files_still_load(tmp_path):
+    state = StateManager(str(tmp_path), write_behind=False)
+    state.write("overseer_output", {"score": 0.5, "nested": {"k": [1, 2]}})
+    raw = (tmp_path / "overseer_output.json").read_text(encoding="utf-8")
+    assert "\n" not in raw and ": " not in raw
+
+    (tmp_path / "legacy.json").write_text('{"value": NaN}', encoding="utf-8")
+    assert np.isnan(state.read("legacy")["value"])
+
+
+def test_write_behind_buffers_until_flush(tmp_path):
+    agent_state = StateManager(str(tmp_path), write_behind=True)
+    agent_state.write("anomalies", {"count": 3})
+    agent_state.write("stale", {"x": 1})
+    agent_state.delete("stale")
+
+    assert not (tmp_path / "anomalies.json").exists()
+    assert StateManager(str(tmp_path), write_behind=False).read("anomalies") == {"count": 3}
+    assert not agent_state.exists("stale")
+
+    assert flush_pending_writes(str(tmp_path)) == 2
+    assert json.loads((tmp_path / "anomalies.json").read_text(encoding="utf-8")) == {"count": 3}
+    assert not (tmp_path / "stale.json").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_array_sidecar_round_trips_memory_mapped(tmp_path):
+    state = StateManager(str(tmp_path), write_behind=True)
+    ref = state.write_array("cluster_labels", [0, 2, 1, 2], dtype=np.int16)
+    state.write("overseer_output", {"labels_ref": ref})
+
+    # Sidecars are on disk before any flush, so the reference is never dangling
+    assert (tmp_path / ref["path"]).is_file()
+    assert ref["length"] == 4 and ref["dtype"] == np.dtype(np.int16).str
+
+    labels = state.read_array(state.read("overseer_output")["labels_ref"])
+    assert isinstance(labels, np.memmap)
+    assert labels.tolist() == [0, 2, 1, 2]
+    assert state.read_array("cluster_labels", mmap=False).dtype == np.int16
+    assert state.read_array("missing") is None
+    flush_pending_writes(str(tmp_path))
+
+
+def test_non_finite_floats_keep_their_json_tokens(tmp_path):
+    state = StateManager(str(tmp_path), write_behind=False)
+    state.write("metrics", {"r2": float("nan"), "lift": [1.5, float("inf")], "mean": np.array([np.nan, 2.0]), "none": None})
+    raw = (tmp_path / "metrics.json").read_text(encoding="utf-8")
+    assert "NaN" in raw and "Infinity" in raw and '"none":null' in raw
+
+    loaded = state.read("metrics")
+    assert np.isnan(loaded["r2"]) and loaded["lift"][1] == float("inf")
+    assert np.isnan(loaded["mean"][0]) and loaded["none"] is None
@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 
 from anti_gravity.core.time_series import (
+    _detect_change_points,
+    _max_drawdown,
     compute_time_series_analysis,
     detect_datetime_column,
     detect_numeric_targets,
@@ -217,3 +219,53 @@ class TestEdgeCases:
         assert result["status"] == "ok"
         assert "revenue" in result["analyses"]
         assert "users" not in result["analyses"]
+
+
+class TestScaling:
+    def test_max_drawdown_matches_running_peak(self):
+        values = np.array([100.0, 120.0, 90.0, 130.0, 65.0, 80.0])
+        assert _max_drawdown(values) == pytest.approx(0.5)
+        assert _max_drawdown(np.arange(10.0)) == 0.0
+
+    def test_change_point_found_at_level_shift(self):
+        rng = np.random.default_rng(0)
+        values = np.concatenate([rng.normal(10, 1, 300), rng.normal(15, 1, 300)])
+        index = pd.date_range("2023-01-01", periods=len(values), freq="D")
+        result = _detect_change_points(values, index)
+        assert result["detected"]
+        assert abs(result["points"][0]["index"] - 300) <= 5
+        assert result["points"][0]["shift_pct"] > 0
+
+    def test_no_change_point_in_white_noise(self):
+        values = np.random.default_rng(1).normal(size=500)
+        result = _detect_change_points(values, pd.RangeIndex(len(values)))
+        assert not result["detected"]
+
+    def test_long_event_log_is_aggregated(self):
+        rng = np.random.default_rng(2)
+        stamps = pd.Timestamp("2023-01-01") + pd.to_timedelta(np.sort(rng.uniform(0, 365 * 86400, 200_000)), unit="s")
+        df = pd.DataFrame({"timestamp": stamps, "amount": rng.gamma(2.0, 10.0, len(stamps))})
+        result = compute_time_series_analysis(df, TimeSeriesConfig(max_points=1_000), datetime_col="timestamp")
+
+        assert result["status"] == "ok"
+        assert result["date_range"]["n_observations"] == 200_000
+        assert result["aggregation"]["frequency"] == "daily"
+        assert result["aggregation"]["points"] <= 1_000
+        assert result["seasonal_period"] == 7
+        assert result["analyses"]["amount"]["n_observations"] == result["aggregation"]["points"]
+
+    def test_parallel_targets_match_serial(self, sample_time_series_df):
+        serial = compute_time_series_analysis(sample_time_series_df, TimeSeriesConfig(n_jobs=1))
+        parallel = compute_time_series_analysis(
+            sample_time_series_df, TimeSeriesConfig(n_jobs=2, parallel_min_points=0)
+        )
+        assert list(parallel["analyses"]) == list(serial["analyses"])
+        for col in serial["analyses"]:
+            assert parallel["analyses"][col]["trend"] == serial["analyses"][col]["trend"]
+
+    def test_default_workers_follow_the_agent_cpu_cap(self, monkeypatch):
+        from anti_gravity.core.time_series import _worker_count
+
+        monkeypatch.setenv("LOKY_MAX_CPU_COUNT", "1")
+        assert _worker_count(TimeSeriesConfig()) == 1
+        assert _worker_count(TimeSeriesConfig(n_jobs=3)) == 3
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from ace_v4.performance.config import PerformanceConfig
+from core.analytics import detect_universal_anomalies
+from core.schema import SchemaMap
+
+
+def _frame(rows=4000, seed=5):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "income": rng.normal(50_000, 5_000, rows),
+        "spend": rng.normal(2_000, 200, rows),
+        "label": ["x"] * rows,
+    })
+    frame.loc[::400, "spend"] = 20_000
+    return frame
+
+
+def _schema():
+    schema = SchemaMap()
+    schema.basic_types.numeric = ["income", "spend"]
+    schema.semantic_roles.spend_like = ["spend"]
+    return schema
+
+
+def test_flags_scores_and_drivers_cover_every_row():
+    frame = _frame()
+    config = PerformanceConfig(anomaly_fit_rows=1000, anomaly_score_chunk_rows=500)
+    result = detect_universal_anomalies(frame, _schema(), config=config)
+
+    assert len(result["scores"]) == len(frame) == result["rows_scored"]
+    assert result["total_count"] == int(result["flags"].sum())
+    assert set(range(0, len(frame), 400)) <= set(result["indices"])
+    assert next(iter(result["drivers"])) == "spend"
+    assert result["role_deviations"]["spend_like"] > 0
+
+
+def test_streams_full_dataset_when_loaded_frame_is_capped(tmp_path):
+    frame = _frame()
+    path = tmp_path / "cleaned_uploaded.csv"
+    frame.to_csv(path, index=False)
+    config = PerformanceConfig(max_analysis_rows=1000, chunk_size=700, anomaly_fit_rows=1000)
+
+    result = detect_universal_anomalies(frame.head(1000), _schema(), data_path=str(path), config=config)
+
+    assert result["rows_scored"] == len(frame)
+    assert 3600 in result["indices"]